@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2025 Beijing Volcano Engine Technology Co., Ltd.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Benchmark: persisting concurrent /chat/stream answers
+Runs concurrent simulated answer streams on one event loop against a real SQLiteBackend.
+Each stream either appends every chunk synchronously (previous chat_stream behaviour) or
+goes through MessageStreamWriter. Reports delivered tokens/sec, event-loop lag measured
+by a 10 ms ticker, and the number of storage appends.
+
+Usage:
+    python benchmarks/benchmark_chat_stream_writes.py
+    python benchmarks/benchmark_chat_stream_writes.py --streams 20 --tokens 4000
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add parent directory to path to import opencontext modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from opencontext.storage.backends.sqlite_backend import SQLiteBackend
+from opencontext.storage.message_stream import MessageStreamWriter
+
+
+async def answer(tokens: int, interval: float):
+    """Simulated model output: short chunks at a steady rate"""
+    for i in range(tokens):
+        await asyncio.sleep(interval)
+        yield f"tok{i % 10} "
+
+
+async def legacy_stream(storage, message_id, tokens, interval):
+    appends = 0
+    async for chunk in answer(tokens, interval):
+        storage.append_message_content(message_id=message_id, content_chunk=chunk, token_count=1)
+        appends += 1
+    storage.mark_message_finished(message_id=message_id, status="completed")
+    return appends
+
+
+async def buffered_stream(storage, message_id, tokens, interval):
+    writer = MessageStreamWriter(storage, message_id)
+    async for chunk in answer(tokens, interval):
+        writer.append(chunk, token_count=1)
+    await writer.finish(status="completed")
+    return writer.flush_count
+
+
+async def run(stream_fn, storage, message_ids, tokens, interval):
+    lags = []
+    done = asyncio.Event()
+
+    async def ticker():
+        while not done.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(0.01)
+            lags.append((time.perf_counter() - start - 0.01) * 1000)
+
+    tick = asyncio.create_task(ticker())
+    start = time.perf_counter()
+    appends = await asyncio.gather(*(stream_fn(storage, m, tokens, interval) for m in message_ids))
+    elapsed = time.perf_counter() - start
+    done.set()
+    await tick
+    lags.sort()
+    return (
+        len(message_ids) * tokens / elapsed,
+        statistics.median(lags),
+        lags[int(len(lags) * 0.99) - 1],
+        sum(appends),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--streams", type=int, default=20)
+    parser.add_argument("--tokens", type=int, default=2000, help="Chunks per answer")
+    parser.add_argument("--interval-ms", type=float, default=2.0, help="Delay between chunks")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = SQLiteBackend()
+        storage.initialize({"config": {"path": os.path.join(tmp, "app.db")}})
+        expected = "".join(f"tok{i % 10} " for i in range(args.tokens))
+
+        print(f"{args.streams} streams x {args.tokens} chunks, one every {args.interval_ms} ms")
+        print(
+            f"{'writes':<22}{'tokens/s':>10}{'lag p50 (ms)':>14}{'lag p99 (ms)':>14}{'appends':>9}"
+        )
+        for name, stream_fn in (("append per chunk", legacy_stream), ("buffered", buffered_stream)):
+            message_ids = []
+            for _ in range(args.streams):
+                conversation = storage.create_conversation(page_name="chat")
+                message = storage.create_streaming_message(conversation["id"], role="assistant")
+                message_ids.append(message["id"])
+            rate, p50, p99, appends = asyncio.run(
+                run(stream_fn, storage, message_ids, args.tokens, args.interval_ms / 1000)
+            )
+            for message_id in message_ids:
+                message = storage.get_message(message_id, include_thinking=False)
+                assert message["content"] == expected and message["status"] == "completed"
+                assert message["token_count"] == args.tokens
+            print(f"{name:<22}{rate:>10.0f}{p50:>14.2f}{p99:>14.2f}{appends:>9}")
+        storage.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2025 Beijing Volcano Engine Technology Co., Ltd.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Benchmark: completion cache hit rate on a replayed typing trace, and LRU operation cost
+Replays a user typing a note one keystroke at a time, each keystroke looking up the
+completion cache with the same key CompletionService builds. On a miss the model is asked
+and its continuation cached; it guesses the text the user goes on to type with probability
+--accuracy, otherwise writes something else. The exact-key lookup is what the cache did
+before; the prefix lookup also serves a continuation cached a few keystrokes earlier with
+the characters typed since consumed. A served suggestion is correct if the user then types it.
+Separately times get/put on a full cache against the previous list-ordered LRU.
+
+Usage:
+    python benchmarks/benchmark_completion_cache.py
+    python benchmarks/benchmark_completion_cache.py --accuracy 0.3 --size 20000
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path to import opencontext modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from opencontext.context_consumption.completion import completion_service
+from opencontext.context_consumption.completion.completion_cache import CompletionCache
+from opencontext.context_consumption.completion.completion_service import (
+    CompletionService,
+    CompletionSuggestion,
+)
+from opencontext.models.enums import CompletionType
+
+WORDS = (
+    "the storage layer keeps every processed context in a vector index so that related "
+    "notes can be found while the user is writing about release plans and design reviews"
+).split()
+
+
+class ListLRU:
+    """The previous cache bookkeeping: a dict plus a list in LRU order"""
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._cache, self._access_order = {}, []
+
+    def get(self, key):
+        if key not in self._cache:
+            return None
+        if key in self._access_order:
+            self._access_order.remove(key)
+        self._access_order.append(key)
+        return self._cache[key]
+
+    def put(self, key, suggestions):
+        while len(self._cache) >= self.max_size and self._access_order:
+            oldest = self._access_order[0]
+            del self._cache[oldest]
+            self._access_order.remove(oldest)
+        self._cache[key] = suggestions
+        self._access_order.append(key)
+
+
+def document(rng: random.Random, sentences: int) -> str:
+    text = "# Design review\n\n"
+    for _ in range(sentences):
+        text += " ".join(rng.choices(WORDS, k=rng.randint(8, 16))).capitalize() + ". "
+    return text
+
+
+def replay(service, cache, text, args, use_prefix):
+    rng = random.Random(args.seed)
+    counts = {"keystrokes": 0, "exact": 0, "prefix": 0, "correct": 0, "llm": 0}
+    for cursor in range(20, len(text)):
+        counts["keystrokes"] += 1
+        context = service._extract_context(text, cursor)
+        key = service._generate_cache_key(context, 1)
+        prefix = context["context_before"] if use_prefix else None
+        before = cache.get_stats()
+        cached = cache.get(key, prefix=prefix, scope=1)
+        after = cache.get_stats()
+        if cached:
+            counts["prefix" if after["prefix_hits"] > before["prefix_hits"] else "exact"] += 1
+            if any(text.startswith(s.text, cursor) for s in cached):
+                counts["correct"] += 1
+            continue
+        counts["llm"] += 1
+        length = rng.randint(30, 60)
+        if rng.random() < args.accuracy:
+            guess = text[cursor : cursor + length]
+        else:
+            guess = " ".join(rng.choices(WORDS, k=length // 6))
+        if not guess.strip():
+            continue
+        suggestion = CompletionSuggestion(guess, CompletionType.SEMANTIC_CONTINUATION, 0.8)
+        cache.put(key, [suggestion], prefix=prefix, scope=1)
+    return counts
+
+
+def time_operations(cache_factory, size, ops, rng):
+    cache = cache_factory(size)
+    for i in range(size):
+        cache.put(f"key-{i}", [i])
+    keys = [f"key-{rng.randrange(size * 2)}" for _ in range(ops)]
+    start = time.perf_counter()
+    for i, key in enumerate(keys):
+        if cache.get(key) is None:
+            cache.put(key, [i])
+    return (time.perf_counter() - start) / ops * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sentences", type=int, default=40)
+    parser.add_argument("--accuracy", type=float, default=0.5, help="Model guesses right")
+    parser.add_argument("--size", type=int, default=10000, help="Entries for the LRU timing")
+    parser.add_argument("--seed", type=int, default=9)
+    args = parser.parse_args()
+
+    completion_service.get_storage = lambda: None
+    service = CompletionService()
+    text = document(random.Random(args.seed), args.sentences)
+
+    rows = []
+    for label, use_prefix in (("exact key", False), ("prefix", True)):
+        counts = replay(service, CompletionCache(), text, args, use_prefix)
+        rows.append((label, counts))
+    assert rows[1][1]["exact"] + rows[1][1]["prefix"] > rows[0][1]["exact"]
+
+    print(f"typing trace of {len(text)} characters, model accuracy {args.accuracy:.0%}\n")
+    print(
+        f"{'lookup':<11}{'keystrokes':>12}{'exact hits':>12}{'prefix hits':>13}{'hit rate':>10}"
+        f"{'correct':>9}{'LLM calls':>11}"
+    )
+    for label, c in rows:
+        hits = c["exact"] + c["prefix"]
+        print(
+            f"{label:<11}{c['keystrokes']:>12}{c['exact']:>12}{c['prefix']:>13}"
+            f"{hits / c['keystrokes']:>10.1%}{c['correct']:>9}{c['llm']:>11}"
+        )
+
+    rng = random.Random(args.seed)
+    ops = 20000
+    legacy_us = time_operations(ListLRU, args.size, ops, rng)
+    new_us = time_operations(lambda size: CompletionCache(max_size=size), args.size, ops, rng)
+    print(
+        f"\nget/put on a full cache of {args.size} entries: list LRU {legacy_us:.1f}us/op, "
+        f"OrderedDict {new_us:.1f}us/op"
+    )
+
+
+if __name__ == "__main__":
+    main()
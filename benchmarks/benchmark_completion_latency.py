@@ -0,0 +1,253 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2025 Beijing Volcano Engine Technology Co., Ltd.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Benchmark: completion latency under simulated typing, sequential vs concurrent pipeline
+A typist writes a markdown note into one document, sending a completion request on every
+keystroke and pausing between words and lines. The model and the vector search are replaced
+by sleeps drawn from long-tailed latency distributions. The legacy pipeline is the previous
+get_completions: continuation, templates, then reference search one after another, run on a
+worker thread per request, with every stale request running to the end. The new pipeline runs
+the strategies concurrently with deadlines, hands out template completions first and cancels
+a document's stale requests on the next keystroke. Latencies are those of the requests the
+typist pauses on, the ones whose suggestions are actually shown.
+
+Usage:
+    python benchmarks/benchmark_completion_latency.py
+    python benchmarks/benchmark_completion_latency.py --words 40 --llm-ms 900
+"""
+
+import argparse
+import asyncio
+import hashlib
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add parent directory to path to import opencontext modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from opencontext.context_consumption.completion import completion_service
+from opencontext.context_consumption.completion.completion_service import CompletionService
+from opencontext.models.enums import CompletionType
+
+WORDS = (
+    "the context index keeps every note close to the editor so that related work "
+    "shows up while writing release plans meeting notes and design reviews"
+).split()
+counters = {"llm_started": 0, "llm_finished": 0, "search_started": 0, "search_finished": 0}
+
+
+class Latency:
+    """Long-tailed latency: lognormal around the median, capped"""
+
+    def __init__(self, median_ms: float, seed: int):
+        self.median = median_ms / 1000
+        self.rng = random.Random(seed)
+
+    def draw(self) -> float:
+        return min(self.median * self.rng.lognormvariate(0, 0.6), self.median * 6)
+
+
+class FakeSearchTool:
+    def __init__(self, latency: Latency):
+        self.latency = latency
+
+    def _results(self, query):
+        return [
+            {
+                "context": f"Related note about {query.split()[-1]}. It was written last week.",
+                "similarity_score": 0.75,
+                "context_description": "note",
+            }
+        ]
+
+    def execute(self, query, top_k=5):
+        counters["search_started"] += 1
+        time.sleep(self.latency.draw())
+        counters["search_finished"] += 1
+        return self._results(query)
+
+    async def aexecute(self, query, top_k=5):
+        counters["search_started"] += 1
+        await asyncio.sleep(self.latency.draw())
+        counters["search_finished"] += 1
+        return self._results(query)
+
+
+def make_llm(latency: Latency):
+    def continuation(messages):
+        tail = messages[-1]["content"][-20:]
+        return f"continues the thought after {tail!r}\nand adds one more detail"
+
+    def generate(messages, **kwargs):
+        counters["llm_started"] += 1
+        time.sleep(latency.draw())
+        counters["llm_finished"] += 1
+        return continuation(messages)
+
+    async def generate_stream(messages, **kwargs):
+        counters["llm_started"] += 1
+        await asyncio.sleep(latency.draw())
+        counters["llm_finished"] += 1
+        delta = SimpleNamespace(content=continuation(messages))
+        yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+
+    return generate, generate_stream
+
+
+def legacy_get_completions(service, generate, text, cursor, document_id):
+    """The sequential get_completions this change replaces"""
+    if not service._should_trigger_completion(text, cursor):
+        return []
+    context = service._extract_context(text, cursor)
+    cache_key = service._generate_cache_key(context, document_id)
+    cached = service.cache.get(cache_key)
+    if cached:
+        return cached
+    suggestions = []
+    messages = [{"role": "user", "content": context["context_before"]}]
+    for line in generate(messages).split("\n")[:2]:
+        suggestions.append(
+            completion_service.CompletionSuggestion(line, CompletionType.SEMANTIC_CONTINUATION, 0.8)
+        )
+    suggestions.extend(service._get_template_completions(context))
+    for result in service.semantic_search_tool.execute(query=context["context_before"], top_k=5):
+        suggestions.append(
+            completion_service.CompletionSuggestion(
+                result["context"].split(".")[0] + ".",
+                CompletionType.REFERENCE_SUGGESTION,
+                result["similarity_score"],
+            )
+        )
+    suggestions = service._rank_and_filter_suggestions(suggestions)
+    if suggestions:
+        context_hash = hashlib.md5(str(context).encode()).hexdigest()
+        service.cache.put(cache_key, suggestions, context_hash, 0.8)
+    return suggestions
+
+
+def keystrokes(args, rng: random.Random):
+    """(text after the keystroke, delay before the next one, whether the typist pauses)"""
+    text, strokes = "# Release plan\n\n", []
+    for w in range(args.words):
+        if w % 6 == 0:
+            text += "\n- " if w else "- "
+        word = rng.choice(WORDS) + " "
+        for char in word:
+            text += char
+            pause = char == " " and rng.random() < 0.5
+            delay = rng.uniform(0.8, 2.0) if pause else rng.uniform(0.07, 0.2)
+            strokes.append((text, delay, pause))
+    return strokes
+
+
+async def type_document(strokes, request):
+    """Send every keystroke's request without waiting for the previous one"""
+    pending = []
+    for text, delay, pause in strokes:
+        sent = time.perf_counter()
+        task = asyncio.create_task(request(text))
+        pending.append((task, sent, pause))
+        await asyncio.sleep(delay)
+    results = []
+    for task, sent, pause in pending:
+        suggestions, finished = await task
+        results.append((finished - sent, pause, suggestions))
+    return results
+
+
+async def run_legacy(service, generate, strokes):
+    async def request(text):
+        suggestions = await asyncio.to_thread(
+            legacy_get_completions, service, generate, text, len(text), 1
+        )
+        return suggestions, time.perf_counter()
+
+    return await type_document(strokes, request)
+
+
+async def run_concurrent(service, strokes, first_results):
+    async def request(text):
+        sent, suggestions = time.perf_counter(), []
+        async for source, batch in service.iter_completions(text, len(text), document_id=1):
+            if source == CompletionType.TEMPLATE_COMPLETION.value:
+                first_results.append(time.perf_counter() - sent)
+            suggestions.extend(batch)
+        return service._rank_and_filter_suggestions(suggestions), time.perf_counter()
+
+    return await type_document(strokes, request)
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--words", type=int, default=40)
+    parser.add_argument("--llm-ms", type=float, default=600, help="Median continuation latency")
+    parser.add_argument("--search-ms", type=float, default=150, help="Median search latency")
+    parser.add_argument("--seed", type=int, default=11)
+    args = parser.parse_args()
+
+    completion_service.get_storage = lambda: None
+    service = CompletionService()
+    service.prompt_manager = type(
+        "Prompts", (), {"get_prompt_group": lambda self, name: {"user": "{context_text}"}}
+    )()
+    completion_service.is_initialized = lambda: True
+    strokes = keystrokes(args, random.Random(args.seed))
+
+    rows = []
+    for mode in ("legacy", "concurrent"):
+        for key in counters:
+            counters[key] = 0
+        service.cache.invalidate()
+        service.semantic_search_tool = FakeSearchTool(Latency(args.search_ms, args.seed + 1))
+        generate, generate_stream = make_llm(Latency(args.llm_ms, args.seed + 2))
+        completion_service.generate_stream_for_agent = generate_stream
+        first_results = []
+        start = time.perf_counter()
+        if mode == "legacy":
+            results = asyncio.run(run_legacy(service, generate, strokes))
+        else:
+            results = asyncio.run(run_concurrent(service, strokes, first_results))
+        elapsed = time.perf_counter() - start
+        shown = [latency * 1000 for latency, pause, _ in results if pause]
+        # The requests the typist waits on still get a continuation or a reference
+        assert all(s for _, pause, s in results if pause), f"{mode}: a paused request got nothing"
+        rows.append((mode, shown, first_results, dict(counters), elapsed))
+
+    pauses = sum(1 for _, _, pause in strokes if pause)
+    print(
+        f"{len(strokes)} keystrokes, {pauses} pauses, continuation median {args.llm_ms:.0f}ms, "
+        f"search median {args.search_ms:.0f}ms\n"
+    )
+    print(
+        f"{'pipeline':<12}{'shown p50':>11}{'shown p95':>11}{'first p50':>11}"
+        f"{'LLM calls':>11}{'LLM done':>10}{'searches':>10}{'wall (s)':>10}"
+    )
+    for mode, shown, first_results, counts, elapsed in rows:
+        first = f"{statistics.median(first_results) * 1000:.2f}ms" if first_results else "-"
+        print(
+            f"{mode:<12}{statistics.median(shown):>9.0f}ms{percentile(shown, 0.95):>9.0f}ms"
+            f"{first:>11}{counts['llm_started']:>11}{counts['llm_finished']:>10}"
+            f"{counts['search_started']:>10}{elapsed:>10.1f}"
+        )
+    stats = service.get_pipeline_stats()
+    print(
+        f"\nconcurrent pipeline: {stats['requests']} requests, {stats['superseded']} superseded, "
+        f"deadline misses {stats['timeouts']}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2025 Beijing Volcano Engine Technology Co., Ltd.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Benchmark: /api/completions/suggest/stream, per-type full pipelines vs one streamed pass
+Serves the completions routes with uvicorn. The model streams its continuation a token at a
+time after a first-token delay and the vector search sleeps; both count their calls. The
+legacy handler is replayed in process: for each of the three completion types it ran the
+whole sequential get_completions (the continuation read to its end, then the search), kept
+that type's suggestions and slept 100 ms. The new handler runs each strategy once and sends
+suggestions as they finish and continuation tokens as they arrive. A last run has clients
+hang up right after the start event; their model streams and searches must be stopped.
+
+Usage:
+    python benchmarks/benchmark_completion_stream.py
+    python benchmarks/benchmark_completion_stream.py --requests 40 --first-token-ms 500
+"""
+
+import argparse
+import asyncio
+import json
+import socket
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add parent directory to path to import opencontext modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import httpx
+import uvicorn
+from fastapi import FastAPI
+
+from opencontext.context_consumption.completion import completion_service
+from opencontext.context_consumption.completion.completion_service import CompletionService
+from opencontext.models.enums import CompletionType
+from opencontext.server.routes import completions
+
+counters = {"llm": 0, "llm_finished": 0, "search": 0, "search_finished": 0}
+TOKENS = "and then the release notes list every change that affects the storage layer".split()
+
+
+class FakeSearchTool:
+    def __init__(self, delay: float):
+        self.delay = delay
+
+    async def aexecute(self, query, top_k=5):
+        counters["search"] += 1
+        await asyncio.sleep(self.delay)
+        counters["search_finished"] += 1
+        return [
+            {
+                "context": f"A related note mentions {query.split()[-1]}. It is from last week.",
+                "similarity_score": 0.75,
+            }
+        ]
+
+
+def make_stream(args):
+    async def generate_stream(messages, **kwargs):
+        counters["llm"] += 1
+        await asyncio.sleep(args.first_token_ms / 1000)
+        for token in TOKENS:
+            yield SimpleNamespace(
+                choices=[SimpleNamespace(delta=SimpleNamespace(content=token + " "))]
+            )
+            await asyncio.sleep(args.token_ms / 1000)
+        counters["llm_finished"] += 1
+
+    return generate_stream
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def serve(port: int) -> uvicorn.Server:
+    app = FastAPI()
+    app.include_router(completions.router)
+    server = uvicorn.Server(uvicorn.Config(app, port=port, log_level="error"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return server
+
+
+def document(i: int) -> str:
+    return f"# Notes {i}\n\nThe storage migration for tenant {i} finished and the index"
+
+
+async def legacy_stream(service, text):
+    """The previous handler: the whole pipeline once per completion type, then a 100 ms sleep"""
+    start, first = time.perf_counter(), None
+    for comp_type in (
+        CompletionType.TEMPLATE_COMPLETION,
+        CompletionType.SEMANTIC_CONTINUATION,
+        CompletionType.REFERENCE_SUGGESTION,
+    ):
+        context = service._extract_context(text, len(text))
+        suggestions = await service._get_semantic_continuations(context)
+        suggestions += service._get_template_completions(context)
+        suggestions += await service._get_reference_suggestions(context)
+        if any(s.completion_type == comp_type for s in suggestions) and first is None:
+            first = time.perf_counter() - start
+        await asyncio.sleep(0.1)
+    return first, None, time.perf_counter() - start
+
+
+async def new_stream(client, url, i):
+    start = time.perf_counter()
+    first = first_token = None
+    body = {"text": document(i), "cursor_position": len(document(i)), "document_id": i}
+    async with client.stream("POST", url, json=body) as response:
+        async for line in response.aiter_lines():
+            if not line.startswith("data: {"):
+                continue
+            event = json.loads(line[6:])
+            now = time.perf_counter() - start
+            if event["type"] == "token" and first_token is None:
+                first_token = now
+            if event["type"] == "suggestion" and first is None:
+                first = now
+    return first, first_token, time.perf_counter() - start
+
+
+async def hang_up(client, url, i):
+    body = {"text": document(i), "cursor_position": len(document(i)), "document_id": i}
+    async with client.stream("POST", url, json=body) as response:
+        async for line in response.aiter_lines():
+            if line.startswith("data: {"):
+                return  # Leaving the block closes the connection
+
+
+def run_counted(coro_factory):
+    for key in counters:
+        counters[key] = 0
+    results = asyncio.run(coro_factory())
+    return results, dict(counters)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--first-token-ms", type=float, default=300)
+    parser.add_argument("--token-ms", type=float, default=25)
+    parser.add_argument("--search-ms", type=float, default=150)
+    args = parser.parse_args()
+
+    completion_service.get_storage = lambda: None
+    completion_service.is_initialized = lambda: True
+    completion_service.generate_stream_for_agent = make_stream(args)
+    service = CompletionService()
+    service.prompt_manager = type(
+        "Prompts", (), {"get_prompt_group": lambda self, name: {"user": "{context_text}"}}
+    )()
+    service.semantic_search_tool = FakeSearchTool(args.search_ms / 1000)
+    service.deadlines = {key: 10.0 for key in service.deadlines}
+    completion_service._completion_service_instance = service
+
+    port = free_port()
+    server = serve(port)
+    url = f"http://127.0.0.1:{port}/api/completions/suggest/stream"
+
+    async def legacy_all():
+        return [await legacy_stream(service, document(i)) for i in range(args.requests)]
+
+    async def new_all():
+        async with httpx.AsyncClient(timeout=None) as client:
+            return [await new_stream(client, url, 1000 + i) for i in range(args.requests)]
+
+    async def hang_up_all():
+        async with httpx.AsyncClient(timeout=None) as client:
+            for i in range(args.requests):
+                await hang_up(client, url, 2000 + i)
+        # Give the server time to notice and for abandoned work to have finished, had it run
+        await asyncio.sleep((args.first_token_ms + args.token_ms * len(TOKENS)) / 1000 + 0.5)
+
+    legacy, legacy_counts = run_counted(legacy_all)
+    new, new_counts = run_counted(new_all)
+    _, hang_up_counts = run_counted(hang_up_all)
+    stats = service.get_pipeline_stats()
+    server.should_exit = True
+
+    assert all(first is not None for first, _, _ in new), "a stream sent no suggestion"
+    assert new_counts["llm"] == args.requests, "the continuation ran more than once per request"
+    assert hang_up_counts["llm_finished"] == 0, "a disconnected stream kept the model running"
+
+    print(
+        f"{args.requests} sequential stream requests, first token {args.first_token_ms:.0f}ms "
+        f"then {args.token_ms:.0f}ms/token ({len(TOKENS)} tokens), search {args.search_ms:.0f}ms\n"
+    )
+    print(
+        f"{'handler':<10}{'first suggestion':>18}{'first token':>13}{'total p50':>11}"
+        f"{'LLM calls/req':>15}{'searches/req':>14}"
+    )
+    for label, rows, counts in (("legacy", legacy, legacy_counts), ("streamed", new, new_counts)):
+        first_token = [t for _, t, _ in rows if t is not None]
+        print(
+            f"{label:<10}{statistics.median(f for f, _, _ in rows) * 1000:>16.0f}ms"
+            f"{(f'{statistics.median(first_token) * 1000:.0f}ms' if first_token else '-'):>13}"
+            f"{statistics.median(t for _, _, t in rows) * 1000:>9.0f}ms"
+            f"{counts['llm'] / args.requests:>15.1f}{counts['search'] / args.requests:>14.1f}"
+        )
+    print(
+        f"\nclients hanging up after the start event: {hang_up_counts['llm']} continuations "
+        f"started, {hang_up_counts['llm_finished']} ran to the end, "
+        f"{hang_up_counts['search_finished']}/{hang_up_counts['search']} searches finished"
+    )
+    print(
+        f"/api/completions/stats time_to_first_suggestion_ms: {stats['time_to_first_suggestion_ms']}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2025 Beijing Volcano Engine Technology Co., Ltd.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Benchmark: reference suggestions from a document's warm state vs a search per keystroke burst
+Fills a local ChromaDB with semantic contexts on a set of topics and opens a note whose
+paragraphs are about some of them. The embedding model is a bag-of-words hash behind a
+simulated network delay (--embed-ms) and counts its requests. The user then types bursts at
+the end of three of the paragraphs; each burst needs reference suggestions. The legacy path
+embeds the text before the cursor and queries the vector store; the warm path ranks the
+contexts prefetched when the note was opened against the edited paragraph's stored vector.
+Relevance is the share of returned contexts on the edited paragraph's topic. Saving the
+edited note refreshes the state, re-embedding only the paragraphs that changed.
+
+Usage:
+    python benchmarks/benchmark_completion_warm_state.py
+    python benchmarks/benchmark_completion_warm_state.py --contexts 10000 --bursts 200
+"""
+
+import argparse
+import asyncio
+import datetime
+import hashlib
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path to import opencontext modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from opencontext.context_consumption.completion import completion_service, document_warm_state
+from opencontext.context_consumption.completion.completion_service import CompletionService
+from opencontext.models.context import ContextProperties, ExtractedData, ProcessedContext, Vectorize
+from opencontext.models.enums import ContextType
+from opencontext.storage.backends.chromadb_backend import ChromaDBBackend
+from opencontext.storage.unified_storage import UnifiedStorage
+from opencontext.tools.retrieval_tools import base_context_retrieval_tool
+
+DIM = 256
+counters = {"embedding_requests": 0, "texts_embedded": 0, "vector_queries": 0}
+
+
+def embed(text: str):
+    vector = np.zeros(DIM, dtype=np.float32)
+    for word in text.lower().split():
+        vector[int(hashlib.md5(word.strip(".,").encode()).hexdigest(), 16) % DIM] += 1
+    return vector.tolist()
+
+
+def make_embedder(args):
+    async def vectorize_batch(vectorizes, **kwargs):
+        counters["embedding_requests"] += 1
+        counters["texts_embedded"] += len(vectorizes)
+        await asyncio.sleep(args.embed_ms / 1000)
+        for vectorize in vectorizes:
+            vectorize.vector = embed(vectorize.text)
+
+    async def vectorize_one(vectorize, **kwargs):
+        await vectorize_batch([vectorize])
+
+    return vectorize_batch, vectorize_one
+
+
+def topics(rng: random.Random, count: int):
+    vocabulary = [f"{rng.choice('bcdfgklmnprst')}{rng.choice('aeiou')}{i}" for i in range(2000)]
+    return [rng.sample(vocabulary, 25) for _ in range(count)]
+
+
+def sentence(rng: random.Random, topic) -> str:
+    return " ".join(rng.choices(topic, k=rng.randint(8, 14))).capitalize() + "."
+
+
+def make_context(rng: random.Random, topic, i: int) -> ProcessedContext:
+    now = datetime.datetime.now()
+    text = " ".join(sentence(rng, topic) for _ in range(2))
+    return ProcessedContext(
+        properties=ContextProperties(create_time=now, event_time=now, update_time=now),
+        extracted_data=ExtractedData(
+            title=f"note {i}", summary=text, context_type=ContextType.SEMANTIC_CONTEXT
+        ),
+        vectorize=Vectorize(text=text, vector=embed(text)),
+    )
+
+
+def on_topic(results, topic: int, topics_count: int) -> float:
+    """Share of results from the paragraph's topic (note i is about topic i % topics_count)"""
+    titles = [line for r in results for line in r["context"].split("\n") if line[:7] == "title: "]
+    hits = sum(int(title.split()[-1]) % topics_count == topic for title in titles)
+    return hits / max(len(titles), 1)
+
+
+async def run(args, service, paragraphs, paragraph_topics, topic_words, rng):
+    document_id = 1
+    content = "\n\n".join(paragraphs)
+    counts = dict(counters)
+    start = time.perf_counter()
+    await service.warm_document(document_id, content)
+    warm_ms = (time.perf_counter() - start) * 1000
+    warm_counts = {k: counters[k] - counts[k] for k in counters}
+
+    rows = {"legacy": [], "warm": []}
+    usage = {"legacy": dict.fromkeys(counters, 0), "warm": dict.fromkeys(counters, 0)}
+    precision = {"legacy": [], "warm": []}
+    # The user works on a few paragraphs of the note
+    active = rng.sample(range(len(paragraphs)), 3)
+    for _ in range(args.bursts):
+        index = rng.choice(active)
+        paragraphs[index] += " " + " ".join(rng.choices(topic_words[paragraph_topics[index]], k=3))
+        text = "\n\n".join(paragraphs[: index + 1])
+        context = service._extract_context(text, len(text))
+
+        results = {}
+        for mode in ("legacy", "warm"):
+            counts = dict(counters)
+            start = time.perf_counter()
+            if mode == "legacy":
+                results[mode] = await service.semantic_search_tool.aexecute(
+                    query=context["context_before"], top_k=5
+                )
+            else:
+                results[mode] = service.warm_states.rank_references(
+                    document_id, context["current_paragraph"], top_k=5
+                )
+                assert results[mode] is not None, "the edited paragraph was not recognised"
+            rows[mode].append((time.perf_counter() - start) * 1000)
+            for key in counters:
+                usage[mode][key] += counters[key] - counts[key]
+        for mode in ("legacy", "warm"):
+            precision[mode].append(
+                on_topic(results[mode], paragraph_topics[index], len(topic_words))
+            )
+
+    counts = dict(counters)
+    await service.warm_document(document_id, "\n\n".join(paragraphs))
+    save_counts = {k: counters[k] - counts[k] for k in counters}
+    edited = len({p for p in paragraphs} - set(content.split("\n\n")))
+    return warm_ms, warm_counts, rows, usage, precision, save_counts, edited
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--contexts", type=int, default=3000)
+    parser.add_argument("--paragraphs", type=int, default=12)
+    parser.add_argument("--bursts", type=int, default=60)
+    parser.add_argument("--embed-ms", type=float, default=60, help="Embedding request latency")
+    parser.add_argument("--seed", type=int, default=4)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+    topic_words = topics(rng, 40)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = UnifiedStorage()
+        storage._vector_backend = ChromaDBBackend()
+        storage._vector_backend.initialize({"config": {"mode": "local", "path": tmp + "/chroma"}})
+        storage._initialized = True
+        contexts = [
+            make_context(rng, topic_words[i % len(topic_words)], i) for i in range(args.contexts)
+        ]
+        for i in range(0, len(contexts), 500):
+            storage.batch_upsert_processed_context(contexts[i : i + 500])
+
+        search = storage.search
+
+        def counted_search(*a, **kw):
+            counters["vector_queries"] += 1
+            return search(*a, **kw)
+
+        storage.search = counted_search
+        vectorize_batch, vectorize_one = make_embedder(args)
+        document_warm_state.do_vectorize_batch_async = vectorize_batch
+        base_context_retrieval_tool.do_vectorize_async = vectorize_one
+        base_context_retrieval_tool.get_storage = lambda: storage
+        completion_service.get_storage = lambda: storage
+        service = CompletionService()
+
+        paragraph_topics = [rng.randrange(len(topic_words)) for _ in range(args.paragraphs)]
+        paragraphs = [
+            " ".join(sentence(rng, topic_words[t]) for _ in range(3)) for t in paragraph_topics
+        ]
+        results = asyncio.run(run(args, service, paragraphs, paragraph_topics, topic_words, rng))
+    warm_ms, warm_counts, rows, usage, precision, save_counts, edited = results
+
+    print(
+        f"{args.contexts} semantic contexts, note of {args.paragraphs} paragraphs, "
+        f"{args.bursts} typing bursts, embedding request {args.embed_ms:.0f}ms\n"
+    )
+    print(
+        f"opening the note: {warm_ms:.0f}ms, {warm_counts['embedding_requests']} embedding "
+        f"request ({warm_counts['texts_embedded']} paragraphs), "
+        f"{warm_counts['vector_queries']} vector queries\n"
+    )
+    print(
+        f"{'references':<12}{'p50':>10}{'p95':>10}{'embedding req':>15}{'vector queries':>16}"
+        f"{'on topic':>10}"
+    )
+    for mode in ("legacy", "warm"):
+        latencies = sorted(rows[mode])
+        print(
+            f"{mode:<12}{statistics.median(latencies):>8.2f}ms"
+            f"{latencies[int(len(latencies) * 0.95) - 1]:>8.2f}ms"
+            f"{usage[mode]['embedding_requests']:>15}{usage[mode]['vector_queries']:>16}"
+            f"{statistics.mean(precision[mode]):>10.0%}"
+        )
+    print(
+        f"\nsaving after the edits ({edited} of {args.paragraphs} paragraphs changed): "
+        f"{save_counts['texts_embedded']} paragraphs embedded, "
+        f"{save_counts['vector_queries']} vector queries"
+    )
+
+
+if __name__ == "__main__":
+    main()
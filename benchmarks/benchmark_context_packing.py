@@ -0,0 +1,176 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2025 Beijing Volcano Engine Technology Co., Ltd.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Benchmark: prompt tokens of the generation prompts on a synthetic busy day
+Builds a working day of processed contexts as screenshot capture produces them: each task
+the user works on yields a stream of near-identical activity contexts (embeddings within a
+small distance of the task's), plus semantic and intent contexts. For every generation the
+scheduler runs (activity every 15 minutes, tips hourly, todos every 30 minutes, the report
+once per hour of the day) it compares the context data of the legacy prompt, every
+get_llm_context_string() JSON-dumped with indent=2, with the context packer's output.
+
+Usage:
+    python benchmarks/benchmark_context_packing.py
+    python benchmarks/benchmark_context_packing.py --hours 10 --per-minute 6
+"""
+
+import argparse
+import datetime
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path to import opencontext modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+
+from opencontext.context_consumption.generation.context_packer import (
+    _DEFAULT_BUDGETS,
+    ContextPacker,
+    estimate_tokens,
+)
+from opencontext.models.context import ContextProperties, ExtractedData, ProcessedContext, Vectorize
+from opencontext.models.enums import ContextType
+
+APPS = ["VS Code", "Chrome", "Slack", "Figma", "Terminal", "Notion", "Zoom", "Outlook"]
+TOPICS = [
+    "refactoring the payment service retry logic",
+    "reviewing the quarterly roadmap document",
+    "debugging flaky integration tests in CI",
+    "discussing the release plan with the mobile team",
+    "writing the design doc for the search ranking change",
+    "triaging customer bug reports",
+    "preparing slides for the architecture review",
+    "reading about vector database indexing",
+]
+
+
+def make_day(args, rng: random.Random, np_rng):
+    """Contexts of a working day, and the start timestamp"""
+    start = datetime.datetime(2025, 6, 2, 9, 0)
+    dim = 256
+    task_vectors = [np_rng.normal(size=dim) for _ in TOPICS]
+    contexts = []
+    minutes = args.hours * 60
+    task = 0
+    for minute in range(minutes):
+        if minute % rng.randint(20, 50) == 0:
+            task = rng.randrange(len(TOPICS))  # The user switches to another task
+        for k in range(args.per_minute):
+            ts = start + datetime.timedelta(minutes=minute, seconds=k * 60 // args.per_minute)
+            kind = rng.random()
+            if kind < 0.8:
+                context_type, step = ContextType.ACTIVITY_CONTEXT, rng.randrange(4)
+            elif kind < 0.93:
+                context_type, step = ContextType.SEMANTIC_CONTEXT, rng.randrange(50)
+            else:
+                context_type, step = ContextType.INTENT_CONTEXT, rng.randrange(20)
+            app = APPS[(task + step) % len(APPS)]
+            # Near-identical captures of the same step share an embedding up to noise
+            vector = task_vectors[task] + np_rng.normal(scale=0.6, size=dim) * (step / 10 + 0.02)
+            contexts.append(
+                ProcessedContext(
+                    properties=ContextProperties(
+                        create_time=ts,
+                        event_time=ts,
+                        update_time=ts,
+                        duration_count=rng.choice([1, 1, 1, 2, 3]),
+                        merge_count=rng.choice([0, 0, 1]),
+                    ),
+                    extracted_data=ExtractedData(
+                        title=f"{app}: {TOPICS[task]} (step {step})",
+                        summary=(
+                            f"The user is {TOPICS[task]} in {app}, looking at part {step} of "
+                            f"the work; visible content includes code, comments and notes "
+                            f"about {TOPICS[(task + 1) % len(TOPICS)]}."
+                        ),
+                        keywords=TOPICS[task].split()[:4] + [app],
+                        entities=[app, f"project-{task}"],
+                        context_type=context_type,
+                        importance=rng.randint(2, 9),
+                        confidence=8,
+                    ),
+                    vectorize=Vectorize(text=TOPICS[task], vector=vector.tolist()),
+                )
+            )
+    return contexts, start
+
+
+def window(contexts, start, end):
+    return [c for c in contexts if start <= c.properties.create_time < end]
+
+
+def legacy_tokens(contexts):
+    data = [context.get_llm_context_string() for context in contexts]
+    return estimate_tokens(json.dumps(data, ensure_ascii=False, indent=2))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--hours", type=int, default=9)
+    parser.add_argument("--per-minute", type=int, default=4, help="Contexts per minute")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    contexts, day_start = make_day(args, random.Random(args.seed), np.random.default_rng(args.seed))
+    minute = datetime.timedelta(minutes=1)
+    # (task, generations over the day, window length, contexts the generator fetches at most)
+    schedule = [
+        ("activity", 15, 10000),
+        ("tips", 60, 10000),
+        ("todos", 30, 80),
+        ("report", 60, 1000),
+    ]
+
+    print(
+        f"{len(contexts)} contexts over {args.hours} h ({args.per_minute}/min), "
+        f"budgets {_DEFAULT_BUDGETS}\n"
+    )
+    print(
+        f"{'generation':<10}{'runs':>6}{'contexts':>10}{'legacy tok':>12}{'packed tok':>12}"
+        f"{'max packed':>12}{'packed ctx':>12}{'dups':>8}{'pack ms':>9}"
+    )
+    for task, minutes, limit in schedule:
+        packer = ContextPacker(_DEFAULT_BUDGETS[task])
+        runs = seen = legacy = packed_tokens = worst = packed_contexts = dups = 0
+        pack_s = 0.0
+        t = day_start
+        end_of_day = day_start + args.hours * 60 * minute
+        while t < end_of_day:
+            chunk = window(contexts, t, t + minutes * minute)[:limit]
+            t += minutes * minute
+            if not chunk:
+                continue
+            t0 = time.perf_counter()
+            packed = packer.pack(chunk)
+            pack_s += time.perf_counter() - t0
+            tokens = estimate_tokens(json.dumps(packed.lines, ensure_ascii=False))
+            assert tokens <= packer.token_budget + len(packed.lines) * 2 + 2, "over budget"
+            assert {c.id for c in packed.contexts} <= {c.id for c in chunk}
+            # Every task the user worked on in the window is still represented
+            topics = {c.vectorize.text for c in chunk}
+            assert topics == {c.vectorize.text for c in packed.contexts}, "a task was dropped"
+            runs += 1
+            seen += len(chunk)
+            legacy += legacy_tokens(chunk)
+            packed_tokens += tokens
+            worst = max(worst, tokens)
+            packed_contexts += len(packed.contexts)
+            dups += packed.duplicates
+        print(
+            f"{task:<10}{runs:>6}{seen // runs:>10}{legacy // runs:>12}{packed_tokens // runs:>12}"
+            f"{worst:>12}{packed_contexts // runs:>12}{dups // runs:>8}"
+            f"{pack_s / runs * 1000:>9.1f}"
+        )
+    print("\n(per-generation averages; tokens of the context data part of the prompt)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2025 Beijing Volcano Engine Technology Co., Ltd.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Benchmark: full scans of a context-type collection in ChromaDBBackend
+Compares the previous limit + offset emulation (fetch limit + offset rows, then slice) that
+the merger and cleanup jobs paged through with the cursor-based iter_processed_contexts.
+
+Usage:
+    python benchmarks/benchmark_context_pagination.py
+    python benchmarks/benchmark_context_pagination.py --docs 20000 --page-size 100
+"""
+
+import argparse
+import datetime
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path to import opencontext modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from opencontext.models.context import ContextProperties, ExtractedData, ProcessedContext, Vectorize
+from opencontext.models.enums import ContextType
+from opencontext.storage.backends.chromadb_backend import ChromaDBBackend
+
+
+def make_context(vector, i: int) -> ProcessedContext:
+    now = datetime.datetime.now()
+    return ProcessedContext(
+        properties=ContextProperties(create_time=now, event_time=now, update_time=now),
+        extracted_data=ExtractedData(
+            title=f"activity {i}",
+            summary=f"synthetic activity number {i}",
+            context_type=ContextType.ACTIVITY_CONTEXT,
+        ),
+        vectorize=Vectorize(text=f"activity {i}", vector=vector),
+    )
+
+
+def legacy_scan(backend: ChromaDBBackend, context_type: str, page_size: int):
+    """Previous paging: every page re-reads and deserialises all rows before it"""
+    ids = []
+    rows_read = 0
+    offset = 0
+    collection = backend._collections[context_type]
+    while True:
+        results = collection.get(limit=page_size + offset, include=["metadatas", "documents"])
+        rows_read += len(results["ids"])
+        page = []
+        for i in range(min(offset, len(results["ids"])), len(results["ids"])):
+            doc = {
+                "id": results["ids"][i],
+                "document": results["documents"][i],
+                "metadata": results["metadatas"][i],
+            }
+            context = backend._chroma_result_to_context(doc, False)
+            if context:
+                page.append(context.id)
+        ids.extend(page)
+        if len(page) < page_size:
+            return ids, rows_read
+        offset += page_size
+
+
+def cursor_scan(backend: ChromaDBBackend, context_type: str, page_size: int):
+    ids = []
+    for page in backend.iter_processed_contexts(context_type, page_size=page_size):
+        ids.extend(context.id for context in page)
+    return ids, len(ids)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--docs", type=int, default=10000)
+    parser.add_argument("--dim", type=int, default=64)
+    parser.add_argument("--page-size", type=int, default=100)
+    args = parser.parse_args()
+
+    context_type = ContextType.ACTIVITY_CONTEXT.value
+    rng = np.random.default_rng(5)
+    with tempfile.TemporaryDirectory() as tmp:
+        backend = ChromaDBBackend()
+        backend.initialize({"config": {"mode": "local", "path": tmp}})
+        vectors = rng.normal(size=(args.docs, args.dim)).astype(np.float32).tolist()
+        contexts = [make_context(v, i) for i, v in enumerate(vectors)]
+        for start in range(0, len(contexts), 1000):
+            backend.batch_upsert_processed_context(contexts[start : start + 1000])
+
+        rows = []
+        for name, scan in (("limit + offset emulation", legacy_scan), ("cursor", cursor_scan)):
+            start = time.perf_counter()
+            ids, rows_read = scan(backend, context_type, args.page_size)
+            rows.append((name, time.perf_counter() - start, rows_read, ids))
+
+        assert rows[0][3] == rows[1][3], "cursor scan returned different contexts"
+        assert len(rows[1][3]) == args.docs
+
+        print(f"\nfull scan of {args.docs} contexts, page size {args.page_size}")
+        print(f"{'mode':<28}{'wall (s)':>10}{'rows read':>12}")
+        for name, elapsed, rows_read, _ in rows:
+            print(f"{name:<28}{elapsed:>10.2f}{rows_read:>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2025 Beijing Volcano Engine Technology Co., Ltd.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Benchmark: embedding request coalescing
+Compares one-request-per-text embedding with the EmbeddingBatcher coalescing layer
+against a local fake OpenAI-compatible embedding server.
+
+The fake server sleeps a fixed per-request latency plus a small per-text cost, which is
+roughly how hosted embedding endpoints behave, and counts the HTTP requests it receives.
+
+Usage:
+    python benchmarks/benchmark_embedding_batching.py
+    python benchmarks/benchmark_embedding_batching.py --texts 200 --latency-ms 40
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Add parent directory to path to import opencontext modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from opencontext.llm.embedding_batcher import EmbeddingBatcher
+from opencontext.llm.llm_client import LLMClient, LLMType
+from opencontext.models.context import Vectorize
+
+
+class FakeEmbeddingServer:
+    """Minimal OpenAI-compatible /embeddings endpoint"""
+
+    def __init__(self, dim: int, latency_ms: float, per_text_ms: float):
+        self.requests = 0
+        self.texts = 0
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                inputs = body["input"]
+                with server._lock:
+                    server.requests += 1
+                    server.texts += len(inputs)
+                time.sleep((latency_ms + per_text_ms * len(inputs)) / 1000.0)
+                data = []
+                for i, text in enumerate(inputs):
+                    seed = hashlib.md5(text.encode("utf-8")).digest()
+                    vector = [((seed[j % 16] + j) % 255) / 255.0 - 0.5 for j in range(dim)]
+                    data.append({"object": "embedding", "index": i, "embedding": vector})
+                payload = json.dumps(
+                    {"object": "list", "data": data, "model": body.get("model", "fake")}
+                ).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address
+        return f"http://{host}:{port}/v1"
+
+    def reset(self):
+        with self._lock:
+            self.requests = 0
+            self.texts = 0
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._httpd.shutdown()
+
+
+async def run_unbatched(client: LLMClient, texts):
+    vectorizes = [Vectorize(text=t) for t in texts]
+    await asyncio.gather(*[client.vectorize_async(v) for v in vectorizes])
+    return vectorizes
+
+
+async def run_coalesced(batcher: EmbeddingBatcher, texts):
+    vectorizes = [Vectorize(text=t) for t in texts]
+
+    async def one(v: Vectorize):
+        v.vector = await batcher.embed_async(v.get_vectorize_content())
+
+    await asyncio.gather(*[one(v) for v in vectorizes])
+    return vectorizes
+
+
+def run_batch_api(client: LLMClient, texts, max_batch_size: int):
+    vectorizes = [Vectorize(text=t) for t in texts]
+    for start in range(0, len(vectorizes), max_batch_size):
+        client.vectorize_batch(vectorizes[start : start + max_batch_size])
+    return vectorizes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--texts", type=int, default=120, help="Concurrent texts to embed")
+    parser.add_argument("--dim", type=int, default=2048)
+    parser.add_argument("--latency-ms", type=float, default=30.0)
+    parser.add_argument("--per-text-ms", type=float, default=0.2)
+    parser.add_argument("--max-batch-size", type=int, default=32)
+    parser.add_argument("--max-wait-ms", type=float, default=5)
+    args = parser.parse_args()
+
+    server = FakeEmbeddingServer(args.dim, args.latency_ms, args.per_text_ms)
+    server.start()
+    config = {"base_url": server.base_url, "api_key": "bench", "model": "fake-embedding"}
+    client = LLMClient(llm_type=LLMType.EMBEDDING, config=config)
+    texts = [f"context {i}: user edited document section {i % 17}" for i in range(args.texts)]
+
+    results = []
+
+    server.reset()
+    start = time.perf_counter()
+    baseline = asyncio.run(run_unbatched(client, texts))
+    results.append(("one request per text", time.perf_counter() - start, server.requests))
+
+    batcher = EmbeddingBatcher(
+        client.generate_embeddings,
+        max_batch_size=args.max_batch_size,
+        max_wait_ms=args.max_wait_ms,
+    )
+    server.reset()
+    start = time.perf_counter()
+    coalesced = asyncio.run(run_coalesced(batcher, texts))
+    results.append(("coalesced single requests", time.perf_counter() - start, server.requests))
+    batcher.shutdown()
+
+    server.reset()
+    start = time.perf_counter()
+    batched = run_batch_api(client, texts, args.max_batch_size)
+    results.append(("do_vectorize_batch", time.perf_counter() - start, server.requests))
+
+    for a, b, c in zip(baseline, coalesced, batched):
+        assert a.vector == b.vector == c.vector, "batched embeddings differ from single ones"
+
+    server.stop()
+
+    print(f"\n{args.texts} texts, dim={args.dim}, server latency {args.latency_ms}ms/request")
+    print(f"{'mode':<28}{'wall (ms)':>12}{'requests':>10}{'texts/s':>10}")
+    for name, elapsed, requests in results:
+        print(f"{name:<28}{elapsed * 1000:>12.1f}{requests:>10}{args.texts / elapsed:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
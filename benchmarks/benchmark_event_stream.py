@@ -0,0 +1,206 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2025 Beijing Volcano Engine Technology Co., Ltd.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Benchmark: event delivery to frontend clients, fetch-and-clear polling vs the SSE stream
+Serves the events routes with uvicorn and publishes events from a background thread, as the
+generators do. The legacy clients poll /api/events/fetch every --poll-interval seconds
+against the previous fetch-and-clear cache, so each event goes to whichever client polls
+first and waits half an interval on average; its latency and request load are computed from
+the interval. The SSE clients hold /api/events/stream open and timestamp every event they
+receive. A last run makes one client stall on large events: it is disconnected as a slow
+consumer, reconnects with Last-Event-ID and must still end up with every event exactly once.
+
+Usage:
+    python benchmarks/benchmark_event_stream.py
+    python benchmarks/benchmark_event_stream.py --clients 5 --events 500
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import socket
+import statistics
+import sys
+import threading
+import time
+from collections import deque
+from pathlib import Path
+
+# Add parent directory to path to import opencontext modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import httpx
+import uvicorn
+from fastapi import FastAPI
+
+from opencontext.managers import event_manager
+from opencontext.managers.event_manager import EventManager, EventType
+from opencontext.server.routes import events
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def serve(port: int) -> uvicorn.Server:
+    app = FastAPI()
+    app.include_router(events.router)
+    server = uvicorn.Server(uvicorn.Config(app, port=port, log_level="error"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return server
+
+
+def legacy_polling(args, rng: random.Random):
+    """Fetch-and-clear cache shared by clients polling at random phases"""
+    cache, seen = deque(), [set() for _ in range(args.clients)]
+    phases = [rng.uniform(0, args.poll_interval) for _ in range(args.clients)]
+    publish_times = sorted(rng.uniform(0, 3600) for _ in range(args.events))
+    polls = sorted(
+        (phase + k * args.poll_interval, client)
+        for client, phase in enumerate(phases)
+        for k in range(int(3600 / args.poll_interval) + 1)
+    )
+    latencies, i = [], 0
+    for poll_time, client in polls:
+        while i < len(publish_times) and publish_times[i] <= poll_time:
+            cache.append((i, publish_times[i]))
+            i += 1
+        while cache:
+            event, published = cache.popleft()
+            seen[client].add(event)
+            latencies.append(poll_time - published)
+    return seen, latencies, len(polls)
+
+
+async def sse_client(url, received, stop, delay=0.0, reconnects=None):
+    """Reads the stream, reconnecting with Last-Event-ID like EventSource does"""
+    last_id = None
+    async with httpx.AsyncClient(timeout=None) as client:
+        while not stop.is_set():
+            headers = {"Last-Event-ID": str(last_id)} if last_id else {}
+            try:
+                async with client.stream("GET", url, headers=headers) as response:
+                    async for line in response.aiter_lines():
+                        if not line.startswith("data: "):
+                            continue
+                        event = json.loads(line[6:])
+                        received.append((event["seq"], time.time() - event["timestamp"]))
+                        last_id = event["seq"]
+                        if delay:
+                            await asyncio.sleep(delay)
+                        if stop.is_set():
+                            return
+            except httpx.HTTPError:
+                pass
+            if reconnects is not None:
+                reconnects.append(last_id)
+            await asyncio.sleep(0.05)
+
+
+async def run_stream(args, url, payload_size=0, slow_delay=0.0):
+    stop = asyncio.Event()
+    received = [[] for _ in range(args.clients)]
+    reconnects = []
+    tasks = [
+        asyncio.create_task(
+            sse_client(
+                url,
+                received[c],
+                stop,
+                delay=slow_delay if c == 0 else 0.0,
+                reconnects=reconnects if c == 0 else None,
+            )
+        )
+        for c in range(args.clients)
+    ]
+    await asyncio.sleep(0.5)
+    bus = event_manager.get_event_manager()
+    first_seq = bus.get_cache_status()["last_event_id"] + 1
+
+    def publish():
+        rng = random.Random(1)
+        for i in range(args.events):
+            bus.publish_event(
+                EventType.TIP_GENERATED, {"title": f"tip {i}", "content": "x" * payload_size}
+            )
+            time.sleep(rng.uniform(0.002, 0.01))
+
+    publisher = threading.Thread(target=publish)
+    publisher.start()
+    await asyncio.to_thread(publisher.join)
+    expected = set(range(first_seq, first_seq + args.events))
+    deadline = time.time() + 60
+    while time.time() < deadline and any(
+        {seq for seq, _ in r if seq >= first_seq} != expected for r in received
+    ):
+        await asyncio.sleep(0.05)
+    stop.set()
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    received = [[(seq, lat) for seq, lat in r if seq >= first_seq] for r in received]
+    for r in received:
+        seqs = [seq for seq, _ in r]
+        assert set(seqs) == expected, "a client missed events"
+        assert len(seqs) == len(set(seqs)), "a client received an event twice"
+    return received, len(reconnects)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, default=3)
+    parser.add_argument("--events", type=int, default=200)
+    parser.add_argument("--poll-interval", type=float, default=30, help="Legacy polling (s)")
+    args = parser.parse_args()
+
+    seen, legacy_latencies, polls = legacy_polling(args, random.Random(2))
+
+    event_manager._event_manager = EventManager(subscriber_queue_size=16)
+    port = free_port()
+    server = serve(port)
+    url = f"http://127.0.0.1:{port}/api/events/stream"
+    received, _ = asyncio.run(run_stream(args, url))
+    latencies = sorted(lat * 1000 for r in received for _, lat in r)
+    slow, reconnects = asyncio.run(run_stream(args, url, payload_size=50000, slow_delay=0.02))
+    status = event_manager.get_event_manager().get_cache_status()
+    server.should_exit = True
+
+    print(f"{args.events} events, {args.clients} clients\n")
+    print(
+        f"{'delivery':<22}{'events/client':>15}{'latency p50':>14}{'latency p99':>14}"
+        f"{'idle req/h/client':>19}"
+    )
+    legacy_latencies.sort()
+    print(
+        f"{'fetch-and-clear poll':<22}"
+        f"{'/'.join(str(len(s)) for s in seen):>15}"
+        f"{statistics.median(legacy_latencies) * 1000:>12.0f}ms"
+        f"{legacy_latencies[int(len(legacy_latencies) * 0.99)] * 1000:>12.0f}ms"
+        f"{polls / args.clients:>19.0f}"
+    )
+    print(
+        f"{'SSE stream':<22}"
+        f"{'/'.join(str(len(r)) for r in received):>15}"
+        f"{statistics.median(latencies):>12.2f}ms"
+        f"{latencies[int(len(latencies) * 0.99)]:>12.2f}ms"
+        f"{0:>19}"
+    )
+    print(
+        f"\nslow consumer (50 KB events, client 0 reads one per 20 ms, queue of 16): "
+        f"events per client {'/'.join(str(len(r)) for r in slow)}, "
+        f"client 0 reconnected {reconnects} times, bus disconnects {status['disconnected']}, "
+        f"resumes {status['resumed']}"
+    )
+
+
+if __name__ == "__main__":
+    main()
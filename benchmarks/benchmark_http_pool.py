@@ -0,0 +1,201 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2025 Beijing Volcano Engine Technology Co., Ltd.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Benchmark: connection reuse of streamed and non-streamed model calls
+Serves an OpenAI-compatible chat/embedding API over TLS on localhost (self-signed
+certificate made with the openssl CLI) and compares the previous streaming path, which
+built a new AsyncOpenAI client, connection pool and TLS handshake per streamed response,
+with LLMClient on the shared endpoint pool. Reports time to first streamed chunk and the
+number of TCP connections the server accepted.
+
+Usage:
+    python benchmarks/benchmark_http_pool.py
+    python benchmarks/benchmark_http_pool.py --streams 200 --concurrency 8
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Add parent directory to path to import opencontext modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+from openai import AsyncOpenAI
+
+from opencontext.llm.http_pool import close_all_pools, get_http_pool_stats
+from opencontext.llm.llm_client import LLMClient, LLMType
+
+connections = set()
+
+
+def make_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.middleware("http")
+    async def track_connections(request: Request, call_next):
+        connections.add(tuple(request.scope["client"]))
+        return await call_next(request)
+
+    @app.post("/v1/chat/completions")
+    async def chat(request: Request):
+        body = await request.json()
+        base = {"id": "c1", "object": "chat.completion.chunk", "created": 0, "model": "m"}
+
+        async def events():
+            for i in range(8):
+                delta = {"role": "assistant", "content": f"tok{i} "}
+                chunk = dict(base, choices=[{"index": 0, "delta": delta, "finish_reason": None}])
+                yield f"data: {json.dumps(chunk)}\n\n"
+            yield "data: [DONE]\n\n"
+
+        if body.get("stream"):
+            return StreamingResponse(events(), media_type="text/event-stream")
+        message = {"role": "assistant", "content": "ok"}
+        return {
+            "id": "c1",
+            "object": "chat.completion",
+            "created": 0,
+            "model": "m",
+            "choices": [{"index": 0, "message": message, "finish_reason": "stop"}],
+        }
+
+    @app.post("/v1/embeddings")
+    async def embeddings(request: Request):
+        body = await request.json()
+        data = [
+            {"object": "embedding", "index": i, "embedding": [0.1] * 8}
+            for i, _ in enumerate(body["input"])
+        ]
+        return {"object": "list", "data": data, "model": "m"}
+
+    return app
+
+
+def start_server(tmp: str, port: int) -> uvicorn.Server:
+    cert, key = os.path.join(tmp, "cert.pem"), os.path.join(tmp, "key.pem")
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1"]
+        + ["-keyout", key, "-out", cert, "-subj", "/CN=localhost"]
+        + ["-addext", "subjectAltName=DNS:localhost"],
+        check=True,
+        capture_output=True,
+    )
+    os.environ["SSL_CERT_FILE"] = cert
+    config = uvicorn.Config(
+        make_app(), port=port, ssl_certfile=cert, ssl_keyfile=key, log_level="error"
+    )
+    server = uvicorn.Server(config)
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+async def legacy_stream(config, messages):
+    """Previous LLMClient._openai_chat_completion_stream_async"""
+    async_client = AsyncOpenAI(api_key=config["api_key"], base_url=config["base_url"], timeout=300)
+    stream = await async_client.chat.completions.create(
+        model=config["model"], messages=messages, stream=True
+    )
+    async for chunk in stream:
+        yield chunk
+
+
+async def run_streams(make_stream, streams: int, concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+    ttfb, texts = [], []
+
+    async def one(i):
+        async with semaphore:
+            start = time.perf_counter()
+            parts = []
+            async for chunk in make_stream([{"role": "user", "content": f"q{i}"}]):
+                if not parts:
+                    ttfb.append((time.perf_counter() - start) * 1000)
+                parts.append(chunk.choices[0].delta.content or "")
+            texts.append("".join(parts))
+
+    start = time.perf_counter()
+    await asyncio.gather(*[one(i) for i in range(streams)])
+    return time.perf_counter() - start, sorted(ttfb), texts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--streams", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--port", type=int, default=18443)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        server = start_server(tmp, args.port)
+        config = {"base_url": f"https://localhost:{args.port}/v1", "api_key": "k", "model": "m"}
+
+        rows = []
+        results = []
+        for label in ("new client per stream", "shared endpoint pool"):
+            connections.clear()
+            client = LLMClient(LLMType.CHAT, config)
+            if label == "new client per stream":
+                make = lambda messages: legacy_stream(config, messages)
+            else:
+                make = lambda messages: client._openai_chat_completion_stream_async(messages)
+            elapsed, ttfb, texts = asyncio.run(run_streams(make, args.streams, args.concurrency))
+            results.append(sorted(texts))
+            rows.append((label, ttfb[len(ttfb) // 2], ttfb[int(len(ttfb) * 0.95) - 1], elapsed))
+            rows[-1] += (len(connections),)
+            client.close()
+            close_all_pools()
+        assert results[0] == results[1], "streamed content differs"
+
+        print(f"{args.streams} streamed responses, {args.concurrency} concurrent, TLS\n")
+        print(
+            f"{'mode':<24}{'TTFB p50 (ms)':>15}{'TTFB p95 (ms)':>15}{'total (s)':>11}{'conns':>7}"
+        )
+        for label, p50, p95, elapsed, conns in rows:
+            print(f"{label:<24}{p50:>15.2f}{p95:>15.2f}{elapsed:>11.2f}{conns:>7}")
+
+        # Chat, streaming and embedding clients of one endpoint share its connections
+        connections.clear()
+        chat = LLMClient(LLMType.CHAT, config)
+        embedding = LLMClient(LLMType.EMBEDDING, dict(config, output_dim=0))
+
+        async def mixed():
+            for i in range(20):
+                await chat.generate_with_messages_async([{"role": "user", "content": "hi"}])
+                async for _ in chat._openai_chat_completion_stream_async(
+                    [{"role": "user", "content": "hi"}]
+                ):
+                    pass
+                await embedding.generate_embeddings_async([f"text {i}"])
+                embedding.generate_embeddings([f"sync text {i}"])
+
+        asyncio.run(mixed())
+        stats = next(iter(get_http_pool_stats().values()))
+        print(
+            f"\nmixed chat/stream/embedding, sync and async: {stats['requests']} requests over "
+            f"{len(connections)} connections, pool refs={stats['refs']}, "
+            f"TTFB p50={stats['ttfb_ms']['p50']:.2f} ms"
+        )
+        chat.close()
+        embedding.close()
+        close_all_pools()
+        server.should_exit = True
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2025 Beijing Volcano Engine Technology Co., Ltd.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Benchmark: re-processing an edited vault document
+Ingests a long note through DocumentProcessor into a local ChromaDB, then applies a series of
+edits (one paragraph reworded, a paragraph inserted, one removed, the text reflowed, nothing
+changed) and processes the document again after each one. The LLM splitter and the embedding
+model are replaced by counters. The splitter first returns exact pieces of what it is given,
+then, like the real one, rewrites them: it splits a buffer into a few pieces, adds context to
+the start of each, and pieces too short to be chunks are dropped. The legacy cost of every
+edit is a full re-ingest: the same document processed with nothing stored for it, re-split
+and re-embedded from scratch. After each edit the texts the stored chunks were made from must
+cover the document's text exactly once.
+
+Usage:
+    python benchmarks/benchmark_incremental_chunking.py
+    python benchmarks/benchmark_incremental_chunking.py --paragraphs 120
+"""
+
+import argparse
+import datetime
+import hashlib
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add parent directory to path to import opencontext modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import opencontext.config.global_config as global_config
+from opencontext.context_processing.chunker import ChunkSource
+from opencontext.context_processing.processor import document_processor
+from opencontext.context_processing.processor.document_processor import DocumentProcessor
+from opencontext.llm import global_vlm_client
+from opencontext.models.context import RawContextProperties
+from opencontext.models.enums import ContentFormat, ContextSource, ContextType
+from opencontext.storage.backends import chromadb_backend
+from opencontext.storage.backends.chromadb_backend import ChromaDBBackend
+from opencontext.storage.unified_storage import UnifiedStorage
+
+counters = {"llm": 0, "embeddings": 0}
+splitter = {"rewrite": False}
+WORDS = (
+    "context storage vector index query latency cache chunk document editor note "
+    "summary model embedding retrieval ranking section paragraph update release"
+).split()
+
+
+async def fake_llm(messages, **kwargs):
+    """
+    Keeps a buffer (at most one chunk long) whole, splits a document at blank lines; when
+    rewriting, splits a buffer every three sentences and prefixes each piece with context
+    """
+    counters["llm"] += 1
+    prompt = messages[-1]["content"]
+    text = prompt.split("<<<", 1)[1].rsplit(">>>", 1)[0]
+    pieces = [p.strip() for p in text.split("\n\n") if p.strip()]
+    if messages[0]["content"] != "split buffer":
+        return json.dumps(pieces)
+    if not splitter["rewrite"]:
+        return json.dumps([text.strip()])
+    topic = pieces[0].split()[0].lower()
+    return json.dumps(
+        [f"[Note on {topic}] " + " ".join(pieces[i : i + 3]) for i in range(0, len(pieces), 3)]
+    )
+
+
+def fake_vectorize_batch(vectorizes, **kwargs):
+    for vectorize in vectorizes:
+        if vectorize.vector:
+            continue
+        counters["embeddings"] += 1
+        digest = hashlib.sha1(vectorize.text.encode()).digest()
+        vectorize.vector = [b / 255 for b in digest[:8]]
+
+
+def paragraph(rng: random.Random) -> str:
+    sentences = []
+    for _ in range(rng.randint(3, 6)):
+        words = rng.choices(WORDS, k=rng.randint(8, 14))
+        sentences.append(" ".join(words).capitalize() + ".")
+    return " ".join(sentences)
+
+
+def vault_event(vault_id: int, paragraphs) -> RawContextProperties:
+    return RawContextProperties(
+        source=ContextSource.VAULT,
+        content_format=ContentFormat.TEXT,
+        content_text="\n\n".join(paragraphs),
+        create_time=datetime.datetime.now(),
+        additional_info={"vault_id": vault_id, "event_type": "updated"},
+        enable_merge=False,
+    )
+
+
+def stored_chunks(storage, vault_id: int):
+    chunks = []
+    for page in storage.iter_processed_contexts(
+        ContextType.KNOWLEDGE_CONTEXT.value, filter={"raw_id": str(vault_id)}
+    ):
+        chunks.extend(page)
+    return chunks
+
+
+def check_coverage(label: str, text, chunks):
+    """The texts the stored chunks were made from cover the document exactly once"""
+    normalized = " ".join("\n\n".join(text).split())
+    sources = {DocumentProcessor._chunk_source(chunk) for chunk in chunks}
+    spans = []
+    for source in sources:
+        start = normalized.find(source.head)
+        while start != -1 and ChunkSource.of(normalized[start : start + source.length]) != source:
+            start = normalized.find(source.head, start + 1)
+        assert start >= 0, f"{label}: a stored chunk's source is not in the document"
+        spans.append((start, start + source.length))
+    covered = " ".join(normalized[start:end] for start, end in sorted(spans))
+    assert covered == normalized, f"{label}: stored chunks do not cover the document"
+
+
+def process(processor, storage, raw):
+    """One pass of DocumentProcessor's processing loop; LLM calls, embeddings and wall time"""
+    llm, embeddings = counters["llm"], counters["embeddings"]
+    start = time.perf_counter()
+    contexts = processor.real_process(raw)
+    assert contexts is not False, "processing failed"
+    if contexts:
+        storage.batch_upsert_processed_context(contexts)
+    elapsed = time.perf_counter() - start
+    return counters["llm"] - llm, counters["embeddings"] - embeddings, elapsed
+
+
+def run_edits(args, rewrite: bool):
+    """Ingest the note, then apply the edits; a row of counts per edit"""
+    rng = random.Random(args.seed)
+    splitter["rewrite"] = rewrite
+    paragraphs = [paragraph(rng) for _ in range(args.paragraphs)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = UnifiedStorage()
+        storage._vector_backend = ChromaDBBackend()
+        storage._vector_backend.initialize({"config": {"mode": "local", "path": tmp + "/chroma"}})
+        storage._initialized = True
+        document_processor.get_storage = lambda: storage
+        processor = DocumentProcessor()
+
+        edits = [("initial ingest", list(paragraphs))]
+        doc = list(paragraphs)
+        doc[len(doc) // 2] = paragraph(rng)
+        edits.append(("reword one paragraph", list(doc)))
+        doc.insert(len(doc) // 3, paragraph(rng))
+        edits.append(("insert a paragraph", list(doc)))
+        del doc[2 * len(doc) // 3]
+        edits.append(("remove a paragraph", list(doc)))
+        edits.append(("reflow whitespace", [p.replace(". ", ".\n", 2) for p in doc]))
+        edits.append(("no change", [p.replace(". ", ".\n", 2) for p in doc]))
+
+        rows = []
+        for step, (label, text) in enumerate(edits):
+            llm, embeddings, elapsed = process(processor, storage, vault_event(1, text))
+            chunks = stored_chunks(storage, 1)
+            check_coverage(label, text, chunks)
+            # Legacy: everything re-split and re-embedded (the same text under a fresh ID)
+            if step:
+                legacy = process(processor, storage, vault_event(1000 + step, text))
+            else:
+                legacy = (llm, embeddings, elapsed)
+            rows.append((label, len(chunks), llm, embeddings, legacy[0], legacy[1]))
+        processor.shutdown()
+    return paragraphs, rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--paragraphs", type=int, default=60)
+    parser.add_argument("--seed", type=int, default=5)
+    args = parser.parse_args()
+
+    global_vlm_client.generate_with_messages_async = fake_llm
+    chromadb_backend.do_vectorize_batch = fake_vectorize_batch
+    # Prompts carry the text between markers so the fake splitter can find it
+    prompts = {
+        "document_processing.text_chunking": {
+            "system": "split buffer",
+            "user": "<<<{text}>>> {max_chunk_size} {min_chunk_size}",
+        },
+        "document_processing.global_semantic_chunking": {
+            "system": "split document",
+            "user": "<<<{full_document}>>> {max_chunk_size} {min_chunk_size}",
+        },
+    }
+    global_config.get_prompt_group = prompts.get
+
+    for rewrite in (False, True):
+        paragraphs, rows = run_edits(args, rewrite)
+        words = sum(len(p.split()) for p in paragraphs)
+        splits = "rewritten with context, short pieces dropped" if rewrite else "exact"
+        print(
+            f"\nnote of {args.paragraphs} paragraphs (~{words} words), chunks of at most "
+            f"1000 chars, LLM splits {splits}\n"
+        )
+        print(
+            f"{'edit':<24}{'chunks':>8}{'LLM calls':>11}{'embeddings':>12}"
+            f"{'legacy LLM':>12}{'legacy emb':>12}"
+        )
+        for label, chunks, llm, embeddings, legacy_llm, legacy_embeddings in rows:
+            print(
+                f"{label:<24}{chunks:>8}{llm:>11}{embeddings:>12}"
+                f"{legacy_llm:>12}{legacy_embeddings:>12}"
+            )
+
+
+if __name__ == "__main__":
+    main()
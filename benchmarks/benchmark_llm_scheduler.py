@@ -0,0 +1,214 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2025 Beijing Volcano Engine Technology Co., Ltd.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Benchmark: interactive chat latency while a capture backlog drains
+Serves an OpenAI-compatible chat API on localhost that works on a fixed number of requests
+at a time, like a provider's per-key concurrency. Background threads drain a backlog of
+capture requests (as the screenshot and document processors do) while an interactive chat
+loop sends a request every few milliseconds. Compares LLMClient without admission control,
+where chat requests queue at the endpoint behind the backlog, with the request scheduler.
+
+With --reject, requests beyond the endpoint's capacity get 429 with Retry-After instead of
+waiting, and the SDK retries them; the scheduler halves its in-flight limit and pauses.
+Requests the SDK gives up on are counted as errors and sent again.
+
+Usage:
+    python benchmarks/benchmark_llm_scheduler.py
+    python benchmarks/benchmark_llm_scheduler.py --capacity 4 --latency-ms 50 --workers 16
+    python benchmarks/benchmark_llm_scheduler.py --reject
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add parent directory to path to import opencontext modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from openai import RateLimitError
+
+from opencontext.llm import http_pool
+from opencontext.llm.http_pool import close_all_pools
+from opencontext.llm.llm_client import LLMClient, LLMType
+from opencontext.llm.request_scheduler import RequestPriority, RequestScheduler, llm_priority
+
+endpoint_stats = {"served": 0, "rejected": 0}
+errors = {"count": 0}
+
+
+def make_app(capacity: int, latency: float, reject: bool) -> FastAPI:
+    app = FastAPI()
+    state = {"active": 0}
+    semaphore = asyncio.Semaphore(capacity)
+
+    @app.post("/v1/chat/completions")
+    async def chat(request: Request):
+        body = await request.json()
+        if reject and state["active"] >= capacity:
+            endpoint_stats["rejected"] += 1
+            error = {"error": {"message": "rate limited", "type": "rate_limit"}}
+            return JSONResponse(error, status_code=429, headers={"retry-after-ms": "100"})
+        state["active"] += 1
+        try:
+            async with semaphore:
+                await asyncio.sleep(latency)
+        finally:
+            state["active"] -= 1
+        endpoint_stats["served"] += 1
+        message = {"role": "assistant", "content": body["messages"][-1]["content"].upper()}
+        return {
+            "id": "c1",
+            "object": "chat.completion",
+            "created": 0,
+            "model": "m",
+            "choices": [{"index": 0, "message": message, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": 10, "completion_tokens": 2, "total_tokens": 12},
+        }
+
+    return app
+
+
+def start_server(port: int, capacity: int, latency: float, reject: bool) -> uvicorn.Server:
+    config = uvicorn.Config(
+        make_app(capacity, latency, reject), port=port, log_level="error", backlog=256
+    )
+    server = uvicorn.Server(config)
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+def run(client: LLMClient, args):
+    """Drain the backlog from worker threads while measuring interactive chat latency"""
+    backlog = list(range(args.backlog))
+    lock = threading.Lock()
+
+    def worker():
+        while True:
+            with lock:
+                if not backlog:
+                    return
+                i = backlog.pop()
+            try:
+                client.generate(f"capture {i}")  # Default priority: background capture
+            except RateLimitError:
+                # The SDK gave up retrying; the processor would lose the item, requeue it
+                with lock:
+                    errors["count"] += 1
+                    backlog.append(i)
+
+    threads = [threading.Thread(target=worker) for _ in range(args.workers)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    time.sleep(args.latency_ms / 1000)  # Let the backlog fill the endpoint first
+
+    async def chat():
+        latencies, answers = [], []
+        with llm_priority(RequestPriority.INTERACTIVE):
+            for i in range(args.chats):
+                t0 = time.perf_counter()
+                while True:
+                    try:
+                        response = await client.generate_with_messages_async(
+                            [{"role": "user", "content": f"question {i}"}]
+                        )
+                        break
+                    except RateLimitError:
+                        errors["count"] += 1  # The user would ask again
+                latencies.append((time.perf_counter() - t0) * 1000)
+                answers.append(response.choices[0].message.content)
+                await asyncio.sleep(args.interval_ms / 1000)
+        return latencies, answers
+
+    latencies, answers = asyncio.run(chat())
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    return sorted(latencies), answers, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--capacity", type=int, default=4, help="Requests the endpoint serves at once"
+    )
+    parser.add_argument("--latency-ms", type=float, default=50)
+    parser.add_argument("--workers", type=int, default=16, help="Background capture threads")
+    parser.add_argument("--backlog", type=int, default=400)
+    parser.add_argument("--chats", type=int, default=20)
+    parser.add_argument("--interval-ms", type=float, default=100)
+    parser.add_argument("--reject", action="store_true", help="Answer 429 beyond capacity")
+    parser.add_argument("--port", type=int, default=18444)
+    args = parser.parse_args()
+
+    server = start_server(args.port, args.capacity, args.latency_ms / 1000, args.reject)
+    config = {"base_url": f"http://127.0.0.1:{args.port}/v1", "api_key": "k", "model": "m"}
+
+    rows, results = [], []
+    for label, scheduler_config in (
+        ("no admission control", {"enabled": False}),
+        (
+            "request scheduler",
+            # With --reject, start above capacity: the limit has to adapt down from 429s
+            {"max_in_flight": args.capacity * (2 if args.reject else 1), "backoff_seconds": 0.1},
+        ),
+    ):
+        endpoint_stats.update(served=0, rejected=0)
+        errors["count"] = 0
+        client = LLMClient(LLMType.CHAT, config)
+        scheduler = RequestScheduler(client._scheduler.endpoint, scheduler_config)
+        client._scheduler = scheduler
+        # Send the endpoint's responses to this run's scheduler only
+        http_pool._response_listeners[scheduler.endpoint] = [scheduler.observe_response]
+        latencies, answers, elapsed = run(client, args)
+        results.append(answers)
+        stats = scheduler.get_stats()
+        rows.append(
+            (
+                label,
+                statistics.median(latencies),
+                latencies[int(len(latencies) * 0.95) - 1],
+                latencies[-1],
+                args.backlog / elapsed,
+                endpoint_stats["rejected"],
+                errors["count"],
+                stats["in_flight_limit"] if scheduler.enabled else "-",
+            )
+        )
+        client.close()
+        close_all_pools()
+    assert results[0] == results[1], "chat answers differ"
+
+    mode = "429 beyond capacity" if args.reject else "queued beyond capacity"
+    print(
+        f"endpoint capacity {args.capacity} x {args.latency_ms:.0f} ms ({mode}), "
+        f"{args.backlog} capture requests from {args.workers} threads, "
+        f"{args.chats} chat requests\n"
+    )
+    print(
+        f"{'mode':<24}{'chat p50 (ms)':>14}{'chat p95 (ms)':>14}{'chat max (ms)':>14}"
+        f"{'capture req/s':>15}{'429s':>7}{'errors':>8}{'limit':>7}"
+    )
+    for label, p50, p95, worst, rate, rejected, failed, limit in rows:
+        print(
+            f"{label:<24}{p50:>14.1f}{p95:>14.1f}{worst:>14.1f}{rate:>15.1f}"
+            f"{rejected:>7}{failed:>8}{limit:>7}"
+        )
+    server.should_exit = True
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2025 Beijing Volcano Engine Technology Co., Ltd.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Benchmark: monitoring overhead on the LLM call path
+Every LLM call reports a stage timing and its token usage. This measures what those two
+calls cost the caller with monitoring off, with the previous synchronous SQLite writes
+(SELECT + UPDATE/INSERT + commit per event) and with the buffered Monitor, which aggregates
+per hour bucket in memory and flushes in one transaction.
+
+Usage:
+    python benchmarks/benchmark_monitoring_sink.py
+    python benchmarks/benchmark_monitoring_sink.py --calls 20000 --threads 8
+"""
+
+import argparse
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Add parent directory to path to import opencontext modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import opencontext.monitoring.monitor as monitor_module
+from opencontext.storage.backends.sqlite_backend import SQLiteBackend
+
+
+def legacy_stage_timing(connection, stage_name, duration_ms, status="success"):
+    """Previous SQLiteBackend.save_monitoring_stage_timing: read-modify-write per event"""
+    cursor = connection.cursor()
+    now = datetime.now()
+    time_bucket = now.strftime("%Y-%m-%d %H:00:00")
+    cursor.execute(
+        "SELECT count, total_duration_ms, min_duration_ms, max_duration_ms, success_count, "
+        "error_count FROM monitoring_stage_timing WHERE time_bucket = ? AND stage_name = ?",
+        (time_bucket, stage_name),
+    )
+    existing = cursor.fetchone()
+    ok = 1 if status == "success" else 0
+    if existing:
+        count, total, lo, hi, success, error = existing
+        cursor.execute(
+            "UPDATE monitoring_stage_timing SET count = ?, total_duration_ms = ?, "
+            "min_duration_ms = ?, max_duration_ms = ?, avg_duration_ms = ?, success_count = ?, "
+            "error_count = ? WHERE time_bucket = ? AND stage_name = ?",
+            (
+                count + 1,
+                total + duration_ms,
+                min(lo, duration_ms),
+                max(hi, duration_ms),
+                (total + duration_ms) // (count + 1),
+                success + ok,
+                error + 1 - ok,
+                time_bucket,
+                stage_name,
+            ),
+        )
+    else:
+        cursor.execute(
+            "INSERT INTO monitoring_stage_timing (time_bucket, stage_name, count, "
+            "total_duration_ms, min_duration_ms, max_duration_ms, avg_duration_ms, success_count, "
+            "error_count, created_at) VALUES (?, ?, 1, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                time_bucket,
+                stage_name,
+                duration_ms,
+                duration_ms,
+                duration_ms,
+                duration_ms,
+                ok,
+                1 - ok,
+                now,
+            ),
+        )
+    connection.commit()
+
+
+def legacy_token_usage(connection, model, prompt, completion, total):
+    cursor = connection.cursor()
+    now = datetime.now()
+    cursor.execute(
+        "INSERT INTO monitoring_token_usage (time_bucket, model, prompt_tokens, "
+        "completion_tokens, total_tokens, created_at) VALUES (?, ?, ?, ?, ?, ?) "
+        "ON CONFLICT(time_bucket, model) DO UPDATE SET prompt_tokens = prompt_tokens + ?, "
+        "completion_tokens = completion_tokens + ?, total_tokens = total_tokens + ?",
+        (
+            now.strftime("%Y-%m-%d %H:00:00"),
+            model,
+            prompt,
+            completion,
+            total,
+            now,
+            prompt,
+            completion,
+            total,
+        ),
+    )
+    connection.commit()
+
+
+def run(report, calls, threads):
+    """Per-call latency (us) of the monitoring hooks of one LLM call"""
+    latencies = []
+    lock = threading.Lock()
+
+    def worker(n):
+        local = []
+        for i in range(n):
+            start = time.perf_counter()
+            report(i)
+            local.append((time.perf_counter() - start) * 1e6)
+        with lock:
+            latencies.extend(local)
+
+    workers = [threading.Thread(target=worker, args=(calls // threads,)) for _ in range(threads)]
+    start = time.perf_counter()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return statistics.mean(latencies), latencies[int(len(latencies) * 0.99) - 1], elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=5000)
+    parser.add_argument("--threads", type=int, default=4)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        backend = SQLiteBackend()
+        db_path = os.path.join(tmp, "app.db")
+        backend.initialize({"config": {"path": db_path}})
+        # Previous backend: one shared default-mode connection
+        legacy_connection = sqlite3.connect(db_path, check_same_thread=False)
+        # The Monitor writes through get_storage(); point it at this database
+        monitor_module.get_storage = lambda: backend
+        monitor = monitor_module.Monitor()
+        write_lock = threading.Lock()
+
+        def off(i):
+            pass
+
+        def legacy(i):
+            # The shared connection was used from request threads one statement at a time
+            with write_lock:
+                legacy_stage_timing(legacy_connection, "chat_completion", 120 + i % 50)
+            with write_lock:
+                legacy_token_usage(legacy_connection, "model-a", 900, 120, 1020)
+
+        def buffered(i):
+            monitor.record_processing_stage("chat_completion", 120 + i % 50)
+            monitor.record_token_usage("model-a", 900, 120, 1020)
+
+        print(f"{args.calls} LLM calls on {args.threads} threads")
+        print(f"{'monitoring':<22}{'mean (us)':>11}{'p99 (us)':>11}{'wall (s)':>10}")
+        for name, report in (("off", off), ("synchronous SQLite", legacy), ("buffered", buffered)):
+            mean, p99, elapsed = run(report, args.calls, args.threads)
+            print(f"{name:<22}{mean:>11.1f}{p99:>11.1f}{elapsed:>10.3f}")
+
+        start = time.perf_counter()
+        monitor.shutdown()
+        flush_ms = (time.perf_counter() - start) * 1000
+        rows = backend.query_monitoring_stage_timing(1)
+        buffered_count = sum(r["count"] for r in rows) - args.calls // args.threads * args.threads
+        assert buffered_count == args.calls // args.threads * args.threads, "lost stage timings"
+        print(f"\nfinal flush {flush_ms:.1f} ms; all {buffered_count} buffered timings persisted")
+
+
+if __name__ == "__main__":
+    main()
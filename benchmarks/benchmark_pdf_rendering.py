@@ -0,0 +1,217 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2025 Beijing Volcano Engine Technology Co., Ltd.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Benchmark: VLM page extraction for a long PDF with a few scanned pages
+Compares the previous path (render every page at the configured DPI into a list, then
+send the flagged pages to the VLM in sequential batches) with the lazy renderer, which
+renders only the flagged pages and streams them to the VLM with a bounded window.
+
+The PDF is synthetic: text pages plus a handful of full-page scans. The VLM is replaced
+by a fixed-latency coroutine. Each mode runs in its own process so peak RSS is comparable.
+
+Usage:
+    python benchmarks/benchmark_pdf_rendering.py
+    python benchmarks/benchmark_pdf_rendering.py --pages 300 --scanned 5 --dpi 200
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+# Add parent directory to path to import opencontext modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+LINE = "The quarterly report covers revenue, hiring plans and the migration schedule."
+
+
+def scanned_page_jpeg(seed: int) -> bytes:
+    """A letter-size 150 DPI grayscale scan with text-like stripes"""
+    rng = np.random.default_rng(seed)
+    pixels = np.full((1650, 1275), 240, dtype=np.uint8)
+    for row in range(120, 1550, 36):
+        length = rng.integers(400, 1100)
+        pixels[row : row + 14, 100 : 100 + length] = rng.integers(20, 80)
+    buffer = io.BytesIO()
+    Image.fromarray(pixels).save(buffer, format="JPEG", quality=80)
+    return buffer.getvalue()
+
+
+def write_pdf(path: str, pages: int, scanned: set):
+    """Hand-written PDF: Helvetica text pages and full-page DCT image pages"""
+    objects = {
+        1: b"<< /Type /Catalog /Pages 2 0 R >>",
+        3: b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    }
+    kids = []
+    next_id = 4
+    for page in range(1, pages + 1):
+        page_id, content_id = next_id, next_id + 1
+        next_id += 2
+        if page in scanned:
+            jpeg = scanned_page_jpeg(page)
+            image_id = next_id
+            next_id += 1
+            objects[image_id] = (
+                b"<< /Type /XObject /Subtype /Image /Width 1275 /Height 1650 /ColorSpace "
+                b"/DeviceGray /BitsPerComponent 8 /Filter /DCTDecode /Length %d >>\nstream\n"
+                % len(jpeg)
+                + jpeg
+                + b"\nendstream"
+            )
+            stream = b"q 612 0 0 792 0 0 cm /Im1 Do Q"
+            resources = b"<< /XObject << /Im1 %d 0 R >> >>" % image_id
+        else:
+            lines = b" ".join(b"(%s) '" % f"{page}.{i} {LINE}".encode() for i in range(45))
+            stream = b"BT /F1 10 Tf 50 760 Td 15 TL " + lines + b" ET"
+            resources = b"<< /Font << /F1 3 0 R >> >>"
+        objects[content_id] = b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream"
+        objects[page_id] = (
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Resources %s /Contents %d 0 R >>"
+            % (resources, content_id)
+        )
+        kids.append(page_id)
+    objects[2] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % k for k in kids),
+        len(kids),
+    )
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = {}
+    for obj_id in sorted(objects):
+        offsets[obj_id] = len(out)
+        out += b"%d 0 obj\n" % obj_id + objects[obj_id] + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for obj_id in sorted(objects):
+        out += b"%010d 00000 n \n" % offsets[obj_id]
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1,
+        xref,
+    )
+    Path(path).write_bytes(out)
+
+
+def legacy_extract(processor, file_path, page_infos):
+    """Previous DocumentProcessor._extract_vlm_pages"""
+    all_images = processor._document_converter.convert_to_images(file_path)
+    vlm_images = [all_images[p.page_number - 1] for p in page_infos]
+    vlm_page_numbers = [p.page_number for p in page_infos]
+    page_results = []
+    loop = asyncio.get_event_loop()
+    for i in range(0, len(vlm_images), processor._vlm_batch_size):
+        batch = vlm_images[i : i + processor._vlm_batch_size]
+        nums = vlm_page_numbers[i : i + processor._vlm_batch_size]
+        tasks = [processor._analyze_image_with_vlm(img, n) for img, n in zip(batch, nums)]
+        page_results.extend(loop.run_until_complete(asyncio.gather(*tasks)))
+    return [r["text"] for r in page_results]
+
+
+def worker(mode: str, pdf_path: str, dpi: int, batch: int, latency: float):
+    import opencontext.config.global_config as global_config
+    import opencontext.context_processing.processor.document_processor as module
+
+    async def fake_vlm(messages, **kwargs):
+        await asyncio.sleep(latency)
+        return "extracted page text"
+
+    global_config.get_prompt_group = lambda name: {"system": "system", "user": "user"}
+    module.generate_with_messages_async = fake_vlm
+
+    processor = module.DocumentProcessor()
+    processor._vlm_batch_size = batch
+    processor._document_converter.dpi = dpi
+    asyncio.set_event_loop(asyncio.new_event_loop())
+
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    page_infos = processor._document_converter.analyze_pdf_pages(pdf_path)
+    vlm_pages = [p for p in page_infos if p.has_visual_elements]
+    if mode == "legacy":
+        texts = legacy_extract(processor, pdf_path, vlm_pages)
+    else:
+        texts = processor._extract_vlm_pages(pdf_path, vlm_pages)
+    elapsed = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    processor.shutdown()
+    print(
+        json.dumps(
+            {
+                "seconds": elapsed,
+                "peak_mb": (peak - baseline) / 1024,
+                "vlm_pages": len(vlm_pages),
+                "texts": len(texts),
+            }
+        )
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=300)
+    parser.add_argument("--scanned", type=int, default=5)
+    parser.add_argument("--dpi", type=int, default=200)
+    parser.add_argument("--batch", type=int, default=3, help="document_processing.batch_size")
+    parser.add_argument("--latency", type=float, default=0.5, help="Simulated VLM seconds")
+    parser.add_argument("--worker", nargs=2, metavar=("MODE", "PDF"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker(args.worker[0], args.worker[1], args.dpi, args.batch, args.latency)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_path = str(Path(tmp) / "report.pdf")
+        step = max(1, args.pages // max(1, args.scanned))
+        scanned = {1 + i * step for i in range(args.scanned)}
+        write_pdf(pdf_path, args.pages, scanned)
+        size_mb = Path(pdf_path).stat().st_size / 1e6
+        print(f"{args.pages} pages ({args.scanned} scanned, {size_mb:.1f} MB) at {args.dpi} DPI")
+
+        print(f"\n{'mode':<24}{'wall (s)':>10}{'peak RSS (MB)':>15}{'VLM pages':>11}")
+        for mode, label in (("legacy", "render all + batches"), ("lazy", "lazy + streaming")):
+            output = (
+                subprocess.run(
+                    [
+                        sys.executable,
+                        __file__,
+                        "--worker",
+                        mode,
+                        pdf_path,
+                        "--dpi",
+                        str(args.dpi),
+                        "--batch",
+                        str(args.batch),
+                        "--latency",
+                        str(args.latency),
+                    ],
+                    capture_output=True,
+                    text=True,
+                    check=True,
+                )
+                .stdout.strip()
+                .splitlines()[-1]
+            )
+            result = json.loads(output)
+            assert result["texts"] == result["vlm_pages"] == args.scanned
+            print(
+                f"{label:<24}{result['seconds']:>10.2f}{result['peak_mb']:>15.0f}"
+                f"{result['vlm_pages']:>11}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2025 Beijing Volcano Engine Technology Co., Ltd.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Benchmark: daily report from stored hourly summaries
+Fills a local ChromaDB and SQLite store with a day of contexts and generates the report of the
+last 24 closed hours. The LLM is replaced by a counter with a fixed latency whose answers
+depend only on the prompt. Compares the legacy path, which summarizes every hour at report
+time and then merges, with the rollup: hours are summarized as they close (by the report
+timer), so the report is a single merge call. Then a late context arrives for a closed hour
+and the report is generated again, and once more with nothing changed.
+
+Usage:
+    python benchmarks/benchmark_report_rollup.py
+    python benchmarks/benchmark_report_rollup.py --per-hour 120 --llm-ms 800
+"""
+
+import argparse
+import asyncio
+import datetime
+import hashlib
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add parent directory to path to import opencontext modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from opencontext.config.global_config import get_prompt_group
+from opencontext.context_consumption.generation import generation_report
+from opencontext.context_consumption.generation.generation_report import ReportGenerator
+from opencontext.models.context import ContextProperties, ExtractedData, ProcessedContext, Vectorize
+from opencontext.models.enums import ContextType
+from opencontext.storage.backends.chromadb_backend import ChromaDBBackend
+from opencontext.storage.backends.sqlite_backend import SQLiteBackend
+from opencontext.storage.unified_storage import UnifiedStorage
+
+llm = {"calls": 0, "latency": 0.5}
+
+
+async def fake_llm(messages, **kwargs):
+    llm["calls"] += 1
+    await asyncio.sleep(llm["latency"])
+    prompt = messages[-1]["content"]
+    return f"summary {hashlib.sha1(prompt.encode()).hexdigest()[:12]}"
+
+
+def make_context(ts: datetime.datetime, i: int) -> ProcessedContext:
+    return ProcessedContext(
+        properties=ContextProperties(create_time=ts, event_time=ts, update_time=ts),
+        extracted_data=ExtractedData(
+            title=f"Working on item {i % 40}",
+            summary=f"The user edits section {i % 40} of the design document.",
+            context_type=ContextType.ACTIVITY_CONTEXT,
+            importance=5,
+        ),
+        vectorize=Vectorize(text=f"item {i % 40}", vector=[float(i % 7 + 1), 1.0, 0.5, 0.25]),
+    )
+
+
+def run(label, coroutine_factory, rows):
+    calls = llm["calls"]
+    start = time.perf_counter()
+    report = asyncio.run(coroutine_factory())
+    rows.append((label, llm["calls"] - calls, time.perf_counter() - start))
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--per-hour", type=int, default=60, help="Contexts per hour")
+    parser.add_argument("--llm-ms", type=float, default=500)
+    args = parser.parse_args()
+    llm["latency"] = args.llm_ms / 1000
+
+    generator = ReportGenerator()
+    end_time = generator._hour_start(int(time.time()))
+    start_time = end_time - 24 * 3600
+
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = UnifiedStorage()
+        storage._vector_backend = ChromaDBBackend()
+        storage._vector_backend.initialize({"config": {"mode": "local", "path": tmp + "/chroma"}})
+        storage._document_backend = SQLiteBackend()
+        storage._document_backend.initialize({"config": {"path": tmp + "/app.db"}})
+        storage._initialized = True
+        generation_report.get_storage = lambda: storage
+        generation_report.generate_with_messages_async = fake_llm
+
+        contexts = []
+        for hour in range(24):
+            for k in range(args.per_hour):
+                ts = datetime.datetime.fromtimestamp(
+                    start_time + hour * 3600 + k * 3600 // args.per_hour
+                )
+                contexts.append(make_context(ts, len(contexts)))
+        # Written while "current" (no summaries exist yet, so nothing is invalidated)
+        storage._vector_backend.batch_upsert_processed_context(contexts)
+
+        async def legacy_report():
+            """Summarize every hour at report time, then merge (the previous implementation)"""
+            chunks = [(t, t + 3600) for t in range(start_time, end_time, 3600)]
+            results = await generator._process_chunks_concurrently(chunks)
+            summaries = [r for r in results if r and not isinstance(r, Exception)]
+            text = "\n\n---\n\n".join(
+                f"**{generator._format_timestamp(r['start_time'])} - "
+                f"{generator._format_timestamp(r['end_time'])}**\n\n{r['summary']}"
+                for r in summaries
+            )
+            prompt_group = get_prompt_group("generation.merge_hourly_reports")
+            return await fake_llm(
+                [
+                    {"role": "system", "content": prompt_group["system"]},
+                    {
+                        "role": "user",
+                        "content": prompt_group["user"].format(
+                            start_time_str=generator._format_timestamp(start_time),
+                            end_time_str=generator._format_timestamp(end_time),
+                            hourly_summaries=text,
+                        ),
+                    },
+                ]
+            )
+
+        rows = []
+        legacy = run("legacy: all hours at report time", legacy_report, rows)
+        run("rollup: hourly job over the day", generator.summarize_closed_hours, rows)
+        rollup = run(
+            "rollup: daily report",
+            lambda: generator._generate_report_with_llm(start_time, end_time),
+            rows,
+        )
+        assert rollup == legacy, "report differs from the legacy path"
+
+        # A context of five hours ago is processed late
+        storage.batch_upsert_processed_context(
+            [make_context(datetime.datetime.fromtimestamp(end_time - 5 * 3600 + 60), 99999)]
+        )
+        stale = run(
+            "rollup: after a late context",
+            lambda: generator._generate_report_with_llm(start_time, end_time),
+            rows,
+        )
+        assert stale != rollup, "late context did not change the report"
+        run(
+            "rollup: again, nothing changed",
+            lambda: generator._generate_report_with_llm(start_time, end_time),
+            rows,
+        )
+        storage._document_backend.close()
+
+    print(
+        f"report of 24 closed hours, {args.per_hour} contexts/hour, "
+        f"LLM {args.llm_ms:g} ms per call (5 concurrent)\n"
+    )
+    print(f"{'step':<36}{'LLM calls':>10}{'wall (s)':>10}")
+    for label, calls, elapsed in rows:
+        print(f"{label:<36}{calls:>10}{elapsed:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
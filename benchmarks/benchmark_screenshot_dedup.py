@@ -0,0 +1,172 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2025 Beijing Volcano Engine Technology Co., Ltd.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Benchmark: screenshot deduplication at capture time
+Replays a stream of frames where most are near duplicates (a mostly static screen with a
+changing clock/cursor) and compares:
+
+  processor-side  every frame is PNG-encoded and written, then resized, rehashed from disk and
+                  checked with a linear hex-string scan over recent hashes (previous behaviour)
+  capture-side    the raw buffer is hashed once and looked up in a per-monitor HammingIndex;
+                  only new frames are downscaled, encoded and written
+
+It also times the hash lookup on its own for growing windows.
+
+Usage:
+    python benchmarks/benchmark_screenshot_dedup.py
+    python benchmarks/benchmark_screenshot_dedup.py --frames 60 --distinct 6
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import deque
+from io import BytesIO
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+# Add parent directory to path to import opencontext modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from opencontext.utils.hash_index import HammingIndex
+from opencontext.utils.image import ImageFrame, calculate_phash, dhash, resize_image
+
+
+def make_screens(width, height, distinct, seed=11):
+    rng = np.random.default_rng(seed)
+    screens = []
+    for _ in range(distinct):
+        pixels = np.full((height, width, 4), 235, dtype=np.uint8)
+        for _ in range(10):
+            x, y = rng.integers(0, width - 200), rng.integers(0, height - 150)
+            w, h = rng.integers(200, width // 2), rng.integers(150, height // 2)
+            pixels[y : y + h, x : x + w, :3] = rng.integers(40, 250, size=3)
+        for row in range(40, height - 20, 22):
+            length = rng.integers(width // 6, width // 2)
+            start = rng.integers(0, width - length)
+            pixels[row : row + 9, start : start + length, :3] = rng.integers(
+                0, 90, size=(9, length, 3)
+            )
+        screens.append(pixels)
+    return screens
+
+
+def make_stream(screens, frames, seed=3):
+    """Each frame shows one of the screens with a small changing region (clock, cursor)"""
+    rng = random.Random(seed)
+    stream = []
+    current = 0
+    for i in range(frames):
+        if rng.random() < 0.15:
+            current = rng.randrange(len(screens))
+        pixels = screens[current].copy()
+        pixels[8:24, -120:-20, :3] = (i * 37) % 255
+        stream.append(pixels.tobytes())
+    return stream
+
+
+def legacy_hex_is_duplicate(recent, phash, threshold):
+    for item in list(recent):
+        if bin(int(str(phash), 16) ^ int(str(item), 16)).count("1") <= threshold:
+            recent.remove(item)
+            recent.append(item)
+            return True
+    recent.append(phash)
+    return False
+
+
+def processor_side(stream, size, tmp, args):
+    recent = deque(maxlen=args.window)
+    encoded = 0
+    for i, bgra in enumerate(stream):
+        img = Image.frombytes("RGB", size, bgra, "raw", "BGRX")
+        buffer = BytesIO()
+        img.save(buffer, format="PNG")
+        encoded += 1
+        path = os.path.join(tmp, f"legacy_{i}.png")
+        with open(path, "wb") as f:
+            f.write(buffer.getvalue())
+        resize_image(path, args.max_image_size, 85)
+        if legacy_hex_is_duplicate(recent, calculate_phash(path), args.max_distance):
+            os.remove(path)
+    return encoded
+
+
+def capture_side(stream, size, tmp, args):
+    index = HammingIndex(args.max_distance, window=args.window)
+    encoded = 0
+    frame = None
+    for i, bgra in enumerate(stream):
+        img = Image.frombytes("RGB", size, bgra, "raw", "BGRX")
+        frame_hash = dhash(img)
+        if index.find_or_add(i, frame_hash) is not None:
+            continue
+        frame = ImageFrame.from_image(img, args.max_image_size, "png", 85, frame_hash)
+        frame.encode()
+        encoded += 1
+        frame.persist_async(os.path.join(tmp, f"frame_{i}.png"))
+    if frame is not None:
+        frame.wait_persisted()
+    return encoded
+
+
+def time_lookups(window, max_distance, lookups=20000):
+    rng = random.Random(5)
+    values = [rng.getrandbits(64) for _ in range(window)]
+    queries = [rng.getrandbits(64) for _ in range(lookups)]
+    hex_recent = deque((f"{v:016x}" for v in values), maxlen=window)
+    start = time.perf_counter()
+    for q in queries:
+        legacy_hex_is_duplicate(hex_recent, f"{q:016x}", max_distance)
+        hex_recent.pop()
+    legacy = (time.perf_counter() - start) / lookups
+    index = HammingIndex(max_distance, window=window)
+    for i, v in enumerate(values):
+        index.add(i, v)
+    start = time.perf_counter()
+    for q in queries:
+        index.find(q)
+    indexed = (time.perf_counter() - start) / lookups
+    return legacy, indexed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--width", type=int, default=2560)
+    parser.add_argument("--height", type=int, default=1440)
+    parser.add_argument("--frames", type=int, default=40)
+    parser.add_argument("--distinct", type=int, default=4)
+    parser.add_argument("--window", type=int, default=30)
+    parser.add_argument("--max-distance", type=int, default=3)
+    parser.add_argument("--max-image-size", type=int, default=1920)
+    args = parser.parse_args()
+
+    size = (args.width, args.height)
+    stream = make_stream(make_screens(args.width, args.height, args.distinct), args.frames)
+
+    print(f"{args.frames} frames of {args.width}x{args.height}, {args.distinct} distinct screens")
+    print(f"{'dedup':<16}{'CPU ms/frame':>14}{'frames encoded':>16}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, run in (("processor-side", processor_side), ("capture-side", capture_side)):
+            start = time.process_time()
+            encoded = run(stream, size, tmp, args)
+            cpu = (time.process_time() - start) * 1000 / args.frames
+            print(f"{name:<16}{cpu:>14.1f}{encoded:>16}")
+
+    print(f"\n{'window':>8}{'hex scan (us)':>15}{'HammingIndex (us)':>19}")
+    for window in (30, 300, 3000):
+        legacy, indexed = time_lookups(window, args.max_distance)
+        print(f"{window:>8}{legacy * 1e6:>15.1f}{indexed * 1e6:>19.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2025 Beijing Volcano Engine Technology Co., Ltd.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Benchmark: per-frame CPU cost of the screenshot pipeline
+Compares the file-based path (PNG encode + write at capture, reopen/resize/rewrite, reopen for
+the dHash, reread + base64 for the VLM) with the in-memory ImageFrame path, where a frame is
+downscaled once, hashed once, encoded once and written to disk on a background thread.
+
+Frames are synthetic desktop-like images (flat panels and text-like stripes), since
+PNG cost depends heavily on content.
+
+Usage:
+    python benchmarks/benchmark_screenshot_frames.py
+    python benchmarks/benchmark_screenshot_frames.py --width 3840 --height 2160 --frames 10
+"""
+
+import argparse
+import base64
+import os
+import sys
+import tempfile
+import time
+from io import BytesIO
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+# Add parent directory to path to import opencontext modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from opencontext.utils.image import ImageFrame, calculate_phash, resize_image
+
+
+def make_bgra(width: int, height: int, seed: int) -> bytes:
+    """Raw BGRA buffer shaped like what mss returns for a desktop"""
+    rng = np.random.default_rng(seed)
+    pixels = np.full((height, width, 4), 235, dtype=np.uint8)
+    for _ in range(12):
+        x, y = rng.integers(0, width - 200), rng.integers(0, height - 150)
+        w, h = rng.integers(200, width // 2), rng.integers(150, height // 2)
+        pixels[y : y + h, x : x + w, :3] = rng.integers(40, 250, size=3)
+    for row in range(40, height - 20, 22):
+        lengths = rng.integers(width // 6, width // 2)
+        start = rng.integers(0, width - lengths)
+        pixels[row : row + 9, start : start + lengths, :3] = rng.integers(
+            0, 90, size=(9, lengths, 3)
+        )
+    return pixels.tobytes()
+
+
+def file_pipeline(bgra, size, path, max_size, quality):
+    # ScreenshotCapture._take_screenshot + _create_new_context
+    img = Image.frombytes("RGB", size, bgra, "raw", "BGRX")
+    buffer = BytesIO()
+    img.save(buffer, format="PNG")
+    with open(path, "wb") as f:
+        f.write(buffer.getvalue())
+    # ScreenshotProcessor.process
+    resize_image(path, max_size, quality)
+    phash = calculate_phash(path)
+    # ScreenshotProcessor._encode_image_to_base64
+    with open(path, "rb") as f:
+        encoded = base64.b64encode(f.read()).decode("utf-8")
+    return phash, encoded
+
+
+def frame_pipeline(bgra, size, path, max_size, quality):
+    img = Image.frombytes("RGB", size, bgra, "raw", "BGRX")
+    frame = ImageFrame.from_image(img, max_size, "png", quality)
+    frame.persist_async(path)
+    phash = frame.phash
+    encoded = frame.to_base64()
+    frame.release()
+    return phash, encoded
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--width", type=int, default=2560)
+    parser.add_argument("--height", type=int, default=1440)
+    parser.add_argument("--frames", type=int, default=6)
+    parser.add_argument("--max-image-size", type=int, default=1920)
+    parser.add_argument("--quality", type=int, default=85)
+    args = parser.parse_args()
+
+    size = (args.width, args.height)
+    buffers = [make_bgra(args.width, args.height, seed) for seed in range(args.frames)]
+
+    print(
+        f"{args.frames} frames of {args.width}x{args.height}, max_image_size {args.max_image_size}"
+    )
+    print(f"{'pipeline':<14}{'CPU ms/frame':>14}{'wall ms/frame':>15}{'payload KB':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, pipeline in (("file-based", file_pipeline), ("in-memory", frame_pipeline)):
+            cpu_start, wall_start = time.process_time(), time.perf_counter()
+            payload = 0
+            for i, bgra in enumerate(buffers):
+                path = os.path.join(tmp, f"{name}_{i}.png")
+                phash, encoded = pipeline(bgra, size, path, args.max_image_size, args.quality)
+                payload += len(encoded)
+            wall = (time.perf_counter() - wall_start) * 1000 / args.frames
+            # Include the background writes in the CPU figure
+            ImageFrame.from_image(Image.new("RGB", (1, 1))).persist_async(
+                os.path.join(tmp, "flush.png")
+            ).result()
+            cpu = (time.process_time() - cpu_start) * 1000 / args.frames
+            print(f"{name:<14}{cpu:>14.1f}{wall:>15.1f}{payload / args.frames / 1024:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2025 Beijing Volcano Engine Technology Co., Ltd.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Benchmark: a burst of screenshots submitted over the API, on the event loop vs the ingest pool
+Serves the screenshot routes with uvicorn in front of a real ScreenshotProcessor whose work
+queue journals to a temporary SQLite file; its VLM loop is switched off so only ingestion is
+measured. A client submits a burst of distinct PNG screenshots; a second run of each handler
+has another client ping the server every 10 ms. The legacy handler is the previous
+/api/add_screenshots, adding the screenshots one by one on the event loop. The new runs send
+the same paths to /api/add_screenshots, now on the ingest pool, and upload the image files to
+/api/screenshots/bulk as one multipart body. A last request mixes in missing paths, which
+must be rejected one by one.
+
+Usage:
+    python benchmarks/benchmark_screenshot_ingest.py
+    python benchmarks/benchmark_screenshot_ingest.py --images 1000 --width 2560 --height 1440
+"""
+
+import argparse
+import asyncio
+import datetime
+import os
+import socket
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+from PIL import Image
+
+# Add parent directory to path to import opencontext modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import httpx
+import uvicorn
+from fastapi import Depends, FastAPI
+
+from opencontext.context_processing import work_queue
+from opencontext.context_processing.processor.screenshot_processor import ScreenshotProcessor
+from opencontext.monitoring import get_monitor
+from opencontext.server import screenshot_ingest
+from opencontext.server.context_operations import ContextOperations
+from opencontext.server.opencontext import OpenContext
+from opencontext.server.routes import screenshots
+from opencontext.server.screenshot_ingest import ScreenshotIngestor
+from opencontext.server.utils import convert_resp, get_context_lab
+
+
+class Lab:
+    """The parts of OpenContext the screenshot routes use"""
+
+    add_screenshot = OpenContext.add_screenshot
+
+    def __init__(self, processor: ScreenshotProcessor):
+        self.processor = processor
+        self.context_operations = ContextOperations.__new__(ContextOperations)
+        self.processor_manager = SimpleNamespace(
+            get_backpressure=lambda source: processor.get_backpressure()
+        )
+
+    def add_context(self, context) -> bool:
+        return self.processor.process(context)
+
+
+def make_images(directory: str, count: int, width: int, height: int):
+    """Distinct screenshots: a window layout of flat blocks with a band of text-like noise"""
+    rng = np.random.default_rng(7)
+    paths = []
+    for i in range(count):
+        blocks = rng.integers(0, 256, (9, 16, 3), dtype=np.uint8)
+        pixels = np.asarray(Image.fromarray(blocks).resize((width, height), Image.NEAREST)).copy()
+        band = rng.integers(0, 2, (height // 8, width), dtype=np.uint8) * 255
+        pixels[height // 3 : height // 3 + height // 8] = band[..., None]
+        path = os.path.join(directory, f"screenshot_{i:04d}.png")
+        Image.fromarray(pixels).save(path, compress_level=1)
+        paths.append(path)
+    return paths
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def serve(app: FastAPI, port: int) -> uvicorn.Server:
+    server = uvicorn.Server(uvicorn.Config(app, port=port, log_level="error"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return server
+
+
+def make_app() -> FastAPI:
+    app = FastAPI()
+    app.include_router(screenshots.router)
+
+    @app.post("/legacy/add_screenshots")
+    async def legacy_add_screenshots(
+        request: screenshots.AddScreenshotsRequest, opencontext=Depends(get_context_lab)
+    ):
+        """The previous handler: one screenshot after another on the event loop"""
+        for screenshot in request.screenshots:
+            err_msg = opencontext.add_screenshot(
+                screenshot.path, screenshot.window, screenshot.create_time, screenshot.source
+            )
+            if err_msg:
+                return convert_resp(code=400, status=400, message=err_msg)
+        return convert_resp(message="Screenshots added successfully")
+
+    @app.get("/ping")
+    async def ping():
+        return {}
+
+    return app
+
+
+def new_processor(directory: str) -> ScreenshotProcessor:
+    work_queue.get_config = lambda key: {"path": directory, "max_items": 100000}
+    processor = ScreenshotProcessor()
+    processor._max_image_size, processor._resize_quality = 1920, 85
+    return processor
+
+
+async def ping_while(done: asyncio.Event, client: httpx.AsyncClient, base: str):
+    latencies = []
+    while not done.is_set():
+        start = time.perf_counter()
+        await client.get(f"{base}/ping")
+        latencies.append((time.perf_counter() - start) * 1000)
+        await asyncio.sleep(0.01)
+    return latencies
+
+
+async def burst(base: str, mode: str, paths, ping: bool):
+    now = datetime.datetime.now().isoformat()
+    body = {
+        "screenshots": [
+            {"path": path, "window": "Editor", "create_time": now, "source": "benchmark"}
+            for path in paths
+        ]
+    }
+    async with httpx.AsyncClient(timeout=None) as client:
+        done = asyncio.Event()
+        if ping:
+            pinger = asyncio.create_task(ping_while(done, client, base))
+            await asyncio.sleep(0.1)
+        start = time.perf_counter()
+        if mode == "legacy":
+            response = await client.post(f"{base}/legacy/add_screenshots", json=body)
+        elif mode == "add_screenshots":
+            response = await client.post(f"{base}/api/add_screenshots", json=body)
+        else:
+            handles = [open(path, "rb") for path in paths]
+            files = [("file", (os.path.basename(h.name), h, "image/png")) for h in handles]
+            data = {"window": "Editor", "source": "benchmark"}
+            response = await client.post(f"{base}/api/screenshots/bulk", data=data, files=files)
+            for handle in handles:
+                handle.close()
+        elapsed = time.perf_counter() - start
+        done.set()
+        pings = await pinger if ping else None
+    return response, elapsed, pings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--images", type=int, default=500)
+    parser.add_argument("--width", type=int, default=1920)
+    parser.add_argument("--height", type=int, default=1080)
+    parser.add_argument("--workers", type=int, default=0, help="0: one per CPU, up to 4")
+    parser.add_argument("--pending", type=int, default=16)
+    args = parser.parse_args()
+
+    # Processing is not under test: leave the journaled screenshots queued
+    ScreenshotProcessor._run_processing_loop = lambda self: self._stop_event.wait()
+    # The monitor recording screenshot paths is set up on first use, outside the timings
+    get_monitor()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = make_images(tmp, args.images, args.width, args.height)
+        image_bytes = sum(os.path.getsize(path) for path in paths)
+        app = make_app()
+        port = free_port()
+        server = serve(app, port)
+        base = f"http://127.0.0.1:{port}"
+
+        runs = iter(range(1000))
+
+        def run(mode, burst_paths, ping=False):
+            """One burst into a fresh processor and work queue"""
+            processor = new_processor(os.path.join(tmp, f"queue-{next(runs)}"))
+            app.state.context_lab_instance = Lab(processor)
+            ingestor = ScreenshotIngestor(
+                args.workers, args.pending, upload_path=os.path.join(tmp, "uploads")
+            )
+            screenshot_ingest._ingestor = ingestor
+            response, elapsed, pings = asyncio.run(burst(base, mode, burst_paths, ping))
+            depth = processor._input_queue.get_stats()["depth"]
+            processor.shutdown()
+            ingestor.shutdown()
+            return response, elapsed, pings, depth, ingestor.get_stats()
+
+        rows = []
+        for mode in ("legacy", "add_screenshots", "bulk upload"):
+            # Throughput alone, then again while the server is pinged
+            response, elapsed, _, depth, stats = run(mode, paths)
+            assert response.status_code in (200, 202), f"{mode}: {response.text[:200]}"
+            pings = run(mode, paths, ping=True)[2]
+            rows.append((mode, response.status_code, elapsed, pings, depth, stats))
+
+        # One missing path no longer fails the screenshots submitted with it
+        mixed = paths[:20] + [os.path.join(tmp, f"missing_{i}.png") for i in range(5)]
+        response = run("add_screenshots", mixed)[0]
+        mixed_data = response.json()["data"]
+        server.should_exit = True
+
+    depths = {depth for _, _, _, _, depth, _ in rows}
+    assert len(depths) == 1, f"the modes journaled different screenshots: {depths}"
+    assert response.status_code == 400 and mixed_data["accepted"] == 20
+    assert mixed_data["rejected"] == 5
+
+    print(
+        f"{args.images} screenshots of {args.width}x{args.height} "
+        f"({image_bytes / args.images / 1024:.0f} KiB PNG each), {os.cpu_count()} CPUs, "
+        f"ingest pool {args.workers or min(4, os.cpu_count())} workers / {args.pending} pending\n"
+    )
+    print(
+        f"{'handler':<17}{'status':>7}{'images/s':>10}{'burst (s)':>11}{'ping p50':>10}"
+        f"{'ping max':>10}{'journaled':>11}{'peak upload buffer':>20}"
+    )
+    for mode, status, elapsed, pings, depth, stats in rows:
+        buffered = (
+            f"{stats['peak_pending_bytes'] / 2**20:.1f} MiB" if mode == "bulk upload" else "-"
+        )
+        print(
+            f"{mode:<17}{status:>7}{args.images / elapsed:>10.1f}{elapsed:>11.2f}"
+            f"{statistics.median(pings):>8.1f}ms{max(pings):>8.0f}ms{depth:>11}{buffered:>20}"
+        )
+    print(
+        f"\nuploaded {image_bytes / 2**20:.0f} MiB in one request; "
+        f"mixed request of 20 screenshots and 5 missing paths: {mixed_data['accepted']} "
+        f"accepted, {mixed_data['rejected']} rejected (legacy: stopped at the first error)"
+    )
+
+
+if __name__ == "__main__":
+    main()
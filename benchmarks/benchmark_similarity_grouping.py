@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2025 Beijing Volcano Engine Technology Co., Ltd.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Benchmark: similarity grouping for periodic memory compression
+Compares the legacy pure-Python greedy grouping (generator-sum cosine per pair) with the
+vectorized group_by_similarity kernel on clustered synthetic embeddings.
+
+The legacy implementation is quadratic in Python; at 10k contexts it would run for hours,
+so unless --full-legacy is given its time is extrapolated from the measured per-pair cost
+and the exact number of comparisons the greedy pass performs. Grouping parity between
+both implementations is checked on a smaller sample.
+
+Usage:
+    python benchmarks/benchmark_similarity_grouping.py
+    python benchmarks/benchmark_similarity_grouping.py --sizes 1000 10000 --dim 2048
+"""
+
+import argparse
+import math
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path to import opencontext modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from opencontext.context_processing.merger.similarity import group_by_similarity
+
+
+def legacy_similarity(emb1, emb2):
+    if emb1 is None or emb2 is None or not emb1 or not emb2:
+        return 0.0
+    dot_product = sum(a * b for a, b in zip(emb1, emb2))
+    norm_emb1 = math.sqrt(sum(a * a for a in emb1))
+    norm_emb2 = math.sqrt(sum(b * b for b in emb2))
+    if norm_emb1 == 0 or norm_emb2 == 0:
+        return 0.0
+    return dot_product / (norm_emb1 * norm_emb2)
+
+
+def legacy_group(vectors, threshold):
+    """Verbatim port of the previous ContextMerger._group_contexts_by_similarity"""
+    groups = []
+    remaining = list(range(len(vectors)))
+    comparisons = 0
+    while remaining:
+        seed = remaining.pop(0)
+        group = [seed]
+        to_remove = []
+        for i, idx in enumerate(remaining):
+            comparisons += 1
+            if legacy_similarity(vectors[seed], vectors[idx]) > threshold:
+                group.append(idx)
+                to_remove.append(i)
+        for i in sorted(to_remove, reverse=True):
+            remaining.pop(i)
+        groups.append(group)
+    return groups, comparisons
+
+
+def count_comparisons(groups, n):
+    """Comparisons the legacy greedy pass makes for a given grouping"""
+    remaining = n
+    total = 0
+    for group in sorted(groups, key=lambda g: g[0]):
+        remaining -= 1
+        total += remaining
+        remaining -= len(group) - 1
+    return total
+
+
+def make_vectors(n, dim, clusters, noise, seed=7):
+    """Embeddings as plain lists, the way they come back from the vector store"""
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(0, 1, size=(clusters, dim))
+    labels = rng.integers(0, clusters, size=n)
+    return (centers[labels] + rng.normal(0, noise, size=(n, dim))).tolist()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--dim", type=int, default=2048)
+    parser.add_argument("--clusters", type=int, default=0, help="0 means n / 4")
+    parser.add_argument("--noise", type=float, default=0.25)
+    parser.add_argument("--threshold", type=float, default=0.9)
+    parser.add_argument("--parity-size", type=int, default=300)
+    parser.add_argument("--full-legacy", action="store_true")
+    args = parser.parse_args()
+
+    parity_vectors = make_vectors(args.parity_size, 256, max(1, args.parity_size // 4), args.noise)
+    parity_vectors[3] = None  # missing embeddings never join a group
+    legacy_groups, _ = legacy_group(parity_vectors, args.threshold)
+    new_groups = group_by_similarity(parity_vectors, args.threshold)
+    assert legacy_groups == new_groups, "vectorized grouping differs from legacy grouping"
+    print(f"parity check on {args.parity_size} contexts: {len(new_groups)} identical groups")
+
+    print(f"\n{'contexts':>9}{'groups':>9}{'legacy (s)':>14}{'vectorized (s)':>16}{'speedup':>10}")
+    for n in args.sizes:
+        clusters = args.clusters or max(1, n // 4)
+        vectors = make_vectors(n, args.dim, clusters, args.noise)
+
+        start = time.perf_counter()
+        groups = group_by_similarity(vectors, args.threshold)
+        vectorized = time.perf_counter() - start
+
+        if args.full_legacy:
+            start = time.perf_counter()
+            legacy_group(vectors, args.threshold)
+            legacy = time.perf_counter() - start
+            label = f"{legacy:.2f}"
+        else:
+            sample = 300
+            start = time.perf_counter()
+            for i in range(sample):
+                legacy_similarity(vectors[i % n], vectors[(i * 7 + 1) % n])
+            per_pair = (time.perf_counter() - start) / sample
+            legacy = per_pair * count_comparisons(groups, n)
+            label = f"~{legacy:.1f}"
+
+        print(f"{n:>9}{len(groups):>9}{label:>14}{vectorized:>16.3f}{legacy / vectorized:>9.0f}x")
+
+
+if __name__ == "__main__":
+    main()
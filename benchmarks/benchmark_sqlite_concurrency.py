@@ -0,0 +1,194 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2025 Beijing Volcano Engine Technology Co., Ltd.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Benchmark: SQLiteBackend under concurrent reads and a streaming writer
+Reader threads call get_todos / get_activities (the FastAPI handlers) while writer
+threads stream append_message_content chunks into chat messages, as completions do.
+Compares the previous backend (one shared default-mode connection, commit per call)
+with the WAL backend (pooled read connections, single group-committing writer thread).
+
+Usage:
+    python benchmarks/benchmark_sqlite_concurrency.py
+    python benchmarks/benchmark_sqlite_concurrency.py --readers 16 --streams 4 --seconds 5
+"""
+
+import argparse
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add parent directory to path to import opencontext modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from opencontext.storage.backends.sqlite_backend import SQLiteBackend
+
+
+class LegacyStore:
+    """The previous SQLiteBackend data path: one shared connection, no WAL, commit per call"""
+
+    def __init__(self, path):
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA journal_mode=DELETE")
+
+    def get_todos(self, limit=100, offset=0):
+        cursor = self.connection.cursor()
+        cursor.execute(
+            "SELECT id, content, created_at, start_time, end_time, status, urgency, assignee, "
+            "reason FROM todo WHERE 1=1 ORDER BY urgency DESC, created_at DESC LIMIT ? OFFSET ?",
+            (limit, offset),
+        )
+        return [dict(row) for row in cursor.fetchall()]
+
+    def get_activities(self, start_time=None, limit=100, offset=0):
+        cursor = self.connection.cursor()
+        cursor.execute(
+            "SELECT id, title, content, resources, metadata, start_time, end_time FROM activity "
+            "WHERE start_time >= ? ORDER BY start_time DESC LIMIT ? OFFSET ?",
+            (start_time, limit, offset),
+        )
+        return [dict(row) for row in cursor.fetchall()]
+
+    def append_message_content(self, message_id, content_chunk, token_count=0):
+        cursor = self.connection.cursor()
+        try:
+            now = datetime.now()
+            cursor.execute(
+                "UPDATE messages SET content = content || ?, token_count = token_count + ?, "
+                "status = CASE WHEN status = 'pending' THEN 'streaming' ELSE status END, "
+                "updated_at = ? WHERE id = ?",
+                (content_chunk, token_count, now, message_id),
+            )
+            cursor.execute(
+                "UPDATE conversations SET updated_at = ? "
+                "WHERE id = (SELECT conversation_id FROM messages WHERE id = ?)",
+                (now, message_id),
+            )
+            self.connection.commit()
+            return True
+        except Exception:
+            self.connection.rollback()
+            return False
+
+
+def populate(backend: SQLiteBackend, todos: int, activities: int, streams: int) -> list:
+    now = datetime.now()
+    for i in range(todos):
+        backend.insert_todo(f"todo {i}", urgency=i % 4, start_time=now - timedelta(minutes=i))
+    for i in range(activities):
+        start = now - timedelta(minutes=i)
+        backend.insert_activity(f"activity {i}", "x" * 400, start_time=start, end_time=start)
+    message_ids = []
+    for _ in range(streams):
+        conversation = backend.create_conversation(page_name="chat")
+        message = backend.create_streaming_message(conversation["id"], role="assistant")
+        message_ids.append(message["id"])
+    return message_ids
+
+
+def run(store, message_ids, readers: int, seconds: float):
+    stop = threading.Event()
+    latencies = []
+    appends = [0] * len(message_ids)
+    lock = threading.Lock()
+    since = datetime.now() - timedelta(days=1)
+
+    def reader(n):
+        local = []
+        i = n
+        while not stop.is_set():
+            start = time.perf_counter()
+            if i % 2:
+                store.get_todos(limit=50)
+            else:
+                store.get_activities(start_time=since, limit=50)
+            local.append((time.perf_counter() - start) * 1000)
+            i += 1
+        with lock:
+            latencies.extend(local)
+
+    def writer(n):
+        while not stop.is_set():
+            store.append_message_content(message_ids[n], "token ", token_count=1)
+            appends[n] += 1
+
+    threads = [threading.Thread(target=reader, args=(n,)) for n in range(readers)]
+    threads += [threading.Thread(target=writer, args=(n,)) for n in range(len(message_ids))]
+    for t in threads:
+        t.start()
+    time.sleep(seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+
+    latencies.sort()
+    pct = lambda q: latencies[max(0, int(len(latencies) * q) - 1)]
+    return (
+        len(latencies) / seconds,
+        statistics.median(latencies),
+        pct(0.99),
+        sum(appends) / seconds,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--streams", type=int, default=4, help="Concurrent chat streams")
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--todos", type=int, default=2000)
+    parser.add_argument("--activities", type=int, default=5000)
+    parser.add_argument("--pool-size", type=int, default=4)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        rows = []
+
+        legacy_path = os.path.join(tmp, "legacy.db")
+        seed = SQLiteBackend()
+        seed.initialize({"config": {"path": legacy_path}})
+        message_ids = populate(seed, args.todos, args.activities, args.streams)
+        seed.close()
+        legacy = LegacyStore(legacy_path)
+        rows.append(("shared connection", *run(legacy, message_ids, args.readers, args.seconds)))
+        legacy.connection.close()
+
+        backend = SQLiteBackend()
+        backend.initialize(
+            {"config": {"path": os.path.join(tmp, "app.db"), "read_pool_size": args.pool_size}}
+        )
+        message_ids = populate(backend, args.todos, args.activities, args.streams)
+        jobs_before = backend.get_write_stats()["jobs"]
+        rows.append(("WAL pool + writer", *run(backend, message_ids, args.readers, args.seconds)))
+        stats = backend.get_write_stats()
+        appended = sum(
+            backend.get_message(i, include_thinking=False)["content"].count("token ")
+            for i in message_ids
+        )
+        assert appended == stats["jobs"] - jobs_before, "lost appends"
+        backend.close()
+
+        print(
+            f"{args.readers} readers + {args.streams} streaming writers, {args.seconds:.0f}s per mode"
+        )
+        print(f"{'backend':<20}{'reads/s':>10}{'p50 (ms)':>10}{'p99 (ms)':>10}{'appends/s':>11}")
+        for name, reads, p50, p99, appends in rows:
+            print(f"{name:<20}{reads:>10.0f}{p50:>10.2f}{p99:>10.2f}{appends:>11.0f}")
+        print(
+            f"\nwriter: {stats['jobs']} writes in {stats['transactions']} transactions "
+            f"({stats['jobs'] / max(stats['transactions'], 1):.1f} per commit)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2025 Beijing Volcano Engine Technology Co., Ltd.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Benchmark: parallel tool calls in ToolsExecutor
+Runs rounds of parallel tool calls, as the agent and GlobalVLMClient tool loops issue them,
+with the previous run_async (sync execute called on the event loop) and with aexecute on
+the shared tool executor. Blocking tools sleep to stand in for vector store queries and
+search requests; native async tools await to stand in for embedding calls. Event loop lag
+is sampled by a heartbeat task while the calls run.
+
+Also measures the sync generate_with_messages tool step, which used to build a fresh
+ThreadPoolExecutor per loop iteration, and a hanging tool bounded by its timeout.
+
+Usage:
+    python benchmarks/benchmark_tool_execution.py
+    python benchmarks/benchmark_tool_execution.py --calls 6 --rounds 20 --latency-ms 80
+"""
+
+import argparse
+import asyncio
+import concurrent.futures
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path to import opencontext modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from opencontext.llm.global_vlm_client import GlobalVLMClient
+from opencontext.tools.base import BaseTool
+from opencontext.tools.tools_executor import ToolsExecutor
+
+
+class BlockingTool(BaseTool):
+    """Sync tool: blocks its thread like a Chroma query or a DuckDuckGo request"""
+
+    latency = 0.05
+
+    @classmethod
+    def get_name(cls) -> str:
+        return "blocking_tool"
+
+    def execute(self, **kwargs):
+        time.sleep(self.latency)
+        return {"success": True, "query": kwargs.get("query")}
+
+
+class AsyncTool(BlockingTool):
+    """Tool with a native aexecute: awaits the I/O like an async embedding call"""
+
+    @classmethod
+    def get_name(cls) -> str:
+        return "async_tool"
+
+    async def aexecute(self, **kwargs):
+        await asyncio.sleep(self.latency)
+        return {"success": True, "query": kwargs.get("query")}
+
+
+class HangingTool(BlockingTool):
+    @classmethod
+    def get_name(cls) -> str:
+        return "hanging_tool"
+
+    def execute(self, **kwargs):
+        time.sleep(self.latency * 20)
+        return {"success": True}
+
+
+async def legacy_run_async(executor: ToolsExecutor, tool_name, tool_input):
+    """Previous ToolsExecutor.run_async: the sync execute runs on the event loop"""
+    return executor._tools_map[tool_name].execute(**tool_input)
+
+
+def legacy_run_tools(executor: ToolsExecutor, tool_call_info):
+    """Previous generate_with_messages tool step: a new thread pool per iteration"""
+    results = []
+    with concurrent.futures.ThreadPoolExecutor() as pool:
+        future_to_tool = {
+            pool.submit(executor.run, function_name, function_args): (tool_id, function_name)
+            for tool_id, function_name, function_args in tool_call_info
+        }
+        for future in concurrent.futures.as_completed(future_to_tool):
+            tool_id, function_name = future_to_tool[future]
+            results.append((tool_id, function_name, future.result()))
+    return results
+
+
+async def measure_async(run, executor, tool_name, calls, rounds):
+    """Wall time per round of parallel calls and event loop lag while they run"""
+    lags = []
+    stop = False
+
+    async def heartbeat():
+        while not stop:
+            start = time.perf_counter()
+            await asyncio.sleep(0.005)
+            lags.append((time.perf_counter() - start - 0.005) * 1000)
+
+    beat = asyncio.create_task(heartbeat())
+    durations = []
+    results = None
+    for r in range(rounds):
+        start = time.perf_counter()
+        results = await asyncio.gather(
+            *[run(executor, tool_name, {"query": f"q{r}-{i}"}) for i in range(calls)]
+        )
+        durations.append((time.perf_counter() - start) * 1000)
+    stop = True
+    await beat
+    lags.sort()
+    p99 = lags[int(len(lags) * 0.99) - 1] if lags else 0.0
+    return statistics.median(durations), p99, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=5, help="Parallel tool calls per round")
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--latency-ms", type=float, default=50)
+    args = parser.parse_args()
+
+    BlockingTool.latency = args.latency_ms / 1000
+    executor = ToolsExecutor()
+    for tool in (BlockingTool(), AsyncTool(), HangingTool()):
+        executor._tools_map[tool.get_name()] = tool
+    new_run = lambda ex, name, tool_input: ex.run_async(name, tool_input)
+
+    async def run_all():
+        rows = []
+        for label, run, tool_name in (
+            ("legacy run_async, sync tool", legacy_run_async, "blocking_tool"),
+            ("aexecute, sync tool", new_run, "blocking_tool"),
+            ("aexecute, native async tool", new_run, "async_tool"),
+        ):
+            p50, lag, results = await measure_async(
+                run, executor, tool_name, args.calls, args.rounds
+            )
+            rows.append((label, p50, lag, results))
+        assert rows[0][3] == rows[1][3] == rows[2][3], "tool results differ between paths"
+        return rows
+
+    rows = asyncio.run(run_all())
+    print(f"{args.calls} parallel calls per round, {args.latency_ms:.0f} ms per call\n")
+    print(f"{'mode':<30}{'round p50 (ms)':>16}{'loop lag p99 (ms)':>20}")
+    for label, p50, lag, _ in rows:
+        print(f"{label:<30}{p50:>16.1f}{lag:>20.2f}")
+
+    # Sync tool loop step with near-instant tools: thread pool setup dominates
+    client = GlobalVLMClient.__new__(GlobalVLMClient)
+    client._tools_executor = executor
+    BlockingTool.latency = 0.0
+    info = [(f"call_{i}", "blocking_tool", {"query": f"q{i}"}) for i in range(args.calls)]
+    assert sorted(legacy_run_tools(executor, info)) == sorted(client._run_tools(info))
+    steps = 500
+    print(f"\n{'sync tool step':<30}{'per step (us)':>16}")
+    for label, fn in (
+        ("new pool per iteration", lambda: legacy_run_tools(executor, info)),
+        ("shared tool executor", lambda: client._run_tools(info)),
+    ):
+        start = time.perf_counter()
+        for _ in range(steps):
+            fn()
+        print(f"{label:<30}{(time.perf_counter() - start) / steps * 1e6:>16.1f}")
+
+    # A hanging tool is abandoned after its time limit instead of stalling the round
+    BlockingTool.latency = args.latency_ms / 1000
+    executor._timeouts["hanging_tool"] = BlockingTool.latency * 2
+    start = time.perf_counter()
+    result = asyncio.run(executor.run_async("hanging_tool", {}))
+    elapsed = (time.perf_counter() - start) * 1000
+    assert "timed out" in result["error"]
+    print(
+        f"\nhanging tool ({BlockingTool.latency * 20 * 1000:.0f} ms) with "
+        f"{executor.get_timeout('hanging_tool') * 1000:.0f} ms limit: returned in {elapsed:.0f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
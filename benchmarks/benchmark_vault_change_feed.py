@@ -0,0 +1,161 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2025 Beijing Volcano Engine Technology Co., Ltd.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Benchmark: detecting vault document edits, polling vs the vault change feed
+Fills a SQLite vault table with documents and edits a random sample of them, most of which
+are older than the newest 100. The legacy monitor polled get_vaults(limit=100) every
+monitor_interval and compared timestamps, so it only sees edits among the newest 100
+documents and reacts after half an interval on average. VaultDocumentMonitor now follows
+the vault_changes feed and is woken by the storage on each write. Also measures the cost of
+one check with nothing changed, and a restart with edits made while the monitor was down.
+
+Usage:
+    python benchmarks/benchmark_vault_change_feed.py
+    python benchmarks/benchmark_vault_change_feed.py --docs 20000 --edits 500
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Add parent directory to path to import opencontext modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from opencontext.context_capture import vault_document_monitor
+from opencontext.context_capture.vault_document_monitor import VaultDocumentMonitor
+from opencontext.storage.backends.sqlite_backend import SQLiteBackend
+from opencontext.storage.unified_storage import UnifiedStorage
+
+
+def legacy_scan(storage, state):
+    """VaultDocumentMonitor._scan_vault_changes before the change feed"""
+    current_time = datetime.now()
+    found = []
+    for doc in storage.get_vaults(limit=100, offset=0, is_deleted=False):
+        created_at = datetime.fromisoformat(doc["created_at"].replace("Z", "+00:00"))
+        updated_at = (
+            datetime.fromisoformat(doc["updated_at"].replace("Z", "+00:00"))
+            if doc.get("updated_at")
+            else created_at
+        )
+        if doc["id"] not in state["seen"]:
+            if created_at > state["last_scan"]:
+                found.append(doc["id"])
+            state["seen"].add(doc["id"])
+        elif updated_at > state["last_scan"]:
+            found.append(doc["id"])
+    state["last_scan"] = current_time
+    return found
+
+
+class Recorder:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.seen = {}
+        self.events = 0
+
+    def __call__(self, contexts):
+        now = time.perf_counter()
+        with self.lock:
+            for context in contexts:
+                self.events += 1
+                self.seen.setdefault(context.additional_info["vault_id"], now)
+
+
+def start_monitor(interval):
+    monitor = VaultDocumentMonitor()
+    recorder = Recorder()
+    monitor.initialize({"monitor_interval": interval, "initial_scan": False})
+    monitor.set_callback(recorder)
+    monitor.start()
+    return monitor, recorder
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--docs", type=int, default=5000)
+    parser.add_argument("--edits", type=int, default=200)
+    parser.add_argument("--interval", type=int, default=30, help="monitor_interval (seconds)")
+    args = parser.parse_args()
+    rng = random.Random(3)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        backend = SQLiteBackend()
+        backend.initialize({"config": {"path": tmp + "/app.db"}})
+        storage = UnifiedStorage()
+        storage._document_backend = backend
+        storage._initialized = True
+        vault_document_monitor.get_storage = lambda: storage
+        for i in range(args.docs):
+            storage.insert_vaults(f"doc {i}", "", f"content {i}", "vaults")
+
+        # Legacy polling: the state after the startup scan, then one poll after the edits
+        state = {"seen": set(), "last_scan": datetime.now()}
+        legacy_scan(storage, state)
+        t0 = time.perf_counter()
+        for _ in range(20):
+            legacy_scan(storage, state)
+        legacy_poll_ms = (time.perf_counter() - t0) / 20 * 1000
+
+        monitor, recorder = start_monitor(args.interval)
+        time.sleep(0.2)
+        t0 = time.perf_counter()
+        for _ in range(20):
+            monitor._consume_vault_changes()
+        feed_poll_ms = (time.perf_counter() - t0) / 20 * 1000
+
+        edited = rng.sample(range(1, args.docs + 1), args.edits)
+        written = {}
+        for vault_id in edited:
+            storage.update_vault(vault_id, content=f"edited {vault_id}")
+            written[vault_id] = time.perf_counter()
+            time.sleep(0.002)
+        legacy_found = set(legacy_scan(storage, state)) & set(edited)
+        deadline = time.time() + 10
+        while len(recorder.seen) < len(edited) and time.time() < deadline:
+            time.sleep(0.01)
+        latencies = sorted((recorder.seen[v] - written[v]) * 1000 for v in recorder.seen)
+        assert set(recorder.seen) == set(edited), "change feed missed edits"
+        monitor.stop()
+
+        # Restart: edits made while the monitor was down are delivered from the stored cursor
+        down_edits = rng.sample(range(1, args.docs + 1), 50)
+        for vault_id in down_edits:
+            storage.update_vault(vault_id, content=f"edited offline {vault_id}")
+        monitor, recorder = start_monitor(args.interval)
+        deadline = time.time() + 10
+        while len(recorder.seen) < len(set(down_edits)) and time.time() < deadline:
+            time.sleep(0.01)
+        assert set(recorder.seen) == set(down_edits), "restart lost edits"
+        restart_events = recorder.events
+        monitor.stop()
+        backend.close()
+
+    print(f"{args.docs} vault documents, {args.edits} random edits\n")
+    print(f"{'mode':<14}{'edits seen':>12}{'latency p50':>14}{'latency max':>14}{'check (ms)':>12}")
+    print(
+        f"{'polling':<14}{len(legacy_found):>12}{args.interval * 500:>12.0f}ms"
+        f"{args.interval * 1000:>12.0f}ms{legacy_poll_ms:>12.2f}"
+    )
+    print(
+        f"{'change feed':<14}{len(latencies):>12}{statistics.median(latencies):>12.2f}ms"
+        f"{latencies[-1]:>12.2f}ms{feed_poll_ms:>12.2f}"
+    )
+    print(
+        f"\nrestart after 50 offline edits: {restart_events} events delivered "
+        f"(legacy: re-emits the newest 1000 documents, edits to older ones are missed)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2025 Beijing Volcano Engine Technology Co., Ltd.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Benchmark: multi-collection vector search in ChromaDBBackend
+Measures search latency over all 7 populated context-type collections with the previous
+sequential, write-locked search and with the concurrent fan-out search, both idle and
+while a writer thread keeps upserting (as the screenshot pipeline does).
+
+Usage:
+    python benchmarks/benchmark_vector_search_fanout.py
+    python benchmarks/benchmark_vector_search_fanout.py --docs 5000 --queries 300
+"""
+
+import argparse
+import datetime
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path to import opencontext modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from opencontext.models.context import ContextProperties, ExtractedData, ProcessedContext, Vectorize
+from opencontext.models.enums import ContextType
+from opencontext.storage.backends.chromadb_backend import ChromaDBBackend
+
+
+def make_context(context_type: ContextType, vector, i: int) -> ProcessedContext:
+    now = datetime.datetime.now()
+    return ProcessedContext(
+        properties=ContextProperties(create_time=now, event_time=now, update_time=now),
+        extracted_data=ExtractedData(
+            title=f"{context_type.value} {i}",
+            summary=f"synthetic {context_type.value} number {i}",
+            context_type=context_type,
+        ),
+        vectorize=Vectorize(text=f"{context_type.value} {i}", vector=vector),
+    )
+
+
+def legacy_search(backend: ChromaDBBackend, query_vector, top_k: int):
+    """Previous behaviour: count + query per collection, sequentially, under the write lock"""
+    all_results = []
+    for context_type, collection in backend._collections.items():
+        with backend._write_lock:
+            count = collection.count()
+        if count == 0:
+            continue
+        with backend._write_lock:
+            results = collection.query(
+                query_embeddings=[query_vector],
+                n_results=top_k,
+                include=["metadatas", "documents", "distances"],
+            )
+        for i in range(len(results["ids"][0])):
+            doc = {
+                "id": results["ids"][0][i],
+                "document": results["documents"][0][i],
+                "metadata": results["metadatas"][0][i],
+            }
+            context = backend._chroma_result_to_context(doc, False)
+            if context:
+                all_results.append((context, 1 - results["distances"][0][i]))
+    all_results.sort(key=lambda x: x[1], reverse=True)
+    return all_results[:top_k]
+
+
+def measure(fn, queries):
+    latencies = []
+    for q in queries:
+        start = time.perf_counter()
+        fn(q)
+        latencies.append((time.perf_counter() - start) * 1000)
+    latencies.sort()
+    return statistics.median(latencies), latencies[int(len(latencies) * 0.95) - 1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--docs", type=int, default=2000, help="Documents per collection")
+    parser.add_argument("--dim", type=int, default=256)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(3)
+    with tempfile.TemporaryDirectory() as tmp:
+        backend = ChromaDBBackend()
+        backend.initialize(
+            {"config": {"mode": "local", "path": tmp, "search_max_workers": args.workers}}
+        )
+        for context_type in ContextType:
+            vectors = rng.normal(size=(args.docs, args.dim)).astype(np.float32).tolist()
+            contexts = [make_context(context_type, v, i) for i, v in enumerate(vectors)]
+            for start in range(0, len(contexts), 1000):
+                backend.batch_upsert_processed_context(contexts[start : start + 1000])
+        print(f"populated {len(ContextType)} collections x {args.docs} docs (dim={args.dim})")
+
+        queries = rng.normal(size=(args.queries, args.dim)).astype(np.float32).tolist()
+        fanout = lambda q: backend.search(Vectorize(vector=q), top_k=args.top_k)
+        legacy = lambda q: legacy_search(backend, q, args.top_k)
+
+        for q in queries[:3]:
+            a = [c.id for c, _ in legacy(q)]
+            b = [c.id for c, _ in fanout(q)]
+            assert a == b, "fan-out search returned different top-k"
+
+        rows = [("sequential + write lock", *measure(legacy, queries))]
+        rows.append(("concurrent fan-out", *measure(fanout, queries)))
+
+        stop = threading.Event()
+        writer_vectors = rng.normal(size=(200, args.dim)).astype(np.float32).tolist()
+
+        def writer():
+            i = 0
+            while not stop.is_set():
+                batch = [
+                    make_context(ContextType.ACTIVITY_CONTEXT, v, 10_000_000 + i * 200 + j)
+                    for j, v in enumerate(writer_vectors)
+                ]
+                backend.batch_upsert_processed_context(batch)
+                i += 1
+
+        thread = threading.Thread(target=writer, daemon=True)
+        thread.start()
+        time.sleep(0.5)
+        rows.append(("sequential, during writes", *measure(legacy, queries)))
+        rows.append(("fan-out, during writes", *measure(fanout, queries)))
+        stop.set()
+        thread.join()
+
+        print(f"\n{'mode':<28}{'p50 (ms)':>10}{'p95 (ms)':>10}")
+        for name, p50, p95 in rows:
+            print(f"{name:<28}{p50:>10.2f}{p95:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2025 Beijing Volcano Engine Technology Co., Ltd.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Benchmark: screenshot burst through the processing queue, with a crash mid-backlog
+A capture thread produces screenshots faster than a simulated VLM batch consumer drains
+them. The legacy path is the bounded in-memory queue.Queue(batch_size * 3) with a blocking
+put and timeout, which stalls capture and drops frames once the queue is full, and loses
+everything queued when the process dies. The durable work queue journals every frame,
+so nothing is dropped; the run is then "crashed" with a batch leased but not acknowledged,
+and the queue is reopened to count what is delivered again.
+
+Usage:
+    python benchmarks/benchmark_work_queue.py
+    python benchmarks/benchmark_work_queue.py --frames 2000 --capture-ms 2 --vlm-ms 200
+"""
+
+import argparse
+import datetime
+import queue
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Add parent directory to path to import opencontext modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from opencontext.context_processing.work_queue import DurableWorkQueue
+from opencontext.models.context import RawContextProperties
+from opencontext.models.enums import ContentFormat, ContextSource
+
+
+def make_frames(count: int):
+    now = datetime.datetime.now()
+    return [
+        RawContextProperties(
+            content_format=ContentFormat.IMAGE,
+            source=ContextSource.SCREENSHOT,
+            create_time=now,
+            content_path=f"/tmp/screenshots/{i:06d}.png",
+            additional_info={"window": f"editor {i % 7}"},
+        )
+        for i in range(count)
+    ]
+
+
+def run_legacy(frames, args):
+    """queue.Queue(maxsize) with put(timeout), as the processors used before"""
+    q = queue.Queue(maxsize=args.batch_size * 3)
+    processed, dropped, stalled = [], [], [0.0]
+    done = threading.Event()
+
+    def consumer():
+        while not (done.is_set() and q.empty()):
+            batch = []
+            try:
+                batch.append(q.get(timeout=0.05))
+                while len(batch) < args.batch_size:
+                    batch.append(q.get_nowait())
+            except queue.Empty:
+                pass
+            if batch:
+                time.sleep(args.vlm_ms / 1000)
+                processed.extend(raw.object_id for raw in batch)
+
+    thread = threading.Thread(target=consumer)
+    thread.start()
+    start = time.perf_counter()
+    for raw in frames:
+        t0 = time.perf_counter()
+        try:
+            q.put(raw, timeout=args.put_timeout_ms / 1000)
+        except queue.Full:
+            dropped.append(raw.object_id)
+        stalled[0] += time.perf_counter() - t0
+        time.sleep(args.capture_ms / 1000)
+    capture_s = time.perf_counter() - start
+    done.set()
+    thread.join()
+    return processed, len(dropped), stalled[0], capture_s, 0
+
+
+def run_durable(frames, args, directory):
+    """DurableWorkQueue; the consumer dies with a leased batch half-way through the backlog"""
+    path = str(Path(directory) / "screenshot.db")
+
+    def open_queue():
+        return DurableWorkQueue(
+            "screenshot",
+            path,
+            encode=RawContextProperties.dump_json,
+            decode=RawContextProperties.from_json,
+            spill=lambda raw: True,
+            memory_items=args.batch_size * 3,
+            high_watermark=args.batch_size * 10,
+        )
+
+    q = open_queue()
+    processed, dropped, stalled = [], 0, 0.0
+    crash_after = len(frames) // args.batch_size // 2
+    crashed = threading.Event()
+
+    def consumer():
+        for _ in range(crash_after):
+            items = q.get_batch(args.batch_size, 0.05)
+            time.sleep(args.vlm_ms / 1000)
+            processed.extend(item.key for item in items)
+            q.ack(items)
+        # Crash: this batch is stored but the process dies before it is acknowledged
+        items = q.get_batch(args.batch_size, 0.05)
+        processed.extend(item.key for item in items)
+        crashed.set()
+
+    thread = threading.Thread(target=consumer)
+    thread.start()
+    start = time.perf_counter()
+    for raw in frames:
+        t0 = time.perf_counter()
+        if not q.put(raw.object_id, raw):
+            dropped += 1
+        stalled += time.perf_counter() - t0
+        time.sleep(args.capture_ms / 1000)
+    capture_s = time.perf_counter() - start
+    thread.join()
+    q.close()
+
+    # Restart: drain everything that was journaled but not acknowledged
+    q = open_queue()
+    recovered = q.get_stats()["recovered"]
+    while True:
+        items = q.get_batch(args.batch_size, 0)
+        if not items:
+            break
+        processed.extend(item.key for item in items)
+        q.ack(items)
+    q.close()
+    return processed, dropped, stalled, capture_s, recovered
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--frames", type=int, default=1000)
+    parser.add_argument("--capture-ms", type=float, default=2, help="Interval between frames")
+    parser.add_argument("--batch-size", type=int, default=20)
+    parser.add_argument("--vlm-ms", type=float, default=200, help="Time per VLM batch")
+    parser.add_argument(
+        "--put-timeout-ms", type=float, default=20, help="Legacy put timeout (2 s in the app)"
+    )
+    args = parser.parse_args()
+
+    frames = make_frames(args.frames)
+    all_ids = {raw.object_id for raw in frames}
+    directory = tempfile.mkdtemp(prefix="work_queue_bench_")
+    try:
+        rows = []
+        for label, runner in (
+            ("queue.Queue (legacy)", lambda: run_legacy(frames, args)),
+            ("durable work queue", lambda: run_durable(frames, args, directory)),
+        ):
+            processed, dropped, stalled, capture_s, recovered = runner()
+            rows.append(
+                (
+                    label,
+                    len(set(processed)),
+                    dropped,
+                    len(processed) - len(set(processed)),
+                    recovered,
+                    stalled / len(frames) * 1e6,
+                    capture_s,
+                )
+            )
+            if label.startswith("durable"):
+                assert set(processed) == all_ids, "durable queue lost frames"
+            else:
+                assert set(processed) <= all_ids
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    print(
+        f"{args.frames} frames every {args.capture_ms:g} ms, VLM batches of "
+        f"{args.batch_size} taking {args.vlm_ms:g} ms\n"
+    )
+    print(
+        f"{'queue':<24}{'processed':>10}{'dropped':>9}{'redelivered':>13}"
+        f"{'recovered':>11}{'put (us)':>10}{'capture (s)':>13}"
+    )
+    for label, done, dropped, again, recovered, put_us, capture_s in rows:
+        print(
+            f"{label:<24}{done:>10}{dropped:>9}{again:>13}{recovered:>11}"
+            f"{put_us:>10.1f}{capture_s:>13.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -24,10 +24,10 @@ import { IpcServerPushChannel } from '@shared/ipc-server-push-channel'
 const AppContent: FC = () => {
   const navigate = useNavigate()
   const location = useLocation()
-  const { startPolling, stopPolling } = useEvents()
+  const { startListening, stopListening } = useEvents()
   useObservableTask({
-    active: startPolling,
-    inactive: stopPolling
+    active: startListening,
+    inactive: stopListening
   })
 
   // Listen for tray navigation event
@@ -61,9 +61,9 @@ const AppContent: FC = () => {
   }, [navigate])
 
   useEffect(() => {
-    startPolling()
+    startListening()
 
-    return () => stopPolling()
+    return () => stopListening()
   }, [])
 
   // Restore last route on hot reload (fallback to /)
@@ -46,11 +46,11 @@ export function useEvents() {
     activityEvents,
     activeEvent,
     currentModalVisible,
-    // 可以手动控制轮询的函数
+    // 可以手动控制事件流的函数
     removeEvent,
     fetchEvents: () => eventService.fetchEvents(dispatch),
-    startPolling: () => eventService.startPolling(dispatch),
-    stopPolling: () => eventService.stopPolling(),
+    startListening: () => eventService.startListening(dispatch),
+    stopListening: () => eventService.stopListening(),
     setCurrentActiveEvent,
     setCurrentModalVisible
   }
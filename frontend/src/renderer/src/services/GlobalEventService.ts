@@ -1,7 +1,7 @@
 // Copyright (c) 2025 Beijing Volcano Engine Technology Co., Ltd.
 // SPDX-License-Identifier: Apache-2.0
 
-import axiosInstance from '@renderer/services/axiosConfig'
+import axiosInstance, { baseURLReady } from '@renderer/services/axiosConfig'
 import { NotificationQueue } from '@renderer/utils/queue/NotificationQueue'
 import { Notification } from '@renderer/types/notification'
 import { addEvent } from '@renderer/store/events'
@@ -9,11 +9,19 @@ import { removeMarkdownSymbols } from '@renderer/utils/time'
 import { PushDataTypes } from '@renderer/constant/feed'
 import { getLogger } from '@shared/logger/renderer'
 const logger = getLogger('GlobalEventService')
-const NORMAL_POLLING_INTERVAL = 30 * 1000 // Normal: 30 seconds
+// Reconnect backoff after a stream error, doubled up to the maximum, reset once connected
+const RECONNECT_DELAY = 1000
+const MAX_RECONNECT_DELAY = 30 * 1000
 
 class GlobalEventService {
   private static instance: GlobalEventService
-  private pollingTimer: NodeJS.Timeout | null = null
+  private eventSource: EventSource | null = null
+  private reconnectTimer: NodeJS.Timeout | null = null
+  private reconnectDelay = RECONNECT_DELAY
+  // Incremented by stopListening, so a start still waiting for the baseURL does not open
+  private generation = 0
+  // Sequence number of the last event received, to resume the stream without gaps
+  private lastEventId = 0
   private notificationQueue: NotificationQueue
 
   private constructor() {
@@ -27,48 +35,94 @@ class GlobalEventService {
     return GlobalEventService.instance
   }
 
-  // Start polling
-  public startPolling(dispatch): void {
-    if (this.pollingTimer) {
-      this.stopPolling()
+  // Open the event stream once the backend port is known; events are pushed as they are published
+  public startListening(dispatch): void {
+    this.stopListening()
+    const generation = this.generation
+    baseURLReady.then(() => {
+      if (generation === this.generation) {
+        this.open(dispatch)
+      }
+    })
+  }
+
+  private open(dispatch): void {
+    // Built on every (re)connect: the baseURL may have changed since the last one
+    const url = new URL('/api/events/stream', axiosInstance.defaults.baseURL)
+    if (this.lastEventId) {
+      url.searchParams.set('last_event_id', String(this.lastEventId))
+    }
+    const eventSource = new EventSource(url.toString())
+    this.eventSource = eventSource
+    logger.info('Global event stream opened')
+
+    eventSource.onopen = () => {
+      this.reconnectDelay = RECONNECT_DELAY
+    }
+    eventSource.onmessage = (message: MessageEvent) => {
+      try {
+        const event = JSON.parse(message.data)
+        this.lastEventId = event.seq || this.lastEventId
+        this.handleEvents(dispatch, [event])
+      } catch (error) {
+        logger.error('Error handling global event:', error)
+      }
+    }
+    eventSource.onerror = () => {
+      // Reconnect ourselves rather than leave the browser retrying a possibly stale URL
+      if (this.eventSource !== eventSource) {
+        return
+      }
+      eventSource.close()
+      this.eventSource = null
+      logger.warn(`Global event stream failed, reconnecting in ${this.reconnectDelay}ms`)
+      this.reconnectTimer = setTimeout(() => {
+        this.reconnectTimer = null
+        this.open(dispatch)
+      }, this.reconnectDelay)
+      this.reconnectDelay = Math.min(this.reconnectDelay * 2, MAX_RECONNECT_DELAY)
     }
-    logger.info('Global event polling started')
-    // Execute immediately
-    this.fetchEvents(dispatch)
-
-    // Set polling timer
-    this.pollingTimer = setInterval(() => {
-      this.fetchEvents(dispatch)
-    }, NORMAL_POLLING_INTERVAL)
   }
 
-  // Stop polling
-  public stopPolling(): void {
-    if (this.pollingTimer) {
-      logger.info('Global event polling stopped')
-      clearInterval(this.pollingTimer)
-      this.pollingTimer = null
+  // Close the event stream
+  public stopListening(): void {
+    this.generation++
+    this.reconnectDelay = RECONNECT_DELAY
+    if (this.reconnectTimer) {
+      clearTimeout(this.reconnectTimer)
+      this.reconnectTimer = null
+    }
+    if (this.eventSource) {
+      logger.info('Global event stream closed')
+      this.eventSource.close()
+      this.eventSource = null
     }
   }
 
-  // Fetch and process events
+  // Fetch the events published since the last one received
   public async fetchEvents(dispatch): Promise<void> {
     try {
-      const res = await axiosInstance.get('/api/events/fetch')
+      const res = await axiosInstance.get('/api/events/fetch', { params: { after_id: this.lastEventId } })
       if (res.status === 200 && res.data && res.data.data.events) {
-        // Store events in Redux
-        dispatch(addEvent(res.data.data.events))
-
-        // Convert each event to a notification and add it to the queue
-        this.processEventsToNotifications(res.data.data.events)
+        this.lastEventId = res.data.data.last_event_id
+        this.handleEvents(dispatch, res.data.data.events)
       }
     } catch (error) {
       logger.error('Error fetching global events:', error)
-    } finally {
-      logger.info('Global event polling completed')
     }
   }
 
+  private handleEvents(dispatch, events: any[]): void {
+    if (!events.length) {
+      return
+    }
+    // Store events in Redux
+    dispatch(addEvent(events))
+
+    // Convert each event to a notification and add it to the queue
+    this.processEventsToNotifications(events)
+  }
+
   // Convert events to notifications
   private processEventsToNotifications(events: any[]): void {
     if (!events || !Array.isArray(events)) {
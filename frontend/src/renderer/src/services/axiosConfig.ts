@@ -21,19 +21,21 @@ export const updateBaseURL = (port: number) => {
   axiosInstance.defaults.baseURL = newBaseURL
 }
 
-// Get the backend port and update the baseURL when the application starts
-if (typeof window !== 'undefined' && window.electron) {
-  window.electron.ipcRenderer
-    .invoke('backend:get-port')
-    .then((port: number) => {
-      if (port && port !== 1733) {
-        updateBaseURL(port)
-      }
-    })
-    .catch((error) => {
-      console.warn('Failed to get backend port, using default 1733:', error)
-    })
-}
+// Get the backend port and update the baseURL when the application starts; connections
+// opened outside axios (e.g. EventSource) wait for this before reading the baseURL
+export const baseURLReady: Promise<void> =
+  typeof window !== 'undefined' && window.electron
+    ? window.electron.ipcRenderer
+        .invoke('backend:get-port')
+        .then((port: number) => {
+          if (port && port !== 1733) {
+            updateBaseURL(port)
+          }
+        })
+        .catch((error) => {
+          console.warn('Failed to get backend port, using default 1733:', error)
+        })
+    : Promise.resolve()
 
 // Request interceptor
 axiosInstance.interceptors.request.use(
@@ -13,7 +13,7 @@ import abc
 import threading
 import time
 from datetime import datetime
-from typing import Any, Callable, Dict, List
+from typing import Any, Callable, Dict, List, Optional
 
 from opencontext.interfaces.capture_interface import ICaptureComponent
 from opencontext.models.context import RawContextProperties
@@ -48,6 +48,11 @@ class BaseCaptureComponent(ICaptureComponent):
         self._stop_event = threading.Event()
         self._callback = None
         self._capture_interval = 1.0  # Default capture interval is 1 second
+        # Processor load of this source; the interval is stretched up to the slowdown cap
+        # while the processor is behind, so bursts queue up instead of overflowing it
+        self._backpressure_probe: Optional[Callable[[ContextSource], float]] = None
+        self._max_backpressure_slowdown = 4.0
+        self._backpressure_slowdown = 1.0
         self._last_capture_time = None
         self._capture_count = 0
         self._error_count = 0
@@ -74,6 +79,10 @@ class BaseCaptureComponent(ICaptureComponent):
             # Set capture interval (if present in config)
             if "capture_interval" in config:
                 self._capture_interval = max(0.1, float(config["capture_interval"]))
+            if "max_backpressure_slowdown" in config:
+                self._max_backpressure_slowdown = max(
+                    1.0, float(config["max_backpressure_slowdown"])
+                )
 
             try:
                 # Subclasses can implement specific initialization logic in _initialize_impl
@@ -325,6 +334,7 @@ class BaseCaptureComponent(ICaptureComponent):
                     self._last_capture_time.isoformat() if self._last_capture_time else None
                 ),
                 "capture_interval": self._capture_interval,
+                "backpressure_slowdown": self._backpressure_slowdown,
                 "auto_capture": self._config.get("auto_capture", False),
             }
 
@@ -405,6 +415,34 @@ class BaseCaptureComponent(ICaptureComponent):
                 )
                 return False
 
+    def set_backpressure_probe(self, probe: Optional[Callable[[ContextSource], float]]):
+        """
+        Set the function reporting processing backpressure for a source (1.0 = at the
+        processor's high watermark)
+        """
+        with self._lock:
+            self._backpressure_probe = probe
+
+    def _next_capture_delay(self) -> float:
+        """Capture interval, stretched while the processor of this source is behind"""
+        slowdown = 1.0
+        if self._backpressure_probe is not None:
+            try:
+                pressure = self._backpressure_probe(self._source_type)
+                slowdown = min(self._max_backpressure_slowdown, max(1.0, pressure))
+            except Exception as e:
+                logger.debug(f"{self._name}: Backpressure probe failed: {e}")
+        if (slowdown > 1.0) != (self._backpressure_slowdown > 1.0):
+            if slowdown > 1.0:
+                logger.info(
+                    f"{self._name}: Processing is behind, capture interval stretched "
+                    f"x{slowdown:.1f}"
+                )
+            else:
+                logger.info(f"{self._name}: Processing caught up, capture interval restored")
+        self._backpressure_slowdown = slowdown
+        return self._capture_interval * slowdown
+
     def _capture_loop(self):
         """
         Capture loop that periodically executes capture operations
@@ -417,7 +455,7 @@ class BaseCaptureComponent(ICaptureComponent):
                 self.capture()
 
                 # Wait for next capture
-                self._stop_event.wait(self._capture_interval)
+                self._stop_event.wait(self._next_capture_delay())
             except Exception as e:
                 logger.exception(f"{self._name}: Exception occurred in capture loop: {str(e)}")
                 self._last_error = str(e)
@@ -9,12 +9,12 @@
 Screenshot capture component for periodic screen capturing
 """
 
+import itertools
 import os
 import platform
 import subprocess
 import threading
 from datetime import datetime
-from io import BytesIO
 from typing import Any, Dict, List, Optional
 
 from PIL import Image
@@ -22,6 +22,8 @@ from PIL import Image
 from opencontext.context_capture import BaseCaptureComponent
 from opencontext.models.context import RawContextProperties
 from opencontext.models.enums import ContentFormat, ContextSource
+from opencontext.utils.hash_index import HammingIndex
+from opencontext.utils.image import ImageFrame, dhash
 from opencontext.utils.logger import LogManager
 
 logger = LogManager.get_logger(__name__)
@@ -57,6 +59,11 @@ class ScreenshotCapture(BaseCaptureComponent):
         self._similarity_threshold = 95  # Image similarity threshold (0-100), default 95
         self._max_image_size = None  # Add maximum image size
         self._resize_quality = 95  # Add image scaling quality
+        self._last_frame: Optional[ImageFrame] = None
+        self._dedup_window = 30  # Recent frames per monitor checked for near duplicates
+        self._dedup_indexes: Dict[str, HammingIndex] = {}
+        self._duplicate_count = 0
+        self._frame_ids = itertools.count()
         self._lock = threading.RLock()
 
     def _initialize_impl(self, config: Dict[str, Any]) -> bool:
@@ -117,6 +124,8 @@ class ScreenshotCapture(BaseCaptureComponent):
 
             # Set similarity threshold
             self._similarity_threshold = config.get("similarity_threshold", 98)
+            self._dedup_window = int(config.get("dedup_window", 30))
+            self._dedup_indexes = {}
 
             # Set image scaling size and quality
             self._max_image_size = config.get("max_image_size", 2048)
@@ -169,6 +178,9 @@ class ScreenshotCapture(BaseCaptureComponent):
                         self._callback(pending_contexts)
 
             self._last_screenshots.clear()
+            # Let queued background writes of captured frames finish
+            if self._last_frame is not None:
+                self._last_frame.wait_persisted(timeout=5)
             logger.info("Screenshot capture component stopped")
             return True
         except Exception as e:
@@ -176,7 +188,7 @@ class ScreenshotCapture(BaseCaptureComponent):
             return False
 
     def _create_new_context(
-        self, screenshot_bytes: bytes, screenshot_format: str, timestamp: datetime, details: dict
+        self, frame: ImageFrame, screenshot_format: str, timestamp: datetime, details: dict
     ) -> RawContextProperties:
         """Create a RawContextProperties object for a new screenshot"""
         screenshot_path = None
@@ -185,10 +197,11 @@ class ScreenshotCapture(BaseCaptureComponent):
             timestamp_str = timestamp.strftime("%Y%m%d_%H%M%S_%f")
             filename = f"screenshot_{monitor_id}_{timestamp_str}.{self._screenshot_format}"
             filepath = os.path.join(self._screenshot_dir, filename)
-            with open(filepath, "wb") as f:
-                f.write(screenshot_bytes)
+            # The frame travels in memory; the file is written in the background
+            frame.persist_async(filepath)
             screenshot_path = os.path.abspath(filepath)
             self._last_screenshot_path = screenshot_path
+        self._last_frame = frame
 
         metadata = {
             "format": screenshot_format,
@@ -218,6 +231,7 @@ class ScreenshotCapture(BaseCaptureComponent):
             content_path=screenshot_path,
             additional_info=metadata,
             create_time=timestamp,
+            frame=frame,
         )
 
     def _capture_impl(self) -> List[RawContextProperties]:
@@ -235,10 +249,8 @@ class ScreenshotCapture(BaseCaptureComponent):
             captured_contexts = []
             now = datetime.now()
 
-            for screenshot_bytes, screenshot_format, details in screenshots:
-                new_ctx = self._create_new_context(
-                    screenshot_bytes, screenshot_format, now, details
-                )
+            for frame, screenshot_format, details in screenshots:
+                new_ctx = self._create_new_context(frame, screenshot_format, now, details)
                 captured_contexts.append(new_ctx)
                 self._screenshot_count += 1
 
@@ -254,14 +266,13 @@ class ScreenshotCapture(BaseCaptureComponent):
         Capture screen screenshots using configured library
 
         Returns:
-            list: (screenshot binary data, format, details_dict)
+            list: (ImageFrame, format, details_dict)
         """
         try:
             screenshots = []
 
             if self._screenshot_lib == "mss":
                 import mss
-                from PIL import Image
 
                 with mss.mss() as sct:
                     monitors_to_capture = []
@@ -279,24 +290,17 @@ class ScreenshotCapture(BaseCaptureComponent):
                         monitors_to_capture.extend(sct.monitors[1:])
 
                     for i, monitor in enumerate(monitors_to_capture):
-                        sct_img = sct.grab(monitor)
-                        img = Image.frombytes("RGB", sct_img.size, sct_img.bgra, "raw", "BGRX")
-
-                        # Convert to binary data
-                        buffer = BytesIO()
-                        if self._screenshot_format in ["jpg", "jpeg"]:
-                            img.save(buffer, format="JPEG", quality=self._screenshot_quality)
-                            format_name = "jpeg"
-                        else:
-                            img.save(buffer, format="PNG")
-                            format_name = "png"
+                        monitor_id = f"monitor_{i+1}"
+                        frame = self._grab_frame(sct, monitor, monitor_id)
+                        if frame is None:
+                            continue
 
                         details = {
-                            "monitor": f"monitor_{i+1}",
+                            "monitor": monitor_id,
                             "coordinates": monitor,
                             "capture_type": "full_display",
                         }
-                        screenshots.append((buffer.getvalue(), format_name, details))
+                        screenshots.append((frame, frame.format, details))
 
                     # Try capturing the active window (macOS only for now)
                     active_capture = self._capture_active_window(sct)
@@ -312,16 +316,51 @@ class ScreenshotCapture(BaseCaptureComponent):
             logger.exception(f"Screenshot failed: {str(e)}")
             return []
 
+    def _grab_frame(self, sct, region: dict, monitor_id: str) -> Optional[ImageFrame]:
+        """
+        Grab a region and downscale it once, before anything encodes it.
+        Returns None for a near duplicate of a recent frame of the same monitor.
+        """
+        sct_img = sct.grab(region)
+        img = Image.frombytes("RGB", sct_img.size, sct_img.bgra, "raw", "BGRX")
+        frame_hash = None
+        if self._dedup_enabled:
+            frame_hash = dhash(img)
+            if self._is_duplicate_frame(monitor_id, frame_hash):
+                return None
+        quality = self._screenshot_quality
+        if self._max_image_size and (
+            img.width > self._max_image_size or img.height > self._max_image_size
+        ):
+            quality = self._resize_quality
+        return ImageFrame.from_image(
+            img, self._max_image_size, self._screenshot_format, quality, frame_hash
+        )
+
+    def _is_duplicate_frame(self, monitor_id: str, frame_hash: int) -> bool:
+        """Check a frame hash against the recent frames of its monitor, remembering new ones"""
+        with self._lock:
+            index = self._dedup_indexes.get(monitor_id)
+            if index is None:
+                # similarity_threshold is a percentage of matching hash bits
+                max_distance = int(round((100 - float(self._similarity_threshold)) * 64 / 100))
+                index = HammingIndex(max_distance, window=self._dedup_window)
+                self._dedup_indexes[monitor_id] = index
+            if index.find_or_add(next(self._frame_ids), frame_hash) is None:
+                return False
+            self._duplicate_count += 1
+            return True
+
     def _capture_active_window(self, sct) -> Optional[tuple]:
         """
         Capture the active window on macOS. Returns tuple like other screenshots:
-        (screenshot_bytes, format, details_dict)
+        (ImageFrame, format, details_dict)
         """
         if platform.system().lower() != "darwin":
             return None
 
         try:
-            script = r'''
+            script = r"""
                 tell application "System Events"
                     set frontApp to first application process whose frontmost is true
                     set appName to name of frontApp
@@ -334,7 +373,7 @@ class ScreenshotCapture(BaseCaptureComponent):
                     set winSize to size of win
                     return appName & "||" & winName & "||" & (item 1 of winPos as text) & "," & (item 2 of winPos as text) & "," & (item 1 of winSize as text) & "," & (item 2 of winSize as text)
                 end tell
-            '''
+            """
             raw_output = subprocess.check_output(["osascript", "-e", script], text=True).strip()
             if not raw_output:
                 return None
@@ -344,19 +383,12 @@ class ScreenshotCapture(BaseCaptureComponent):
                 return None
 
             region = {"left": left, "top": top, "width": width, "height": height}
-            sct_img = sct.grab(region)
-            img = Image.frombytes("RGB", sct_img.size, sct_img.bgra, "raw", "BGRX")
-            buffer = BytesIO()
-            if self._screenshot_format in ["jpg", "jpeg"]:
-                img.save(buffer, format="JPEG", quality=self._screenshot_quality)
-                format_name = "jpeg"
-            else:
-                img.save(buffer, format="PNG")
-                format_name = "png"
-            screenshot_bytes = buffer.getvalue()
+            frame = self._grab_frame(sct, region, "active_window")
+            if frame is None:
+                return None
             return (
-                screenshot_bytes,
-                format_name,
+                frame,
+                frame.format,
                 {
                     "monitor": "active_window",
                     "capture_type": "active_window",
@@ -411,7 +443,7 @@ class ScreenshotCapture(BaseCaptureComponent):
                 "storage_path": {"type": "string", "description": "Screenshot save directory"},
                 "dedup_enabled": {
                     "type": "boolean",
-                    "description": "Whether to enable screenshot deduplication (skip screenshots identical to the previous one)",
+                    "description": "Whether to enable screenshot deduplication (skip screenshots similar to a recent one of the same monitor)",
                     "default": True,
                 },
                 "similarity_threshold": {
@@ -421,6 +453,12 @@ class ScreenshotCapture(BaseCaptureComponent):
                     "minimum": 0,
                     "maximum": 100,
                 },
+                "dedup_window": {
+                    "type": "integer",
+                    "description": "Number of recent frames per monitor checked for near duplicates",
+                    "default": 30,
+                    "minimum": 1,
+                },
             }
         }
 
@@ -540,6 +578,8 @@ class ScreenshotCapture(BaseCaptureComponent):
             "screenshot_dir": self._screenshot_dir,
             "dedup_enabled": self._dedup_enabled,
             "similarity_threshold": self._similarity_threshold,
+            "dedup_window": self._dedup_window,
+            "duplicate_count": self._duplicate_count,
             "last_screenshot_time": (
                 self._last_screenshot_time.isoformat() if self._last_screenshot_time else None
             ),
@@ -574,6 +614,7 @@ class ScreenshotCapture(BaseCaptureComponent):
         Reset statistics implementation
         """
         self._screenshot_count = 0
+        self._duplicate_count = 0
         self._active_screenshots = {}
         self._last_screenshot_time = None
         self._last_screenshot_path = None
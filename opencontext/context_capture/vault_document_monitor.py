@@ -9,7 +9,6 @@ Vault document monitoring component that monitors changes in the vaults table an
 """
 
 import threading
-import time
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Set
@@ -26,23 +25,31 @@ logger = get_logger(__name__)
 class VaultDocumentMonitor(BaseCaptureComponent):
     """
     Vault document monitoring component that monitors changes in the vaults table and generates context capture events
+
+    Follows the storage's vault change feed from the last sequence number it delivered (kept
+    in the database across restarts) and is notified by the storage on every vault write.
     """
 
+    _CURSOR_NAME = "vault_document_monitor"
+
     def __init__(self):
         """Initialize Vault document monitoring component"""
         super().__init__(
             name="VaultDocumentMonitor",
             description="Monitor document changes in vaults table",
-            source_type=ContextSource.TEXT,
+            source_type=ContextSource.VAULT,
         )
         self._storage = None
-        self._monitor_interval = 5  # Monitor interval (seconds)
+        self._monitor_interval = 5  # Fallback poll interval (seconds)
+        self._batch_size = 500  # Vault changes read per batch
         self._last_scan_time = None
-        self._processed_vault_ids: Set[int] = set()
+        self._last_seq = 0  # Last vault change sequence number delivered
         self._document_events = []
         self._event_lock = threading.RLock()
         self._monitor_thread = None
         self._stop_event = threading.Event()
+        self._changed = threading.Event()
+        self._listening = False
 
         # Statistics
         self._total_processed = 0
@@ -61,6 +68,7 @@ class VaultDocumentMonitor(BaseCaptureComponent):
         try:
             self._storage = get_storage()
             self._monitor_interval = config.get("monitor_interval", 5)
+            self._batch_size = config.get("batch_size", 500)
 
             # Set initial scan time to current time
             self._last_scan_time = datetime.now()
@@ -81,9 +89,21 @@ class VaultDocumentMonitor(BaseCaptureComponent):
             bool: Whether startup was successful
         """
         try:
-            # If initial scan is configured, scan existing documents first
-            if self._config.get("initial_scan", True):
-                self._scan_existing_documents()
+            # Resume after the last delivered change; on the first start, begin at the
+            # current end of the feed and (if configured) scan the existing documents once
+            cursor = self._storage.get_vault_change_cursor(self._CURSOR_NAME)
+            if cursor is None:
+                self._last_seq = self._storage.get_vault_change_seq()
+                if self._config.get("initial_scan", True):
+                    self._scan_existing_documents()
+                self._storage.set_vault_change_cursor(self._CURSOR_NAME, self._last_seq)
+            else:
+                self._last_seq = cursor
+            self._stop_event.clear()
+            self._changed.clear()
+            if not self._listening:
+                self._storage.add_vault_change_listener(self._on_vault_change)
+                self._listening = True
 
             # Start monitoring thread
             self._monitor_thread = threading.Thread(
@@ -106,6 +126,7 @@ class VaultDocumentMonitor(BaseCaptureComponent):
         """
         try:
             self._stop_event.set()
+            self._changed.set()
 
             if self._monitor_thread and self._monitor_thread.is_alive():
                 self._monitor_thread.join(timeout=10 if graceful else 1)
@@ -142,24 +163,34 @@ class VaultDocumentMonitor(BaseCaptureComponent):
             logger.exception(f"Document capture failed: {str(e)}")
             return []
 
+    def _on_vault_change(self):
+        """Storage notification: vaults changed, wake the monitor thread"""
+        self._changed.set()
+
     def _monitor_loop(self):
-        """Monitor loop that periodically checks changes in the vaults table"""
+        """Monitor loop that follows the vault change feed"""
+        # Blocks until start() has finished, so captured events can be delivered
+        if not self.is_running():
+            return
         while not self._stop_event.is_set():
             try:
-                self._scan_vault_changes()
-                time.sleep(self._monitor_interval)
+                self._consume_vault_changes()
             except Exception as e:
                 logger.exception(f"Monitor loop error: {e}")
-                time.sleep(self._monitor_interval)
+            # Woken by the storage on every vault write; the interval is only a fallback
+            # for writes the storage was not told about (e.g. another process)
+            self._changed.wait(self._monitor_interval)
+            self._changed.clear()
 
     def _scan_existing_documents(self):
         """Scan existing documents (initial scan)"""
         try:
             logger.info("Starting initial scan of existing vault documents")
-            documents = self._storage.get_vaults(limit=1000, offset=0, is_deleted=False)
-
-            for doc in documents:
-                if doc["id"] not in self._processed_vault_ids:
+            count = 0
+            offset = 0
+            while True:
+                documents = self._storage.get_vaults(limit=500, offset=offset, is_deleted=False)
+                for doc in documents:
                     event = {
                         "event_type": "existing",
                         "vault_id": doc["id"],
@@ -169,84 +200,74 @@ class VaultDocumentMonitor(BaseCaptureComponent):
 
                     with self._event_lock:
                         self._document_events.append(event)
+                count += len(documents)
+                if len(documents) < 500:
+                    break
+                offset += 500
 
-                    self._processed_vault_ids.add(doc["id"])
-
-            logger.info(f"Initial scan completed, found {len(documents)} documents")
+            logger.info(f"Initial scan completed, found {count} documents")
         except Exception as e:
             logger.exception(f"Initial scan failed: {e}")
 
-    def _scan_vault_changes(self):
-        """Scan changes in the vaults table"""
-        try:
-            # Get recent documents (based on created_at and updated_at)
-            current_time = datetime.now()
-            documents = self._storage.get_vaults(limit=100, offset=0, is_deleted=False)
-
-            new_documents = []
-            updated_documents = []
-
-            for doc in documents:
-                vault_id = doc["id"]
-                created_at = datetime.fromisoformat(doc["created_at"].replace("Z", "+00:00"))
-                updated_at = (
-                    datetime.fromisoformat(doc["updated_at"].replace("Z", "+00:00"))
-                    if doc.get("updated_at")
-                    else created_at
-                )
-
-                # Check if it's a new document
-                if vault_id not in self._processed_vault_ids:
-                    if created_at > self._last_scan_time:
-                        new_documents.append(doc)
-                    self._processed_vault_ids.add(vault_id)
-                # Check if it's an updated document
-                elif updated_at > self._last_scan_time:
-                    updated_documents.append(doc)
-
-            # Process new documents
-            for doc in new_documents:
-                event = {
-                    "event_type": "created",
-                    "vault_id": doc["id"],
-                    "document_data": doc,
-                    "timestamp": current_time,
-                }
-
-                with self._event_lock:
-                    self._document_events.append(event)
-
-                logger.debug(
-                    f"Detected new document: vault_id={doc['id']}, title={doc.get('title', '')}"
-                )
-
-            # Process updated documents
-            for doc in updated_documents:
-                event = {
-                    "event_type": "updated",
-                    "vault_id": doc["id"],
-                    "document_data": doc,
-                    "timestamp": current_time,
-                }
+    def _consume_vault_changes(self):
+        """Turn vault changes after the stored cursor into events and deliver them"""
+        while not self._stop_event.is_set():
+            changes = self._storage.get_vault_changes(self._last_seq, limit=self._batch_size)
+            if not changes:
+                break
+
+            # Several changes of a document in one batch become one event with its latest state
+            latest: Dict[int, Dict[str, Any]] = {}
+            created: Set[int] = set()
+            for change in changes:
+                latest.pop(change["vault_id"], None)
+                latest[change["vault_id"]] = change
+                if change["change_type"] == "created":
+                    created.add(change["vault_id"])
 
+            current_time = datetime.now()
+            new_count = updated_count = 0
+            for vault_id, change in latest.items():
+                if change["created_at"] is None or change["is_deleted"]:
+                    continue  # Deleted since (or purged): nothing to capture
+                event_type = "created" if vault_id in created else "updated"
+                doc = dict(change, id=vault_id)
+                for key in ("seq", "change_type", "vault_id"):
+                    doc.pop(key)
                 with self._event_lock:
-                    self._document_events.append(event)
-
+                    self._document_events.append(
+                        {
+                            "event_type": event_type,
+                            "vault_id": vault_id,
+                            "document_data": doc,
+                            "timestamp": current_time,
+                        }
+                    )
+                if event_type == "created":
+                    new_count += 1
+                else:
+                    updated_count += 1
                 logger.debug(
-                    f"Detected document update: vault_id={doc['id']}, title={doc.get('title', '')}"
+                    f"Detected document {event_type}: vault_id={vault_id}, title={doc.get('title', '')}"
                 )
 
-            # Update scan time
+            # Deliver before advancing the cursor: a crash in between replays the changes
+            self.capture()
+            self._last_seq = changes[-1]["seq"]
+            self._storage.set_vault_change_cursor(self._CURSOR_NAME, self._last_seq)
             self._last_scan_time = current_time
             self._last_activity_time = current_time
 
-            if new_documents or updated_documents:
+            if new_count or updated_count:
                 logger.info(
-                    f"Scan completed: {len(new_documents)} new documents, {len(updated_documents)} updated documents"
+                    f"Vault changes up to #{self._last_seq}: {new_count} new documents, {updated_count} updated documents"
                 )
+            if len(changes) < self._batch_size:
+                break
 
-        except Exception as e:
-            logger.exception(f"Failed to scan vault changes: {e}")
+        # Events of the initial scan that no change batch delivered yet
+        if self._document_events:
+            self.capture()
 
     def _create_context_from_event(self, event: Dict[str, Any]) -> Optional[RawContextProperties]:
         """
@@ -318,15 +339,21 @@ class VaultDocumentMonitor(BaseCaptureComponent):
             "properties": {
                 "monitor_interval": {
                     "type": "integer",
-                    "description": "Monitor interval (seconds)",
+                    "description": "Fallback poll interval (seconds); writes through the storage are picked up at once",
                     "minimum": 1,
                     "default": 5,
                 },
                 "initial_scan": {
                     "type": "boolean",
-                    "description": "Whether to perform initial scan",
+                    "description": "Whether to scan existing documents on the first start",
                     "default": True,
                 },
+                "batch_size": {
+                    "type": "integer",
+                    "description": "Vault changes read per batch",
+                    "minimum": 1,
+                    "default": 500,
+                },
             }
         }
 
@@ -360,7 +387,7 @@ class VaultDocumentMonitor(BaseCaptureComponent):
         """
         return {
             "monitor_interval": self._monitor_interval,
-            "processed_vault_count": len(self._processed_vault_ids),
+            "last_change_seq": self._last_seq,
             "pending_events": len(self._document_events),
             "last_scan_time": self._last_scan_time.isoformat() if self._last_scan_time else None,
             "is_monitoring": not self._stop_event.is_set(),
@@ -9,12 +9,14 @@ Completion Cache Manager
 Provides high-performance caching and optimization for completion results
 """
 
+import copy
 import hashlib
 import threading
+from collections import OrderedDict
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from opencontext.utils.logging_utils import get_logger
 
@@ -40,12 +42,19 @@ class CacheEntry:
     access_count: int
     confidence_score: float
     context_hash: str
+    prefix_key: Optional[Tuple[Any, str]] = None  # Entry of the prefix index, if any
 
 
 class CompletionCache:
     """
     Intelligent Completion Cache Manager
     Supports multiple caching strategies and performance optimizations
+
+    Entries are kept in two ordered dicts, one in recency order for LRU and one in insertion
+    order for TTL, so lookups, evictions and expiry are O(1). Entries stored with the text
+    before the cursor are also indexed by its tail: when the user has since typed a few more
+    characters and a cached suggestion starts with them, the suggestion is served again with
+    those characters consumed.
     """
 
     def __init__(
@@ -53,19 +62,25 @@ class CompletionCache:
         max_size: int = 1000,
         ttl_seconds: int = 300,
         strategy: CacheStrategy = CacheStrategy.HYBRID,
+        prefix_window: int = 100,
+        max_lookahead: int = 64,
     ):
         self.max_size = max_size
         self.ttl = timedelta(seconds=ttl_seconds)
         self.strategy = strategy
+        self.prefix_window = prefix_window  # Characters of context identifying a position
+        self.max_lookahead = max_lookahead  # Characters typed past a cached position
 
-        # Cache storage
-        self._cache: Dict[str, CacheEntry] = {}
-        self._access_order: List[str] = []  # LRU order
+        # Cache storage, least recently used first
+        self._cache: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._created: "OrderedDict[str, datetime]" = OrderedDict()  # Oldest first, for TTL
+        self._prefix_index: Dict[Tuple[Any, str], str] = {}  # (scope, context tail) -> key
         self._lock = threading.RLock()
 
         # Statistics
         self._stats = {
             "hits": 0,
+            "prefix_hits": 0,
             "misses": 0,
             "evictions": 0,
             "total_requests": 0,
@@ -80,30 +95,39 @@ class CompletionCache:
             f"CompletionCache initialized: max_size={max_size}, ttl={ttl_seconds}s, strategy={strategy.value}"
         )
 
-    def get(self, key: str, context_hash: str = None) -> Optional[List[Any]]:
-        """Get cached completion suggestions"""
+    def get(
+        self,
+        key: str,
+        context_hash: str = None,
+        prefix: Optional[str] = None,
+        scope: Any = None,
+    ) -> Optional[List[Any]]:
+        """
+        Get cached completion suggestions
+
+        Without an entry for ``key``, and given the text before the cursor as ``prefix``,
+        falls back to an entry stored a few keystrokes earlier in the same ``scope``
+        (e.g. document) whose suggestions start with what has been typed since.
+        """
         import time
 
         start_time = time.time()
 
         with self._lock:
             self._stats["total_requests"] += 1
+            self._expire_entries()
 
-            # Check if key exists
-            if key not in self._cache:
-                self._stats["misses"] += 1
-                return None
+            entry = self._cache.get(key)
 
-            entry = self._cache[key]
+            # Check if context matches
+            if entry and context_hash and entry.context_hash != context_hash:
+                entry = None
 
-            # Check TTL expiration
-            if self._is_expired(entry):
-                self._evict(key)
-                self._stats["misses"] += 1
-                return None
+            suggestions = entry.suggestions if entry else None
+            if entry is None and prefix:
+                entry, suggestions = self._get_by_prefix(prefix, scope)
 
-            # Check if context matches
-            if context_hash and entry.context_hash != context_hash:
+            if entry is None:
                 self._stats["misses"] += 1
                 return None
 
@@ -112,22 +136,42 @@ class CompletionCache:
             entry.access_count += 1
 
             # Update LRU order
-            if key in self._access_order:
-                self._access_order.remove(key)
-            self._access_order.append(key)
+            self._cache.move_to_end(entry.key)
 
             # Mark as hot key
             if entry.access_count > 5:
-                self._hot_keys.add(key)
+                self._hot_keys.add(entry.key)
 
-            self._stats["hits"] += 1
+            self._stats["hits" if entry.key == key else "prefix_hits"] += 1
 
             # Update average response time
             response_time = time.time() - start_time
             self._update_average_response_time(response_time)
 
             logger.debug(f"Cache hit: {key[:20]}...")
-            return entry.suggestions
+            return suggestions
+
+    def _get_by_prefix(
+        self, prefix: str, scope: Any
+    ) -> Tuple[Optional[CacheEntry], Optional[List[Any]]]:
+        """The nearest earlier position with suggestions that the typed text continues into"""
+        for typed_length in range(1, min(self.max_lookahead, len(prefix)) + 1):
+            earlier = prefix[:-typed_length]
+            key = self._prefix_index.get((scope, earlier[-self.prefix_window :]))
+            if key is None:
+                continue
+            entry = self._cache[key]
+            typed = prefix[-typed_length:]
+            suggestions = []
+            for suggestion in entry.suggestions:
+                text = getattr(suggestion, "text", "")
+                if len(text) > typed_length and text.startswith(typed):
+                    remaining = copy.copy(suggestion)
+                    remaining.text = text[typed_length:]
+                    suggestions.append(remaining)
+            if suggestions:
+                return entry, suggestions
+        return None, None
 
     def put(
         self,
@@ -135,10 +179,20 @@ class CompletionCache:
         suggestions: List[Any],
         context_hash: str = None,
         confidence_score: float = 0.0,
+        prefix: Optional[str] = None,
+        scope: Any = None,
     ):
-        """Add completion suggestions to the cache"""
+        """
+        Add completion suggestions to the cache
+
+        ``prefix`` is the text before the cursor the suggestions were made for; with it the
+        entry can also be found from later keystrokes in the same ``scope``.
+        """
         with self._lock:
             now = datetime.now()
+            self._expire_entries()
+            if key in self._cache:
+                self._evict(key, count=False)
 
             # If cache is full, execute eviction policy
             if len(self._cache) >= self.max_size:
@@ -154,10 +208,13 @@ class CompletionCache:
                 confidence_score=confidence_score,
                 context_hash=context_hash or "",
             )
+            if prefix:
+                entry.prefix_key = (scope, prefix[-self.prefix_window :])
+                self._prefix_index[entry.prefix_key] = key
 
             # Add to cache
             self._cache[key] = entry
-            self._access_order.append(key)
+            self._created[key] = now
 
             logger.debug(f"Cache add: {key[:20]}... ({len(suggestions)} suggestions)")
 
@@ -167,7 +224,8 @@ class CompletionCache:
             if pattern is None:
                 # Clear all cache
                 self._cache.clear()
-                self._access_order.clear()
+                self._created.clear()
+                self._prefix_index.clear()
                 self._hot_keys.clear()
                 logger.info("All cache cleared")
             else:
@@ -185,50 +243,48 @@ class CompletionCache:
             return datetime.now() - entry.created_at > self.ttl
         return False
 
+    def _expire_entries(self):
+        """Drop expired entries, oldest first, stopping at the first live one"""
+        if self.strategy not in [CacheStrategy.TTL, CacheStrategy.HYBRID]:
+            return
+        now = datetime.now()
+        while self._created:
+            key, created_at = next(iter(self._created.items()))
+            if now - created_at <= self.ttl:
+                break
+            self._evict(key)
+
     def _evict_entries(self):
         """Evict cache entries"""
         if self.strategy == CacheStrategy.LRU or self.strategy == CacheStrategy.HYBRID:
-            # LRU eviction
-            while len(self._cache) >= self.max_size and self._access_order:
-                oldest_key = self._access_order[0]
-
-                # Protect hot keys
-                if oldest_key in self._hot_keys and len(self._cache) < self.max_size * 1.2:
-                    # If it's a hot key and there's still space, skip it
-                    self._access_order.remove(oldest_key)
-                    self._access_order.append(oldest_key)  # Move to the end
+            # LRU eviction; a hot key gets a second chance and is moved to the end once
+            while len(self._cache) >= self.max_size:
+                oldest_key = next(iter(self._cache))
+                if oldest_key in self._hot_keys:
+                    self._hot_keys.discard(oldest_key)
+                    self._cache.move_to_end(oldest_key)
                     continue
 
                 self._evict(oldest_key)
 
         elif self.strategy == CacheStrategy.TTL:
-            # TTL eviction
-            now = datetime.now()
-            expired_keys = [
-                key for key, entry in self._cache.items() if now - entry.created_at > self.ttl
-            ]
+            # Expired entries are already gone; if still full, evict by confidence score
+            sorted_entries = sorted(self._cache.items(), key=lambda x: x[1].confidence_score)
 
-            for key in expired_keys:
+            for key, _ in sorted_entries[: len(self._cache) - self.max_size + 10]:
                 self._evict(key)
 
-            # If still full after TTL eviction, evict by confidence score
-            if len(self._cache) >= self.max_size:
-                sorted_entries = sorted(self._cache.items(), key=lambda x: x[1].confidence_score)
-
-                for key, _ in sorted_entries[: len(self._cache) - self.max_size + 10]:
-                    self._evict(key)
-
-    def _evict(self, key: str):
+    def _evict(self, key: str, count: bool = True):
         """Evict a single cache entry"""
-        if key in self._cache:
-            del self._cache[key]
+        entry = self._cache.pop(key, None)
+        if entry is None:
+            return
+        if count:
             self._stats["evictions"] += 1
-
-        if key in self._access_order:
-            self._access_order.remove(key)
-
-        if key in self._hot_keys:
-            self._hot_keys.remove(key)
+        self._created.pop(key, None)
+        self._hot_keys.discard(key)
+        if entry.prefix_key and self._prefix_index.get(entry.prefix_key) == key:
+            del self._prefix_index[entry.prefix_key]
 
     def _update_average_response_time(self, response_time: float):
         """Update the average response time"""
@@ -295,10 +351,7 @@ class CompletionCache:
                 if entry.access_count > 3 or key in self._hot_keys
             }
 
-            # 3. Compact access order list
-            self._access_order = [key for key in self._access_order if key in self._cache]
-
-            # 4. Clean up old precomputed contexts
+            # 3. Clean up old precomputed contexts
             old_contexts = [
                 doc_id
                 for doc_id, ctx in self._precomputed_contexts.items()
@@ -316,13 +369,16 @@ class CompletionCache:
         """Get cache statistics"""
         with self._lock:
             total_requests = self._stats["total_requests"]
-            hit_rate = (self._stats["hits"] / total_requests * 100) if total_requests > 0 else 0
+            hits = self._stats["hits"] + self._stats["prefix_hits"]
+            hit_rate = (hits / total_requests * 100) if total_requests > 0 else 0
 
             return {
                 "cache_size": len(self._cache),
                 "max_size": self.max_size,
                 "hit_rate": round(hit_rate, 2),
                 "hits": self._stats["hits"],
+                "prefix_hits": self._stats["prefix_hits"],
+                "prefix_index_size": len(self._prefix_index),
                 "misses": self._stats["misses"],
                 "evictions": self._stats["evictions"],
                 "total_requests": total_requests,
@@ -9,15 +9,22 @@ Intelligent Completion Service
 An intelligent completion system based on vector retrieval and LLM generation
 """
 
+import asyncio
 import hashlib
 import re
+import threading
+import time
+from collections import deque
 from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple, Union
 
-from opencontext.config.global_config import get_prompt_manager
+from opencontext.config.global_config import get_config, get_prompt_manager
 from opencontext.context_consumption.completion.completion_cache import get_completion_cache
-from opencontext.llm.global_vlm_client import generate_with_messages
+from opencontext.context_consumption.completion.document_warm_state import DocumentWarmStates
+from opencontext.llm.global_vlm_client import generate_stream_for_agent, is_initialized
+from opencontext.llm.http_pool import run_sync
+from opencontext.llm.request_scheduler import RequestPriority, llm_priority
 from opencontext.models.enums import CompletionType
 from opencontext.storage.global_storage import get_storage
 from opencontext.tools.retrieval_tools.semantic_context_tool import SemanticContextTool
@@ -25,6 +32,15 @@ from opencontext.utils.logging_utils import get_logger
 
 logger = get_logger(__name__)
 
+# Seconds a strategy may run before its suggestions are dropped from the response
+DEFAULT_DEADLINES = {
+    CompletionType.SEMANTIC_CONTINUATION.value: 1.5,
+    CompletionType.REFERENCE_SUGGESTION.value: 0.8,
+}
+# Source of the continuation text streamed by iter_completions(stream_tokens=True)
+CONTINUATION_TOKEN = "continuation_token"
+_LATENCY_SAMPLES = 256
+
 
 class CompletionSuggestion:
     """Completion suggestion data structure"""
@@ -63,12 +79,29 @@ class CompletionService:
         self.cache = get_completion_cache()  # Use a dedicated cache manager
         self.prompt_manager = None  # Prompt manager
         self.semantic_search_tool = None  # SemanticContextTool instance
+        self.warm_states = None  # Per-document state for local reference ranking
 
         # Completion configuration
         self.max_context_length = 500  # Maximum context length
         self.max_suggestions = 3  # Maximum number of suggestions
         self.min_trigger_length = 3  # Minimum trigger length
         self.similarity_threshold = 0.7  # Similarity threshold
+        self.deadlines = {
+            **DEFAULT_DEADLINES,
+            **((get_config("completion") or {}).get("deadlines") or {}),
+        }
+
+        # Strategy tasks still running per document, cancelled by the next request for it
+        self._inflight: Dict[int, Tuple[asyncio.AbstractEventLoop, List[asyncio.Task]]] = {}
+        self._inflight_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            "requests": 0,
+            "cache_hits": 0,
+            "superseded": 0,
+            "timeouts": {strategy: 0 for strategy in DEFAULT_DEADLINES},
+        }
+        self._first_suggestion_ms = deque(maxlen=_LATENCY_SAMPLES)
 
         self._initialize()
 
@@ -82,6 +115,13 @@ class CompletionService:
 
             # Initialize SemanticContextTool
             self.semantic_search_tool = SemanticContextTool()
+            warm_config = (get_config("completion") or {}).get("warm_state") or {}
+            self.warm_states = DocumentWarmStates(
+                self.semantic_search_tool,
+                max_documents=warm_config.get("max_documents", 20),
+                candidates_per_paragraph=warm_config.get("candidates_per_paragraph", 5),
+                refresh_interval=warm_config.get("refresh_interval", 5),
+            )
 
             logger.info("CompletionService initialized successfully")
 
@@ -95,6 +135,18 @@ class CompletionService:
         cursor_position: int,
         document_id: Optional[int] = None,
         user_context: Dict[str, Any] = None,
+    ) -> List[CompletionSuggestion]:
+        """Blocking variant of get_completions_async for callers without an event loop"""
+        return run_sync(
+            self.get_completions_async(current_text, cursor_position, document_id, user_context)
+        )
+
+    async def get_completions_async(
+        self,
+        current_text: str,
+        cursor_position: int,
+        document_id: Optional[int] = None,
+        user_context: Dict[str, Any] = None,
     ) -> List[CompletionSuggestion]:
         """
         Get intelligent completion suggestions
@@ -108,53 +160,188 @@ class CompletionService:
         Returns:
             List[CompletionSuggestion]: List of completion suggestions
         """
+        suggestions = []
         try:
-            # Check if completion should be triggered
-            if not self._should_trigger_completion(current_text, cursor_position):
-                return []
-
-            # Extract context
-            context = self._extract_context(current_text, cursor_position)
-
-            # Generate cache key
-            cache_key = self._generate_cache_key(context, document_id)
-
-            # Check cache
-            cached_result = self.cache.get(cache_key)
-            if cached_result:
-                logger.debug("Returning completion suggestions from cache")
-                return cached_result
+            async for _, batch in self.iter_completions(
+                current_text, cursor_position, document_id, user_context
+            ):
+                suggestions.extend(batch)
+        except Exception as e:
+            logger.error(f"Failed to get completion suggestions: {e}")
+            return []
 
-            # Get different types of completion suggestions
-            suggestions = []
+        suggestions = self._rank_and_filter_suggestions(suggestions)
+        logger.info(f"Generated {len(suggestions)} completion suggestions")
+        return suggestions
 
-            # 1. Semantic continuation completion
-            semantic_suggestions = self._get_semantic_continuations(context)
-            suggestions.extend(semantic_suggestions)
+    async def iter_completions(
+        self,
+        current_text: str,
+        cursor_position: int,
+        document_id: Optional[int] = None,
+        user_context: Dict[str, Any] = None,
+        stream_tokens: bool = False,
+    ) -> AsyncIterator[Tuple[str, Union[List[CompletionSuggestion], str]]]:
+        """
+        Yield ``(source, suggestions)`` for each completion strategy as soon as it finishes
+
+        Template completions are computed locally and come first. Semantic continuations and
+        reference suggestions run concurrently, each within its deadline, and a newer request
+        for the same document cancels the ones still running for this one. Source is
+        "cache" for a cache hit, otherwise the strategy's CompletionType value. With
+        ``stream_tokens``, the continuation's text is also yielded as the model produces it,
+        as ``(CONTINUATION_TOKEN, text)``.
+        """
+        started = time.perf_counter()
 
-            # 2. Template completion
-            template_suggestions = self._get_template_completions(context)
-            suggestions.extend(template_suggestions)
+        # Any newer keystroke makes the previous request's results stale
+        self._cancel_inflight(document_id)
 
-            # 3. Reference suggestions
-            reference_suggestions = self._get_reference_suggestions(context)
-            suggestions.extend(reference_suggestions)
+        # Check if completion should be triggered
+        if not self._should_trigger_completion(current_text, cursor_position):
+            return
+        self._record("requests")
 
-            # Rank and filter
-            suggestions = self._rank_and_filter_suggestions(suggestions)
+        context = self._extract_context(current_text, cursor_position)
+        cache_key = self._generate_cache_key(context, document_id)
+        if document_id is not None and self.warm_states:
+            self.warm_states.refresh(document_id, current_text)
 
-            # Cache results
+        # Check cache
+        cached_result = self.cache.get(
+            cache_key, prefix=context["context_before"], scope=document_id
+        )
+        if cached_result:
+            logger.debug("Returning completion suggestions from cache")
+            self._record("cache_hits")
+            self._record_first_suggestion(started)
+            yield "cache", list(cached_result)
+            return
+
+        # Tokens and finished strategy tasks arrive on one queue, in the order they happen
+        events: asyncio.Queue = asyncio.Queue()
+        on_token = (lambda text: events.put_nowait(text)) if stream_tokens else None
+
+        # Start the remote strategies before handing out the local results
+        with llm_priority(RequestPriority.COMPLETION):
+            tasks = {
+                asyncio.create_task(self._run_with_deadline(strategy, coro)): strategy.value
+                for strategy, coro in (
+                    (
+                        CompletionType.SEMANTIC_CONTINUATION,
+                        self._get_semantic_continuations(context, on_token),
+                    ),
+                    (
+                        CompletionType.REFERENCE_SUGGESTION,
+                        self._get_reference_suggestions(context, document_id),
+                    ),
+                )
+            }
+        for task in tasks:
+            task.add_done_callback(events.put_nowait)
+        self._track_inflight(document_id, list(tasks))
+
+        suggestions = self._get_template_completions(context)
+        first_sent = False
+        complete = True
+        try:
             if suggestions:
-                confidence_score = sum(s.confidence for s in suggestions) / len(suggestions)
-                context_hash = hashlib.md5(str(context).encode()).hexdigest()
-                self.cache.put(cache_key, suggestions, context_hash, confidence_score)
-
-            logger.info(f"Generated {len(suggestions)} completion suggestions")
-            return suggestions
+                self._record_first_suggestion(started)
+                first_sent = True
+            yield CompletionType.TEMPLATE_COMPLETION.value, list(suggestions)
+
+            remaining = len(tasks)
+            while remaining:
+                event = await events.get()
+                if isinstance(event, str):
+                    if not first_sent:
+                        self._record_first_suggestion(started)
+                        first_sent = True
+                    yield CONTINUATION_TOKEN, event
+                    continue
+                remaining -= 1
+                batch = None if event.cancelled() else event.result()
+                if batch is None:
+                    complete = False
+                    continue
+                suggestions.extend(batch)
+                if batch and not first_sent:
+                    self._record_first_suggestion(started)
+                    first_sent = True
+                yield tasks[event], list(batch)
+        finally:
+            for task in tasks:
+                task.cancel()
+            self._untrack_inflight(document_id, tasks)
+
+        if any(task.cancelled() for task in tasks):
+            logger.debug(f"Completion request for document {document_id} was superseded")
+            self._record("superseded")
+
+        # Only a full result set is worth serving again
+        suggestions = self._rank_and_filter_suggestions(suggestions)
+        if complete and suggestions:
+            confidence_score = sum(s.confidence for s in suggestions) / len(suggestions)
+            context_hash = hashlib.md5(str(context).encode()).hexdigest()
+            self.cache.put(
+                cache_key,
+                suggestions,
+                context_hash,
+                confidence_score,
+                prefix=context["context_before"],
+                scope=document_id,
+            )
 
-        except Exception as e:
-            logger.error(f"Failed to get completion suggestions: {e}")
-            return []
+    async def _run_with_deadline(
+        self, strategy: CompletionType, coro
+    ) -> Optional[List[CompletionSuggestion]]:
+        """Run a strategy within its deadline; None when it ran out of time"""
+        deadline = self.deadlines.get(strategy.value)
+        try:
+            return await asyncio.wait_for(coro, deadline)
+        except asyncio.TimeoutError:
+            logger.debug(f"{strategy.value} missed its {deadline}s deadline")
+            with self._stats_lock:
+                self._stats["timeouts"][strategy.value] += 1
+            return None
+
+    def _cancel_inflight(self, document_id: Optional[int]):
+        """Cancel the strategies still running for an older request on the document"""
+        if document_id is None:
+            return
+        with self._inflight_lock:
+            previous = self._inflight.pop(document_id, None)
+        if not previous:
+            return
+        loop, tasks = previous
+        for task in tasks:
+            try:
+                loop.call_soon_threadsafe(task.cancel)
+            except RuntimeError:
+                pass  # That request's loop has already finished
+
+    def _track_inflight(self, document_id: Optional[int], tasks: List[asyncio.Task]):
+        if document_id is None:
+            return
+        self._cancel_inflight(document_id)
+        with self._inflight_lock:
+            self._inflight[document_id] = (asyncio.get_running_loop(), tasks)
+
+    def _untrack_inflight(self, document_id: Optional[int], tasks):
+        if document_id is None:
+            return
+        with self._inflight_lock:
+            current = self._inflight.get(document_id)
+            if current and set(current[1]) == set(tasks):
+                del self._inflight[document_id]
+
+    def _record(self, key: str):
+        with self._stats_lock:
+            self._stats[key] += 1
+
+    def _record_first_suggestion(self, started: float):
+        with self._stats_lock:
+            self._first_suggestion_ms.append((time.perf_counter() - started) * 1000)
 
     def _should_trigger_completion(self, text: str, cursor_pos: int) -> bool:
         """Determine if completion should be triggered"""
@@ -240,12 +427,14 @@ class CompletionService:
             "line_number": current_line_idx + 1,
         }
 
-    def _get_semantic_continuations(self, context: Dict[str, Any]) -> List[CompletionSuggestion]:
-        """Get semantic continuation suggestions"""
+    async def _get_semantic_continuations(
+        self, context: Dict[str, Any], on_token: Optional[Callable[[str], None]] = None
+    ) -> List[CompletionSuggestion]:
+        """Get semantic continuation suggestions, passing the text to on_token as it streams"""
         suggestions = []
 
         try:
-            if not self.chat_client:
+            if not is_initialized():
                 return suggestions
 
             # Get prompt group
@@ -268,10 +457,18 @@ class CompletionService:
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": prompt},
             ]
-            response = generate_with_messages(messages)
+            response = ""
+            async for chunk in generate_stream_for_agent(messages):
+                if not chunk.choices:
+                    continue
+                text = chunk.choices[0].delta.content
+                if text:
+                    response += text
+                    if on_token:
+                        on_token(text)
 
-            if response and response.choices:
-                content = response.choices[0].message.content.strip()
+            if response:
+                content = response.strip()
 
                 # Parse multiple suggestions (separated by newlines)
                 continuations = [c.strip() for c in content.split("\n") if c.strip()]
@@ -349,8 +546,15 @@ class CompletionService:
 
         return suggestions
 
-    def _get_reference_suggestions(self, context: Dict[str, Any]) -> List[CompletionSuggestion]:
-        """Get reference suggestions (based on vector search)"""
+    async def _get_reference_suggestions(
+        self, context: Dict[str, Any], document_id: Optional[int] = None
+    ) -> List[CompletionSuggestion]:
+        """
+        Get reference suggestions (based on vector search)
+
+        A document with a warm state has its prefetched contexts ranked in memory against
+        the paragraph at the cursor; otherwise the text before the cursor is searched.
+        """
         suggestions = []
 
         try:
@@ -362,8 +566,16 @@ class CompletionService:
             if len(search_text) < 10:
                 return suggestions
 
-            # Use SemanticContextTool for semantic search
-            search_results = self.semantic_search_tool.execute(query=search_text, top_k=5)
+            search_results = None
+            if self.warm_states:
+                search_results = self.warm_states.rank_references(
+                    document_id, context.get("current_paragraph", ""), top_k=5
+                )
+            if search_results is None:
+                # Use SemanticContextTool for semantic search
+                search_results = await self.semantic_search_tool.aexecute(
+                    query=search_text, top_k=5
+                )
 
             # Process search results
             for result in search_results:
@@ -470,9 +682,31 @@ class CompletionService:
         """Get cache statistics"""
         return self.cache.get_stats()
 
-    def precompute_document_context(self, document_id: int, content: str):
-        """Precompute document context"""
-        self.cache.precompute_context(document_id, content)
+    def get_pipeline_stats(self) -> Dict[str, Any]:
+        """Get request, deadline and cancellation counts of the completion pipeline"""
+        with self._stats_lock:
+            stats = {**self._stats, "timeouts": dict(self._stats["timeouts"])}
+            samples = sorted(self._first_suggestion_ms)
+        stats["time_to_first_suggestion_ms"] = {
+            "p50": samples[len(samples) // 2] if samples else None,
+            "p95": samples[int(len(samples) * 0.95) - 1] if len(samples) >= 20 else None,
+        }
+        with self._inflight_lock:
+            stats["inflight_documents"] = len(self._inflight)
+        stats["deadlines"] = dict(self.deadlines)
+        if self.warm_states:
+            stats["warm_states"] = self.warm_states.get_stats()
+        return stats
+
+    async def warm_document(self, document_id: int, content: str):
+        """Build or refresh the document's warm state, e.g. when it is opened or saved"""
+        if self.warm_states:
+            await self.warm_states.warm(document_id, content)
+
+    def drop_document(self, document_id: int):
+        """Forget the warm state of a closed or deleted document"""
+        if self.warm_states:
+            self.warm_states.drop(document_id)
 
     def optimize_cache(self):
         """Optimize cache performance"""
@@ -0,0 +1,272 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2025 Beijing Volcano Engine Technology Co., Ltd.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Per-document warm state for reference suggestions
+Keeps the embeddings of an open document's paragraphs and the related contexts prefetched
+for them, so reference suggestions are ranked in memory instead of embedding the text before
+the cursor and querying the vector store on every keystroke burst.
+"""
+
+import asyncio
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from opencontext.context_processing.merger.similarity import build_normalized_matrix
+from opencontext.llm.global_embedding_client import do_vectorize_batch_async
+from opencontext.models.context import Vectorize
+from opencontext.tools.base import run_in_tool_executor
+from opencontext.utils.logging_utils import get_logger
+
+logger = get_logger(__name__)
+
+# Paragraphs shorter than this carry too little meaning to search with
+MIN_PARAGRAPH_LENGTH = 20
+# Characters compared when matching the paragraph being typed to a stored one
+_MATCH_PREFIX = 80
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.split())
+
+
+def _paragraph_key(text: str) -> str:
+    return hashlib.sha1(_normalize(text).encode("utf-8")).hexdigest()
+
+
+@dataclass
+class Candidate:
+    """A related context prefetched for the document, formatted as a retrieval result"""
+
+    result: Dict[str, Any]
+    vector: List[float]
+
+
+class DocumentWarmState:
+    """Paragraph embeddings and prefetched related contexts of one document"""
+
+    def __init__(self, document_id: int):
+        self.document_id = document_id
+        self.paragraphs: Dict[str, Tuple[str, List[float]]] = {}  # key -> (text, vector)
+        self.paragraph_candidates: Dict[str, List[str]] = {}  # key -> candidate IDs
+        self.candidates: Dict[str, Candidate] = {}
+        self.updated_at = 0.0
+        self.refreshing = False
+        self.lock = asyncio.Lock()
+        self._candidate_ids: List[str] = []
+        self._matrix = None
+
+    def paragraph_vector(self, paragraph: str) -> Optional[List[float]]:
+        """Vector of the paragraph, or of the stored version it is an edit of"""
+        stored = self.paragraphs.get(_paragraph_key(paragraph))
+        if stored:
+            return stored[1]
+        # The paragraph being typed: a stored paragraph it extends, or one it was cut from
+        probe = _normalize(paragraph)[:_MATCH_PREFIX]
+        if len(probe) < MIN_PARAGRAPH_LENGTH:
+            return None
+        for text, vector in self.paragraphs.values():
+            if text.startswith(probe) or probe.startswith(text[:_MATCH_PREFIX]):
+                return vector
+        return None
+
+    def rank(self, vector: List[float], top_k: int) -> List[Dict[str, Any]]:
+        """Candidates most similar to the vector, as retrieval results with their scores"""
+        if self._matrix is None or not self._candidate_ids:
+            return []
+        query, valid = build_normalized_matrix([vector])
+        if not valid[0] or query.shape[1] != self._matrix.shape[1]:
+            return []
+        scores = self._matrix @ query[0]
+        results = []
+        for index in scores.argsort()[::-1][:top_k]:
+            result = dict(self.candidates[self._candidate_ids[index]].result)
+            result["similarity_score"] = float(scores[index])
+            results.append(result)
+        return results
+
+    def apply(
+        self,
+        paragraphs: Dict[str, str],
+        embedded: Dict[str, List[float]],
+        found: Dict[str, List[Tuple[str, Candidate]]],
+    ):
+        """Replace the paragraph set, keeping the unchanged paragraphs' state"""
+        self.paragraphs = {
+            key: (text, embedded[key] if key in embedded else self.paragraphs[key][1])
+            for key, text in paragraphs.items()
+        }
+        for key in list(self.paragraph_candidates):
+            if key not in paragraphs:
+                del self.paragraph_candidates[key]
+        for key, candidates in found.items():
+            self.paragraph_candidates[key] = [candidate_id for candidate_id, _ in candidates]
+            for candidate_id, candidate in candidates:
+                self.candidates[candidate_id] = candidate
+        referenced = {cid for ids in self.paragraph_candidates.values() for cid in ids}
+        self.candidates = {cid: c for cid, c in self.candidates.items() if cid in referenced}
+        self._candidate_ids = list(self.candidates)
+        self._matrix = (
+            build_normalized_matrix([self.candidates[cid].vector for cid in self._candidate_ids])[0]
+            if self._candidate_ids
+            else None
+        )
+        self.updated_at = time.monotonic()
+
+
+class DocumentWarmStates:
+    """
+    Warm states of the most recently opened documents
+
+    A state is built when a document is opened and refreshed when it is saved or edited;
+    each refresh embeds and searches with only the paragraphs that changed.
+    """
+
+    def __init__(
+        self,
+        search_tool,
+        max_documents: int = 20,
+        candidates_per_paragraph: int = 5,
+        refresh_interval: float = 5.0,
+    ):
+        self.search_tool = search_tool
+        self.max_documents = max_documents
+        self.candidates_per_paragraph = candidates_per_paragraph
+        self.refresh_interval = refresh_interval
+        self._states: "OrderedDict[int, DocumentWarmState]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._refresh_tasks = set()
+        self._stats = {
+            "warmups": 0,
+            "paragraphs_embedded": 0,
+            "paragraphs_reused": 0,
+            "local_rankings": 0,
+            "misses": 0,
+        }
+
+    async def warm(self, document_id: int, content: str) -> DocumentWarmState:
+        """Build or refresh a document's state from its full content"""
+        with self._lock:
+            state = self._states.get(document_id)
+            if state is None:
+                state = self._states[document_id] = DocumentWarmState(document_id)
+            self._states.move_to_end(document_id)
+            while len(self._states) > self.max_documents:
+                self._states.popitem(last=False)
+
+        async with state.lock:
+            paragraphs = {}
+            for paragraph in content.split("\n\n"):
+                text = _normalize(paragraph)
+                if len(text) >= MIN_PARAGRAPH_LENGTH:
+                    paragraphs.setdefault(_paragraph_key(text), text)
+            changed = [key for key in paragraphs if key not in state.paragraphs]
+
+            embedded, found = {}, {}
+            if changed:
+                vectorizes = [Vectorize(text=paragraphs[key]) for key in changed]
+                await do_vectorize_batch_async(vectorizes)
+                searches = [self._prefetch(v.vector) for v in vectorizes]
+                for key, vectorize, candidates in zip(
+                    changed, vectorizes, await asyncio.gather(*searches)
+                ):
+                    if vectorize.vector:
+                        embedded[key] = vectorize.vector
+                        found[key] = candidates
+            # A paragraph that failed to embed is left out and retried on the next refresh
+            paragraphs = {
+                key: text
+                for key, text in paragraphs.items()
+                if key in embedded or key in state.paragraphs
+            }
+            state.apply(paragraphs, embedded, found)
+
+        with self._lock:
+            self._stats["warmups"] += 1
+            self._stats["paragraphs_embedded"] += len(embedded)
+            self._stats["paragraphs_reused"] += len(paragraphs) - len(embedded)
+        logger.debug(
+            f"Warm state of document {document_id}: {len(paragraphs)} paragraphs "
+            f"({len(embedded)} embedded), {len(state.candidates)} candidates"
+        )
+        return state
+
+    async def _prefetch(self, vector: Optional[List[float]]) -> List[Tuple[str, Candidate]]:
+        """Related contexts of one paragraph, with their vectors"""
+        if not vector:
+            return []
+        results = await run_in_tool_executor(
+            self.search_tool.storage.search,
+            query=Vectorize(vector=vector),
+            top_k=self.candidates_per_paragraph,
+            context_types=[self.search_tool.CONTEXT_TYPE.value],
+            need_vector=True,
+        )
+        candidates = []
+        for context, score in results:
+            if context.vectorize and context.vectorize.vector:
+                result = self.search_tool._format_context_result(context, score)
+                candidates.append((context.id, Candidate(result, context.vectorize.vector)))
+        return candidates
+
+    def refresh(self, document_id: int, content: str):
+        """Refresh a warm document from its edited text in the background, throttled"""
+        with self._lock:
+            state = self._states.get(document_id)
+            if (
+                state is None
+                or state.refreshing
+                or time.monotonic() - state.updated_at < self.refresh_interval
+            ):
+                return
+            state.refreshing = True
+
+        async def run():
+            try:
+                await self.warm(document_id, content)
+            except Exception as e:
+                logger.warning(f"Refreshing warm state of document {document_id} failed: {e}")
+            finally:
+                state.refreshing = False
+
+        task = asyncio.get_running_loop().create_task(run())
+        self._refresh_tasks.add(task)
+        task.add_done_callback(self._refresh_tasks.discard)
+
+    def rank_references(
+        self, document_id: Optional[int], paragraph: str, top_k: int
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Rank the document's prefetched contexts against the paragraph at the cursor.
+
+        Returns None when the document has no warm state or the paragraph is not known yet,
+        in which case the caller searches the vector store.
+        """
+        with self._lock:
+            state = self._states.get(document_id) if document_id is not None else None
+        vector = state.paragraph_vector(paragraph) if state else None
+        with self._lock:
+            self._stats["local_rankings" if vector else "misses"] += 1
+        if vector is None:
+            return None
+        return state.rank(vector, top_k)
+
+    def drop(self, document_id: int):
+        with self._lock:
+            self._states.pop(document_id, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self._stats,
+                "documents": len(self._states),
+                "paragraphs": sum(len(s.paragraphs) for s in self._states.values()),
+                "candidates": sum(len(s.candidates) for s in self._states.values()),
+            }
@@ -0,0 +1,186 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2025 Beijing Volcano Engine Technology Co., Ltd.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Context packer - selects the contexts that fit a generation prompt's token budget.
+"""
+
+import math
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from opencontext.config.global_config import get_config
+from opencontext.context_processing.merger.similarity import group_by_similarity
+from opencontext.models.context import ProcessedContext
+from opencontext.utils.logging_utils import get_logger
+
+logger = get_logger(__name__)
+
+# CJK characters are roughly a token each; other text about four characters per token
+_WIDE_CHARS = re.compile(r"[\u3000-\u9fff\uac00-\ud7af\uf900-\ufaff\uff00-\uffef]")
+
+# Prompt token budgets for the context data of each generation task
+_DEFAULT_BUDGETS = {"activity": 6000, "tips": 4000, "todos": 4000, "report": 8000}
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate of a prompt fragment"""
+    if not text:
+        return 0
+    wide = len(_WIDE_CHARS.findall(text))
+    return wide + (len(text) - wide + 3) // 4
+
+
+def compact_context_string(context: ProcessedContext, repeats: int = 1) -> str:
+    """
+    One-line rendering of a context for generation prompts.
+
+    Keeps what the generators reason about (id, time, type, title, summary, keywords,
+    entities) and drops the boilerplate of get_llm_context_string; ``repeats`` counts the
+    near-identical contexts this one stands for.
+    """
+    ed = context.extracted_data
+    parts = [f"[{context.id}]", context.properties.create_time.strftime("%m-%d %H:%M")]
+    if ed.context_type:
+        parts.append(ed.context_type.value)
+    duration = context.properties.duration_count
+    if repeats > 1 or duration > 1:
+        parts.append(f"x{max(repeats, 1) * max(duration, 1)}")
+    text = ed.title or ""
+    if ed.summary and ed.summary != ed.title:
+        text = f"{text}: {ed.summary}" if text else ed.summary
+    parts.append(text)
+    if ed.keywords:
+        parts.append(f"keywords: {', '.join(ed.keywords)}")
+    if ed.entities:
+        parts.append(f"entities: {', '.join(ed.entities)}")
+    return " | ".join(parts)
+
+
+@dataclass
+class PackedContexts:
+    """Contexts selected for a prompt, in chronological order"""
+
+    contexts: List[ProcessedContext] = field(default_factory=list)
+    lines: List[str] = field(default_factory=list)
+    tokens: int = 0
+    candidates: int = 0
+    duplicates: int = 0  # Folded into a near-identical context
+    dropped: int = 0  # Did not fit the budget
+
+
+class ContextPacker:
+    """
+    Packs contexts into a prompt token budget.
+
+    Near-identical contexts (embedding cosine above ``similarity_threshold``, or the same
+    title and summary) are sent once with a repeat count. The rest are ranked by
+    importance, recency and how often they were merged or repeated, and taken best first
+    while they fit; the selection is rendered compactly in chronological order.
+    """
+
+    def __init__(
+        self,
+        token_budget: int,
+        similarity_threshold: float = 0.95,
+        importance_weight: float = 0.5,
+        recency_weight: float = 0.3,
+        frequency_weight: float = 0.2,
+    ):
+        self.token_budget = max(0, int(token_budget))
+        self.similarity_threshold = similarity_threshold
+        self.importance_weight = importance_weight
+        self.recency_weight = recency_weight
+        self.frequency_weight = frequency_weight
+
+    def pack(self, contexts: List[ProcessedContext]) -> PackedContexts:
+        result = PackedContexts(candidates=len(contexts))
+        if not contexts:
+            return result
+
+        representatives, repeats = self._deduplicate(contexts)
+        result.duplicates = len(contexts) - len(representatives)
+
+        scores = self._score(representatives, repeats)
+        ranked = sorted(range(len(representatives)), key=lambda i: scores[i], reverse=True)
+        selected = []
+        for i in ranked:
+            line = compact_context_string(representatives[i], repeats[i])
+            tokens = estimate_tokens(line)
+            if result.tokens + tokens > self.token_budget:
+                result.dropped += 1
+                continue  # A shorter, lower ranked context may still fit
+            result.tokens += tokens
+            selected.append((representatives[i], line))
+
+        selected.sort(key=lambda item: item[0].properties.create_time.timestamp())
+        result.contexts = [context for context, _ in selected]
+        result.lines = [line for _, line in selected]
+        logger.debug(
+            f"Packed {len(selected)} of {len(contexts)} contexts into ~{result.tokens} tokens "
+            f"({result.duplicates} duplicates, {result.dropped} over budget)"
+        )
+        return result
+
+    def _deduplicate(self, contexts: List[ProcessedContext]):
+        """Representatives of near-identical groups (the most important member) and group sizes"""
+        groups = group_by_similarity(
+            [context.vectorize.vector for context in contexts], self.similarity_threshold
+        )
+        # Contexts without embeddings only fold into an identical title and summary
+        by_text: Dict[tuple, int] = {}
+        merged: List[List[int]] = []
+        for group in groups:
+            ed = contexts[group[0]].extracted_data
+            key = (ed.context_type, (ed.title or "").strip(), (ed.summary or "").strip())
+            if key in by_text:
+                merged[by_text[key]].extend(group)
+                continue
+            by_text[key] = len(merged)
+            merged.append(list(group))
+
+        representatives, repeats = [], []
+        for group in merged:
+            best = max(
+                group,
+                key=lambda i: (
+                    contexts[i].extracted_data.importance,
+                    contexts[i].properties.create_time.timestamp(),
+                ),
+            )
+            representatives.append(contexts[best])
+            repeats.append(len(group))
+        return representatives, repeats
+
+    def _score(self, contexts: List[ProcessedContext], repeats: List[int]) -> List[float]:
+        timestamps = [context.properties.create_time.timestamp() for context in contexts]
+        oldest, newest = min(timestamps), max(timestamps)
+        span = newest - oldest
+        scores = []
+        for context, ts, count in zip(contexts, timestamps, repeats):
+            importance = min(max(context.extracted_data.importance, 0), 10) / 10
+            recency = (ts - oldest) / span if span > 0 else 1.0
+            properties = context.properties
+            repeated = (count - 1) + properties.merge_count + max(properties.duration_count - 1, 0)
+            frequency = min(1.0, math.log1p(repeated) / math.log1p(10))
+            scores.append(
+                self.importance_weight * importance
+                + self.recency_weight * recency
+                + self.frequency_weight * frequency
+            )
+        return scores
+
+
+def get_context_packer(task: str, token_budget: Optional[int] = None) -> ContextPacker:
+    """Packer for a generation task (activity, tips, todos, report) as configured"""
+    config = get_config("content_generation.context_packing") or {}
+    budgets = config.get("budgets") or {}
+    if token_budget is None:
+        token_budget = budgets.get(task, _DEFAULT_BUDGETS.get(task, 4000))
+    return ContextPacker(
+        token_budget, similarity_threshold=config.get("similarity_threshold", 0.95)
+    )
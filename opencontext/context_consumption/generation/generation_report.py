@@ -9,11 +9,14 @@ OpenContext module: generation_report
 
 import datetime
 import json
-from typing import Any, Dict, List, Optional
+import time
+from typing import Any, Dict, List, Optional, Tuple
 
 from opencontext.config.global_config import get_prompt_group
+from opencontext.context_consumption.generation.context_packer import get_context_packer
 from opencontext.context_consumption.generation.debug_helper import DebugHelper
 from opencontext.llm.global_vlm_client import generate_with_messages_async
+from opencontext.llm.request_scheduler import RequestPriority, prioritized
 from opencontext.models.enums import ContextType
 from opencontext.storage.global_storage import get_storage
 from opencontext.tools.tool_definitions import ALL_TOOL_DEFINITIONS
@@ -31,19 +34,22 @@ class ReportGenerator:
     def __init__(self):
         self.tools_executor = ToolsExecutor()
 
-    async def generate_report(self, start_time: int, end_time: int) -> str:
+    @prioritized(RequestPriority.REPORT)
+    async def generate_report(self, start_time: int, end_time: int, use_cache: bool = True) -> str:
         """
         Generate an activity report for a specified time range.
 
         Args:
             start_time: The start time as a Unix timestamp in seconds.
             end_time: The end time as a Unix timestamp in seconds.
+            use_cache: Reuse and store the hourly and daily summaries; pass False when the
+                report prompts are not the configured ones, e.g. for a debug run.
 
         Returns:
             str: The activity report in Markdown format.
         """
         try:
-            result = await self._generate_report_with_llm(start_time, end_time)
+            result = await self._generate_report_with_llm(start_time, end_time, use_cache)
             if not result:
                 return result
 
@@ -73,40 +79,109 @@ class ReportGenerator:
             return f"Error generating activity report: {str(e)}"
 
 
-    async def _process_chunks_concurrently(self, start_time: int, end_time: int) -> list:
-        """Process all time chunks concurrently."""
-        import asyncio
+    @prioritized(RequestPriority.REPORT)
+    async def summarize_closed_hours(self, lookback_hours: int = 24) -> int:
+        """
+        Summarize and store every closed hour of the lookback window that has no up-to-date
+        summary, so the daily report only has to merge stored hours.
 
+        Returns:
+            int: The number of hours summarized.
+        """
+        end_time = self._hour_start(int(time.time()))
+        start_time = end_time - lookback_hours * 3600
+        _, computed = await self._get_hourly_summaries(start_time, end_time)
+        return computed
+
+    async def _get_hourly_summaries(
+        self, start_time: int, end_time: int, use_cache: bool = True
+    ) -> Tuple[list, int]:
+        """
+        Summaries of the clock hours covering [start_time, end_time), in time order.
+
+        Stored summaries of closed hours are reused; missing and stale hours (late contexts
+        arrived after they were summarized) are summarized again and stored once closed.
+        Without ``use_cache`` every hour is summarized and nothing is stored.
+        Returns the non-empty summaries and the number of hours summarized.
+        """
+        now = int(time.time())
         hour_chunks = []
-        current_time = start_time
+        chunk_start = self._hour_start(start_time)
+        while chunk_start < end_time:
+            hour_chunks.append((chunk_start, chunk_start + 3600))
+            chunk_start += 3600
+        if not hour_chunks:
+            return [], 0
+
+        stored = {}
+        if use_cache:
+            stored = {
+                row["start_time"]: row
+                for row in get_storage().get_summaries(
+                    "hour", hour_chunks[0][0], hour_chunks[-1][1]
+                )
+            }
+        summaries = {}
+        missing = []
+        for chunk in hour_chunks:
+            row = stored.get(chunk[0])
+            if row and not row["is_stale"] and row["end_time"] == chunk[1] and chunk[1] <= now:
+                summaries[chunk[0]] = row["content"]
+            else:
+                missing.append(chunk)
+
+        results = await self._process_chunks_concurrently(missing)
+        for (chunk_start, chunk_end), result in zip(missing, results):
+            if isinstance(result, Exception):
+                logger.error(
+                    f"Failed to process time chunk {self._format_timestamp(chunk_start)} - {self._format_timestamp(chunk_end)}: {result}"
+                )
+                continue
+            content = result["summary"] if result else ""
+            if result and not content:
+                continue  # The LLM returned nothing: try again next time
+            if use_cache and chunk_end <= now:
+                # Closed hours are stored, empty ones too so they are not queried again
+                get_storage().upsert_summary(
+                    "hour",
+                    chunk_start,
+                    chunk_end,
+                    content,
+                    result["context_count"] if result else 0,
+                )
+            summaries[chunk_start] = content
 
-        while current_time < end_time:
-            chunk_end = min(current_time + 3600, end_time)  # 1-hour chunks
-            hour_chunks.append((current_time, chunk_end))
-            current_time = chunk_end
+        logger.info(
+            f"Hourly summaries for {self._format_timestamp(start_time)} - {self._format_timestamp(end_time)}: "
+            f"{len(hour_chunks) - len(missing)} stored, {len(missing)} summarized"
+        )
+        hourly_summaries = [
+            {"start_time": start, "end_time": start + 3600, "summary": summaries[start]}
+            for start in sorted(summaries)
+            if summaries[start]
+        ]
+        return hourly_summaries, len(missing)
+
+    async def _process_chunks_concurrently(self, hour_chunks: List[Tuple[int, int]]) -> list:
+        """Process time chunks concurrently; results (or exceptions) in chunk order."""
+        import asyncio
 
-        tasks = []
-        for chunk_start, chunk_end in hour_chunks:
-            task = self._process_single_chunk_async(chunk_start, chunk_end)
-            tasks.append(task)
         semaphore = asyncio.Semaphore(5)
 
-        async def limited_task(task):
+        async def limited_task(chunk_start, chunk_end):
             async with semaphore:
-                return await task
+                return await self._process_single_chunk_async(chunk_start, chunk_end)
 
-        limited_tasks = [limited_task(task) for task in tasks]
-        results = await asyncio.gather(*limited_tasks, return_exceptions=True)
-        hourly_summaries = []
-        for i, result in enumerate(results):
-            if isinstance(result, Exception):
-                chunk_start, chunk_end = hour_chunks[i]
-                logger.error(
-                    f"Failed to process time chunk {self._format_timestamp(chunk_start)} - {self._format_timestamp(chunk_end)}: {result}"
-                )
-            elif result:
-                hourly_summaries.append(result)
-        return hourly_summaries
+        return await asyncio.gather(
+            *(limited_task(chunk_start, chunk_end) for chunk_start, chunk_end in hour_chunks),
+            return_exceptions=True,
+        )
+
+    @staticmethod
+    def _hour_start(timestamp: int) -> int:
+        """Start of the local clock hour containing the timestamp"""
+        dt = datetime.datetime.fromtimestamp(timestamp)
+        return int(dt.replace(minute=0, second=0, microsecond=0).timestamp())
 
     async def _process_single_chunk_async(self, chunk_start: int, chunk_end: int) -> dict:
         """Process a single time chunk asynchronously."""
@@ -122,13 +197,13 @@ class ReportGenerator:
         context_types = [ContextType.ACTIVITY_CONTEXT.value, ContextType.SEMANTIC_CONTEXT.value, ContextType.ENTITY_CONTEXT.value, ContextType.INTENT_CONTEXT.value,
                          ContextType.PROCEDURAL_CONTEXT.value, ContextType.ACTIVITY_CONTEXT.value]
         all_contexts = get_storage().get_all_processed_contexts(
-            context_types=context_types, limit=1000, offset=0, filter=filters
+            context_types=context_types, limit=1000, offset=0, filter=filters, need_vector=True
         )
         contexts = []
         for context_list in all_contexts.values():
             contexts.extend(context_list)
-        contexts.sort(key=lambda x: x.properties.create_time)
-        contexts_data = [context.get_llm_context_string() for context in contexts]
+        # The most relevant contexts of the hour that fit the prompt budget, in time order
+        contexts_data = get_context_packer("report").pack(contexts).lines
 
         # Convert timestamps to datetime objects for storage queries
         start_datetime = datetime.datetime.fromtimestamp(chunk_start) if chunk_start else None
@@ -190,7 +265,7 @@ class ReportGenerator:
                     end_time_str=end_time_str,
                     start_timestamp=chunk_start,
                     end_timestamp=chunk_end,
-                    contexts=json.dumps(contexts_data, ensure_ascii=False, indent=2),
+                    contexts=json.dumps(contexts_data, ensure_ascii=False),
                     tips=json.dumps(tips_list, ensure_ascii=False, indent=2),
                     todos=json.dumps(todos_list, ensure_ascii=False, indent=2),
                     activities=json.dumps(activities_list, ensure_ascii=False, indent=2),
@@ -199,16 +274,29 @@ class ReportGenerator:
         ]
         summary = await generate_with_messages_async(messages)
 
-        if summary:
-            return {"start_time": chunk_start, "end_time": chunk_end, "summary": summary}
-        return None
+        return {
+            "start_time": chunk_start,
+            "end_time": chunk_end,
+            "summary": summary or "",
+            "context_count": len(contexts),
+        }
 
-    async def _generate_report_with_llm(self, start_time: int, end_time: int) -> str:
+    async def _generate_report_with_llm(
+        self, start_time: int, end_time: int, use_cache: bool = True
+    ) -> str:
         """
         Generate a comprehensive activity report by merging hourly summaries.
         """
-        # Get hourly summaries
-        hourly_summaries = await self._process_chunks_concurrently(start_time, end_time)
+        # A report of the same window is reused while none of its hours changed
+        if use_cache and end_time <= time.time():
+            for row in get_storage().get_summaries("day", start_time, end_time):
+                if row["start_time"] == start_time and row["end_time"] == end_time:
+                    if not row["is_stale"] and row["content"]:
+                        logger.info("Reusing the stored report, no hour changed since")
+                        return row["content"]
+
+        # Get hourly summaries: stored ones for closed hours, the rest summarized now
+        hourly_summaries, _ = await self._get_hourly_summaries(start_time, end_time, use_cache)
 
         if not hourly_summaries:
             return "No activity data available for the specified time range."
@@ -248,6 +336,12 @@ class ReportGenerator:
             logger.error("Failed to generate report.")
             return None
 
+        # Stored as a rollup of the hours, so it can be reused and rolled up further
+        if use_cache and end_time <= time.time():
+            get_storage().upsert_summary(
+                "day", start_time, end_time, report, source_count=len(hourly_summaries)
+            )
+
         # Save debug information (sync call within async function)
         DebugHelper.save_generation_debug(
             task_type="report",
@@ -15,8 +15,10 @@ from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional, Set, TypedDict
 
 from opencontext.config.global_config import get_prompt_group
+from opencontext.context_consumption.generation.context_packer import get_context_packer
 from opencontext.context_consumption.generation.debug_helper import DebugHelper
 from opencontext.llm.global_vlm_client import generate_with_messages
+from opencontext.llm.request_scheduler import RequestPriority, prioritized
 from opencontext.models.context import ProcessedContext
 from opencontext.models.enums import ContentFormat, ContextType
 from opencontext.storage.global_storage import get_storage
@@ -57,6 +59,7 @@ class RealtimeActivityMonitor:
     Generates a summary of recent activity, including the most valuable context information.
     """
 
+    @prioritized(RequestPriority.REPORT)
     def generate_realtime_activity_summary(
         self, start_time: int, end_time: int
     ) -> Optional[Dict[str, Any]]:
@@ -142,7 +145,10 @@ class RealtimeActivityMonitor:
                 ContextType.INTENT_CONTEXT.value,
             ]
             all_contexts = get_storage().get_all_processed_contexts(
-                context_types=context_types, limit=10000, offset=0, filter=filters
+                context_types=context_types,
+                limit=10000,
+                offset=0,
+                filter=filters,
             )
             return all_contexts
 
@@ -159,16 +165,15 @@ class RealtimeActivityMonitor:
             prompt_group = get_prompt_group("generation.realtime_activity_monitor")
             system_prompt = prompt_group["system"]
             user_prompt_template = prompt_group["user"]
-            # Prepare context data
+            # Prepare context data: the most relevant contexts that fit the prompt budget
+            packed = get_context_packer("activity").pack(
+                [context for context_list in contexts.values() for context in context_list]
+            )
             context_data = {}
-            for context_type, context_list in contexts.items():
-                try:
-                    context_data[context_type] = [
-                        context.get_llm_context_string() for context in context_list
-                    ]
-                except Exception as e:
-                    logger.debug(f"Failed to process context data: {e} {context_list}")
-                    continue
+            for context, line in zip(packed.contexts, packed.lines):
+                context_type = context.extracted_data.context_type
+                key = context_type.value if context_type else "unknown"
+                context_data.setdefault(key, []).append(line)
             # Format time information
             start_time_str = datetime.datetime.fromtimestamp(start_time).strftime("%H:%M")
             end_time_str = datetime.datetime.fromtimestamp(end_time).strftime("%H:%M")
@@ -179,7 +184,7 @@ class RealtimeActivityMonitor:
                 current_time=current_time,
                 start_time_str=start_time_str,
                 end_time_str=end_time_str,
-                context_data=json.dumps(context_data, ensure_ascii=False, indent=2),
+                context_data=json.dumps(context_data, ensure_ascii=False),
             )
             messages = [
                 {"role": "system", "content": system_prompt},
@@ -197,9 +202,9 @@ class RealtimeActivityMonitor:
                     "start_time": start_time,
                     "end_time": end_time,
                     "num_context_types": len(context_data),
-                    "total_contexts": (
-                        sum(len(v) for v in context_data.values()) if context_data else 0
-                    ),
+                    "total_contexts": packed.candidates,
+                    "packed_contexts": len(packed.contexts),
+                    "context_tokens": packed.tokens,
                 },
             )
 
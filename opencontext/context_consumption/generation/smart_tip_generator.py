@@ -14,8 +14,10 @@ from dataclasses import dataclass
 from typing import Any, Dict, List, Optional, TypedDict
 
 from opencontext.config.global_config import get_prompt_group
+from opencontext.context_consumption.generation.context_packer import get_context_packer
 from opencontext.context_consumption.generation.debug_helper import DebugHelper
 from opencontext.llm.global_vlm_client import generate_with_messages
+from opencontext.llm.request_scheduler import RequestPriority, prioritized
 from opencontext.models.context import ProcessedContext
 from opencontext.models.enums import ContextType
 from opencontext.storage.base_storage import DocumentData
@@ -43,6 +45,7 @@ class SmartTipGenerator:
     Generates personalized reminders and suggestions based on the user's recent activity patterns.
     """
 
+    @prioritized(RequestPriority.REPORT)
     def generate_smart_tip(self, start_time: int, end_time: int) -> Optional[str]:
         """
         Generate a smart tip, combining activity patterns and multi-dimensional information.
@@ -208,7 +211,11 @@ class SmartTipGenerator:
             ]
 
             all_contexts = get_storage().get_all_processed_contexts(
-                context_types=context_types, limit=10000, offset=0, filter=filters
+                context_types=context_types,
+                limit=10000,
+                offset=0,
+                filter=filters,
+                need_vector=True,  # For near-duplicate folding in the context packer
             )
 
             contexts = []
@@ -272,9 +279,7 @@ class SmartTipGenerator:
             current_time=current_time,
             start_time_str=start_time_str,
             end_time_str=end_time_str,
-            context_data=(
-                json.dumps(context_data, ensure_ascii=False, indent=2) if context_data else "[]"
-            ),
+            context_data=json.dumps(context_data, ensure_ascii=False) if context_data else "[]",
             activity_patterns_info=(
                 json.dumps(activity_patterns, ensure_ascii=False, indent=2)
                 if activity_patterns
@@ -311,17 +316,9 @@ class SmartTipGenerator:
 
         return tip_content
 
-    def _prepare_context_data_for_analysis(self, contexts: List[ProcessedContext]) -> List[Dict]:
-        """Prepare context data for analysis."""
-        context_data = []
-        for context in contexts:
-            try:
-                context_data.append(context.get_llm_context_string())
-
-            except Exception as e:
-                logger.debug(f"Failed to process context {getattr(context, 'id', 'unknown')}: {e}")
-                continue
-        return context_data
+    def _prepare_context_data_for_analysis(self, contexts: List[ProcessedContext]) -> List[str]:
+        """Prepare context data for analysis: the most relevant contexts that fit the prompt budget."""
+        return get_context_packer("tips").pack(contexts).lines
 
     def get_recent_tips(self, limit: int = 10) -> List[DocumentData]:
         """
@@ -15,8 +15,10 @@ from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional, TypedDict
 
 from opencontext.config.global_config import get_prompt_group
+from opencontext.context_consumption.generation.context_packer import get_context_packer
 from opencontext.context_consumption.generation.debug_helper import DebugHelper
 from opencontext.llm.global_vlm_client import generate_with_messages
+from opencontext.llm.request_scheduler import RequestPriority, prioritized
 from opencontext.models.context import ContextType, Vectorize
 from opencontext.storage.global_storage import get_storage
 from opencontext.utils.json_parser import parse_json_from_response
@@ -54,6 +56,7 @@ class SmartTodoManager:
         priority_map = {"low": 0, "medium": 1, "high": 2, "urgent": 3}
         return priority_map.get(priority.lower(), 0)
 
+    @prioritized(RequestPriority.REPORT)
     def generate_todo_tasks(self, start_time: int, end_time: int) -> Optional[str]:
         """
         Generate Todo tasks based on recent activity, combining activity insights and historical todo information.
@@ -203,7 +206,11 @@ class SmartTodoManager:
                     all_contexts.extend(ctxs)
             else:
                 contexts = get_storage().get_all_processed_contexts(
-                    context_types=context_types, limit=80, offset=0, filter=filters
+                    context_types=context_types,
+                    limit=80,
+                    offset=0,
+                    filter=filters,
+                    need_vector=True,
                 )
                 for context_type, context_list in contexts.items():
                     all_contexts.extend(context_list)
@@ -221,8 +228,11 @@ class SmartTodoManager:
             logger.info(
                 f"Retrieved {len(all_contexts)} context records relevant to task identification."
             )
-            all_contexts_data = [ctx.get_llm_context_string() for ctx in all_contexts]
-            return all_contexts_data
+            # Searches for several potential todos return overlapping contexts: send each once,
+            # and only as many as fit the prompt budget
+            return get_context_packer("todos").pack(
+                list({ctx.id: ctx for ctx in all_contexts}.values())
+            ).lines
 
         except Exception as e:
             logger.exception(f"Failed to get task-relevant context: {e}")
@@ -262,9 +272,7 @@ class SmartTodoManager:
                     if activity_insights
                     else "[]"
                 ),
-                context_data=(
-                    json.dumps(context_data, ensure_ascii=False, indent=2) if context_data else "[]"
-                ),
+                context_data=json.dumps(context_data, ensure_ascii=False) if context_data else "[]",
             )
             messages = [
                 {"role": "system", "content": system_prompt},
@@ -12,7 +12,10 @@ from opencontext.context_processing.chunker.chunkers import (
     FAQChunker,
     StructuredFileChunker,
 )
-from opencontext.context_processing.chunker.document_text_chunker import DocumentTextChunker
+from opencontext.context_processing.chunker.document_text_chunker import (
+    ChunkSource,
+    DocumentTextChunker,
+)
 
 __all__ = [
     "BaseChunker",
@@ -20,4 +23,5 @@ __all__ = [
     "StructuredFileChunker",
     "FAQChunker",
     "DocumentTextChunker",
+    "ChunkSource",
 ]
@@ -12,8 +12,9 @@ Splits based on semantic boundaries (paragraphs, sections) rather than simple ch
 """
 
 import asyncio
+import hashlib
 import re
-from typing import Iterator, List, Optional
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
 
 from opencontext.context_processing.chunker.chunkers import BaseChunker, ChunkingConfig
 from opencontext.models.context import Chunk
@@ -21,6 +22,40 @@ from opencontext.utils.logging_utils import get_logger
 
 logger = get_logger(__name__)
 
+# Characters of a source text kept to find it again in an edited document
+_SOURCE_HEAD = 48
+
+
+class ChunkSource(NamedTuple):
+    """
+    Fingerprint of the document text a chunk was made from, up to whitespace
+
+    The LLM rewrites what it splits (it adds context to the chunks), so an unchanged region
+    is recognised by the text it was split from rather than by its chunks.
+    """
+
+    digest: str
+    length: int
+    head: str
+
+    @classmethod
+    def of(cls, text: str) -> "ChunkSource":
+        normalized = " ".join(text.split())
+        digest = hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+        return cls(digest, len(normalized), normalized[:_SOURCE_HEAD])
+
+    @classmethod
+    def parse(cls, key: str) -> Optional["ChunkSource"]:
+        """The fingerprint stored as ``key()``, None if there is none"""
+        try:
+            digest, length, head = key.split(":", 2)
+            return cls(digest, int(length), head)
+        except (AttributeError, ValueError):
+            return None
+
+    def key(self) -> str:
+        return f"{self.digest}:{self.length}:{self.head}"
+
 
 class DocumentTextChunker(BaseChunker):
     """
@@ -62,6 +97,115 @@ class DocumentTextChunker(BaseChunker):
         logger.info(f"Created {len(chunks)} chunks from {len(texts)} text elements")
         return chunks
 
+    def chunk_text_incremental(
+        self, texts: List[str], previous_sources: List[ChunkSource]
+    ) -> Tuple[List[int], List[Chunk]]:
+        """
+        Re-chunk an edited document, reusing the chunks of its previous version
+
+        ``previous_sources`` holds the source of each previous chunk, the document text it
+        was made from. The chunks of every source still in the document are kept as they
+        are; chunks split from the same text are kept or redone together. Only the text no
+        kept source covers is chunked again: a region that fits max_chunk_size becomes one
+        chunk, longer regions are split with the LLM. A region too short to be a chunk is
+        merged with a neighbouring source, whose chunks are then redone too.
+
+        Returns:
+            (indices of the previous chunks to keep, chunks of the changed text)
+        """
+        if not texts or all(not t.strip() for t in texts):
+            return [], []
+        full_document = "\n\n".join([t.strip() for t in texts if t.strip()])
+        normalized, offsets = self._normalize_with_offsets(full_document)
+
+        groups: Dict[ChunkSource, List[int]] = {}
+        for i, source in enumerate(previous_sources):
+            groups.setdefault(source, []).append(i)
+        # Claim the first free occurrence of each source, longest sources first
+        spans = []  # (start, end, source) in normalized coordinates
+        for source in sorted(groups, key=lambda source: -source.length):
+            if not source.length:
+                continue
+            start = normalized.find(source.head)
+            while start != -1:
+                end = start + source.length
+                if (
+                    all(end <= s or start >= e for s, e, _ in spans)
+                    and ChunkSource.of(normalized[start:end]) == source
+                ):
+                    spans.append((start, end, source))
+                    break
+                start = normalized.find(source.head, start + 1)
+        spans.sort()
+
+        while True:
+            regions = self._uncovered_regions(full_document, offsets, spans)
+            short = [k for text, k in regions if len(text) < self.config.min_chunk_size]
+            if not short or not spans:
+                break
+            # Give up the kept chunk before the short region (after it, for the first one)
+            spans.pop(max(short[0] - 1, 0))
+
+        if not spans:
+            return [], self.chunk_text(texts)
+
+        # Regions that fit a chunk are used as is, longer ones are split like a long document
+        region_chunks = []
+        buffers_to_split = []
+        for text, _ in regions:
+            if len(text) <= self.config.max_chunk_size:
+                region_chunks.append([Chunk(text=text, source_text=text)])
+            else:
+                buffers, _, _ = self._collect_buffers([text])
+                region_chunks.append(buffers)
+                buffers_to_split.extend(buffers)
+        if buffers_to_split:
+            logger.info(f"Splitting {len(buffers_to_split)} changed buffers with LLM")
+            llm_results = iter(
+                self._batch_split_with_llm([buf for buf, _ in buffers_to_split])
+            )
+            for k, items in enumerate(region_chunks):
+                if items and not isinstance(items[0], Chunk):
+                    results = [next(llm_results) for _ in items]
+                    region_chunks[k] = self._assemble_chunks(items, results, [], [])
+        chunks = [chunk for items in region_chunks for chunk in items]
+        for idx, chunk in enumerate(chunks):
+            chunk.chunk_index = idx
+
+        kept = [i for _, _, source in spans for i in groups[source]]
+        logger.info(
+            f"Kept {len(kept)} of {len(previous_sources)} chunks, "
+            f"created {len(chunks)} from {len(regions)} changed regions"
+        )
+        return kept, chunks
+
+    @staticmethod
+    def _normalize_with_offsets(text: str) -> Tuple[str, List[int]]:
+        """Text with whitespace runs collapsed, and the original offset of each character"""
+        parts, offsets = [], []
+        for match in re.finditer(r"\S+", text):
+            if parts:
+                parts.append(" ")
+                offsets.append(match.start())
+            parts.append(match.group())
+            offsets.extend(range(match.start(), match.end()))
+        offsets.append(len(text))
+        return "".join(parts), offsets
+
+    @staticmethod
+    def _uncovered_regions(
+        document: str, offsets: List[int], spans: List[Tuple[int, int, int]]
+    ) -> List[Tuple[str, int]]:
+        """Non-empty text between kept spans, with the index of the span that follows it"""
+        regions = []
+        position = 0
+        for k, (start, end, _) in enumerate(spans + [(len(offsets) - 1, len(offsets) - 1, -1)]):
+            text = document[position : offsets[start]].strip()
+            if text:
+                regions.append((text, k))
+            position = offsets[end - 1] + 1
+        return regions
+
     def _collect_buffers(self, texts: List[str]) -> tuple:
         """
         Phase 1: Collect buffers that need LLM splitting
@@ -172,6 +316,7 @@ class DocumentTextChunker(BaseChunker):
                     chunk = Chunk(
                         text=text_chunk,
                         chunk_index=chunk_idx,
+                        source_text=buffer,
                     )
                     chunks.append(chunk)
                     chunk_idx += 1
@@ -307,6 +452,7 @@ class DocumentTextChunker(BaseChunker):
                     chunk = Chunk(
                         text=text.strip(),
                         chunk_index=idx,
+                        source_text=full_document,
                     )
                     chunks.append(chunk)
 
@@ -8,7 +8,6 @@
 Context merge processor - Responsible for merging similar contexts into one.
 """
 import json
-import math
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional, Tuple
 
@@ -20,6 +19,7 @@ from opencontext.context_processing.merger.merge_strategies import (
     ContextTypeAwareStrategy,
     StrategyFactory,
 )
+from opencontext.context_processing.merger.similarity import cosine_similarity, group_by_similarity
 from opencontext.context_processing.processor.base_processor import BaseContextProcessor
 from opencontext.llm.global_embedding_client import do_vectorize
 from opencontext.llm.global_vlm_client import generate_with_messages
@@ -490,61 +490,47 @@ class ContextMerger(BaseContextProcessor):
                 "has_compression": False,
                 "enable_merge": True,
             }
-            limit = 1000
-            offset = 0
-            while True:
-                contexts_by_backend = self.storage.get_all_processed_contexts(
-                    limit=limit, offset=offset, filter=filter
-                )
-
-                if not any(contexts_by_backend.values()):
-                    logger.info("No more recent contexts to process in this iteration.")
-                    break
-                has_merge = False
-                for backend_name, backend_contexts in contexts_by_backend.items():
-                    if len(backend_contexts) < 2:
+            for context_type in ContextType:
+                merged_ids = []
+                for page in self.storage.iter_processed_contexts(
+                    context_type.value, filter=filter, page_size=1000, need_vector=True
+                ):
+                    if len(page) < 2:
                         continue
-                    has_merge = True
-                    logger.info(
-                        f"Processing {len(backend_contexts)} contexts from backend '{backend_name}'."
-                    )
+                    logger.info(f"Processing {len(page)} contexts of type '{context_type.value}'.")
+                    merged_ids.extend(self._compress_contexts(page))
 
-                    groups = self._group_contexts_by_similarity(
-                        backend_contexts, self._similarity_threshold
+                # Deleting while scanning would shift offset-based pages, so delete afterwards
+                if merged_ids:
+                    self.storage.delete_contexts(merged_ids, context_type.value)
+                    logger.info(
+                        f"Cleaned up {len(merged_ids)} merged {context_type.value} contexts."
                     )
 
-                    for group in groups:
-                        if len(group) > 1:
-                            group.sort(key=lambda c: c.properties.create_time)
-                            target_candidate = group[-1]
-                            sources = group[:-1]
-
-                            logger.info(
-                                f"Merging {len(sources)} contexts into {target_candidate.id} within the group."
-                            )
-                            merged_context = self.merge_multiple(target_candidate, sources)
-                            if merged_context:
-                                self.storage.upsert_processed_context(merged_context)
-                                self.storage.delete_processed_context(
-                                    target_candidate.id,
-                                    target_candidate.extracted_data.context_type.value,
-                                )
-                                for ctx in sources:
-                                    self.storage.delete_processed_context(
-                                        ctx.id, ctx.extracted_data.context_type.value
-                                    )
-                                logger.info(
-                                    f"Successfully merged within group and cleaned up {len(sources)} source contexts."
-                                )
-
-                if not has_merge:
-                    break
-                offset += limit
-
             logger.info("Periodic memory compression finished.")
         except Exception as e:
             logger.exception(f"Error during periodic memory compression: {e}")
 
+    def _compress_contexts(self, contexts: List[ProcessedContext]) -> List[str]:
+        """Merge similar contexts of one page, returning the ids that were merged away"""
+        merged_ids = []
+        groups = self._group_contexts_by_similarity(contexts, self._similarity_threshold)
+        for group in groups:
+            if len(group) > 1:
+                group.sort(key=lambda c: c.properties.create_time)
+                target_candidate = group[-1]
+                sources = group[:-1]
+
+                logger.info(
+                    f"Merging {len(sources)} contexts into {target_candidate.id} within the group."
+                )
+                merged_context = self.merge_multiple(target_candidate, sources)
+                if merged_context:
+                    self.storage.upsert_processed_context(merged_context)
+                    merged_ids.append(target_candidate.id)
+                    merged_ids.extend(ctx.id for ctx in sources)
+        return merged_ids
+
     def _group_contexts_by_similarity(
         self, contexts: List[ProcessedContext], threshold: float
     ) -> List[List[ProcessedContext]]:
@@ -552,46 +538,12 @@ class ContextMerger(BaseContextProcessor):
         if not contexts:
             return []
 
-        groups = []
-        remaining_contexts = list(contexts)
-
-        while remaining_contexts:
-            seed = remaining_contexts.pop(0)
-            new_group = [seed]
-
-            # Use a list comprehension to build the list of contexts to remove, then iterate
-            to_remove = []
-            seed_embedding = seed.vectorize.vector
-            for i, ctx in enumerate(remaining_contexts):
-                ctx_embedding = ctx.vectorize.vector
-                if self._calculate_similarity(seed_embedding, ctx_embedding) > threshold:
-                    new_group.append(ctx)
-                    to_remove.append(i)
-
-            # Remove items in reverse index order to avoid index shifting issues
-            for i in sorted(to_remove, reverse=True):
-                remaining_contexts.pop(i)
-
-            groups.append(new_group)
-
-        return groups
+        index_groups = group_by_similarity([ctx.vectorize.vector for ctx in contexts], threshold)
+        return [[contexts[i] for i in group] for group in index_groups]
 
     def _calculate_similarity(self, emb1: List[float], emb2: List[float]) -> float:
         """Calculates cosine similarity between two embeddings."""
-        if emb1 is None or emb2 is None or not emb1 or not emb2:
-            return 0.0
-
-        # Calculate dot product
-        dot_product = sum(a * b for a, b in zip(emb1, emb2))
-
-        # Calculate norms
-        norm_emb1 = math.sqrt(sum(a * a for a in emb1))
-        norm_emb2 = math.sqrt(sum(b * b for b in emb2))
-
-        if norm_emb1 == 0 or norm_emb2 == 0:
-            return 0.0
-
-        return dot_product / (norm_emb1 * norm_emb2)
+        return cosine_similarity(emb1, emb2)
 
     def intelligent_memory_cleanup(self):
         """
@@ -627,38 +579,28 @@ class ContextMerger(BaseContextProcessor):
         stats = {"checked": 0, "cleaned": 0, "errors": 0}
 
         try:
-            # 获取该类型的所有上下文
-            backend = self.storage._get_or_create_backend(context_type.value)
-            if not backend:
-                return stats
-
-            # 分批获取上下文进行清理
-            limit = 100
-            offset = 0
-
-            while True:
-                contexts = self._get_contexts_for_cleanup(context_type.value, limit, offset)
-                if not contexts:
-                    break
-
+            # 分批流式获取该类型的上下文，扫描结束后再统一删除
+            to_delete = []
+            for contexts in self.storage.iter_processed_contexts(context_type.value):
                 for context in contexts:
                     stats["checked"] += 1
 
                     try:
                         if strategy.should_cleanup(context):
-                            self.storage.delete_processed_context(context.id, context_type.value)
-                            stats["cleaned"] += 1
+                            to_delete.append(context.id)
                             logger.debug(
-                                f"Cleaned up context {context.id} of type {context_type.value}"
+                                f"Cleaning up context {context.id} of type {context_type.value}"
                             )
 
                     except Exception as e:
                         stats["errors"] += 1
                         logger.error(f"Error cleaning up context {context.id}: {e}")
 
-                if len(contexts) < limit:
-                    break
-                offset += limit
+            if to_delete:
+                if self.storage.delete_contexts(to_delete, context_type.value):
+                    stats["cleaned"] += len(to_delete)
+                else:
+                    stats["errors"] += len(to_delete)
 
             logger.info(
                 f"Cleanup for {context_type.value}: checked {stats['checked']}, cleaned {stats['cleaned']}"
@@ -670,21 +612,6 @@ class ContextMerger(BaseContextProcessor):
 
         return stats
 
-    def _get_contexts_for_cleanup(
-        self, context_type_value: str, limit: int, offset: int
-    ) -> List[ProcessedContext]:
-        """获取需要清理检查的上下文"""
-        try:
-            contexts_dict = self.storage.get_all_processed_contexts(
-                limit=limit, offset=offset, filter={}
-            )
-
-            return contexts_dict.get(context_type_value, [])
-
-        except Exception as e:
-            logger.error(f"Error getting contexts for cleanup: {e}")
-            return []
-
     def memory_reinforcement(self, context_ids: List[str]):
         """
         记忆强化：重置指定上下文的遗忘状态，提升重要性
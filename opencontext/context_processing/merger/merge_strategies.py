@@ -14,6 +14,7 @@ from abc import ABC, abstractmethod
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional, Tuple
 
+from opencontext.context_processing.merger.similarity import cosine_similarity
 from opencontext.models.context import ExtractedData, ProcessedContext
 from opencontext.models.enums import ContextType, MergeType
 from opencontext.utils.logging_utils import get_logger
@@ -101,6 +102,10 @@ class ContextTypeAwareStrategy(ABC):
         forgetting_prob = self.calculate_forgetting_probability(context)
         return random.random() < forgetting_prob
 
+    def _calculate_cosine_similarity(self, vec1: List[float], vec2: List[float]) -> float:
+        """计算余弦相似度"""
+        return cosine_similarity(vec1, vec2)
+
     def get_merge_prompt_name(self) -> str:
         """Get type-specific merge prompt name"""
         return f"merging.{self.context_type.value}_merging"
@@ -211,20 +216,6 @@ class ProfileContextStrategy(ContextTypeAwareStrategy):
         # 简化的摘要合并，实际应该用LLM进行智能融合
         return f"综合{len(summaries)}项记录的身份信息: " + "; ".join(summaries[:3])
 
-    def _calculate_cosine_similarity(self, vec1: List[float], vec2: List[float]) -> float:
-        """计算余弦相似度"""
-        if not vec1 or not vec2 or len(vec1) != len(vec2):
-            return 0.0
-
-        dot_product = sum(a * b for a, b in zip(vec1, vec2))
-        norm1 = math.sqrt(sum(a * a for a in vec1))
-        norm2 = math.sqrt(sum(b * b for b in vec2))
-
-        if norm1 == 0 or norm2 == 0:
-            return 0.0
-
-        return dot_product / (norm1 * norm2)
-
     def _create_merged_context(
         self, target: ProcessedContext, sources: List[ProcessedContext], merged_data: Dict[str, Any]
     ) -> ProcessedContext:
@@ -386,20 +377,6 @@ class ActivityContextStrategy(ContextTypeAwareStrategy):
 
         return f"包含{len(contexts)}个活动的序列: " + " -> ".join(key_activities[:5])
 
-    def _calculate_cosine_similarity(self, vec1: List[float], vec2: List[float]) -> float:
-        """计算余弦相似度"""
-        if not vec1 or not vec2 or len(vec1) != len(vec2):
-            return 0.0
-
-        dot_product = sum(a * b for a, b in zip(vec1, vec2))
-        norm1 = math.sqrt(sum(a * a for a in vec1))
-        norm2 = math.sqrt(sum(b * b for b in vec2))
-
-        if norm1 == 0 or norm2 == 0:
-            return 0.0
-
-        return dot_product / (norm1 * norm2)
-
     def _create_merged_context(
         self, target: ProcessedContext, sources: List[ProcessedContext], merged_data: Dict[str, Any]
     ) -> ProcessedContext:
@@ -798,20 +775,6 @@ class IntentContextStrategy(ContextTypeAwareStrategy):
             # 未完成的意图需要保留
             return base_prob * 0.7
 
-    def _calculate_cosine_similarity(self, vec1: List[float], vec2: List[float]) -> float:
-        """计算余弦相似度"""
-        if not vec1 or not vec2 or len(vec1) != len(vec2):
-            return 0.0
-
-        dot_product = sum(a * b for a, b in zip(vec1, vec2))
-        norm1 = math.sqrt(sum(a * a for a in vec1))
-        norm2 = math.sqrt(sum(b * b for b in vec2))
-
-        if norm1 == 0 or norm2 == 0:
-            return 0.0
-
-        return dot_product / (norm1 * norm2)
-
     def _create_merged_context(
         self, target: ProcessedContext, sources: List[ProcessedContext], merged_data: Dict[str, Any]
     ) -> ProcessedContext:
@@ -1009,20 +972,6 @@ class SemanticContextStrategy(ContextTypeAwareStrategy):
 
         return f"知识整合的{len(all_contexts)}个相关概念: " + "; ".join(key_concepts)
 
-    def _calculate_cosine_similarity(self, vec1: List[float], vec2: List[float]) -> float:
-        """计算余弦相似度"""
-        if not vec1 or not vec2 or len(vec1) != len(vec2):
-            return 0.0
-
-        dot_product = sum(a * b for a, b in zip(vec1, vec2))
-        norm1 = math.sqrt(sum(a * a for a in vec1))
-        norm2 = math.sqrt(sum(b * b for b in vec2))
-
-        if norm1 == 0 or norm2 == 0:
-            return 0.0
-
-        return dot_product / (norm1 * norm2)
-
     def _create_merged_context(
         self, target: ProcessedContext, sources: List[ProcessedContext], merged_data: Dict[str, Any]
     ) -> ProcessedContext:
@@ -1217,20 +1166,6 @@ class ProceduralContextStrategy(ContextTypeAwareStrategy):
 
         return f"包含{len(all_contexts)}个相关操作流程的整合指南: " + "; ".join(key_procedures[:5])
 
-    def _calculate_cosine_similarity(self, vec1: List[float], vec2: List[float]) -> float:
-        """计算余弦相似度"""
-        if not vec1 or not vec2 or len(vec1) != len(vec2):
-            return 0.0
-
-        dot_product = sum(a * b for a, b in zip(vec1, vec2))
-        norm1 = math.sqrt(sum(a * a for a in vec1))
-        norm2 = math.sqrt(sum(b * b for b in vec2))
-
-        if norm1 == 0 or norm2 == 0:
-            return 0.0
-
-        return dot_product / (norm1 * norm2)
-
     def _create_merged_context(
         self, target: ProcessedContext, sources: List[ProcessedContext], merged_data: Dict[str, Any]
     ) -> ProcessedContext:
@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2025 Beijing Volcano Engine Technology Co., Ltd.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Vectorized similarity kernels shared by the context merger and merge strategies
+"""
+
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Rows of seeds whose similarities are computed with a single matrix product
+_GROUP_BLOCK_SIZE = 512
+
+
+def cosine_similarity(vec1: Optional[Sequence[float]], vec2: Optional[Sequence[float]]) -> float:
+    """Cosine similarity of two vectors, 0.0 if either is missing, empty, zero or mismatched"""
+    if vec1 is None or vec2 is None or len(vec1) == 0 or len(vec2) == 0:
+        return 0.0
+    if len(vec1) != len(vec2):
+        return 0.0
+    a = np.asarray(vec1, dtype=np.float64)
+    b = np.asarray(vec2, dtype=np.float64)
+    norm = np.linalg.norm(a) * np.linalg.norm(b)
+    if norm == 0:
+        return 0.0
+    return float(np.dot(a, b) / norm)
+
+
+def build_normalized_matrix(
+    vectors: Sequence[Optional[Sequence[float]]],
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Stack vectors into an L2-normalised float32 matrix.
+
+    Vectors that are missing, empty, all-zero or whose dimension differs from the most
+    common one become zero rows, so every similarity against them is 0.0.
+
+    Returns:
+        (matrix of shape (n, dim), boolean mask of valid rows)
+    """
+    n = len(vectors)
+    dims = [len(v) if v is not None else 0 for v in vectors]
+    valid_dims = [d for d in dims if d > 0]
+    if not valid_dims:
+        return np.zeros((n, 0), dtype=np.float32), np.zeros(n, dtype=bool)
+    values, counts = np.unique(valid_dims, return_counts=True)
+    dim = int(values[np.argmax(counts)])
+
+    matrix = np.zeros((n, dim), dtype=np.float32)
+    valid = np.zeros(n, dtype=bool)
+    for i, (vector, d) in enumerate(zip(vectors, dims)):
+        if d == dim:
+            matrix[i] = vector
+            valid[i] = True
+
+    norms = np.linalg.norm(matrix, axis=1)
+    valid &= norms > 0
+    norms[~valid] = 1.0
+    matrix /= norms[:, None]
+    matrix[~valid] = 0.0
+    return matrix, valid
+
+
+def similarity_matrix(matrix: np.ndarray, other: Optional[np.ndarray] = None) -> np.ndarray:
+    """Pairwise cosine similarities of pre-normalised rows"""
+    return matrix @ (matrix if other is None else other).T
+
+
+def group_by_similarity(
+    vectors: Sequence[Optional[Sequence[float]]], threshold: float
+) -> List[List[int]]:
+    """
+    Greedy-seed grouping over a thresholded similarity matrix.
+
+    Walks items in order; each item not yet grouped becomes a seed and collects every
+    later, still ungrouped item whose similarity to the seed is strictly greater than
+    ``threshold``. Similarities are computed block-wise as matrix products, so memory
+    stays at O(block * n) instead of O(n^2).
+
+    Returns:
+        Groups as lists of indices into ``vectors``; every index appears exactly once.
+    """
+    n = len(vectors)
+    if n == 0:
+        return []
+
+    matrix, _ = build_normalized_matrix(vectors)
+    assigned = np.zeros(n, dtype=bool)
+    groups: List[List[int]] = []
+
+    for block_start in range(0, n, _GROUP_BLOCK_SIZE):
+        block_end = min(block_start + _GROUP_BLOCK_SIZE, n)
+        if assigned[block_start:block_end].all():
+            continue
+        # Only later items can join a seed's group
+        adjacency = (
+            similarity_matrix(matrix[block_start:block_end], matrix[block_start:]) > threshold
+        )
+
+        for seed in range(block_start, block_end):
+            if assigned[seed]:
+                continue
+            assigned[seed] = True
+            row = adjacency[seed - block_start, seed - block_start + 1 :]
+            members = np.flatnonzero(row & ~assigned[seed + 1 :]) + seed + 1
+            assigned[members] = True
+            groups.append([seed, *members.tolist()])
+
+    return groups
@@ -213,6 +213,14 @@ class BaseContextProcessor(IContextProcessor, ABC):
             logger.error(f"Failed to reset statistics for {self.get_name()}: {e}")
             return False
 
+    def get_backpressure(self) -> float:
+        """
+        Load of the processor's input queue relative to its high watermark.
+
+        Above 1.0 the processor is falling behind and producers should slow down.
+        """
+        return 0.0
+
     def set_callback(self, callback: Optional[Callable[[List[ProcessedContext]], None]]) -> bool:
         """
         Set callback function to be called when processing is complete.
@@ -15,7 +15,7 @@ Provides document conversion and analysis functions:
 import os
 import tempfile
 from pathlib import Path
-from typing import List
+from typing import Iterable, Iterator, List, Optional, Tuple
 
 from PIL import Image
 
@@ -61,26 +61,50 @@ class DocumentConverter:
 
     def _convert_pdf_to_images(self, pdf_path: str) -> List[Image.Image]:
         """Convert PDF to image list (using pypdfium2)"""
+        return [image for _, image in self.iter_pdf_pages(pdf_path)]
+
+    def iter_pdf_pages(
+        self, pdf_path: str, page_numbers: Optional[Iterable[int]] = None
+    ) -> Iterator[Tuple[int, Image.Image]]:
+        """
+        Lazily render PDF pages (using pypdfium2)
+
+        The document is opened once and only the requested pages are rendered, one at a
+        time, so at most one page bitmap is alive per step of the consumer.
+
+        Args:
+            pdf_path: PDF file path
+            page_numbers: 1-based page numbers to render, in the order to yield them;
+                all pages when None
+
+        Yields:
+            (page_number, RGB image)
+        """
+        import pypdfium2 as pdfium
+
+        pdf = pdfium.PdfDocument(pdf_path)
         try:
-            import pypdfium2 as pdfium
-
-            pdf = pdfium.PdfDocument(pdf_path)
-            images = []
-            for page_index in range(len(pdf)):
-                page = pdf[page_index]
-                # Render page as PIL Image
-                # scale parameter controls resolution: scale=1 corresponds to 72 DPI
-                scale = self.dpi / 72.0
-                pil_image = page.render(scale=scale).to_pil()
+            page_count = len(pdf)
+            if page_numbers is None:
+                page_numbers = range(1, page_count + 1)
+            # scale parameter controls resolution: scale=1 corresponds to 72 DPI
+            scale = self.dpi / 72.0
+            for page_number in page_numbers:
+                if not 1 <= page_number <= page_count:
+                    raise ValueError(f"Page {page_number} out of range (1-{page_count})")
+                page = pdf[page_number - 1]
+                try:
+                    pil_image = page.render(scale=scale).to_pil()
+                finally:
+                    page.close()
                 if pil_image.mode != "RGB":
                     pil_image = pil_image.convert("RGB")
-                images.append(pil_image)
-            pdf.close()
-            return images
-
+                yield page_number, pil_image
         except Exception as e:
             logger.exception(f"Error converting PDF: {e}")
             raise
+        finally:
+            pdf.close()
 
     def _load_image(self, image_path: str) -> List[Image.Image]:
         """Load single image"""
@@ -10,23 +10,25 @@ Document Processor
 
 import asyncio
 import datetime
+import hashlib
 import os
-import queue
 import threading
 import time
 from pathlib import Path
-from typing import List
+from typing import Dict, Iterator, List, Optional, Set, Tuple
 
 from PIL import Image
 
 from opencontext.context_processing.chunker import (
     ChunkingConfig,
+    ChunkSource,
     DocumentTextChunker,
     FAQChunker,
     StructuredFileChunker,
 )
 from opencontext.context_processing.processor.base_processor import BaseContextProcessor
 from opencontext.context_processing.processor.document_converter import DocumentConverter, PageInfo
+from opencontext.context_processing.work_queue import open_work_queue
 from opencontext.llm.global_vlm_client import generate_with_messages_async
 from opencontext.models.context import *
 from opencontext.models.enums import *
@@ -62,8 +64,13 @@ class DocumentProcessor(BaseContextProcessor):
         # Thread control
         self._stop_event = threading.Event()
 
-        # Queue and background thread
-        self._input_queue = queue.Queue(maxsize=self._batch_size * 2)
+        # Durable queue and background thread
+        self._input_queue = open_work_queue(
+            "document",
+            encode=RawContextProperties.dump_json,
+            decode=RawContextProperties.from_json,
+            memory_items=self._batch_size * 2,
+        )
         self._processing_task = threading.Thread(target=self._run_processing_loop, daemon=True)
         self._processing_task.start()
         # Document converter
@@ -85,10 +92,11 @@ class DocumentProcessor(BaseContextProcessor):
     def shutdown(self, _graceful: bool = False):
         """Gracefully shutdown background processing task"""
         self._stop_event.set()
-        self._input_queue.put(None)
+        self._input_queue.interrupt()
         self._processing_task.join(timeout=10)
         if self._processing_task.is_alive():
             logger.warning("UnifiedDocumentProcessor background task failed to stop in time.")
+        self._input_queue.close()
         logger.info("UnifiedDocumentProcessor has been shut down.")
 
     def get_name(self) -> str:
@@ -138,7 +146,26 @@ class DocumentProcessor(BaseContextProcessor):
         return file_type in STRUCTURED_FILE_TYPES
 
     def _is_text_content(self, context: RawContextProperties) -> bool:
-        return context.source == ContextSource.INPUT
+        return context.source in (ContextSource.INPUT, ContextSource.VAULT)
+
+    @staticmethod
+    def _document_key(raw_context: RawContextProperties) -> Tuple[Optional[str], str]:
+        """raw_type and raw_id of the chunks; a vault document keeps its ID across edits"""
+        vault_id = (raw_context.additional_info or {}).get("vault_id")
+        if vault_id is not None:
+            return "vaults", str(vault_id)
+        return raw_context.content_type, raw_context.object_id
+
+    @staticmethod
+    def _chunk_hash(text: str) -> str:
+        """Content hash of a chunk, insensitive to whitespace changes"""
+        return hashlib.sha1(" ".join(text.split()).encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _chunk_source(context: ProcessedContext) -> ChunkSource:
+        """Source of a stored chunk; chunks stored without one came from their own text"""
+        key = (context.metadata or {}).get("knowledge_source_key")
+        return ChunkSource.parse(key) or ChunkSource.of(context.vectorize.text or "")
 
     def _is_visual_document(self, context: RawContextProperties) -> bool:
         if context.source != ContextSource.LOCAL_FILE:
@@ -179,7 +206,9 @@ class DocumentProcessor(BaseContextProcessor):
         if not self.can_process(context):
             return False
         try:
-            self._input_queue.put(context)
+            if not self._input_queue.put(context.object_id, context):
+                logger.error(f"Document queue is full, dropping {context.object_id}")
+                return False
             return True
         except Exception as e:
             logger.exception(f"Error queuing document {context.object_id}: {e}")
@@ -188,38 +217,44 @@ class DocumentProcessor(BaseContextProcessor):
     def _run_processing_loop(self):
         """Background processing loop (consume documents from queue)"""
         while not self._stop_event.is_set():
-            unprocessed_context = None
             try:
-                raw_context = self._input_queue.get(timeout=self._batch_timeout)
-                unprocessed_context = raw_context
-            except queue.Empty:
-                continue
+                items = self._input_queue.get_batch(1, self._batch_timeout)
             except Exception as e:
                 logger.error(f"Unexpected error in processing loop: {e}")
                 time.sleep(3)
                 continue
 
-            if unprocessed_context:
+            for item in items:
                 time_start = int(time.time())
                 try:
-                    processed_contexts = self.real_process(unprocessed_context)
+                    processed_contexts = self.real_process(item.value)
+                    if processed_contexts is False:
+                        # real_process logged the error; try the document again later
+                        self._input_queue.retry([item], "Document processing failed")
+                        continue
                     if processed_contexts:
                         get_storage().batch_upsert_processed_context(processed_contexts)
+                    self._input_queue.ack([item])
                 except Exception as e:
                     logger.exception(f"Unexpected error in real_process: {e}")
+                    self._input_queue.retry([item], str(e))
+                    continue
 
                 time_end = int(time.time())
                 logger.info(f"Processed 1 document in {time_end - time_start} seconds")
 
+    def get_backpressure(self) -> float:
+        return self._input_queue.pressure()
+
     def real_process(self, raw_context: RawContextProperties) -> List[ProcessedContext]:
         """处理文档"""
         start_time = time.time()
         try:
             all_processed_contexts = []
-            if self._is_structured_document(raw_context):
-                contexts = self._process_structured_document(raw_context)
-            elif self._is_text_content(raw_context):
+            if self._is_text_content(raw_context):
                 contexts = self._process_text_content(raw_context)
+            elif self._is_structured_document(raw_context):
+                contexts = self._process_structured_document(raw_context)
             else:
                 contexts = self._process_visual_document(raw_context)
             all_processed_contexts.extend(contexts)
@@ -251,28 +286,45 @@ class DocumentProcessor(BaseContextProcessor):
         return self._create_contexts_from_chunks(raw_context, chunks)
 
     def _create_contexts_from_chunks(
-        self, raw_context: RawContextProperties, chunks: List[Chunk]
+        self,
+        raw_context: RawContextProperties,
+        chunks: List[Chunk],
+        taken_ids: Optional[Set[str]] = None,
     ) -> List[ProcessedContext]:
         """Create ProcessedContext from Chunk list"""
         contexts = []
         now = datetime.datetime.now()
-        # TODO: semantic additional
-        knowledge_metadata = KnowledgeContextMetadata(
-            knowledge_source=raw_context.source,
-            knowledge_file_path=raw_context.content_path,
-            knowledge_raw_id=raw_context.object_id,
-            # knowledge_title=raw_context.title,
-        )
+        raw_type, raw_id = self._document_key(raw_context)
+        taken_ids = set(taken_ids or ())
         for chunk in chunks:
+            chunk_hash = self._chunk_hash(chunk.text)
+            # Stable per document and chunk text: reprocessing a redelivered document
+            # overwrites, and a chunk an edit left unchanged keeps its ID
+            occurrence = 0
+            context_id = derived_context_id(raw_id, chunk_hash, occurrence)
+            while context_id in taken_ids:
+                occurrence += 1
+                context_id = derived_context_id(raw_id, chunk_hash, occurrence)
+            taken_ids.add(context_id)
+            # TODO: semantic additional
+            knowledge_metadata = KnowledgeContextMetadata(
+                knowledge_source=raw_context.source,
+                knowledge_file_path=raw_context.content_path or "",
+                knowledge_raw_id=raw_id,
+                knowledge_chunk_hash=chunk_hash,
+                knowledge_source_key=ChunkSource.of(chunk.source_text or chunk.text).key(),
+                # knowledge_title=raw_context.title,
+            )
             ctx = ProcessedContext(
+                id=context_id,
                 properties=ContextProperties(
                     raw_properties=[raw_context],
                     create_time=now,
                     update_time=now,
                     event_time=now,
                     enable_merge=False,
-                    raw_type=raw_context.content_type,
-                    raw_id=raw_context.object_id,
+                    raw_type=raw_type,
+                    raw_id=raw_id,
                 ),
                 extracted_data=ExtractedData(
                     title="",
@@ -292,13 +344,53 @@ class DocumentProcessor(BaseContextProcessor):
         return contexts
 
     def _process_text_content(self, raw_context: RawContextProperties) -> List[ProcessedContext]:
-        """Process TEXT type (vaults text content)"""
-        if not raw_context.content_text:
-            return []
-        chunks = self._document_chunker.chunk_text(
-            texts=[raw_context.content_text],
+        """
+        Process TEXT type (vaults text content)
+
+        An edited document is re-chunked against the chunks stored for it: unchanged chunks
+        stay as they are, only the changed text is split and embedded again, and chunks that
+        no longer appear in the document are deleted.
+        """
+        _, raw_id = self._document_key(raw_context)
+        stored = self._get_stored_chunks(raw_id)
+        if not stored:
+            if not raw_context.content_text:
+                return []
+            chunks = self._document_chunker.chunk_text(
+                texts=[raw_context.content_text],
+            )
+            return self._create_contexts_from_chunks(raw_context, chunks)
+
+        kept, chunks = self._document_chunker.chunk_text_incremental(
+            texts=[raw_context.content_text or ""],
+            previous_sources=[self._chunk_source(context) for context in stored],
         )
-        return self._create_contexts_from_chunks(raw_context, chunks)
+        kept_ids = {stored[i].id for i in kept}
+        contexts = self._create_contexts_from_chunks(raw_context, chunks, taken_ids=kept_ids)
+        new_ids = {context.id for context in contexts}
+        stale_ids = [
+            context.id
+            for context in stored
+            if context.id not in kept_ids and context.id not in new_ids
+        ]
+        # Removed before the new chunks are stored: if storing fails, the redelivered
+        # document is compared with what is left and the missing text is chunked again
+        if stale_ids:
+            get_storage().delete_contexts(stale_ids, ContextType.KNOWLEDGE_CONTEXT.value)
+        logger.info(
+            f"Document {raw_id}: {len(kept_ids)} chunks unchanged, {len(contexts)} new, "
+            f"{len(stale_ids)} stale deleted"
+        )
+        return contexts
+
+    def _get_stored_chunks(self, raw_id: str) -> List[ProcessedContext]:
+        """Knowledge chunks stored for a document"""
+        stored = []
+        for page in get_storage().iter_processed_contexts(
+            ContextType.KNOWLEDGE_CONTEXT.value, filter={"raw_id": raw_id}
+        ):
+            stored.extend(page)
+        return stored
 
     def _process_visual_document(self, raw_context: RawContextProperties) -> List[ProcessedContext]:
         """
@@ -399,49 +491,74 @@ class DocumentProcessor(BaseContextProcessor):
         if file_ext in [".docx", ".doc", ".md"]:
             return self._process_vlm_pages_with_doc_images(page_infos)
 
-        # For PDF and other formats, convert pages to images
-        # Convert document to images
-        all_images = self._document_converter.convert_to_images(file_path)
+        # For PDF, render only the pages that need VLM, lazily
+        page_numbers = [p.page_number for p in page_infos]
+        pages = self._document_converter.iter_pdf_pages(file_path, page_numbers)
+
+        try:
+            loop = asyncio.get_event_loop()
+        except RuntimeError:
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+
+        page_results = loop.run_until_complete(self._analyze_pages_streaming(pages))
 
-        # Only process pages that need VLM
-        vlm_images = [all_images[p.page_number - 1] for p in page_infos]
-        vlm_page_numbers = [p.page_number for p in page_infos]
+        # One entry per requested page so callers can zip it with page_infos
+        return [page_results[n].get("text", "").strip() for n in page_numbers]
 
-        # VLM analysis
-        page_results = []
-        for i in range(0, len(vlm_images), self._vlm_batch_size):
-            batch = vlm_images[i : i + self._vlm_batch_size]
-            batch_page_nums = vlm_page_numbers[i : i + self._vlm_batch_size]
+    async def _analyze_pages_streaming(
+        self, pages: Iterator[Tuple[int, Image.Image]]
+    ) -> Dict[int, dict]:
+        """
+        Feed lazily rendered pages to the VLM with at most `_vlm_batch_size` pages in flight
 
-            tasks = [
-                self._analyze_image_with_vlm(img, page_num)
-                for img, page_num in zip(batch, batch_page_nums)
-            ]
+        A page is only rendered once a slot is free, so memory stays bounded by the window
+        regardless of document length. Rendering runs in a worker thread, overlapping with
+        the VLM requests of the previous pages. The first failing page aborts the rest.
+        """
+        window = asyncio.Semaphore(max(1, self._vlm_batch_size))
+        results: Dict[int, dict] = {}
+        tasks: Dict[int, asyncio.Task] = {}
 
+        async def analyze(page_number: int, image: Image.Image):
             try:
-                loop = asyncio.get_event_loop()
-            except RuntimeError:
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-
-            batch_results = loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
-
-            for idx, result in enumerate(batch_results):
-                if isinstance(result, Exception):
-                    error_msg = f"Error processing page {batch_page_nums[idx]}: {result}"
-                    logger.error(error_msg)
-                    raise RuntimeError(error_msg) from result
-                else:
-                    page_results.append(result)
-
-        # Collect result texts (as list)
-        text_list = [
-            result.get("text", "").strip()
-            for result in page_results
-            if result.get("text", "").strip()
-        ]
+                results[page_number] = await self._analyze_image_with_vlm(image, page_number)
+            finally:
+                image.close()
+                window.release()
+
+        def failed_page():
+            for page_number, task in tasks.items():
+                if task.done() and not task.cancelled() and task.exception():
+                    return page_number
+            return None
 
-        return text_list
+        try:
+            while True:
+                await window.acquire()
+                if failed_page() is not None:
+                    window.release()
+                    break
+                item = await asyncio.to_thread(next, pages, None)
+                if item is None:
+                    window.release()
+                    break
+                page_number, image = item
+                tasks[page_number] = asyncio.create_task(analyze(page_number, image))
+            if tasks:
+                await asyncio.wait(list(tasks.values()))
+        finally:
+            pages.close()
+            for task in tasks.values():
+                task.cancel()
+
+        page_number = failed_page()
+        if page_number is not None:
+            error = tasks[page_number].exception()
+            error_msg = f"Error processing page {page_number}: {error}"
+            logger.error(error_msg)
+            raise RuntimeError(error_msg) from error
+        return results
 
     def _process_vlm_pages_with_doc_images(self, page_infos: List[PageInfo]) -> List[str]:
         """
@@ -547,10 +664,13 @@ class DocumentProcessor(BaseContextProcessor):
         system_prompt = prompt_group["system"]
         user_prompt = prompt_group["user"]
 
-        # Convert PIL Image to base64
-        buffered = io.BytesIO()
-        image.save(buffered, format="PNG")
-        base64_image = base64.b64encode(buffered.getvalue()).decode("utf-8")
+        # Convert PIL Image to base64 off the event loop, other pages keep streaming meanwhile
+        def encode() -> str:
+            buffered = io.BytesIO()
+            image.save(buffered, format="PNG")
+            return base64.b64encode(buffered.getvalue()).decode("utf-8")
+
+        base64_image = await asyncio.to_thread(encode)
 
         # Build content, including text and image
         content = [
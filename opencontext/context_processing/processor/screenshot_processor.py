@@ -8,15 +8,12 @@
 Screenshot processor
 """
 import asyncio
-import base64
 import datetime
 import heapq
 import json
 import os
-import queue
 import threading
 import time
-from collections import deque
 from typing import Any, Dict, List, Optional, Tuple
 
 from opencontext.context_processing.processor.base_processor import BaseContextProcessor
@@ -24,14 +21,17 @@ from opencontext.context_processing.processor.entity_processor import (
     refresh_entities,
     validate_and_clean_entities,
 )
+from opencontext.context_processing.work_queue import WorkItem, open_work_queue
 from opencontext.llm.global_embedding_client import do_vectorize_async
 from opencontext.llm.global_vlm_client import generate_with_messages_async
+from opencontext.llm.http_pool import run_sync
 from opencontext.models.context import *
 from opencontext.models.enums import get_context_type_descriptions_for_extraction
 from opencontext.monitoring.monitor import record_processing_error
 from opencontext.storage.global_storage import get_storage
 from opencontext.tools.tool_definitions import ALL_TOOL_DEFINITIONS
-from opencontext.utils.image import calculate_phash, resize_image
+from opencontext.utils.hash_index import HammingIndex
+from opencontext.utils.image import ImageFrame
 from opencontext.utils.json_parser import parse_json_from_response
 from opencontext.utils.logging_utils import get_logger
 from opencontext.config.global_config import get_prompt_group
@@ -72,8 +72,14 @@ class ScreenshotProcessor(BaseContextProcessor):
 
         self._stop_event = threading.Event()
 
-        # Pipeline related
-        self._input_queue = queue.Queue(maxsize=self._batch_size * 3)
+        # Pipeline related: captured screenshots are journaled until their batch is stored
+        self._input_queue = open_work_queue(
+            "screenshot",
+            encode=RawContextProperties.dump_json,
+            decode=RawContextProperties.from_json,
+            spill=self._spill_frame,
+            memory_items=self._batch_size * 3,
+        )
         self._processing_task = threading.Thread(target=self._run_processing_loop, daemon=True)
         self._processing_task.start()
 
@@ -81,17 +87,23 @@ class ScreenshotProcessor(BaseContextProcessor):
         self._processed_cache = (
             {}
         )
-        self._current_screenshot = deque(maxlen=self._batch_size * 2)
+        self._recent_hashes = HammingIndex(
+            self._similarity_hash_threshold,
+            window=self.config.get("dedup_cache_size", self._batch_size * 2),
+        )
+        # Screenshots submitted over the API are processed on several threads at once
+        self._dedup_lock = threading.Lock()
 
     def shutdown(self, graceful: bool = False):
         """Gracefully shut down background processing tasks."""
         logger.info("Shutting down ScreenshotProcessor...")
         self._stop_event.set()
-        # Put a sentinel value in the queue to unblock the blocked get()
-        self._input_queue.put(None)
+        # Unblock the waiting get_batch(); a batch still in flight is delivered again on restart
+        self._input_queue.interrupt()
         self._processing_task.join(timeout=5)
         if self._processing_task.is_alive():
             logger.warning("ScreenshotProcessor background task failed to stop in time.")
+        self._input_queue.close()
         logger.info("ScreenshotProcessor has been shut down.")
 
     def get_name(self) -> str:
@@ -114,6 +126,8 @@ class ScreenshotProcessor(BaseContextProcessor):
     def _is_duplicate(self, new_context: RawContextProperties) -> bool:
         """
         Real-time deduplication of incoming screenshots after image compression.
+        Captured frames are already deduplicated per monitor; this also covers screenshots
+        submitted by path and near duplicates across monitors.
 
         Args:
             new_context (RawContextProperties): New screenshot context.
@@ -122,29 +136,20 @@ class ScreenshotProcessor(BaseContextProcessor):
         Returns:
             bool: Returns True if it's a new image, False if it's a duplicate image.
         """
-        new_phash = calculate_phash(new_context.content_path)
-        if new_phash is None:
-            raise ValueError("Failed to calculate screenshot pHash")
-
-        # To avoid modification during iteration
-        for item in list(self._current_screenshot):
-            diff = bin(int(str(new_phash), 16) ^ int(str(item["phash"]), 16)).count("1")
-            if diff <= self._similarity_hash_threshold:
-                # Find duplicate, move it to end of list (consider as most recently used)
-                self._current_screenshot.remove(item)
-                self._current_screenshot.append(item)
-
-                if self._enabled_delete:
-                    try:
-                        os.remove(new_context.content_path)
-                    except Exception as e:
-                        logger.error(f"Failed to delete duplicate screenshot file: {e}")
-                return True
-
-        # If no duplicate found, it's a new image
-        self._current_screenshot.append({"phash": new_phash, "id": new_context.object_id})
-
-        return False
+        # A match is refreshed as the most recently seen entry; a new image is added
+        dhash_value = new_context.frame.dhash
+        with self._dedup_lock:
+            match = self._recent_hashes.find_or_add(new_context.object_id, dhash_value)
+        if match is None:
+            return False
+
+        new_context.frame.release()
+        if self._enabled_delete and new_context.content_path:
+            try:
+                os.remove(new_context.content_path)
+            except Exception as e:
+                logger.error(f"Failed to delete duplicate screenshot file: {e}")
+        return True
 
     def process(self, context: RawContextProperties) -> bool:
         """
@@ -155,10 +160,12 @@ class ScreenshotProcessor(BaseContextProcessor):
         if not self.can_process(context):
             return False
         try:
-            if self._max_image_size > 0:
-                resize_image(context.content_path, self._max_image_size, self._resize_quality)
+            self._ensure_frame(context)
             if not self._is_duplicate(context):
-                self._input_queue.put(context, timeout=2)
+                if not self._input_queue.put(context.object_id, context):
+                    logger.error(f"Screenshot queue is full, dropping {context.content_path}")
+                    self._settle_rejected(context)
+                    return False
                 # Record screenshot path for UI display
                 from opencontext.monitoring import record_screenshot_path
 
@@ -166,72 +173,125 @@ class ScreenshotProcessor(BaseContextProcessor):
                     record_screenshot_path(context.content_path)
         except Exception as e:
             logger.exception(f"Error processing screenshot {context.content_path}: {e}")
+            self._settle_rejected(context)
+            return False
+        return True
+
+    @staticmethod
+    def _settle_rejected(context: RawContextProperties):
+        """
+        Let the downscaled file of a rejected screenshot finish writing, so the caller
+        may remove the file once it is told of the rejection
+        """
+        if context.frame is not None:
+            context.frame.wait_persisted()
+
+    def _ensure_frame(self, context: RawContextProperties) -> ImageFrame:
+        """
+        Attach a decoded, downscaled frame to the context.
+        Captured screenshots already carry one; file-based ones are decoded here, once.
+        """
+        if context.frame is None:
+            if not context.content_path or not os.path.exists(context.content_path):
+                raise ValueError(f"Screenshot path is invalid or does not exist: {context.content_path}")
+            frame = ImageFrame.from_file(
+                context.content_path, self._max_image_size, self._resize_quality
+            )
+            context.frame = frame
+            # Keep the stored file as small as before, without blocking the pipeline
+            if frame.size != frame.original_size:
+                frame.persist_async(context.content_path)
+        elif context.frame.downscale(self._max_image_size) and context.content_path:
+            context.frame.persist_async(context.content_path)
+        return context.frame
+
+    @staticmethod
+    def _spill_frame(context: RawContextProperties) -> bool:
+        """
+        Drop the frame of a screenshot queued beyond the in-memory window; it is decoded
+        again from its file when its turn comes. Frames without a file, or whose file is
+        still being written, stay in memory for now: this runs under the queue lock.
+        """
+        if not context.content_path or context.frame is None:
+            return context.frame is None
+        if not context.frame.wait_persisted(timeout=0):
             return False
+        context.frame.release()
+        context.frame = None
         return True
 
+    def get_backpressure(self) -> float:
+        return self._input_queue.pressure()
+
     def _run_processing_loop(self):
-        from opencontext.monitoring import (
-            increment_data_count,
-            increment_recording_stat,
-            record_processing_metrics,
-        )
         """Background processing loop for handling screenshots in input queue."""
-        unprocessed_contexts = []
-        last_process_time = int(time.time())
         while not self._stop_event.is_set():
             try:
-                # Wait for new items or timeout
-                raw_context = self._input_queue.get(timeout=self._batch_timeout)
-                if raw_context is None:  # sentinel value
-                    logger.info("Received sentinel value, exiting processing loop")
-                    break
-                # Process deduplication
-                unprocessed_contexts.append(raw_context)
-                if (int(time.time()) - last_process_time) < self._batch_timeout * 2 and len(
-                    unprocessed_contexts
-                ) < self._batch_size:
-                    # logger.info(f"Screenshots in cache: {len(unprocessed_contexts)}")
-                    continue
-            except queue.Empty:
-                # logger.info("Queue empty, waiting for new data")
-                continue
+                # Wait for a full batch, or process what arrived within the batch window
+                items = self._input_queue.get_batch(self._batch_size, self._batch_timeout * 2)
             except Exception as e:
                 logger.error(f"Unexpected error in processing loop: {e}")
                 time.sleep(1)
-            start_time = time.time()
-            increment_data_count("screenshot", count=len(unprocessed_contexts))
-            try:
-                processed_contexts =  asyncio.run(self.batch_process(unprocessed_contexts))
-                if processed_contexts:
-                    get_storage().batch_upsert_processed_context(processed_contexts)
-            except Exception as e:
-                error_msg = f"Failed during concurrent VLM processing: {e}"
-                logger.error(error_msg)
-                record_processing_error(
-                    error_msg, processor_name=self.get_name(), context_count=len(unprocessed_contexts)
-                )
-                increment_recording_stat("failed", len(unprocessed_contexts))
                 continue
-            try:
-                duration_ms = int((time.time() - start_time) * 1000)
-                record_processing_metrics(
-                    processor_name=self.get_name(),
-                    operation="screenshot_process",
-                    duration_ms=duration_ms,
-                    context_count=len(processed_contexts),
-                )
+            if items:
+                self._process_items(items)
 
-                # Record context count by type
-                for context in processed_contexts:
-                    increment_data_count("context", count=1, context_type=context.extracted_data.context_type.value)
+    def _process_items(self, items: List[WorkItem]):
+        """Process a leased batch; stored screenshots are acknowledged, failed ones retried"""
+        unprocessed_contexts = []
+        for item in items:
+            context = item.value
+            if context.frame is None and not (
+                context.content_path and os.path.exists(context.content_path)
+            ):
+                # Replayed after a restart, but the image was never written or is gone
+                logger.warning(f"Screenshot {context.object_id} has no image left, skipping")
+                self._input_queue.ack([item])
+                continue
+            unprocessed_contexts.append(context)
+        if not unprocessed_contexts:
+            return
 
-                # Increment processed screenshots count
-                increment_recording_stat("processed", len(processed_contexts))
+        start_time = time.time()
+        increment_data_count("screenshot", count=len(unprocessed_contexts))
+        failed = []
+        try:
+            processed_contexts = run_sync(self.batch_process(unprocessed_contexts, failed))
+            if processed_contexts:
+                get_storage().batch_upsert_processed_context(processed_contexts)
+        except Exception as e:
+            error_msg = f"Failed during concurrent VLM processing: {e}"
+            logger.error(error_msg)
+            record_processing_error(
+                error_msg, processor_name=self.get_name(), context_count=len(unprocessed_contexts)
+            )
+            increment_recording_stat("failed", len(unprocessed_contexts))
+            self._input_queue.retry(items, error_msg)
+            return
+
+        failed_ids = {context.object_id for context in failed}
+        self._input_queue.retry(
+            [item for item in items if item.key in failed_ids], "VLM processing failed"
+        )
+        self._input_queue.ack([item for item in items if item.key not in failed_ids])
+        try:
+            duration_ms = int((time.time() - start_time) * 1000)
+            record_processing_metrics(
+                processor_name=self.get_name(),
+                operation="screenshot_process",
+                duration_ms=duration_ms,
+                context_count=len(processed_contexts),
+            )
+
+            # Record context count by type
+            for context in processed_contexts:
+                increment_data_count("context", count=1, context_type=context.extracted_data.context_type.value)
 
-            except ImportError:
-                pass
-            unprocessed_contexts.clear()
-            last_process_time = int(time.time())
+            # Increment processed screenshots count
+            increment_recording_stat("processed", len(processed_contexts))
+
+        except ImportError:
+            pass
 
     async def _process_vlm_single(self, raw_context: RawContextProperties) -> List[ProcessedContext]:
         """
@@ -246,22 +306,19 @@ class ScreenshotProcessor(BaseContextProcessor):
             logger.error("Failed to get complete prompt for screenshot_analyze.")
             raise ValueError("Missing prompt configuration for screenshot_analyze")
 
-        # Prepare image data
-        image_path = raw_context.content_path
-        if not image_path or not os.path.exists(image_path):
-            logger.error(f"Screenshot path is invalid or does not exist: {image_path}")
-            raise ValueError(f"Screenshot path is invalid or does not exist: {image_path}")
-
-        base64_image = self._encode_image_to_base64(image_path)
-        if not base64_image:
-            logger.warning(f"Failed to encode image: {image_path}")
-            raise ValueError(f"Failed to encode image: {image_path}")
+        # Prepare image data from the in-memory frame, encoded once at capture
+        frame = self._ensure_frame(raw_context)
+        base64_image = frame.to_base64()
+        mime_type = frame.mime_type
+        # The frame is not needed past this point; free its pixels and bytes
+        frame.release()
+        raw_context.frame = None
 
         content = [
             {
                 "type": "image_url",
                 "image_url": {
-                    "url": f"data:image/png;base64,{base64_image}",
+                    "url": f"data:{mime_type};base64,{base64_image}",
                 },
             }
         ]
@@ -310,8 +367,8 @@ class ScreenshotProcessor(BaseContextProcessor):
             raise ValueError("Empty VLM response items.")
 
         processed_items = []
-        for item in items:
-            processed_items.append(self._create_processed_context(item, raw_context))
+        for index, item in enumerate(items):
+            processed_items.append(self._create_processed_context(item, raw_context, index))
         return processed_items
 
     async def _merge_contexts(self, processed_items: List[ProcessedContext]) -> List[ProcessedContext]:
@@ -408,6 +465,7 @@ class ScreenshotProcessor(BaseContextProcessor):
                     all_raw_props.extend(item.properties.raw_properties)
 
                 merged_ctx = ProcessedContext(
+                    id=derived_context_id("merged", *sorted(i.id for i in items_to_merge)),
                     properties=ContextProperties(
                         raw_properties=all_raw_props,
                         create_time=min_create_time,
@@ -509,9 +567,14 @@ class ScreenshotProcessor(BaseContextProcessor):
             else None,
         }
 
-    async def batch_process(self, raw_contexts: List[RawContextProperties]) -> List[ProcessedContext]:
+    async def batch_process(
+        self,
+        raw_contexts: List[RawContextProperties],
+        failed: Optional[List[RawContextProperties]] = None,
+    ) -> List[ProcessedContext]:
         """
-        Batch process screenshots using Vision LLM with concurrent batch processing
+        Batch process screenshots using Vision LLM with concurrent batch processing.
+        Screenshots whose VLM call failed are appended to ``failed`` when given.
         """
 
         logger.info(f"Processing {len(raw_contexts)} screenshots concurrently")
@@ -527,6 +590,8 @@ class ScreenshotProcessor(BaseContextProcessor):
             if isinstance(result, Exception):
                 logger.error(f"Screenshot {idx} failed with error: {result}")
                 increment_recording_stat("failed", 1)
+                if failed is not None:
+                    failed.append(raw_contexts[idx])
                 record_processing_error(str(result), processor_name=self.get_name(), context_count=1)
                 continue
             if result:
@@ -544,7 +609,7 @@ class ScreenshotProcessor(BaseContextProcessor):
         newly_processed_contexts = await self._merge_contexts(all_vlm_items)
         return newly_processed_contexts
 
-    def _create_processed_context(self, analysis: Dict[str, Any], raw_context: RawContextProperties = None) -> ProcessedContext:
+    def _create_processed_context(self, analysis: Dict[str, Any], raw_context: RawContextProperties = None, index: int = 0) -> ProcessedContext:
         now = datetime.datetime.now()
         if not analysis:
             logger.warning(f"Skipping incomplete item: {analysis}")
@@ -576,6 +641,8 @@ class ScreenshotProcessor(BaseContextProcessor):
         )
 
         new_context = ProcessedContext(
+            # Stable per screenshot and item, so reprocessing a redelivered screenshot is idempotent
+            **({"id": derived_context_id(raw_context.object_id, index)} if raw_context else {}),
             properties=ContextProperties(
                 raw_properties=[raw_context] if raw_context else [],
                 source=ContextSource.SCREENSHOT,
@@ -593,12 +660,3 @@ class ScreenshotProcessor(BaseContextProcessor):
             metadata=raw_context.additional_info if raw_context and raw_context.additional_info else {},
         )
         return new_context
-
-    def _encode_image_to_base64(self, image_path: str) -> Optional[str]:
-        """Encode image file to base64 string."""
-        try:
-            with open(image_path, "rb") as image_file:
-                return base64.b64encode(image_file.read()).decode("utf-8")
-        except Exception as e:
-            logger.error(f"Error encoding image {image_path} to base64: {e}")
-            return None
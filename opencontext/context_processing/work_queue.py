@@ -0,0 +1,384 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2025 Beijing Volcano Engine Technology Co., Ltd.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Durable work queue between capture and the processors
+Items are journaled in SQLite before they are accepted, leased to the processing thread and
+deleted once acknowledged, so captured work survives a restart and failed batches are retried
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from opencontext.config.global_config import get_config
+from opencontext.utils.logging_utils import get_logger
+
+logger = get_logger(__name__)
+
+# Item states
+_READY = 0
+_LEASED = 1
+_DEAD = 2  # Out of attempts, kept for inspection
+
+
+class WorkItem:
+    """A leased item; ``value`` is the in-memory object, or the one decoded from its payload"""
+
+    __slots__ = ("id", "key", "value", "attempts")
+
+    def __init__(self, item_id: int, key: str, value: Any, attempts: int):
+        self.id = item_id
+        self.key = key
+        self.value = value
+        self.attempts = attempts
+
+
+class DurableWorkQueue:
+    """
+    Persistent FIFO with at-least-once delivery.
+
+    ``put`` commits the encoded item before returning; items are unique per key, so putting
+    an item again while it is queued is a no-op. ``get_batch`` leases ready items, which
+    must then be acknowledged (deleted) or released for retry with exponential backoff;
+    after ``max_attempts`` an item is parked as dead. Items still leased when the process
+    died are delivered again when the queue is reopened.
+
+    The first ``memory_items`` queued objects are also kept in memory, so the normal path
+    hands the processor the live object (e.g. a screenshot with its decoded frame) and only
+    a backlog beyond that, or a restart, decodes items from disk. ``spill`` is called on an
+    object beyond that window and returns whether it may be dropped from memory; it runs
+    under the queue lock and must not block. Objects it keeps are offered again on later
+    puts until they are spilled or leased.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        path: Optional[str],
+        encode: Callable[[Any], str],
+        decode: Callable[[str], Any],
+        spill: Optional[Callable[[Any], bool]] = None,
+        memory_items: int = 64,
+        high_watermark: int = 200,
+        max_items: int = 50000,
+        max_attempts: int = 5,
+        retry_base_seconds: float = 30,
+        retry_max_seconds: float = 1800,
+    ):
+        self.name = name
+        self._encode = encode
+        self._decode = decode
+        self._spill = spill
+        self._memory_items = max(0, int(memory_items))
+        self._high_watermark = max(1, int(high_watermark))
+        self._max_items = max(1, int(max_items))
+        self._max_attempts = max(1, int(max_attempts))
+        self._retry_base = float(retry_base_seconds)
+        self._retry_max = float(retry_max_seconds)
+
+        self._cond = threading.Condition()
+        self._live: Dict[str, Any] = {}
+        # Keys of queued objects beyond the in-memory window that spill has kept so far
+        self._unspilled: Dict[str, None] = {}
+        self._interrupted = False
+        self._stats = {
+            "enqueued": 0,
+            "duplicates": 0,
+            "rejected": 0,
+            "acked": 0,
+            "retried": 0,
+            "dead": 0,
+            "recovered": 0,
+            "decoded": 0,
+        }
+        self._connection: Optional[sqlite3.Connection] = None
+        try:
+            self._open(path or ":memory:")
+        except Exception as e:
+            logger.error(f"Failed to open work queue {name} at {path}, using memory only: {e}")
+            self._open(":memory:")
+
+    def _open(self, path: str):
+        if path != ":memory:":
+            dir_name = os.path.dirname(path)
+            if dir_name:
+                os.makedirs(dir_name, exist_ok=True)
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS items (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                item_key TEXT NOT NULL UNIQUE,
+                payload TEXT NOT NULL,
+                state INTEGER NOT NULL DEFAULT 0,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                available_at REAL NOT NULL,
+                enqueued_at REAL NOT NULL,
+                last_error TEXT
+            )
+            """
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS idx_items_ready ON items (state, available_at, id)"
+        )
+        # Leases of a previous run were never acknowledged: deliver those items again
+        recovered = self._connection.execute(
+            "UPDATE items SET state = ? WHERE state = ?", (_READY, _LEASED)
+        ).rowcount
+        self._connection.commit()
+        self._stats["recovered"] = recovered
+        self._depth = self._connection.execute(
+            "SELECT COUNT(*) FROM items WHERE state != ?", (_DEAD,)
+        ).fetchone()[0]
+        if self._depth:
+            logger.info(
+                f"Work queue {self.name}: {self._depth} items pending from a previous run "
+                f"({recovered} were being processed)"
+            )
+
+    # Producer side
+
+    def put(self, key: str, value: Any) -> bool:
+        """Journal an item; False if the queue is full or closed"""
+        payload = self._encode(value)
+        with self._cond:
+            if self._connection is None:
+                return False
+            if self._depth >= self._max_items:
+                self._stats["rejected"] += 1
+                return False
+            now = time.time()
+            inserted = self._connection.execute(
+                "INSERT OR IGNORE INTO items (item_key, payload, available_at, enqueued_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, payload, now, now),
+            ).rowcount
+            self._connection.commit()
+            if not inserted:
+                self._stats["duplicates"] += 1
+                return True
+            self._depth += 1
+            self._stats["enqueued"] += 1
+            full = len(self._live) >= self._memory_items
+            self._live[key] = value
+            if full and self._spill:
+                self._unspilled[key] = None
+                self._spill_locked()
+            self._cond.notify_all()
+            return True
+
+    def _spill_locked(self):
+        for key in list(self._unspilled):
+            value = self._live.get(key)
+            if value is None or self._spill(value):
+                self._live.pop(key, None)
+                del self._unspilled[key]
+
+    def pressure(self) -> float:
+        """Queue depth relative to the high watermark: above 1.0 producers should slow down"""
+        return self._depth / self._high_watermark
+
+    # Consumer side
+
+    def get_batch(self, max_items: int, max_wait: float) -> List[WorkItem]:
+        """
+        Lease up to max_items ready items, waiting up to max_wait for the batch to fill.
+
+        Returns what is ready at the deadline, possibly nothing, and returns at once when
+        the queue is interrupted.
+        """
+        deadline = time.monotonic() + max_wait
+        with self._cond:
+            while not self._interrupted and self._connection is not None:
+                now = time.time()
+                ready = self._connection.execute(
+                    "SELECT COUNT(*) FROM items WHERE state = ? AND available_at <= ?",
+                    (_READY, now),
+                ).fetchone()[0]
+                remaining = deadline - time.monotonic()
+                if ready >= max_items or (ready and remaining <= 0):
+                    return self._lease_locked(max_items, now)
+                if remaining <= 0:
+                    return []
+                # Sleep until notified of a put, the deadline, or the next retry is due
+                due = self._connection.execute(
+                    "SELECT MIN(available_at) FROM items WHERE state = ? AND available_at > ?",
+                    (_READY, now),
+                ).fetchone()[0]
+                wait = remaining if due is None else min(remaining, max(0.01, due - now))
+                self._cond.wait(wait)
+            return []
+
+    def _lease_locked(self, max_items: int, now: float) -> List[WorkItem]:
+        rows = self._connection.execute(
+            "SELECT id, item_key, payload, attempts FROM items "
+            "WHERE state = ? AND available_at <= ? ORDER BY id LIMIT ?",
+            (_READY, now, max_items),
+        ).fetchall()
+        self._connection.executemany(
+            "UPDATE items SET state = ? WHERE id = ?", [(_LEASED, row[0]) for row in rows]
+        )
+        self._connection.commit()
+        items = []
+        for item_id, key, payload, attempts in rows:
+            # The processor now holds the object: it must not be spilled under it
+            self._unspilled.pop(key, None)
+            value = self._live.get(key)
+            if value is None:
+                try:
+                    value = self._decode(payload)
+                    self._stats["decoded"] += 1
+                except Exception as e:
+                    logger.error(f"Work queue {self.name}: dropping undecodable item {key}: {e}")
+                    self._delete_locked([item_id])
+                    continue
+            items.append(WorkItem(item_id, key, value, attempts))
+        return items
+
+    def ack(self, items: List[WorkItem]):
+        """Processing finished: remove the items"""
+        if not items:
+            return
+        with self._cond:
+            if self._connection is None:
+                return  # Closed: the items are delivered again on the next start
+            self._delete_locked([item.id for item in items])
+            self._connection.commit()
+            for item in items:
+                self._live.pop(item.key, None)
+            self._stats["acked"] += len(items)
+
+    def retry(self, items: List[WorkItem], error: str = ""):
+        """Processing failed: deliver the items again after a backoff, or park them as dead"""
+        if not items:
+            return
+        now = time.time()
+        with self._cond:
+            if self._connection is None:
+                return
+            for item in items:
+                attempts = item.attempts + 1
+                if attempts >= self._max_attempts:
+                    self._connection.execute(
+                        "UPDATE items SET state = ?, attempts = ?, last_error = ? WHERE id = ?",
+                        (_DEAD, attempts, error, item.id),
+                    )
+                    self._live.pop(item.key, None)
+                    self._depth -= 1
+                    self._stats["dead"] += 1
+                    logger.error(
+                        f"Work queue {self.name}: giving up on {item.key} after "
+                        f"{attempts} attempts: {error}"
+                    )
+                    continue
+                delay = min(self._retry_max, self._retry_base * 2 ** (attempts - 1))
+                self._connection.execute(
+                    "UPDATE items SET state = ?, attempts = ?, available_at = ?, last_error = ? "
+                    "WHERE id = ?",
+                    (_READY, attempts, now + delay, error, item.id),
+                )
+                self._stats["retried"] += 1
+            self._connection.commit()
+            self._cond.notify_all()
+
+    def _delete_locked(self, ids: List[int]):
+        self._connection.executemany("DELETE FROM items WHERE id = ?", [(i,) for i in ids])
+        self._depth -= len(ids)
+
+    # Lifecycle
+
+    def interrupt(self):
+        """Wake the consumer and make get_batch return empty, e.g. on shutdown"""
+        with self._cond:
+            self._interrupted = True
+            self._cond.notify_all()
+
+    def close(self):
+        """Close the journal; unacknowledged items are delivered again on the next start"""
+        with self._cond:
+            self._interrupted = True
+            self._cond.notify_all()
+            self._live.clear()
+            self._unspilled.clear()
+            if self._connection is not None:
+                try:
+                    self._connection.close()
+                except Exception:
+                    pass
+                self._connection = None
+        _unregister(self)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._cond:
+            stats = dict(self._stats)
+            stats.update(
+                {
+                    "depth": self._depth,
+                    "memory_items": len(self._live),
+                    "pressure": round(self.pressure(), 3),
+                }
+            )
+            if self._connection is not None:
+                now = time.time()
+                stats["leased"], stats["waiting_retry"], stats["dead_items"] = (
+                    self._connection.execute(
+                        "SELECT COALESCE(SUM(state = ?), 0), "
+                        "COALESCE(SUM(state = ? AND available_at > ?), 0), "
+                        "COALESCE(SUM(state = ?), 0) FROM items",
+                        (_LEASED, _READY, now, _DEAD),
+                    ).fetchone()
+                )
+        return stats
+
+
+_queues: Dict[str, DurableWorkQueue] = {}
+_queues_lock = threading.Lock()
+
+
+def open_work_queue(
+    name: str,
+    encode: Callable[[Any], str],
+    decode: Callable[[str], Any],
+    spill: Optional[Callable[[Any], bool]] = None,
+    memory_items: int = 64,
+) -> DurableWorkQueue:
+    """Open the queue ``name`` as configured under ``processing.work_queue``"""
+    config = get_config("processing.work_queue") or {}
+    directory = config.get("path")
+    queue = DurableWorkQueue(
+        name,
+        os.path.join(directory, f"{name}.db") if directory else None,
+        encode,
+        decode,
+        spill=spill,
+        memory_items=config.get("memory_items", memory_items),
+        high_watermark=config.get("high_watermark", 200),
+        max_items=config.get("max_items", 50000),
+        max_attempts=config.get("max_attempts", 5),
+        retry_base_seconds=config.get("retry_base_seconds", 30),
+        retry_max_seconds=config.get("retry_max_seconds", 1800),
+    )
+    with _queues_lock:
+        _queues[name] = queue
+    return queue
+
+
+def _unregister(queue: DurableWorkQueue):
+    with _queues_lock:
+        if _queues.get(queue.name) is queue:
+            del _queues[queue.name]
+
+
+def get_work_queue_stats() -> Dict[str, Any]:
+    """Depth, retry and recovery statistics of every open work queue"""
+    with _queues_lock:
+        queues = list(_queues.values())
+    return {queue.name: queue.get_stats() for queue in queues}
@@ -0,0 +1,209 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2025 Beijing Volcano Engine Technology Co., Ltd.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Embedding request coalescer
+Collects concurrent single-text embedding requests into multi-input requests
+"""
+
+import asyncio
+import concurrent.futures
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from opencontext.llm.request_scheduler import RequestPriority, get_request_priority, llm_priority
+from opencontext.utils.logging_utils import get_logger
+
+logger = get_logger(__name__)
+
+# (texts, kwargs) -> embeddings, one embedding per text in the same order
+EmbedBatchFn = Callable[..., List[List[float]]]
+
+
+@dataclass
+class _EmbeddingRequest:
+    text: str
+    kwargs: Dict[str, Any]
+    # The submitter's; the batch is sent on the batcher's threads, outside its context
+    priority: RequestPriority = RequestPriority.CAPTURE
+    future: concurrent.futures.Future = field(default_factory=concurrent.futures.Future)
+
+    @property
+    def group_key(self) -> Tuple:
+        # Requests with different options (e.g. output_dim) cannot share a request
+        return tuple(sorted(self.kwargs.items()))
+
+
+class EmbeddingBatcher:
+    """
+    Micro-batching layer in front of an embedding function.
+
+    Single requests submitted from any thread or event loop are queued; a background
+    thread drains the queue into batches of at most ``max_batch_size`` texts, waiting
+    at most ``max_wait_ms`` after the first request of a batch before dispatching it.
+    Batches are dispatched on a small thread pool so that slow requests do not stall
+    the collection of the next batch.
+    """
+
+    def __init__(
+        self,
+        embed_fn: EmbedBatchFn,
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5,
+        max_concurrency: int = 4,
+    ):
+        self._embed_fn = embed_fn
+        self._max_batch_size = max(1, int(max_batch_size))
+        self._max_wait = max(0.0, float(max_wait_ms)) / 1000.0
+        self._queue: "queue.Queue[Optional[_EmbeddingRequest]]" = queue.Queue()
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max(1, int(max_concurrency)), thread_name_prefix="embedding-batch"
+        )
+        self._stop_event = threading.Event()
+        # Makes the stop check and the put in submit atomic with shutdown
+        self._submit_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._stats = {"batches": 0, "texts": 0, "errors": 0}
+        self._worker = threading.Thread(target=self._run, name="embedding-batcher", daemon=True)
+        self._worker.start()
+
+    def submit(self, text: str, **kwargs) -> concurrent.futures.Future:
+        """Queue a text for embedding and return a future resolving to its vector"""
+        request = _EmbeddingRequest(text=text, kwargs=kwargs, priority=get_request_priority())
+        with self._submit_lock:
+            if not self._stop_event.is_set():
+                self._queue.put(request)
+                return request.future
+        # Late caller still holding a retired batcher: serve it directly
+        self._dispatch([request])
+        return request.future
+
+    def embed(self, text: str, **kwargs) -> List[float]:
+        """Blocking single-text embedding through the coalescer"""
+        return self.submit(text, **kwargs).result()
+
+    async def embed_async(self, text: str, **kwargs) -> List[float]:
+        """Awaitable single-text embedding through the coalescer"""
+        return await asyncio.wrap_future(self.submit(text, **kwargs))
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats["avg_batch_size"] = stats["texts"] / stats["batches"] if stats["batches"] else 0
+        stats["queue_size"] = self._queue.qsize()
+        return stats
+
+    def shutdown(self, wait: bool = True):
+        """Stop accepting requests, flush what is queued and release the worker threads"""
+        with self._submit_lock:
+            if self._stop_event.is_set():
+                return
+            self._stop_event.set()
+            # Nothing is queued after the sentinel, so the worker's final drain sees it all
+            self._queue.put(None)
+        if wait:
+            self._worker.join(timeout=10)
+        self._executor.shutdown(wait=wait)
+
+    def _collect_batch(self) -> Optional[List[_EmbeddingRequest]]:
+        """Block for the first request, then gather more until full or the wait expires"""
+        first = self._queue.get()
+        if first is None:
+            return None
+        batch = [first]
+        deadline = time.monotonic() + self._max_wait
+        while len(batch) < self._max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                item = (
+                    self._queue.get(timeout=remaining)
+                    if remaining > 0
+                    else self._queue.get_nowait()
+                )
+            except queue.Empty:
+                break
+            if item is None:
+                # Shutdown requested: dispatch what we have, then stop on the next loop
+                self._queue.put(None)
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect_batch()
+            if batch is None:
+                break
+            self._dispatch_safely(batch)
+
+        # Serve anything submitted concurrently with shutdown
+        leftovers = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                leftovers.append(item)
+        if leftovers:
+            self._dispatch_safely(leftovers)
+
+    def _dispatch_safely(self, batch: List[_EmbeddingRequest]):
+        """Dispatch a batch; an unexpected error fails its requests instead of the worker"""
+        try:
+            self._dispatch_groups(batch)
+        except Exception as e:
+            logger.exception(f"Dispatching embedding batch of {len(batch)} failed: {e}")
+            for request in batch:
+                if not request.future.done():
+                    request.future.set_exception(e)
+
+    def _dispatch_groups(self, batch: List[_EmbeddingRequest]):
+        groups: Dict[Tuple, List[_EmbeddingRequest]] = {}
+        for request in batch:
+            try:
+                key = request.group_key
+                hash(key)
+            except TypeError as e:
+                # Options that cannot be grouped (e.g. a list value) fail only this request
+                request.future.set_exception(e)
+                continue
+            groups.setdefault(key, []).append(request)
+        for requests in groups.values():
+            try:
+                self._executor.submit(self._dispatch, requests)
+            except RuntimeError:
+                # Executor already shut down, run inline so no caller hangs
+                self._dispatch(requests)
+
+    def _dispatch(self, requests: List[_EmbeddingRequest]):
+        texts = [r.text for r in requests]
+        try:
+            # A batch is as urgent as its most urgent request
+            with llm_priority(min(r.priority for r in requests)):
+                vectors = self._embed_fn(texts, **requests[0].kwargs)
+            if len(vectors) != len(requests):
+                raise ValueError(
+                    f"Embedding batch size mismatch: expected {len(requests)}, got {len(vectors)}"
+                )
+        except Exception as e:
+            logger.error(f"Embedding batch of {len(requests)} failed: {e}")
+            with self._stats_lock:
+                self._stats["errors"] += 1
+            for request in requests:
+                if not request.future.done():
+                    request.future.set_exception(e)
+            return
+
+        with self._stats_lock:
+            self._stats["batches"] += 1
+            self._stats["texts"] += len(requests)
+        for request, vector in zip(requests, vectors):
+            if not request.future.done():
+                request.future.set_result(vector)
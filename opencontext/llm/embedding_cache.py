@@ -0,0 +1,317 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2025 Beijing Volcano Engine Technology Co., Ltd.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Content-addressed embedding cache
+Persists embeddings in SQLite keyed by (model, output_dim, text hash) with an in-process LRU front
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence
+
+from opencontext.utils.logging_utils import get_logger
+
+logger = get_logger(__name__)
+
+CACHE_NAME = "embedding"
+# Recency refreshes of disk hits are written in batches rather than one commit per lookup
+_TOUCH_BATCH = 256
+
+
+def hash_text(text: str) -> str:
+    """Content address of a text"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    Two-level embedding cache.
+
+    Vectors are stored as float32 blobs in a SQLite table, keyed by the embedding model,
+    the effective output dimension and the SHA-256 of the text. An in-memory LRU keeps the
+    hottest vectors. The on-disk table is bounded to ``max_entries`` rows, evicting the
+    least recently used ones. Entries of other (model, output_dim) namespaces are purged
+    when the cache is opened, so changing either setting invalidates the cache.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str],
+        model: str,
+        output_dim: int = 0,
+        memory_items: int = 2048,
+        max_entries: int = 200000,
+    ):
+        self._model = model or ""
+        self._output_dim = int(output_dim or 0)
+        self._memory_items = max(0, int(memory_items))
+        self._max_entries = max(1, int(max_entries))
+        self._lru: "OrderedDict[tuple, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+        self._connection: Optional[sqlite3.Connection] = None
+        self._row_count = 0
+        self._pending_touches: Dict[tuple, float] = {}
+
+        if path:
+            try:
+                self._open(path)
+            except Exception as e:
+                logger.error(f"Failed to open embedding cache at {path}, using memory only: {e}")
+                self._connection = None
+
+    def _open(self, path: str):
+        dir_name = os.path.dirname(path)
+        if dir_name:
+            os.makedirs(dir_name, exist_ok=True)
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS embeddings (
+                model TEXT NOT NULL,
+                output_dim INTEGER NOT NULL,
+                text_hash TEXT NOT NULL,
+                vector BLOB NOT NULL,
+                last_access REAL NOT NULL,
+                PRIMARY KEY (model, output_dim, text_hash)
+            )
+            """
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS idx_embeddings_last_access ON embeddings (last_access)"
+        )
+        # Invalidate vectors produced by a different model or output dimension
+        cursor = self._connection.execute(
+            "DELETE FROM embeddings WHERE model != ? OR output_dim != ?",
+            (self._model, self._output_dim),
+        )
+        if cursor.rowcount:
+            logger.info(f"Embedding cache invalidated {cursor.rowcount} stale entries")
+        self._connection.commit()
+        self._row_count = self._connection.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    @property
+    def model(self) -> str:
+        return self._model
+
+    @property
+    def output_dim(self) -> int:
+        return self._output_dim
+
+    def _key(self, text: str, output_dim: int) -> tuple:
+        return (output_dim, hash_text(text))
+
+    def get_many(
+        self, texts: Sequence[str], output_dim: Optional[int] = None
+    ) -> List[Optional[List[float]]]:
+        """Look up texts, returning the cached vector or None for each"""
+        dim = self._output_dim if output_dim is None else int(output_dim or 0)
+        keys = [self._key(t, dim) for t in texts]
+        results: List[Optional[List[float]]] = [None] * len(keys)
+        disk_lookup: Dict[tuple, List[int]] = {}
+        memory_hits = 0
+
+        with self._lock:
+            for i, key in enumerate(keys):
+                vector = self._lru.get(key)
+                if vector is not None:
+                    self._lru.move_to_end(key)
+                    results[i] = vector
+                    memory_hits += 1
+                else:
+                    disk_lookup.setdefault(key, []).append(i)
+
+            disk_hits = 0
+            if disk_lookup and self._connection is not None:
+                try:
+                    found = self._select(list(disk_lookup.keys()))
+                except Exception as e:
+                    logger.warning(f"Embedding cache read failed: {e}")
+                    found = {}
+                for key, vector in found.items():
+                    for i in disk_lookup[key]:
+                        results[i] = vector
+                        disk_hits += 1
+                    self._remember(key, vector)
+                if found:
+                    self._touch(list(found.keys()))
+
+            misses = len(keys) - memory_hits - disk_hits
+            self._stats["memory_hits"] += memory_hits
+            self._stats["disk_hits"] += disk_hits
+            self._stats["misses"] += misses
+
+        self._report(hits=memory_hits + disk_hits, misses=misses)
+        return results
+
+    def get(self, text: str, output_dim: Optional[int] = None) -> Optional[List[float]]:
+        return self.get_many([text], output_dim)[0]
+
+    def put_many(
+        self, texts: Sequence[str], vectors: Sequence[List[float]], output_dim: Optional[int] = None
+    ):
+        """Store vectors for texts"""
+        dim = self._output_dim if output_dim is None else int(output_dim or 0)
+        now = time.time()
+        rows = []
+        with self._lock:
+            for text, vector in zip(texts, vectors):
+                if not vector:
+                    continue
+                key = self._key(text, dim)
+                self._remember(key, list(vector))
+                rows.append((self._model, dim, key[1], array("f", vector).tobytes(), now))
+            if not rows or self._connection is None:
+                return
+            try:
+                self._flush_touches()
+                before = self._connection.total_changes
+                self._connection.executemany(
+                    "INSERT OR REPLACE INTO embeddings "
+                    "(model, output_dim, text_hash, vector, last_access) VALUES (?, ?, ?, ?, ?)",
+                    rows,
+                )
+                self._row_count += self._connection.total_changes - before
+                evicted = self._evict()
+                self._connection.commit()
+            except Exception as e:
+                logger.warning(f"Embedding cache write failed: {e}")
+                return
+        if evicted:
+            self._report(evictions=evicted)
+
+    def put(self, text: str, vector: List[float], output_dim: Optional[int] = None):
+        self.put_many([text], [vector], output_dim)
+
+    def clear(self):
+        """Drop every cached vector"""
+        with self._lock:
+            self._lru.clear()
+            if self._connection is not None:
+                try:
+                    self._connection.execute("DELETE FROM embeddings")
+                    self._connection.commit()
+                    self._row_count = 0
+                except Exception as e:
+                    logger.warning(f"Embedding cache clear failed: {e}")
+
+    def close(self):
+        with self._lock:
+            self._lru.clear()
+            if self._connection is not None:
+                try:
+                    self._flush_touches()
+                    self._connection.commit()
+                    self._connection.close()
+                except Exception:
+                    pass
+                self._connection = None
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_entries"] = len(self._lru)
+            stats["disk_entries"] = self._row_count
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = (stats["memory_hits"] + stats["disk_hits"]) / lookups if lookups else 0
+        stats["model"] = self._model
+        stats["output_dim"] = self._output_dim
+        return stats
+
+    def _select(self, keys: List[tuple]) -> Dict[tuple, List[float]]:
+        """Read vectors for keys from disk (caller holds the lock)"""
+        found = {}
+        by_dim: Dict[int, List[str]] = {}
+        for dim, text_hash in keys:
+            by_dim.setdefault(dim, []).append(text_hash)
+        for dim, hashes in by_dim.items():
+            # Stay well below SQLite's host parameter limit
+            for start in range(0, len(hashes), 500):
+                chunk = hashes[start : start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._connection.execute(
+                    f"SELECT text_hash, vector FROM embeddings "
+                    f"WHERE model = ? AND output_dim = ? AND text_hash IN ({placeholders})",
+                    (self._model, dim, *chunk),
+                ).fetchall()
+                for text_hash, blob in rows:
+                    found[(dim, text_hash)] = array("f", blob).tolist()
+        return found
+
+    def _touch(self, keys: List[tuple]):
+        """
+        Refresh recency of disk entries promoted to memory (caller holds the lock).
+        Refreshes are buffered and written with the next insert, or once enough piled up.
+        """
+        now = time.time()
+        for key in keys:
+            self._pending_touches[key] = now
+        if len(self._pending_touches) >= _TOUCH_BATCH:
+            self._flush_touches()
+            try:
+                self._connection.commit()
+            except Exception as e:
+                logger.debug(f"Embedding cache touch failed: {e}")
+
+    def _flush_touches(self):
+        """Write buffered recency refreshes, uncommitted (caller holds the lock)"""
+        if not self._pending_touches:
+            return
+        touches, self._pending_touches = self._pending_touches, {}
+        try:
+            self._connection.executemany(
+                "UPDATE embeddings SET last_access = ? "
+                "WHERE model = ? AND output_dim = ? AND text_hash = ?",
+                [(at, self._model, dim, text_hash) for (dim, text_hash), at in touches.items()],
+            )
+        except Exception as e:
+            logger.debug(f"Embedding cache touch failed: {e}")
+
+    def _remember(self, key: tuple, vector: List[float]):
+        """Insert into the memory LRU (caller holds the lock)"""
+        if self._memory_items <= 0:
+            return
+        self._lru[key] = vector
+        self._lru.move_to_end(key)
+        while len(self._lru) > self._memory_items:
+            self._lru.popitem(last=False)
+
+    def _evict(self) -> int:
+        """Trim the disk table back under max_entries (caller holds the lock)"""
+        if self._row_count <= self._max_entries:
+            return 0
+        # Replacements are counted as inserts above, so recount before evicting
+        self._row_count = self._connection.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        if self._row_count <= self._max_entries:
+            return 0
+        # Evict a little more than needed so eviction does not run on every insert
+        target = int(self._max_entries * 0.9)
+        excess = self._row_count - target
+        cursor = self._connection.execute(
+            "DELETE FROM embeddings WHERE rowid IN "
+            "(SELECT rowid FROM embeddings ORDER BY last_access ASC LIMIT ?)",
+            (excess,),
+        )
+        evicted = cursor.rowcount
+        self._row_count -= evicted
+        self._stats["evictions"] += evicted
+        return evicted
+
+    def _report(self, hits: int = 0, misses: int = 0, evictions: int = 0):
+        try:
+            from opencontext.monitoring import record_cache_access
+
+            record_cache_access(CACHE_NAME, hits=hits, misses=misses, evictions=evictions)
+        except Exception:
+            pass  # Monitoring module not installed or initialized
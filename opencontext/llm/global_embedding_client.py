@@ -9,10 +9,13 @@ Global embedding client singleton wrapper
 Provides global access to embedding client instances
 """
 
+import asyncio
 import threading
 from typing import Dict, List, Optional
 
 from opencontext.config.global_config import get_config
+from opencontext.llm.embedding_batcher import EmbeddingBatcher
+from opencontext.llm.embedding_cache import EmbeddingCache
 from opencontext.llm.llm_client import LLMClient, LLMType
 from opencontext.models.context import Vectorize
 from opencontext.utils.logging_utils import get_logger
@@ -43,6 +46,10 @@ class GlobalEmbeddingClient:
             with self._lock:
                 if not self._initialized:
                     self._embedding_client: Optional[LLMClient] = None
+                    self._batcher: Optional[EmbeddingBatcher] = None
+                    self._cache: Optional[EmbeddingCache] = None
+                    self._max_batch_size = 32
+                    self._max_concurrency = 4
                     self._auto_initialized = False
                     GlobalEmbeddingClient._initialized = True
 
@@ -69,15 +76,60 @@ class GlobalEmbeddingClient:
                 return
 
             self._embedding_client = LLMClient(llm_type=LLMType.EMBEDDING, config=embedding_config)
+            self._batcher = self._create_batcher(self._embedding_client, embedding_config)
+            self._cache = self._create_cache(embedding_config)
             logger.info("GlobalEmbeddingClient auto-initialized successfully")
             self._auto_initialized = True
         except Exception as e:
             logger.error(f"GlobalEmbeddingClient auto-initialization failed: {e}")
             self._auto_initialized = True
 
+    def _create_batcher(
+        self, client: LLMClient, embedding_config: Dict
+    ) -> Optional[EmbeddingBatcher]:
+        """Create the request coalescer from embedding_model.batching"""
+        batching_config = embedding_config.get("batching") or {}
+        self._max_batch_size = int(batching_config.get("max_batch_size", 32))
+        self._max_concurrency = max(1, int(batching_config.get("max_concurrency", 4)))
+        if not batching_config.get("enabled", True):
+            return None
+        return EmbeddingBatcher(
+            client.generate_embeddings,
+            max_batch_size=self._max_batch_size,
+            max_wait_ms=batching_config.get("max_wait_ms", 5),
+            max_concurrency=self._max_concurrency,
+        )
+
+    def _create_cache(self, embedding_config: Dict) -> Optional[EmbeddingCache]:
+        """Create the embedding cache from embedding_model.cache"""
+        cache_config = embedding_config.get("cache") or {}
+        if not cache_config.get("enabled", True):
+            return None
+        return EmbeddingCache(
+            path=cache_config.get("path", "./persist/embedding_cache/embeddings.db"),
+            model=embedding_config.get("model", ""),
+            output_dim=embedding_config.get("output_dim", 0),
+            memory_items=cache_config.get("memory_items", 2048),
+            max_entries=cache_config.get("max_entries", 200000),
+        )
+
     def is_initialized(self) -> bool:
         return self._embedding_client is not None
 
+    def get_cache_stats(self) -> Dict:
+        """Get embedding cache statistics"""
+        cache = self._cache
+        if cache is None:
+            return {"enabled": False}
+        return {"enabled": True, **cache.get_stats()}
+
+    def get_batching_stats(self) -> Dict:
+        """Get request coalescing statistics"""
+        batcher = self._batcher
+        if batcher is None:
+            return {"enabled": False}
+        return {"enabled": True, **batcher.get_stats()}
+
     def reinitialize(self, new_config: Optional[Dict] = None):
         """
         Reinitialize embedding client (thread-safe)
@@ -90,19 +142,76 @@ class GlobalEmbeddingClient:
                     raise ValueError("No embedding config found")
                 logger.info("Reinitializing embedding client...")
                 new_client = LLMClient(llm_type=LLMType.EMBEDDING, config=embedding_config)
+                new_batcher = self._create_batcher(new_client, embedding_config)
+                old_batcher = self._batcher
+                old_cache = self._cache
+                cache_config = embedding_config.get("cache") or {}
+                if (
+                    old_cache is not None
+                    and cache_config.get("enabled", True)
+                    and old_cache.model == (embedding_config.get("model") or "")
+                    and old_cache.output_dim == int(embedding_config.get("output_dim") or 0)
+                ):
+                    new_cache = old_cache
+                else:
+                    # Model or output_dim changed: reopening purges the stale vectors
+                    if old_cache is not None:
+                        old_cache.close()
+                    new_cache = self._create_cache(embedding_config)
                 old_client = self._embedding_client
                 self._embedding_client = new_client
+                self._batcher = new_batcher
+                self._cache = new_cache
+                if old_batcher is not None:
+                    # Flush requests already queued against the old client
+                    old_batcher.shutdown(wait=False)
+                if old_client is not None:
+                    old_client.close()
                 logger.info("Embedding client reinitialization completed")
             except Exception as e:
                 logger.error(f"Failed to reinitialize embedding client: {e}")
                 return False
             return True
 
+    def _cache_dim(self, client: LLMClient, kwargs: Dict) -> int:
+        return int(kwargs.get("output_dim", client.config.get("output_dim", 0)) or 0)
+
     def do_embedding(self, text: str, **kwargs) -> List[float]:
         """
         Get text embeddings
         """
-        return self._embedding_client.generate_embedding(text, **kwargs)
+        client, batcher, cache = self._embedding_client, self._batcher, self._cache
+        if cache is not None:
+            dim = self._cache_dim(client, kwargs)
+            vector = cache.get(text, dim)
+            if vector is not None:
+                return vector
+        if batcher is not None:
+            vector = batcher.embed(text, **kwargs)
+        else:
+            vector = client.generate_embedding(text, **kwargs)
+        if cache is not None:
+            cache.put(text, vector, dim)
+        return vector
+
+    async def do_embedding_async(self, text: str, **kwargs) -> List[float]:
+        """
+        Get text embeddings asynchronously
+        """
+        client, batcher, cache = self._embedding_client, self._batcher, self._cache
+        if cache is not None:
+            # The cache reads and writes SQLite: keep it off the event loop
+            dim = self._cache_dim(client, kwargs)
+            vector = await asyncio.to_thread(cache.get, text, dim)
+            if vector is not None:
+                return vector
+        if batcher is not None:
+            vector = await batcher.embed_async(text, **kwargs)
+        else:
+            vector = await client.generate_embedding_async(text, **kwargs)
+        if cache is not None:
+            await asyncio.to_thread(cache.put, text, vector, dim)
+        return vector
 
     def do_vectorize(self, vectorize: Vectorize, **kwargs):
         """
@@ -110,16 +219,93 @@ class GlobalEmbeddingClient:
         """
         if vectorize.vector:
             return
-        self._embedding_client.vectorize(vectorize, **kwargs)
+        vectorize.vector = self.do_embedding(vectorize.get_vectorize_content(), **kwargs)
         return
-    
+
     async def do_vectorize_async(self, vectorize: Vectorize, **kwargs):
         """
         Vectorize a Vectorize object asynchronously
         """
         if vectorize.vector:
             return
-        await self._embedding_client.vectorize_async(vectorize, **kwargs)
+        vectorize.vector = await self.do_embedding_async(
+            vectorize.get_vectorize_content(), **kwargs
+        )
+        return
+
+    def _plan_batch(self, client: LLMClient, cache: Optional[EmbeddingCache], vectorizes, kwargs):
+        """
+        Fill cached vectors and return the distinct texts that still need embedding,
+        along with the objects waiting on each of them.
+        """
+        waiting: Dict[str, List[Vectorize]] = {}
+        for v in vectorizes:
+            if not v.vector:
+                waiting.setdefault(v.get_vectorize_content(), []).append(v)
+        texts = list(waiting.keys())
+        if cache is not None and texts:
+            cached = cache.get_many(texts, self._cache_dim(client, kwargs))
+            for text, vector in zip(texts, cached):
+                if vector is not None:
+                    for v in waiting.pop(text):
+                        v.vector = vector
+        return waiting
+
+    def _apply_batch(self, client, cache, waiting, texts, vectors, kwargs):
+        if cache is not None:
+            cache.put_many(texts, vectors, self._cache_dim(client, kwargs))
+        for text, vector in zip(texts, vectors):
+            for v in waiting[text]:
+                v.vector = vector
+
+    def do_vectorize_batch(self, vectorizes: List[Vectorize], **kwargs):
+        """
+        Vectorize several Vectorize objects with as few requests as possible
+        """
+        client, cache = self._embedding_client, self._cache
+        waiting = self._plan_batch(client, cache, vectorizes, kwargs)
+        texts = list(waiting.keys())
+        for start in range(0, len(texts), self._max_batch_size):
+            chunk = texts[start : start + self._max_batch_size]
+            vectors = client.generate_embeddings(chunk, **kwargs)
+            self._apply_batch(client, cache, waiting, chunk, vectors, kwargs)
+        return
+
+    async def do_vectorize_batch_async(self, vectorizes: List[Vectorize], **kwargs):
+        """
+        Vectorize several Vectorize objects asynchronously with as few requests as possible
+        """
+        client, batcher, cache = self._embedding_client, self._batcher, self._cache
+        waiting = await asyncio.to_thread(self._plan_batch, client, cache, vectorizes, kwargs)
+        texts = list(waiting.keys())
+        chunks = [
+            texts[start : start + self._max_batch_size]
+            for start in range(0, len(texts), self._max_batch_size)
+        ]
+        if batcher is not None:
+            # Sent by the coalescer, within its limit of concurrent embedding requests
+            vectors = await asyncio.gather(*[batcher.embed_async(text, **kwargs) for text in texts])
+            results = [
+                vectors[start : start + len(chunk)]
+                for start, chunk in zip(range(0, len(texts), self._max_batch_size), chunks)
+            ]
+        else:
+            slots = asyncio.Semaphore(self._max_concurrency)
+
+            async def embed(chunk: List[str]) -> List[List[float]]:
+                async with slots:
+                    return await client.generate_embeddings_async(chunk, **kwargs)
+
+            results = await asyncio.gather(*[embed(chunk) for chunk in chunks])
+        if cache is not None and chunks:
+            await asyncio.to_thread(
+                cache.put_many,
+                texts,
+                [v for vectors in results for v in vectors],
+                self._cache_dim(client, kwargs),
+            )
+        for chunk, vectors in zip(chunks, results):
+            self._apply_batch(client, None, waiting, chunk, vectors, kwargs)
         return
 
 
@@ -133,6 +319,17 @@ def do_embedding(text: str, **kwargs) -> List[float]:
 
 def do_vectorize(vectorize_obj: Vectorize, **kwargs):
     return GlobalEmbeddingClient.get_instance().do_vectorize(vectorize_obj, **kwargs)
-  
+
+
 async def do_vectorize_async(vectorize_obj: Vectorize, **kwargs):
     return await GlobalEmbeddingClient.get_instance().do_vectorize_async(vectorize_obj, **kwargs)
+
+
+def do_vectorize_batch(vectorize_objs: List[Vectorize], **kwargs):
+    return GlobalEmbeddingClient.get_instance().do_vectorize_batch(vectorize_objs, **kwargs)
+
+
+async def do_vectorize_batch_async(vectorize_objs: List[Vectorize], **kwargs):
+    return await GlobalEmbeddingClient.get_instance().do_vectorize_batch_async(
+        vectorize_objs, **kwargs
+    )
@@ -11,13 +11,16 @@ Provides global access to LLMManager instances
 
 import asyncio
 import concurrent.futures
+import contextvars
 import json
 import threading
+import time
 from typing import Any, Dict, Optional
 
 from opencontext.config.global_config import get_config
 from opencontext.llm.llm_client import LLMClient, LLMType
 from opencontext.storage.unified_storage import UnifiedStorage
+from opencontext.tools.base import abandon_tool_call, in_tool_worker, submit_tool_call
 from opencontext.utils.json_parser import parse_json_from_response
 from opencontext.utils.logging_utils import get_logger
 
@@ -116,6 +119,9 @@ class GlobalVLMClient:
                 new_client = LLMClient(llm_type=LLMType.CHAT, config=vlm_config)
                 old_client = self._vlm_client
                 self._vlm_client = new_client
+                if old_client is not None:
+                    # Requests still running on it finish within the pool's close grace period
+                    old_client.close()
                 logger.info("GlobalVLMClient reinitialized successfully")
 
             except Exception as e:
@@ -153,24 +159,7 @@ class GlobalVLMClient:
                 function_name = tc.function.name
                 function_args = parse_json_from_response(tc.function.arguments)
                 tool_call_info.append((tc.id, function_name, function_args))
-            results = []
-            with concurrent.futures.ThreadPoolExecutor() as executor:
-                future_to_tool = {
-                    executor.submit(self._tools_executor.run, function_name, function_args): (
-                        tool_id,
-                        function_name,
-                    )
-                    for tool_id, function_name, function_args in tool_call_info
-                }
-                for future in concurrent.futures.as_completed(future_to_tool):
-                    tool_id, function_name = future_to_tool[future]
-                    try:
-                        content = future.result()
-                        # logger.info(f"Tool call {function_name} successful, result: {content}")
-                        results.append((tool_id, function_name, content))
-                    except Exception as e:
-                        # logger.exception(f"Tool call {function_name} failed: {e}")
-                        results.append((tool_id, function_name, "failed"))
+            results = self._run_tools(tool_call_info)
             # logger.info(f"Tool call results: {results}")
             for tool_id, function_name, content in results:
                 messages.append(
@@ -186,6 +175,49 @@ class GlobalVLMClient:
         message = response.choices[0].message
         return message.content
 
+    def _run_tools(self, tool_call_info: list) -> list:
+        """
+        Run tool calls in parallel on the shared tool executor, each within its time limit
+
+        Returns (tool_id, function_name, content) in call order.
+        """
+        if in_tool_worker():
+            # Called from a tool: waiting on the bounded pool from one of its own workers
+            # could deadlock it, so run the calls inline
+            futures = None
+        else:
+            started = time.monotonic()
+            # Each call carries the caller's context, e.g. its LLM request priority
+            futures = [
+                submit_tool_call(
+                    contextvars.copy_context().run,
+                    self._tools_executor.run,
+                    function_name,
+                    function_args,
+                )
+                for _, function_name, function_args in tool_call_info
+            ]
+
+        results = []
+        for i, (tool_id, function_name, function_args) in enumerate(tool_call_info):
+            try:
+                if futures is None:
+                    content = self._tools_executor.run(function_name, function_args)
+                else:
+                    deadline = started + self._tools_executor.get_timeout(function_name)
+                    content = futures[i].result(timeout=max(0.0, deadline - time.monotonic()))
+                results.append((tool_id, function_name, content))
+            except concurrent.futures.TimeoutError:
+                abandon_tool_call(futures[i])
+                logger.warning(f"Tool {function_name} timed out")
+                results.append(
+                    (tool_id, function_name, self._tools_executor.timeout_result(function_name))
+                )
+            except Exception as e:
+                # logger.exception(f"Tool call {function_name} failed: {e}")
+                results.append((tool_id, function_name, "failed"))
+        return results
+
     async def generate_with_messages_async(
         self, messages: list, enable_executor: bool = True, max_calls: int = 5, **kwargs
     ):
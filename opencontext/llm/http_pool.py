@@ -0,0 +1,367 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2025 Beijing Volcano Engine Technology Co., Ltd.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Shared HTTP connection pools for model endpoints
+One keep-alive pool per endpoint, shared by every LLMClient (chat, stream, VLM, embedding) using it
+"""
+
+import asyncio
+import importlib
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional
+
+from openai import DefaultAsyncHttpxClient, DefaultHttpxClient
+
+# Transports and streams must come from the HTTP library the installed OpenAI SDK is built
+# on: httpx, or its successor package httpx2 in recent releases
+httpx = importlib.import_module(DefaultHttpxClient.__mro__[1].__module__.split(".")[0])
+
+from opencontext.config.global_config import get_config
+from opencontext.utils.logging_utils import get_logger
+
+logger = get_logger(__name__)
+
+_TTFB_SAMPLES = 256
+_TTFB_START = "opencontext.ttfb_start"
+# Unread body a closed async response may still read to keep its connection
+_DRAIN_MAX_BYTES = 64 * 1024
+_DRAIN_TIMEOUT = 0.5
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+
+        return True
+    except ImportError:
+        return False
+
+
+def endpoint_key(base_url: str) -> str:
+    """Pool key of a base URL: its origin, so clients of one host share connections"""
+    url = httpx.URL(base_url)
+    port = f":{url.port}" if url.port else ""
+    return f"{url.scheme}://{url.host}{port}"
+
+
+class _DrainingByteStream(httpx.AsyncByteStream):
+    """
+    Response body that reads its unread tail before releasing the connection.
+
+    The OpenAI SDK stops reading a stream at its [DONE] event and closes the response,
+    leaving the end of the chunked body unread; httpcore then drops the connection
+    instead of returning it to the pool, so every streamed answer paid for a new TCP and
+    TLS handshake. Closing first drains what is left, within a small byte and time budget
+    so an abandoned long stream is still cut off promptly.
+    """
+
+    def __init__(self, stream: httpx.AsyncByteStream):
+        self._stream = stream
+        self._complete = False
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+        self._complete = True
+
+    async def _drain(self):
+        read = 0
+        async for chunk in self._stream:
+            read += len(chunk)
+            if read > _DRAIN_MAX_BYTES:
+                return
+        self._complete = True
+
+    async def aclose(self):
+        if not self._complete:
+            try:
+                await asyncio.wait_for(self._drain(), _DRAIN_TIMEOUT)
+            except Exception:
+                pass  # The connection is closed below instead of reused
+        await self._stream.aclose()
+
+
+class _DrainingTransport(httpx.AsyncBaseTransport):
+    def __init__(self, transport: httpx.AsyncHTTPTransport):
+        self.transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        response = await self.transport.handle_async_request(request)
+        response.stream = _DrainingByteStream(response.stream)
+        return response
+
+    async def aclose(self):
+        await self.transport.aclose()
+
+
+class EndpointPool:
+    """
+    Connection pools of one endpoint.
+
+    The sync client is shared by every thread. httpx async connections are bound to the
+    event loop that opened them, and coroutines run both on the server loop and on the
+    short-lived loops of sync wrappers, so each event loop gets its own async client,
+    created on first use. A loop's client keeps the loop referenced through its
+    connections, so it is closed by ``run_sync`` before its loop ends, and a client whose
+    loop was closed some other way is dropped on the next lookup.
+    """
+
+    def __init__(self, endpoint: str, config: Dict[str, Any]):
+        self.endpoint = endpoint
+        self._limits = httpx.Limits(
+            max_connections=config.get("max_connections", 32),
+            max_keepalive_connections=config.get("max_keepalive_connections", 16),
+            keepalive_expiry=config.get("keepalive_expiry", 60),
+        )
+        self._http2 = bool(config.get("http2", True)) and _http2_available()
+        self._lock = threading.Lock()
+        self._sync_client: Optional[httpx.Client] = None
+        # event loop -> httpx.AsyncClient
+        self._async_clients: Dict[asyncio.AbstractEventLoop, httpx.AsyncClient] = {}
+        self._ttfb_ms: deque = deque(maxlen=_TTFB_SAMPLES)
+        self._stats = {"requests": 0, "responses": 0}
+        self._refs = 0
+        self._close_timer: Optional[threading.Timer] = None
+        self._closed = False
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def sync_client(self) -> httpx.Client:
+        with self._lock:
+            if self._closed:
+                raise RuntimeError(f"HTTP pool for {self.endpoint} is closed")
+            if self._sync_client is None:
+                self._sync_client = DefaultHttpxClient(
+                    limits=self._limits,
+                    http2=self._http2,
+                    event_hooks={"request": [self._on_request], "response": [self._on_response]},
+                )
+            return self._sync_client
+
+    def async_client(self) -> httpx.AsyncClient:
+        """Async client of the running event loop"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError(f"HTTP pool for {self.endpoint} is closed")
+            drop_closed_loops(self._async_clients)
+            client = self._async_clients.get(loop)
+            if client is None:
+                transport = httpx.AsyncHTTPTransport(limits=self._limits, http2=self._http2)
+                client = DefaultAsyncHttpxClient(
+                    transport=_DrainingTransport(transport),
+                    event_hooks={
+                        "request": [self._on_request_async],
+                        "response": [self._on_response_async],
+                    },
+                )
+                self._async_clients[loop] = client
+            return client
+
+    async def aclose_loop_client(self):
+        """Close the running event loop's async client, e.g. before the loop ends"""
+        with self._lock:
+            client = self._async_clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+    def _on_request(self, request: httpx.Request):
+        request.extensions[_TTFB_START] = time.perf_counter()
+        with self._lock:
+            self._stats["requests"] += 1
+
+    def _on_response(self, response: httpx.Response):
+        # Response hooks run once the status line and headers are in: time to first byte
+        start = response.request.extensions.get(_TTFB_START)
+        with self._lock:
+            self._stats["responses"] += 1
+            if start is not None:
+                self._ttfb_ms.append((time.perf_counter() - start) * 1000)
+        for listener in _response_listeners.get(self.endpoint, ()):
+            try:
+                listener(response.status_code, response.headers)
+            except Exception as e:
+                logger.warning(f"HTTP response listener failed for {self.endpoint}: {e}")
+
+    async def _on_request_async(self, request: httpx.Request):
+        self._on_request(request)
+
+    async def _on_response_async(self, response: httpx.Response):
+        self._on_response(response)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            clients = [self._sync_client] if self._sync_client is not None else []
+            clients.extend(self._async_clients.values())
+            stats = dict(self._stats)
+            samples = sorted(self._ttfb_ms)
+            last_ttfb = self._ttfb_ms[-1] if self._ttfb_ms else None
+            stats["refs"] = self._refs
+        active = idle = 0
+        for client in clients:
+            # httpx keeps its httpcore pool private; read it defensively
+            transport = getattr(client, "_transport", None)
+            transport = getattr(transport, "transport", transport)
+            pool = getattr(transport, "_pool", None)
+            for connection in getattr(pool, "connections", []):
+                if connection.is_closed():
+                    continue
+                if connection.is_idle():
+                    idle += 1
+                else:
+                    active += 1
+        stats.update(
+            {
+                "endpoint": self.endpoint,
+                "http2": self._http2,
+                "event_loops": len(clients) - (1 if self._sync_client is not None else 0),
+                "active_connections": active,
+                "idle_connections": idle,
+                "max_connections": self._limits.max_connections,
+                "ttfb_ms": {
+                    "samples": len(samples),
+                    "p50": samples[len(samples) // 2] if samples else None,
+                    "p95": samples[int(len(samples) * 0.95) - 1] if len(samples) >= 20 else None,
+                    "last": last_ttfb,
+                },
+            }
+        )
+        return stats
+
+    def close(self):
+        """Close every connection of the endpoint"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            sync_client, self._sync_client = self._sync_client, None
+            async_clients = list(self._async_clients.items())
+            self._async_clients.clear()
+        if sync_client is not None:
+            sync_client.close()
+        for loop, client in async_clients:
+            # A loop that is not running cannot be driven from here; its client's sockets
+            # are released when the loop and client are collected
+            if loop.is_running() and not loop.is_closed():
+                asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+
+
+def drop_closed_loops(clients: Dict[asyncio.AbstractEventLoop, Any]):
+    """
+    Forget the clients of event loops that were closed without run_sync; their
+    connections cannot be closed on a closed loop, the sockets go with the objects
+    """
+    for loop in [loop for loop in clients if loop.is_closed()]:
+        del clients[loop]
+
+
+async def aclose_loop_clients():
+    """Close the async clients every endpoint pool holds for the running event loop"""
+    with _pools_lock:
+        pools = list(_pools.values())
+    for pool in pools:
+        try:
+            await pool.aclose_loop_client()
+        except Exception as e:
+            logger.debug(f"Error closing async HTTP client of {pool.endpoint}: {e}")
+
+
+def run_sync(coro):
+    """
+    asyncio.run for code calling model endpoints from a sync context: the short-lived
+    loop's pooled async clients are closed before the loop is, so their sockets go too
+    """
+
+    async def main():
+        try:
+            return await coro
+        finally:
+            await aclose_loop_clients()
+
+    return asyncio.run(main())
+
+
+_pools: Dict[str, EndpointPool] = {}
+_pools_lock = threading.Lock()
+# endpoint -> callables(status_code, headers) told of every response, retried ones included
+_response_listeners: Dict[str, List[Callable[[int, Any], None]]] = {}
+
+
+def add_response_listener(base_url: str, listener: Callable[[int, Any], None]):
+    """Call listener with the status and headers of every response of base_url's endpoint"""
+    key = endpoint_key(base_url)
+    with _pools_lock:
+        _response_listeners[key] = _response_listeners.get(key, []) + [listener]
+
+
+def acquire_pool(base_url: str) -> EndpointPool:
+    """Take a reference on the pool of the endpoint serving base_url, creating it if needed"""
+    key = endpoint_key(base_url)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = EndpointPool(key, get_config("http_pool") or {})
+            logger.info(f"Created HTTP pool for {key} (http2={pool._http2})")
+        if pool._close_timer is not None:
+            pool._close_timer.cancel()
+            pool._close_timer = None
+        pool._refs += 1
+        return pool
+
+
+def release_pool(pool: EndpointPool):
+    """
+    Drop a reference taken with acquire_pool.
+
+    The last release closes the pool after ``http_pool.close_grace_seconds``, so requests
+    still running on a replaced client finish, and a client recreated for the same
+    endpoint (reinitialize) takes the warm connections over.
+    """
+    with _pools_lock:
+        pool._refs -= 1
+        if pool._refs > 0 or _pools.get(pool.endpoint) is not pool:
+            return
+        grace = (get_config("http_pool") or {}).get("close_grace_seconds", 30)
+        timer = threading.Timer(grace, _close_if_unused, args=(pool,))
+        timer.daemon = True
+        pool._close_timer = timer
+        timer.start()
+
+
+def _close_if_unused(pool: EndpointPool):
+    with _pools_lock:
+        if pool._refs > 0 or _pools.get(pool.endpoint) is not pool:
+            return
+        del _pools[pool.endpoint]
+        pool._close_timer = None
+    pool.close()
+    logger.info(f"Closed HTTP pool for {pool.endpoint}")
+
+
+def close_all_pools():
+    """Close every endpoint pool, e.g. on shutdown"""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        if pool._close_timer is not None:
+            pool._close_timer.cancel()
+        try:
+            pool.close()
+        except Exception as e:
+            logger.warning(f"Error closing HTTP pool for {pool.endpoint}: {e}")
+
+
+def get_http_pool_stats() -> Dict[str, Any]:
+    """Connection and time-to-first-byte statistics of every endpoint pool"""
+    with _pools_lock:
+        pools = list(_pools.values())
+    return {pool.endpoint: pool.get_stats() for pool in pools}
@@ -7,11 +7,18 @@
 OpenContext module: llm_client
 """
 
+import asyncio
 from enum import Enum
 from typing import Any, Dict, List
 
 from openai import APIError, AsyncOpenAI, OpenAI
 
+from opencontext.llm.http_pool import acquire_pool, drop_closed_loops, release_pool
+from opencontext.llm.request_scheduler import (
+    estimate_text_tokens,
+    estimate_tokens,
+    get_scheduler,
+)
 from opencontext.models.context import Vectorize
 from opencontext.utils.logging_utils import get_logger
 from opencontext.monitoring import record_processing_stage
@@ -39,10 +46,53 @@ class LLMClient:
         self.provider = config.get("provider", LLMProvider.OLLAMA.value)
         if not self.base_url or not self.model:
             raise ValueError("Base URL and model must be provided")
-        self.client = OpenAI(api_key=self.api_key, base_url=self.base_url, timeout=self.timeout)
-        self.async_client = AsyncOpenAI(
-            api_key=self.api_key, base_url=self.base_url, timeout=self.timeout
+        # Connections come from the pool shared by every client of this endpoint
+        self._http_pool = acquire_pool(self.base_url)
+        self._released = False
+        self.client = OpenAI(
+            api_key=self.api_key,
+            base_url=self.base_url,
+            timeout=self.timeout,
+            http_client=self._http_pool.sync_client(),
         )
+        self._async_clients: Dict[asyncio.AbstractEventLoop, AsyncOpenAI] = {}
+        # Requests wait for a slot of the endpoint's scheduler, by priority
+        self._scheduler = get_scheduler(self.base_url)
+
+    @property
+    def async_client(self) -> AsyncOpenAI:
+        """Async client bound to the running event loop's connection pool"""
+        loop = asyncio.get_running_loop()
+        # The httpx client is the pool's: a loop's entry goes when the pool drops its own
+        http_client = self._http_pool.async_client()
+        client = self._async_clients.get(loop)
+        if client is None or client._client is not http_client:
+            drop_closed_loops(self._async_clients)
+            client = AsyncOpenAI(
+                api_key=self.api_key,
+                base_url=self.base_url,
+                timeout=self.timeout,
+                http_client=http_client,
+            )
+            self._async_clients[loop] = client
+        return client
+
+    def close(self):
+        """
+        Release the shared connection pool
+
+        The OpenAI clients are not closed themselves: that would close the pool's
+        connections under every other client of the endpoint.
+        """
+        if not self._released:
+            self._released = True
+            release_pool(self._http_pool)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
 
     def generate(self, prompt: str, **kwargs) -> str:
         messages = [{"role": "user", "content": prompt}]
@@ -108,8 +158,10 @@ class LLMClient:
                 create_params["extra_body"] = {"thinking": {"type": thinking}}
 
             # Stage: LLM API call
-            api_start = time.time()
-            response = self.client.chat.completions.create(**create_params)
+            with self._scheduler.slot(estimate_tokens(messages)) as ticket:
+                api_start = time.time()
+                response = self.client.chat.completions.create(**create_params)
+                ticket.record_usage(response)
 
             record_processing_stage(
                 "chat_cost", int((time.time() - api_start) * 1000), status="success"
@@ -164,8 +216,10 @@ class LLMClient:
             if thinking:
                 create_params["extra_body"] = {"thinking": {"type": thinking}}
             # Stage: LLM API call
-            api_start = time.time()
-            response = await self.async_client.chat.completions.create(**create_params)
+            async with self._scheduler.aslot(estimate_tokens(messages)) as ticket:
+                api_start = time.time()
+                response = await self.async_client.chat.completions.create(**create_params)
+                ticket.record_usage(response)
 
             record_processing_stage(
                 "chat_cost", int((time.time() - api_start) * 1000), status="success"
@@ -215,25 +269,26 @@ class LLMClient:
             if thinking:
                 create_params["extra_body"] = {"thinking": {"type": thinking}}
 
-            stream = self.client.chat.completions.create(**create_params)
-            return stream
+            return self._scheduled_stream(create_params, estimate_tokens(messages))
         except APIError as e:
             logger.error(f"LLM API stream error: {e}")
             raise
 
+    def _scheduled_stream(self, create_params: Dict[str, Any], tokens: int):
+        # The slot is held until the stream is consumed or closed
+        with self._scheduler.slot(tokens):
+            stream = self.client.chat.completions.create(**create_params)
+            try:
+                yield from stream
+            finally:
+                stream.close()
+
     async def _openai_chat_completion_stream_async(self, messages: List[Dict[str, Any]], **kwargs):
         """Async stream chat completion - async generator"""
         try:
             tools = kwargs.get("tools", None)
             thinking = kwargs.get("thinking", None)
 
-            # Create async client
-            from openai import AsyncOpenAI
-
-            async_client = AsyncOpenAI(
-                api_key=self.api_key, base_url=self.base_url, timeout=self.timeout
-            )
-
             create_params = {
                 "model": self.model,
                 "messages": messages,
@@ -246,95 +301,131 @@ class LLMClient:
             if thinking:
                 create_params["extra_body"] = {"thinking": {"type": thinking}}
 
-            stream = await async_client.chat.completions.create(**create_params)
-
-            # Return stream object directly, it's already an async iterator
-            async for chunk in stream:
-                yield chunk
+            # The slot is held for the whole stream, until it ends or the consumer closes it
+            async with self._scheduler.aslot(estimate_tokens(messages)):
+                stream = await self.async_client.chat.completions.create(**create_params)
+                async for chunk in stream:
+                    yield chunk
         except APIError as e:
             logger.error(f"LLM API async stream error: {e}")
             raise
 
-    def _openai_embedding(self, text: str, **kwargs) -> List[float]:
-        try:
-            response = self.client.embeddings.create(model=self.model, input=[text])
-            embedding = response.data[0].embedding
-
-            # Record token usage
-            if hasattr(response, "usage") and response.usage:
-                try:
-                    from opencontext.monitoring import record_token_usage
+    def generate_embeddings(self, texts: List[str], **kwargs) -> List[List[float]]:
+        """Embed several texts with a single request"""
+        if self.llm_type == LLMType.EMBEDDING:
+            return self._openai_embeddings(texts, **kwargs)
+        else:
+            raise ValueError(f"Unsupported LLM type for embedding generation: {self.llm_type}")
 
-                    record_token_usage(
-                        model=self.model,
-                        prompt_tokens=response.usage.prompt_tokens,
-                        completion_tokens=0,  # embedding has no completion tokens
-                        total_tokens=response.usage.total_tokens,
-                    )
-                except ImportError:
-                    pass  # Monitoring module not installed or initialized
+    async def generate_embeddings_async(self, texts: List[str], **kwargs) -> List[List[float]]:
+        """Embed several texts with a single async request"""
+        if self.llm_type == LLMType.EMBEDDING:
+            return await self._openai_embeddings_async(texts, **kwargs)
+        else:
+            raise ValueError(f"Unsupported LLM type for embedding generation: {self.llm_type}")
 
-            output_dim = kwargs.get("output_dim", self.config.get("output_dim", 0))
-            if output_dim and len(embedding) > output_dim:
-                import math
+    def _openai_embedding(self, text: str, **kwargs) -> List[float]:
+        return self._openai_embeddings([text], **kwargs)[0]
 
-                embedding = embedding[:output_dim]
-                norm = math.sqrt(sum(x**2 for x in embedding))
-                if norm > 0:
-                    embedding = [x / norm for x in embedding]
+    async def _openai_embedding_async(self, text: str, **kwargs) -> List[float]:
+        return (await self._openai_embeddings_async([text], **kwargs))[0]
 
-            return embedding
+    def _openai_embeddings(self, texts: List[str], **kwargs) -> List[List[float]]:
+        if not texts:
+            return []
+        try:
+            with self._scheduler.slot(estimate_text_tokens(texts)) as ticket:
+                response = self.client.embeddings.create(model=self.model, input=list(texts))
+                ticket.record_usage(response)
+            return self._parse_embedding_response(response, len(texts), **kwargs)
         except APIError as e:
             logger.error(f"LLM API error during embedding: {e}")
             raise
-          
-    async def _openai_embedding_async(self, text: str, **kwargs) -> List[float]:
-        try:
-            response = await self.async_client.embeddings.create(model=self.model, input=[text])
-            embedding = response.data[0].embedding
 
-            # Record token usage
-            if hasattr(response, "usage") and response.usage:
-                try:
-                    from opencontext.monitoring import record_token_usage
+    async def _openai_embeddings_async(self, texts: List[str], **kwargs) -> List[List[float]]:
+        if not texts:
+            return []
+        try:
+            async with self._scheduler.aslot(estimate_text_tokens(texts)) as ticket:
+                response = await self.async_client.embeddings.create(
+                    model=self.model, input=list(texts)
+                )
+                ticket.record_usage(response)
+            return self._parse_embedding_response(response, len(texts), **kwargs)
+        except APIError as e:
+            logger.error(f"LLM API error during embedding: {e}")
+            raise
 
-                    record_token_usage(
-                        model=self.model,
-                        prompt_tokens=response.usage.prompt_tokens,
-                        completion_tokens=0,  # embedding has no completion tokens
-                        total_tokens=response.usage.total_tokens,
-                    )
-                except ImportError:
-                    pass  # Monitoring module not installed or initialized
+    def _parse_embedding_response(self, response, expected: int, **kwargs) -> List[List[float]]:
+        """Order embeddings by input index, record token usage and apply output_dim"""
+        data = sorted(response.data, key=lambda item: getattr(item, "index", 0) or 0)
+        if len(data) != expected:
+            raise ValueError(
+                f"Embedding response size mismatch: expected {expected}, got {len(data)}"
+            )
 
-            output_dim = kwargs.get("output_dim", self.config.get("output_dim", 0))
-            if output_dim and len(embedding) > output_dim:
-                import math
+        # Record token usage (once per request, whatever the batch size)
+        if hasattr(response, "usage") and response.usage:
+            try:
+                from opencontext.monitoring import record_token_usage
 
-                embedding = embedding[:output_dim]
-                norm = math.sqrt(sum(x**2 for x in embedding))
-                if norm > 0:
-                    embedding = [x / norm for x in embedding]
+                record_token_usage(
+                    model=self.model,
+                    prompt_tokens=response.usage.prompt_tokens,
+                    completion_tokens=0,  # embedding has no completion tokens
+                    total_tokens=response.usage.total_tokens,
+                )
+            except ImportError:
+                pass  # Monitoring module not installed or initialized
 
-            return embedding
-        except APIError as e:
-            logger.error(f"LLM API error during embedding: {e}")
-            raise
+        output_dim = kwargs.get("output_dim", self.config.get("output_dim", 0))
+        return [self._truncate_embedding(item.embedding, output_dim) for item in data]
 
+    @staticmethod
+    def _truncate_embedding(embedding: List[float], output_dim: int) -> List[float]:
+        """Truncate to output_dim and renormalise (Matryoshka-style embeddings)"""
+        if output_dim and len(embedding) > output_dim:
+            import math
 
+            embedding = embedding[:output_dim]
+            norm = math.sqrt(sum(x**2 for x in embedding))
+            if norm > 0:
+                embedding = [x / norm for x in embedding]
+        return embedding
 
     def vectorize(self, vectorize: Vectorize, **kwargs):
         if vectorize.vector:
             return
         vectorize.vector = self.generate_embedding(vectorize.get_vectorize_content(), **kwargs)
         return
-      
+
     async def vectorize_async(self, vectorize: Vectorize, **kwargs):
         if vectorize.vector:
             return
-        vectorize.vector = await self.generate_embedding_async(vectorize.get_vectorize_content(), **kwargs)
+        vectorize.vector = await self.generate_embedding_async(
+            vectorize.get_vectorize_content(), **kwargs
+        )
         return
-      
+
+    def vectorize_batch(self, vectorizes: List[Vectorize], **kwargs):
+        """Vectorize all objects without a vector using one embedding request"""
+        pending = [v for v in vectorizes if not v.vector]
+        if not pending:
+            return
+        vectors = self.generate_embeddings([v.get_vectorize_content() for v in pending], **kwargs)
+        for v, vector in zip(pending, vectors):
+            v.vector = vector
+
+    async def vectorize_batch_async(self, vectorizes: List[Vectorize], **kwargs):
+        """Async variant of vectorize_batch"""
+        pending = [v for v in vectorizes if not v.vector]
+        if not pending:
+            return
+        vectors = await self.generate_embeddings_async(
+            [v.get_vectorize_content() for v in pending], **kwargs
+        )
+        for v, vector in zip(pending, vectors):
+            v.vector = vector
 
     def validate(self) -> tuple[bool, str]:
         """
@@ -403,7 +494,10 @@ class LLMClient:
                 #     }
                 # ]
                 messages = [{"role": "user", "content": "Hi"}]
-                response = self.client.chat.completions.create(model=self.model, messages=messages)
+                with self._scheduler.slot(estimate_tokens(messages)):
+                    response = self.client.chat.completions.create(
+                        model=self.model, messages=messages
+                    )
                 if response.choices and len(response.choices) > 0:
                     return True, "Chat model validation successful"
                 else:
@@ -411,7 +505,8 @@ class LLMClient:
 
             elif self.llm_type == LLMType.EMBEDDING:
                 # Test with a simple text
-                response = self.client.embeddings.create(model=self.model, input=["test"])
+                with self._scheduler.slot(estimate_text_tokens(["test"])):
+                    response = self.client.embeddings.create(model=self.model, input=["test"])
                 if response.data and len(response.data) > 0 and response.data[0].embedding:
                     return True, "Embedding model validation successful"
                 else:
@@ -0,0 +1,469 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2025 Beijing Volcano Engine Technology Co., Ltd.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Global LLM request scheduler
+Every model request of an endpoint waits here for a slot: requests are admitted by
+priority class within a per-endpoint in-flight limit and tokens-per-minute budget, and the
+in-flight limit adapts to the endpoint (additive increase, multiplicative decrease on
+429/5xx/timeouts) so a screenshot backlog cannot crowd out interactive chat.
+"""
+
+import asyncio
+import contextlib
+import contextvars
+import functools
+import threading
+import time
+from collections import deque
+from enum import IntEnum
+from typing import Any, Dict, List, Optional
+
+from opencontext.config.global_config import get_config
+from opencontext.llm.http_pool import add_response_listener, endpoint_key
+from opencontext.utils.logging_utils import get_logger
+
+logger = get_logger(__name__)
+
+_WAIT_SAMPLES = 256
+# Rough prompt size of an image part, used until the response reports real usage
+_IMAGE_TOKENS = 1000
+
+
+class RequestPriority(IntEnum):
+    """Priority classes, lower values are served first"""
+
+    INTERACTIVE = 0  # Chat and agent answers a user is waiting for
+    COMPLETION = 1  # Editor completions
+    CAPTURE = 2  # Screenshot, document and merge processing
+    REPORT = 3  # Scheduled reports, tips, todos and activity summaries
+
+
+_priority: contextvars.ContextVar = contextvars.ContextVar(
+    "llm_request_priority", default=RequestPriority.CAPTURE
+)
+
+
+def get_request_priority() -> RequestPriority:
+    return _priority.get()
+
+
+def set_request_priority(priority: RequestPriority):
+    """Set the priority of LLM requests made from the current context onwards"""
+    return _priority.set(RequestPriority(priority))
+
+
+@contextlib.contextmanager
+def llm_priority(priority: RequestPriority):
+    """Run the block's LLM requests (and tasks or tool calls it starts) at the given priority"""
+    token = _priority.set(RequestPriority(priority))
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def prioritized(priority: RequestPriority):
+    """Decorator running a sync or async function's LLM requests at the given priority"""
+
+    def decorator(func):
+        if asyncio.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with llm_priority(priority):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with llm_priority(priority):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def estimate_tokens(messages: List[Dict[str, Any]]) -> int:
+    """Cheap prompt size estimate (about four characters per token)"""
+    chars = images = 0
+    for message in messages:
+        content = message.get("content") if isinstance(message, dict) else None
+        if isinstance(content, str):
+            chars += len(content)
+        elif isinstance(content, list):
+            for part in content:
+                if not isinstance(part, dict):
+                    continue
+                if part.get("type") == "text":
+                    chars += len(part.get("text") or "")
+                else:
+                    images += 1
+    return chars // 4 + images * _IMAGE_TOKENS + 1
+
+
+def estimate_text_tokens(texts: List[str]) -> int:
+    return sum(len(text) for text in texts) // 4 + 1
+
+
+def _retry_after(headers) -> Optional[float]:
+    """Seconds to wait according to Retry-After(-ms) headers, None without a usable value"""
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None  # Missing, or an HTTP date
+
+
+def _on_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+        return True
+    except RuntimeError:
+        return False
+
+
+class _Waiter:
+    __slots__ = ("priority", "tokens", "enqueued", "event", "future", "loop", "granted")
+
+    def __init__(self, priority: RequestPriority, tokens: int):
+        self.priority = priority
+        self.tokens = tokens
+        self.enqueued = time.monotonic()
+        self.event: Optional[threading.Event] = None
+        self.future: Optional[asyncio.Future] = None
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.granted = False
+
+    def wake(self):
+        if self.event is not None:
+            self.event.set()
+        elif not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(self._resolve)
+
+    def _resolve(self):
+        if not self.future.done():
+            self.future.set_result(None)
+
+
+class Ticket:
+    """A granted slot; record the response usage on it to correct the token budget"""
+
+    __slots__ = ("priority", "tokens", "used_tokens")
+
+    def __init__(self, priority: RequestPriority, tokens: int):
+        self.priority = priority
+        self.tokens = tokens
+        self.used_tokens: Optional[int] = None
+
+    def record_usage(self, response):
+        usage = getattr(response, "usage", None)
+        total = getattr(usage, "total_tokens", None)
+        if isinstance(total, int):
+            self.used_tokens = total
+
+
+class RequestScheduler:
+    """
+    Admission control for the requests of one endpoint.
+
+    Waiting requests are granted in priority order; a request's priority improves by one
+    class for every ``aging_seconds`` it waits, so background work is delayed but never
+    starved. Sync callers block on an event and async callers await a future, so the
+    scheduler is shared by threads and event loops alike.
+
+    Throttling is seen on every HTTP response of the endpoint (observe_response), not only
+    on the outcome of a request: the OpenAI SDK retries 429 and 5xx responses itself.
+    """
+
+    def __init__(self, endpoint: str, config: Dict[str, Any]):
+        self.endpoint = endpoint
+        self.enabled = bool(config.get("enabled", True))
+        self.max_in_flight = max(1, int(config.get("max_in_flight", 8)))
+        self.min_in_flight = max(1, min(int(config.get("min_in_flight", 1)), self.max_in_flight))
+        self.tokens_per_minute = max(0, int(config.get("tokens_per_minute", 0)))
+        self.aging_seconds = float(config.get("aging_seconds", 30)) or float("inf")
+        self.backoff_seconds = float(config.get("backoff_seconds", 1))
+        self.decrease_cooldown = float(config.get("decrease_cooldown_seconds", 2))
+
+        self._lock = threading.Lock()
+        self._waiters: List[_Waiter] = []
+        self._in_flight = 0
+        self._limit = float(self.max_in_flight)
+        self._paused_until = 0.0
+        self._last_decrease = 0.0
+        self._tokens = float(self.tokens_per_minute)
+        self._tokens_at = time.monotonic()
+        self._timer: Optional[threading.Timer] = None
+        self._timer_at = 0.0
+        self._waits = {p: deque(maxlen=_WAIT_SAMPLES) for p in RequestPriority}
+        self._granted = {p: 0 for p in RequestPriority}
+        self._stats = {
+            "completed": 0,
+            "failed": 0,
+            "rate_limited": 0,
+            "overloaded": 0,
+            "timeouts": 0,
+            "unqueued": 0,
+        }
+
+    # Slots
+
+    @contextlib.contextmanager
+    def slot(self, tokens: int = 0, priority: Optional[RequestPriority] = None):
+        """Block the calling thread until the request may be sent"""
+        priority = get_request_priority() if priority is None else priority
+        ticket = Ticket(priority, tokens)
+        if not self.enabled:
+            yield ticket
+            return
+        waiter = _Waiter(priority, self._clamp(tokens))
+        waiter.event = threading.Event()
+        if _on_event_loop():
+            # Blocking here would stall the loop, and with it the async requests whose
+            # completion frees a slot: admit the request over the limit instead
+            self._admit(waiter)
+        elif not self._enqueue(waiter):
+            waiter.event.wait()
+        with self._outcome(ticket):
+            yield ticket
+
+    @contextlib.asynccontextmanager
+    async def aslot(self, tokens: int = 0, priority: Optional[RequestPriority] = None):
+        """Wait, without blocking the event loop, until the request may be sent"""
+        priority = get_request_priority() if priority is None else priority
+        ticket = Ticket(priority, tokens)
+        if not self.enabled:
+            yield ticket
+            return
+        waiter = _Waiter(priority, self._clamp(tokens))
+        waiter.loop = asyncio.get_running_loop()
+        waiter.future = waiter.loop.create_future()
+        if not self._enqueue(waiter):
+            try:
+                await waiter.future
+            except BaseException:
+                self._abandon(waiter)
+                raise
+        with self._outcome(ticket):
+            yield ticket
+
+    @contextlib.contextmanager
+    def _outcome(self, ticket: Ticket):
+        try:
+            yield
+        except BaseException as e:
+            if not isinstance(e, Exception):
+                kind = "cancelled"
+            elif "Timeout" in type(e).__name__:
+                kind = "timeout"
+            else:
+                kind = "failed"
+            self._release(ticket, kind)
+            raise
+        self._release(ticket, "completed")
+
+    def _clamp(self, tokens: int) -> int:
+        # A request larger than the whole budget is admitted once the bucket is full
+        if self.tokens_per_minute:
+            return min(max(0, tokens), self.tokens_per_minute)
+        return 0
+
+    # Queue
+
+    def _enqueue(self, waiter: _Waiter) -> bool:
+        """Queue a waiter; True if it was granted immediately"""
+        with self._lock:
+            self._waiters.append(waiter)
+            woken = self._dispatch_locked()
+        for w in woken:
+            if w is not waiter:
+                w.wake()
+        return waiter.granted
+
+    def _admit(self, waiter: _Waiter):
+        with self._lock:
+            self._tokens -= waiter.tokens
+            self._in_flight += 1
+            self._granted[waiter.priority] += 1
+            self._stats["unqueued"] += 1
+
+    def _abandon(self, waiter: _Waiter):
+        """Cancelled while waiting: leave the queue, or hand back a slot granted meanwhile"""
+        with self._lock:
+            if not waiter.granted:
+                self._waiters.remove(waiter)
+                return
+        self._release(Ticket(waiter.priority, waiter.tokens), "cancelled")
+
+    def _release(self, ticket: Ticket, kind: str):
+        now = time.monotonic()
+        with self._lock:
+            self._in_flight -= 1
+            if ticket.used_tokens is not None and self.tokens_per_minute:
+                self._refill_locked(now)
+                self._tokens += self._clamp(ticket.tokens) - ticket.used_tokens
+            if kind == "completed":
+                self._stats["completed"] += 1
+                # Additive increase, about one slot per limit's worth of successes, while the
+                # limit is what holds requests back and not right after a decrease
+                saturated = self._in_flight + 1 >= int(self._limit) or self._waiters
+                if saturated and now - self._last_decrease >= self.decrease_cooldown:
+                    self._limit = min(self.max_in_flight, self._limit + 1 / self._limit)
+            elif kind != "cancelled":
+                self._stats["failed"] += 1
+            if kind == "timeout":
+                self._stats["timeouts"] += 1
+                self._decrease_locked(now, "timed out")
+            woken = self._dispatch_locked()
+        for w in woken:
+            w.wake()
+
+    def observe_response(self, status_code: int, headers):
+        """Adapt to a response of the endpoint: back off on 429 and 5xx"""
+        if status_code != 429 and status_code < 500:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if status_code == 429:
+                self._stats["rate_limited"] += 1
+                retry_after = _retry_after(headers)
+                pause = self.backoff_seconds if retry_after is None else retry_after
+                self._paused_until = max(self._paused_until, now + pause)
+                self._decrease_locked(now, "rate limited")
+            else:
+                self._stats["overloaded"] += 1
+                self._decrease_locked(now, f"returned {status_code}")
+
+    def _decrease_locked(self, now: float, reason: str):
+        # Multiplicative decrease, once per cooldown: a burst of errors from requests
+        # already in flight reflects a single overload
+        if now - self._last_decrease < self.decrease_cooldown:
+            return
+        self._last_decrease = now
+        self._limit = max(self.min_in_flight, self._limit / 2)
+        logger.warning(
+            f"LLM endpoint {self.endpoint} {reason}, in-flight limit lowered to "
+            f"{max(self.min_in_flight, int(self._limit))}"
+        )
+
+    def _refill_locked(self, now: float):
+        rate = self.tokens_per_minute / 60
+        self._tokens = min(self.tokens_per_minute, self._tokens + (now - self._tokens_at) * rate)
+        self._tokens_at = now
+
+    def _dispatch_locked(self) -> List[_Waiter]:
+        """Grant slots to the best waiters the limits allow; returns the granted waiters"""
+        woken = []
+        now = time.monotonic()
+        if now < self._paused_until:
+            self._wake_at_locked(self._paused_until - now)
+            return woken
+        if self.tokens_per_minute:
+            self._refill_locked(now)
+        while self._waiters and self._in_flight < max(self.min_in_flight, int(self._limit)):
+            waiter = min(
+                self._waiters,
+                key=lambda w: (w.priority - (now - w.enqueued) / self.aging_seconds, w.enqueued),
+            )
+            if waiter.tokens > self._tokens and self.tokens_per_minute:
+                # Hold the line for it rather than let smaller requests drain the budget
+                rate = self.tokens_per_minute / 60
+                self._wake_at_locked((waiter.tokens - self._tokens) / rate)
+                break
+            self._waiters.remove(waiter)
+            self._tokens -= waiter.tokens
+            self._in_flight += 1
+            waiter.granted = True
+            self._granted[waiter.priority] += 1
+            self._waits[waiter.priority].append((now - waiter.enqueued) * 1000)
+            woken.append(waiter)
+        return woken
+
+    def _wake_at_locked(self, delay: float):
+        """Re-run dispatch once a pause ends or the token bucket has refilled"""
+        at = time.monotonic() + delay
+        if self._timer is not None and self._timer_at <= at:
+            return
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = threading.Timer(delay, self._on_timer)
+        self._timer.daemon = True
+        self._timer_at = at
+        self._timer.start()
+
+    def _on_timer(self):
+        with self._lock:
+            self._timer = None
+            woken = self._dispatch_locked()
+        for w in woken:
+            w.wake()
+
+    # Stats
+
+    def get_stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        with self._lock:
+            queued = {p.name.lower(): 0 for p in RequestPriority}
+            oldest = 0.0
+            for waiter in self._waiters:
+                queued[waiter.priority.name.lower()] += 1
+                oldest = max(oldest, now - waiter.enqueued)
+            waits = {}
+            for p in RequestPriority:
+                samples = sorted(self._waits[p])
+                waits[p.name.lower()] = {
+                    "granted": self._granted[p],
+                    "p50": samples[len(samples) // 2] if samples else None,
+                    "p95": samples[int(len(samples) * 0.95) - 1] if len(samples) >= 20 else None,
+                }
+            if self.tokens_per_minute:
+                self._refill_locked(now)
+            stats = dict(self._stats)
+            stats.update(
+                {
+                    "endpoint": self.endpoint,
+                    "enabled": self.enabled,
+                    "in_flight": self._in_flight,
+                    "in_flight_limit": max(self.min_in_flight, int(self._limit)),
+                    "max_in_flight": self.max_in_flight,
+                    "paused_seconds": max(0.0, self._paused_until - now),
+                    "queue_depth": sum(queued.values()),
+                    "queued": queued,
+                    "oldest_wait_ms": oldest * 1000,
+                    "wait_ms": waits,
+                    "tokens_per_minute": self.tokens_per_minute or None,
+                    "tokens_available": int(self._tokens) if self.tokens_per_minute else None,
+                }
+            )
+        return stats
+
+
+_schedulers: Dict[str, RequestScheduler] = {}
+_schedulers_lock = threading.Lock()
+
+
+def get_scheduler(base_url: str) -> RequestScheduler:
+    """Scheduler of the endpoint serving base_url"""
+    key = endpoint_key(base_url)
+    with _schedulers_lock:
+        scheduler = _schedulers.get(key)
+        if scheduler is None:
+            config = dict(get_config("llm_scheduler") or {})
+            overrides = (config.pop("endpoints", None) or {}).get(key) or {}
+            scheduler = _schedulers[key] = RequestScheduler(key, {**config, **overrides})
+            add_response_listener(key, scheduler.observe_response)
+        return scheduler
+
+
+def get_llm_scheduler_stats() -> Dict[str, Any]:
+    """Queue, wait time and rate control statistics of every endpoint"""
+    with _schedulers_lock:
+        schedulers = list(_schedulers.values())
+    return {scheduler.endpoint: scheduler.get_stats() for scheduler in schedulers}
@@ -38,6 +38,8 @@ class ContextCaptureManager:
 
         # Callback function, called when new data is captured
         self._callback: Optional[callable] = None
+        # Reports processing backpressure per source to the components
+        self._backpressure_probe: Optional[callable] = None
 
         # Statistics
         self._statistics: Dict[str, Any] = {
@@ -155,6 +157,8 @@ class ContextCaptureManager:
         try:
             # Set the callback function, the component will report data through this callback
             component.set_callback(self._on_component_capture)
+            if hasattr(component, "set_backpressure_probe"):
+                component.set_backpressure_probe(self._backpressure_probe)
 
             # Start the component (the component will manage its own capture thread internally)
             success = component.start()
@@ -270,6 +274,16 @@ class ContextCaptureManager:
         """
         self._callback = callback
 
+    def set_backpressure_probe(self, probe: callable) -> None:
+        """
+        Set the function reporting processing backpressure for a ContextSource; capture
+        components slow down while it is above 1.0.
+        """
+        self._backpressure_probe = probe
+        for component in self._components.values():
+            if hasattr(component, "set_backpressure_probe"):
+                component.set_backpressure_probe(probe)
+
     def _on_component_capture(self, contexts: List[RawContextProperties]) -> None:
         """
         Component capture callback function.
@@ -9,7 +9,6 @@
 Context consumption manager, responsible for managing and coordinating context consumption components
 """
 
-import asyncio
 import threading
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional
@@ -20,6 +19,7 @@ from opencontext.context_consumption.generation.realtime_activity_monitor import
 )
 from opencontext.context_consumption.generation.smart_tip_generator import SmartTipGenerator
 from opencontext.context_consumption.generation.smart_todo_manager import SmartTodoManager
+from opencontext.llm.http_pool import run_sync
 from opencontext.managers.event_manager import EventType, get_event_manager
 from opencontext.models.enums import VaultType
 from opencontext.storage.global_storage import get_storage
@@ -212,6 +212,14 @@ class ConsumptionManager:
         def check_and_generate_daily_report():
             if not self._activity_generator or not self._task_enabled.get("report", True):
                 return
+            try:
+                # Summarize each hour as soon as it closes, so the daily report only merges
+                # stored hourly summaries
+                summarized = run_sync(self._activity_generator.summarize_closed_hours())
+                if summarized:
+                    logger.info(f"Summarized {summarized} closed hours")
+            except Exception as e:
+                logger.exception(f"Failed to summarize closed hours: {e}")
             try:
                 now = datetime.now()
                 today = now.date()
@@ -221,10 +229,11 @@ class ConsumptionManager:
 
                 if now >= target_time and self._last_report_date != today:
                     try:
-                        end_time = int(now.timestamp())
-                        start_time = int((now - timedelta(days=1)).timestamp())
+                        # The last 24 closed hours
+                        end_time = int(now.replace(minute=0, second=0, microsecond=0).timestamp())
+                        start_time = end_time - 24 * 3600
 
-                        asyncio.run(self._activity_generator.generate_report(start_time, end_time))
+                        run_sync(self._activity_generator.generate_report(start_time, end_time))
                         # Update last report date to prevent duplicate generation on the same day
                         self._last_report_date = today
                     except Exception as e:
@@ -233,12 +242,19 @@ class ConsumptionManager:
                 logger.error(f"Failed to check daily report generation time: {e}")
 
             if self._scheduled_tasks_enabled and self._task_enabled.get("report", True):
+                # Check again shortly after the next hour closes (giving its last screenshots
+                # time to be processed), at least every 30 minutes
+                now = datetime.now()
+                next_hour = now.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+                delay = min(60 * 30, (next_hour - now).total_seconds() + 120)
                 self._task_timers["report"] = threading.Timer(
-                    60 * 30, check_and_generate_daily_report
+                    delay, check_and_generate_daily_report
                 )
                 self._task_timers["report"].start()
 
-        check_and_generate_daily_report()
+        # First check off the caller's thread: catching up on unsummarized hours takes a while
+        self._task_timers["report"] = threading.Timer(0, check_and_generate_daily_report)
+        self._task_timers["report"].start()
 
     def _start_activity_timer(self):
         """Start activity recording timer"""
@@ -521,4 +537,4 @@ class ConsumptionManager:
 
         self._statistics["total_queries"] = 0
         self._statistics["total_contexts_consumed"] = 0
-        self._statistics["errors"] = 0
\ No newline at end of file
+        self._statistics["errors"] = 0
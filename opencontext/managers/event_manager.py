@@ -4,23 +4,29 @@
 # SPDX-License-Identifier: Apache-2.0
 
 """
-Event Manager - Cached version, supports get and clear mechanism
+Event Manager - publish/subscribe event bus pushed to clients over Server-Sent Events
 """
 
-import json
+import asyncio
 import threading
 import time
 import uuid
 from collections import deque
 from dataclasses import dataclass
-from datetime import datetime
 from enum import Enum
 from typing import Any, Dict, List, Optional
 
+from opencontext.config.global_config import get_config
 from opencontext.utils.logging_utils import get_logger
 
 logger = get_logger(__name__)
 
+# Slow consumer policies: a subscriber whose queue is full is either closed, so that the
+# client reconnects and resumes from the ring buffer with Last-Event-ID, or loses its
+# oldest undelivered event
+DISCONNECT = "disconnect"
+DROP_OLDEST = "drop_oldest"
+
 
 class EventType(str, Enum):
     """Event type enumeration"""
@@ -41,76 +47,212 @@ class Event:
     type: EventType
     data: Dict[str, Any]
     timestamp: float
+    seq: int = 0  # Position in the stream, sent as the SSE event id
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary format"""
         return {
             "id": self.id,
+            "seq": self.seq,
             "type": self.type.value,
             "data": self.data,
             "timestamp": self.timestamp,
         }
 
 
+class Subscription:
+    """One subscriber's bounded queue, filled from any thread and read on its event loop"""
+
+    def __init__(self, bus: "EventManager", loop: asyncio.AbstractEventLoop, max_size: int):
+        self._bus = bus
+        self._loop = loop
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._max_size = max_size
+        self.closed = False
+        self.dropped = 0
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[Event]:
+        """Next event; None on timeout or once the subscription is closed"""
+        if self.closed and self._queue.empty():
+            return None
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self):
+        """Unsubscribe"""
+        self._bus._unsubscribe(self)
+
+    def _offer(self, event: Optional[Event]):
+        """Deliver from any thread"""
+        try:
+            self._loop.call_soon_threadsafe(self._put, event)
+        except RuntimeError:
+            # The subscriber's loop is gone
+            self.closed = True
+            self._bus._unsubscribe(self)
+
+    def _put(self, event: Optional[Event], replay: bool = False):
+        """Runs on the subscriber's loop; a replay is not held to the queue bound"""
+        if self.closed:
+            return
+        if event is None:
+            self._close_locally()
+            return
+        if not replay and self._queue.qsize() >= self._max_size:
+            if self._bus.slow_consumer_policy == DROP_OLDEST:
+                self._queue.get_nowait()
+                self.dropped += 1
+                self._bus._record("dropped")
+            else:
+                logger.warning(f"Event subscriber fell behind at event {event.seq}, disconnecting")
+                self._bus._record("disconnected")
+                self._bus._unsubscribe(self)
+                self._close_locally()
+                return
+        self._queue.put_nowait(event)
+
+    def _close_locally(self):
+        self.closed = True
+        # Wake a reader waiting on an empty queue; it sees closed and returns None
+        if self._queue.empty():
+            self._queue.put_nowait(None)
+
+
 class EventManager:
-    """Cached Event Manager"""
+    """
+    Event bus
+
+    Published events get consecutive sequence numbers and are kept in a ring buffer.
+    Subscribers receive them through their own bounded queue; a subscriber that reconnects
+    with the last sequence number it saw gets what it missed from the ring buffer. Events
+    published while no one is subscribed are handed to the next new subscriber.
+    """
 
-    def __init__(self):
-        self.event_cache: deque[Event] = deque()
-        self.max_cache_size = 1000
-        self._lock = threading.Lock()  # Ensure thread safety
+    def __init__(
+        self,
+        buffer_size: int = 1000,
+        subscriber_queue_size: int = 256,
+        slow_consumer_policy: str = DISCONNECT,
+    ):
+        self.max_cache_size = buffer_size
+        self.subscriber_queue_size = subscriber_queue_size
+        self.slow_consumer_policy = slow_consumer_policy
+        self.event_cache: deque[Event] = deque(maxlen=buffer_size)
+        # Reentrant: an offer made under it unsubscribes a subscriber whose loop is gone
+        self._lock = threading.RLock()
+        self._seq = 0
+        self._delivered_seq = 0  # Highest seq published while someone was subscribed
+        self._subscribers: List[Subscription] = []
+        self._stats = {"published": 0, "dropped": 0, "disconnected": 0, "resumed": 0}
 
     def publish_event(self, event_type: EventType, data: Dict[str, Any]) -> str:
-        """Publish event to cache"""
+        """Publish event to all subscribers"""
         event_id = str(uuid.uuid4())
-        event = Event(id=event_id, type=event_type, data=data, timestamp=time.time())
-
         with self._lock:
+            self._seq += 1
+            event = Event(
+                id=event_id, type=event_type, data=data, timestamp=time.time(), seq=self._seq
+            )
             self.event_cache.append(event)
+            self._stats["published"] += 1
+            subscribers = list(self._subscribers)
+            if subscribers:
+                self._delivered_seq = event.seq
+            # Offered in seq order: concurrent publishers must not interleave their offers.
+            # Offering only schedules the put on each subscriber's loop, it never blocks
+            for subscription in subscribers:
+                subscription._offer(event)
+        logger.info(
+            f"Published event {event_type.value} #{event.seq} to {len(subscribers)} subscribers"
+        )
+        return event_id
 
-            # Limit cache size to avoid memory overflow
-            while len(self.event_cache) > self.max_cache_size:
-                removed_event = self.event_cache.popleft()
-                logger.warning(f"Cache overflow, removing old event: {removed_event.id}")
+    def subscribe(self, last_event_id: Optional[int] = None) -> Subscription:
+        """
+        Subscribe on the running event loop.
 
-        logger.info(f"Published event to cache: {event_type.value}, ID: {event_id}")
-        return event_id
+        With ``last_event_id``, the buffered events after it are replayed first; without it,
+        the events no subscriber has received yet.
+        """
+        subscription = Subscription(self, asyncio.get_running_loop(), self.subscriber_queue_size)
+        with self._lock:
+            after = self._delivered_seq if last_event_id is None else last_event_id
+            if after > self._seq:
+                after = 0  # An ID from before a restart
+            replay = [event for event in self.event_cache if event.seq > after]
+            if last_event_id is not None:
+                self._stats["resumed"] += 1
+                oldest = self.event_cache[0].seq if self.event_cache else self._seq + 1
+                if after + 1 < oldest:
+                    logger.warning(
+                        f"Events {after + 1}-{oldest - 1} left the buffer before the "
+                        f"subscriber resumed"
+                    )
+            self._subscribers.append(subscription)
+            self._delivered_seq = self._seq
+        for event in replay:
+            subscription._put(event, replay=True)
+        return subscription
+
+    def _unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            if subscription in self._subscribers:
+                self._subscribers.remove(subscription)
+        if not subscription.closed:
+            subscription._offer(None)
 
-    def fetch_and_clear_events(self) -> List[Dict[str, Any]]:
-        """Fetch all cached events and clear the cache"""
+    def _record(self, key: str):
         with self._lock:
-            # Get all current events
-            events = [event.to_dict() for event in self.event_cache]
-            # Clear the cache
-            self.event_cache.clear()
+            self._stats[key] += 1
 
-        logger.info(f"Returned and cleared {len(events)} cached events")
-        return events
+    def get_events_after(self, after_seq: int = 0) -> List[Dict[str, Any]]:
+        """Buffered events after a sequence number, without consuming them"""
+        with self._lock:
+            if after_seq > self._seq:
+                after_seq = 0
+            return [event.to_dict() for event in self.event_cache if event.seq > after_seq]
 
     def get_cache_status(self) -> Dict[str, Any]:
-        """Get cache status"""
+        """Get bus status"""
         with self._lock:
-            cache_size = len(self.event_cache)
-
-        return {
-            "cache_size": cache_size,
-            "max_cache_size": self.max_cache_size,
-            "supported_event_types": [t.value for t in EventType],
-        }
+            return {
+                "cache_size": len(self.event_cache),
+                "max_cache_size": self.max_cache_size,
+                "last_event_id": self._seq,
+                "subscribers": len(self._subscribers),
+                "subscriber_queue_size": self.subscriber_queue_size,
+                "slow_consumer_policy": self.slow_consumer_policy,
+                **self._stats,
+                "supported_event_types": [t.value for t in EventType],
+            }
 
 
 # Global event manager instance
 _event_manager = None
+_event_manager_lock = threading.Lock()
 
 
 def get_event_manager() -> EventManager:
     """Get global event manager instance"""
     global _event_manager
     if _event_manager is None:
-        _event_manager = EventManager()
+        with _event_manager_lock:
+            if _event_manager is None:
+                config = get_config("events") or {}
+                policy = config.get("slow_consumer_policy", DISCONNECT)
+                if policy not in (DISCONNECT, DROP_OLDEST):
+                    logger.warning(f"Unknown slow_consumer_policy '{policy}', using disconnect")
+                    policy = DISCONNECT
+                _event_manager = EventManager(
+                    buffer_size=config.get("buffer_size", 1000),
+                    subscriber_queue_size=config.get("subscriber_queue_size", 256),
+                    slow_consumer_policy=policy,
+                )
     return _event_manager
 
 
 def publish_event(event_type: EventType, data: Dict[str, Any]) -> str:
-    """Publish event to cache"""
+    """Publish event to all subscribers"""
     return get_event_manager().publish_event(event_type, data)
@@ -153,6 +153,16 @@ class ContextProcessorManager:
             logger.exception(f"Processing component '{processor_name}' encountered exception while processing data: {e}")
             return False
 
+    def get_backpressure(self, source: ContextSource) -> float:
+        """
+        Backpressure of the processor that inputs of a source are routed to (see
+        BaseContextProcessor.get_backpressure); 0.0 when nothing is queued or no processor
+        """
+        processor = self._processors.get(self._routing_table.get(source))
+        if processor is None or not hasattr(processor, "get_backpressure"):
+            return 0.0
+        return processor.get_backpressure()
+
     def batch_process(
         self, initial_inputs: List[RawContextProperties]
     ) -> Dict[str, List[ProcessedContext]]:
@@ -20,6 +20,18 @@ logger = get_logger(__name__)
 
 from opencontext.models.enums import ContentFormat, ContextSource, ContextType
 
+_DERIVED_ID_NAMESPACE = uuid.UUID("5d1f0f3e-7a39-4c55-9a0e-3c1b2f6b8e41")
+
+
+def derived_context_id(*parts: Any) -> str:
+    """
+    Stable ID of a context derived from its inputs, e.g. (raw object_id, item index).
+
+    Processing the same raw context again yields the same IDs, so a redelivered work item
+    overwrites what an interrupted attempt stored instead of duplicating it.
+    """
+    return str(uuid.uuid5(_DERIVED_ID_NAMESPACE, ":".join(str(part) for part in parts)))
+
 
 class Chunk(BaseModel):
     """
@@ -28,6 +40,7 @@ class Chunk(BaseModel):
     text: Optional[str] = None
     image: Optional[bytes] = None
     chunk_index: int = 0
+    source_text: Optional[str] = None  # text the chunk was made from, if not the chunk text
     keywords: List[str] = Field(default_factory=list)  # keywords
     entities: List[str] = Field(default_factory=list)  # entities
 
@@ -43,6 +56,8 @@ class RawContextProperties(BaseModel):
     filter_path: Optional[str] = None  # filter path
     additional_info: Optional[Dict[str, Any]] = None  # additional information
     enable_merge: bool = True
+    # in-memory ImageFrame for screenshots, never serialized
+    frame: Optional[Any] = Field(default=None, exclude=True, repr=False)
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert model to dictionary"""
@@ -53,6 +68,15 @@ class RawContextProperties(BaseModel):
         """Create model from dictionary"""
         return cls.model_validate(data)
 
+    def dump_json(self) -> str:
+        """Convert model to JSON string (without the in-memory frame)"""
+        return self.model_dump_json(exclude_none=True)
+
+    @classmethod
+    def from_json(cls, json_str: str) -> "RawContextProperties":
+        """Create model from JSON string"""
+        return cls.model_validate_json(json_str)
+
 
 class ExtractedData(BaseModel):
     """
@@ -340,3 +364,5 @@ class KnowledgeContextMetadata(BaseModel):
     knowledge_file_path: str = ""
     knowledge_title: str = ""
     knowledge_raw_id: str = ""
+    knowledge_chunk_hash: str = ""  # content hash of the chunk text, up to whitespace
+    knowledge_source_key: str = ""  # ChunkSource of the document text the chunk came from
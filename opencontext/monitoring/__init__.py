@@ -10,6 +10,7 @@
 from .metrics_collector import MetricsCollector
 from .monitor import (
     Monitor,
+    get_cache_stats,
     get_monitor,
     get_recording_stats,
     increment_context_count,
@@ -17,6 +18,7 @@ from .monitor import (
     increment_recording_stat,
     increment_screenshot_count,
     initialize_monitor,
+    record_cache_access,
     record_processing_error,
     record_processing_metrics,
     record_processing_stage,
@@ -24,17 +26,21 @@ from .monitor import (
     record_token_usage,
     reset_recording_stats,
     record_screenshot_path,
+    shutdown_monitor,
 )
 
 __all__ = [
     "Monitor",
     "get_monitor",
     "initialize_monitor",
+    "shutdown_monitor",
     "record_token_usage",
     "record_processing_metrics",
     "record_retrieval_metrics",
     "record_processing_error",
     "record_processing_stage",
+    "record_cache_access",
+    "get_cache_stats",
     "increment_screenshot_count",
     "increment_context_count",
     "increment_data_count",
@@ -7,6 +7,7 @@
 System Monitor - Collects and manages various system metrics
 """
 
+import atexit
 import threading
 import time
 from collections import defaultdict, deque
@@ -74,6 +75,59 @@ class ProcessingError:
     timestamp: datetime = field(default_factory=datetime.now)
 
 
+@dataclass
+class CacheStats:
+    """Cache hit/miss statistics"""
+
+    cache_name: str
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    last_update: datetime = field(default_factory=datetime.now)
+
+
+@dataclass
+class StageTimingBucket:
+    """Stage timings of one hour bucket, waiting to be flushed"""
+
+    count: int = 0
+    total_duration_ms: int = 0
+    min_duration_ms: int = 0
+    max_duration_ms: int = 0
+    success_count: int = 0
+    error_count: int = 0
+    metadata: Optional[str] = None
+
+    def add(self, duration_ms: int, success: bool, metadata: Optional[str] = None):
+        if self.count == 0:
+            self.min_duration_ms = self.max_duration_ms = duration_ms
+        else:
+            self.min_duration_ms = min(self.min_duration_ms, duration_ms)
+            self.max_duration_ms = max(self.max_duration_ms, duration_ms)
+        self.count += 1
+        self.total_duration_ms += duration_ms
+        self.success_count += 1 if success else 0
+        self.error_count += 0 if success else 1
+        if metadata is not None:
+            self.metadata = metadata
+
+    def merge(self, other: "StageTimingBucket"):
+        if other.count == 0:
+            return
+        if self.count == 0:
+            self.min_duration_ms = other.min_duration_ms
+            self.max_duration_ms = other.max_duration_ms
+        else:
+            self.min_duration_ms = min(self.min_duration_ms, other.min_duration_ms)
+            self.max_duration_ms = max(self.max_duration_ms, other.max_duration_ms)
+        self.count += other.count
+        self.total_duration_ms += other.total_duration_ms
+        self.success_count += other.success_count
+        self.error_count += other.error_count
+        if other.metadata is not None:
+            self.metadata = other.metadata
+
+
 @dataclass
 class RecordingSessionStats:
     """Recording session statistics"""
@@ -114,6 +168,22 @@ class Monitor:
         # Recording session statistics
         self._recording_stats = RecordingSessionStats()
 
+        # Cache statistics by cache name
+        self._cache_stats: Dict[str, CacheStats] = {}
+
+        # Hourly aggregates waiting to be written to storage, keyed by time bucket first
+        self._pending_token_usage: Dict[tuple, List[int]] = {}
+        self._pending_stage_timing: Dict[tuple, StageTimingBucket] = {}
+        self._pending_data_stats: Dict[tuple, List[Any]] = {}
+        self._flush_lock = threading.Lock()
+        self._flush_interval = self._load_flush_interval()
+        self._stop_event = threading.Event()
+        self._flush_thread = threading.Thread(
+            target=self._flush_loop, name="monitor-flush", daemon=True
+        )
+        self._flush_thread.start()
+        atexit.register(self.shutdown)
+
         # Start time
         self._start_time = datetime.now()
 
@@ -122,6 +192,91 @@ class Monitor:
 
         logger.info("System monitor initialized")
 
+    @staticmethod
+    def _load_flush_interval() -> float:
+        try:
+            from opencontext.config.global_config import get_config
+
+            return float(get_config("monitoring.flush_interval_seconds") or 5)
+        except Exception:
+            return 5.0
+
+    @staticmethod
+    def _time_bucket() -> str:
+        return datetime.now().strftime("%Y-%m-%d %H:00:00")
+
+    def _flush_loop(self):
+        while not self._stop_event.wait(self._flush_interval):
+            self.flush()
+
+    def flush(self) -> bool:
+        """Write all pending hourly aggregates to storage in one transaction"""
+        with self._flush_lock:
+            with self._lock:
+                if not (
+                    self._pending_token_usage
+                    or self._pending_stage_timing
+                    or self._pending_data_stats
+                ):
+                    return True
+                token_usage = self._pending_token_usage
+                stage_timing = self._pending_stage_timing
+                data_stats = self._pending_data_stats
+                self._pending_token_usage = {}
+                self._pending_stage_timing = {}
+                self._pending_data_stats = {}
+
+            try:
+                saved = get_storage().save_monitoring_batch(
+                    token_usage=[(*key, *values) for key, values in token_usage.items()],
+                    stage_timing=[
+                        (
+                            *key,
+                            b.count,
+                            b.total_duration_ms,
+                            b.min_duration_ms,
+                            b.max_duration_ms,
+                            b.success_count,
+                            b.error_count,
+                            b.metadata,
+                        )
+                        for key, b in stage_timing.items()
+                    ],
+                    data_stats=[(*key, *values) for key, values in data_stats.items()],
+                )
+            except Exception as e:
+                logger.error(f"Failed to flush monitoring data: {e}")
+                saved = False
+
+            if not saved:
+                # Put the aggregates back so the next flush retries them
+                with self._lock:
+                    self._merge_pending(token_usage, stage_timing, data_stats)
+            return saved
+
+    def _merge_pending(self, token_usage, stage_timing, data_stats):
+        """Fold aggregates back into the pending buffers (caller holds the lock)"""
+        for key, values in token_usage.items():
+            pending = self._pending_token_usage.setdefault(key, [0, 0, 0])
+            for i, value in enumerate(values):
+                pending[i] += value
+        for key, bucket in stage_timing.items():
+            self._pending_stage_timing.setdefault(key, StageTimingBucket()).merge(bucket)
+        for key, (count, metadata) in data_stats.items():
+            pending = self._pending_data_stats.setdefault(key, [0, None])
+            pending[0] += count
+            if metadata is not None:
+                pending[1] = metadata
+
+    def shutdown(self):
+        """Stop the background flusher and write whatever is still pending"""
+        if self._stop_event.is_set():
+            return
+        self._stop_event.set()
+        if self._flush_thread.is_alive() and self._flush_thread is not threading.current_thread():
+            self._flush_thread.join(timeout=self._flush_interval + 1)
+        self.flush()
+
     def _cleanup_old_data(self):
         """Clean up monitoring data older than 7 days"""
 
@@ -148,19 +303,11 @@ class Monitor:
             if len(self._token_usage_by_model[model]) > 100:
                 self._token_usage_by_model[model] = self._token_usage_by_model[model][-100:]
 
-            # Persist to database
-            self._persist_token_usage(model, prompt_tokens, completion_tokens, total_tokens)
-
-    def _persist_token_usage(
-        self, model: str, prompt_tokens: int, completion_tokens: int, total_tokens: int
-    ):
-        """Persist token usage to database"""
-        try:
-            get_storage().save_monitoring_token_usage(
-                model, prompt_tokens, completion_tokens, total_tokens
-            )
-        except Exception as e:
-            logger.error(f"Failed to persist token usage: {e}")
+            # Aggregated in memory, persisted by the next flush
+            pending = self._pending_token_usage.setdefault((self._time_bucket(), model), [0, 0, 0])
+            pending[0] += prompt_tokens
+            pending[1] += completion_tokens
+            pending[2] += total_tokens
 
     def record_processing_metrics(
         self,
@@ -200,6 +347,34 @@ class Monitor:
             )
             self._retrieval_history.append(metrics)
 
+    def record_cache_access(
+        self, cache_name: str, hits: int = 0, misses: int = 0, evictions: int = 0
+    ):
+        """Record cache hits, misses and evictions"""
+        with self._lock:
+            stats = self._cache_stats.get(cache_name)
+            if stats is None:
+                stats = self._cache_stats[cache_name] = CacheStats(cache_name=cache_name)
+            stats.hits += hits
+            stats.misses += misses
+            stats.evictions += evictions
+            stats.last_update = datetime.now()
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get hit/miss statistics of all caches"""
+        with self._lock:
+            result = {}
+            for name, stats in self._cache_stats.items():
+                lookups = stats.hits + stats.misses
+                result[name] = {
+                    "hits": stats.hits,
+                    "misses": stats.misses,
+                    "evictions": stats.evictions,
+                    "hit_rate": stats.hits / lookups if lookups else 0,
+                    "last_update": stats.last_update.isoformat(),
+                }
+            return result
+
     def get_context_type_stats(self, force_refresh: bool = False) -> Dict[str, int]:
         """Get record count for each context_type"""
         now = datetime.now()
@@ -244,6 +419,7 @@ class Monitor:
         }
 
         try:
+            self.flush()
             rows = get_storage().query_monitoring_token_usage(hours)
 
             model_stats = defaultdict(
@@ -342,10 +518,12 @@ class Monitor:
         metadata: Optional[str] = None,
     ):
         """Record processing stage timing"""
-        try:
-            get_storage().save_monitoring_stage_timing(stage_name, duration_ms, status, metadata)
-        except Exception as e:
-            logger.error(f"Failed to record processing stage: {e}")
+        with self._lock:
+            key = (self._time_bucket(), stage_name)
+            bucket = self._pending_stage_timing.get(key)
+            if bucket is None:
+                bucket = self._pending_stage_timing[key] = StageTimingBucket()
+            bucket.add(int(duration_ms), status == "success", metadata)
 
     def increment_data_count(
         self,
@@ -355,10 +533,14 @@ class Monitor:
         metadata: Optional[str] = None,
     ):
         """Increment data count"""
-        try:
-            get_storage().save_monitoring_data_stats(data_type, count, context_type, metadata)
-        except Exception as e:
-            logger.error(f"Failed to increment data count: {e}")
+        with self._lock:
+            key = (self._time_bucket(), data_type, context_type)
+            pending = self._pending_data_stats.get(key)
+            if pending is None:
+                pending = self._pending_data_stats[key] = [0, None]
+            pending[0] += count
+            if metadata is not None:
+                pending[1] = metadata
 
     def get_stage_timing_summary(self, hours: int = 24) -> Dict[str, Any]:
         """Get stage timing summary from database"""
@@ -369,6 +551,7 @@ class Monitor:
         }
 
         try:
+            self.flush()
             rows = get_storage().query_monitoring_stage_timing(hours)
 
             stage_stats = defaultdict(
@@ -421,6 +604,7 @@ class Monitor:
         }
 
         try:
+            self.flush()
             rows = get_storage().query_monitoring_data_stats(hours)
 
             # Process the grouped data
@@ -459,6 +643,7 @@ class Monitor:
         }
 
         try:
+            self.flush()
             rows = get_storage().query_monitoring_data_stats_by_range(start_time, end_time)
 
             # Process the grouped data
@@ -487,6 +672,7 @@ class Monitor:
     def get_data_stats_trend(self, hours: int = 24) -> Dict[str, Any]:
         """Get data statistics trend with time series data"""
         try:
+            self.flush()
             rows = get_storage().query_monitoring_data_stats_trend(hours)
 
             # Organize data by data_type for easy frontend consumption
@@ -715,6 +901,7 @@ class Monitor:
             "processing": self.get_processing_summary(hours=24),
             "stage_timing": self.get_stage_timing_summary(hours=24),
             "data_stats_24h": self.get_data_stats_summary(hours=24),
+            "caches": self.get_cache_stats(),
             "last_updated": datetime.now().isoformat(),
         }
 
@@ -740,6 +927,12 @@ def initialize_monitor() -> Monitor:
     return monitor
 
 
+def shutdown_monitor():
+    """Flush pending monitoring data and stop the background flusher"""
+    if _monitor is not None:
+        _monitor.shutdown()
+
+
 # Convenient global functions for reporting metrics
 def record_token_usage(
     model: str, prompt_tokens: int = 0, completion_tokens: int = 0, total_tokens: int = 0
@@ -775,6 +968,16 @@ def record_processing_error(
     get_monitor().record_processing_error(error_message, processor_name, context_count, timestamp)
 
 
+def record_cache_access(cache_name: str, hits: int = 0, misses: int = 0, evictions: int = 0):
+    """Global function: Record cache hits, misses and evictions"""
+    get_monitor().record_cache_access(cache_name, hits, misses, evictions)
+
+
+def get_cache_stats() -> Dict[str, Any]:
+    """Global function: Get cache statistics"""
+    return get_monitor().get_cache_stats()
+
+
 def record_processing_stage(
     stage_name: str, duration_ms: int, status: str = "success", metadata: Optional[str] = None
 ):
@@ -68,6 +68,7 @@ class OpenContext:
             GlobalVLMClient.get_instance()
             self.context_operations = ContextOperations()
             self.capture_manager.set_callback(self._handle_captured_context)
+            self.capture_manager.set_backpressure_probe(self.processor_manager.get_backpressure)
             self.component_initializer.initialize_capture_components(
                 self.capture_manager)
             logger.info("Capture modules initialization completed")
@@ -170,6 +171,22 @@ class OpenContext:
             self.capture_manager.shutdown(graceful=graceful)
             self.processor_manager.shutdown(graceful=graceful)
 
+            # Flush buffered monitoring aggregates
+            try:
+                from opencontext.monitoring import shutdown_monitor
+
+                shutdown_monitor()
+            except Exception as e:
+                logger.warning(f"Error flushing monitoring data: {e}")
+
+            # Close model endpoint connections
+            try:
+                from opencontext.llm.http_pool import close_all_pools
+
+                close_all_pools()
+            except Exception as e:
+                logger.warning(f"Error closing HTTP connection pools: {e}")
+
             if self.web_server and self.web_server.is_alive():
                 logger.info("Web server will close when main thread exits.")
 
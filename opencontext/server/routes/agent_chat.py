@@ -9,6 +9,7 @@ Agent Chat Routes
 Intelligent conversation routing based on Context Agent
 """
 
+import asyncio
 import json
 import uuid
 from typing import Any, Dict, Optional
@@ -17,11 +18,14 @@ from fastapi import APIRouter, Depends, HTTPException
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
+from opencontext.config.global_config import get_config
 from opencontext.context_consumption.context_agent import ContextAgent
 from opencontext.context_consumption.context_agent.models import WorkflowStage
 from opencontext.context_consumption.context_agent.models.enums import EventType
+from opencontext.llm.request_scheduler import RequestPriority, llm_priority, set_request_priority
 from opencontext.server.middleware.auth import auth_dependency
 from opencontext.storage.global_storage import get_storage
+from opencontext.storage.message_stream import MessageStreamWriter
 from opencontext.utils.logging_utils import get_logger
 
 logger = get_logger(__name__)
@@ -45,6 +49,17 @@ def get_agent():
     return agent_instance
 
 
+def create_stream_writer(storage, message_id: int) -> MessageStreamWriter:
+    """Buffered writer persisting a streamed answer into its message"""
+    config = get_config("consumption.chat_stream") or {}
+    return MessageStreamWriter(
+        storage,
+        message_id,
+        flush_interval=config.get("flush_interval_ms", 250) / 1000,
+        flush_chars=config.get("flush_chars", 1024),
+    )
+
+
 # Request models
 class ChatRequest(BaseModel):
     """Chat request"""
@@ -87,13 +102,14 @@ async def chat(request: ChatRequest, _auth: str = auth_dependency) -> ChatRespon
         if not request.session_id:
             request.session_id = str(uuid.uuid4())
 
-        # Process query
-        result = await agent.process(
-            query=request.query,
-            session_id=request.session_id,
-            user_id=request.user_id,
-            context=request.context,
-        )
+        # Process query; its model requests go ahead of background work
+        with llm_priority(RequestPriority.INTERACTIVE):
+            result = await agent.process(
+                query=request.query,
+                session_id=request.session_id,
+                user_id=request.user_id,
+                context=request.context,
+            )
 
         # Build response
         response = ChatResponse(
@@ -123,6 +139,11 @@ async def chat_stream(request: ChatRequest, _auth: str = auth_dependency):
         user_message_id = None
         assistant_message_id = None
         storage = None
+        stream_writer = None
+        event_metadata = {}  # Store events by type
+        # The response is streamed from its own task: model requests of this stream go
+        # ahead of background work
+        set_request_priority(RequestPriority.INTERACTIVE)
 
         try:
             agent = get_agent()
@@ -159,6 +180,7 @@ async def chat_stream(request: ChatRequest, _auth: str = auth_dependency):
                     role="assistant"
                 )
                 logger.info(f"Created assistant streaming message {assistant_message_id}")
+                stream_writer = create_stream_writer(storage, assistant_message_id)
                 # Register this message as an active stream
                 active_streams[assistant_message_id] = False
 
@@ -174,7 +196,6 @@ async def chat_stream(request: ChatRequest, _auth: str = auth_dependency):
                 args.update(request.context)
 
             accumulated_content = ""
-            event_metadata = {}  # Store events by type
             interrupted = False  # Track if stream was interrupted
 
             async for event in agent.process_stream(**args):
@@ -201,14 +222,9 @@ async def chat_stream(request: ChatRequest, _auth: str = auth_dependency):
                         )
                         logger.debug(f"Saved thinking to message {assistant_message_id}: stage={event.stage.value if event.stage else 'unknown'}, content_len={len(event.content)}")
                     elif event.type == EventType.STREAM_CHUNK:
-                        # Only stream_chunk content goes to message.content
+                        # Only stream_chunk content goes to message.content, written in batches
                         accumulated_content += event.content
-                        storage.append_message_content(
-                            message_id=assistant_message_id,
-                            content_chunk=event.content,
-                            token_count=1  # Approximate token count
-                        )
-                        logger.debug(f"Appended stream_chunk to message {assistant_message_id}: content_len={len(event.content)}")
+                        stream_writer.append(event.content, token_count=1)  # Approximate token count
                     else:
                         # Other event types (running, done, etc.) go to metadata as lists
                         event_type_key = event.type.value
@@ -225,55 +241,52 @@ async def chat_stream(request: ChatRequest, _auth: str = auth_dependency):
                 yield f"data: {json.dumps(converted_event, ensure_ascii=False)}\n\n"
 
                 if event.stage in [WorkflowStage.COMPLETED, WorkflowStage.FAILED]:
-                    # Update metadata with collected events before finishing
-                    if assistant_message_id and event_metadata:
-                        storage.update_message_metadata(
-                            message_id=assistant_message_id,
-                            metadata=event_metadata
-                        )
-                        logger.info(f"Updated message {assistant_message_id} metadata with {len(event_metadata)} event types")
-
-                    # Mark assistant message as finished
-                    if assistant_message_id:
+                    # Flush remaining content, then store collected events and the final status
+                    if stream_writer:
                         status = "completed" if event.stage == WorkflowStage.COMPLETED else "failed"
-                        storage.mark_message_finished(
-                            message_id=assistant_message_id,
+                        await stream_writer.finish(
                             status=status,
-                            error_message=event.metadata.get("error") if status == "failed" else None
+                            error_message=event.metadata.get("error") if status == "failed" else None,
+                            metadata=event_metadata or None,
                         )
                         logger.info(f"Marked assistant message {assistant_message_id} as {status}")
                     break
 
             # Handle interrupted stream - save accumulated data and mark as cancelled
-            if interrupted and assistant_message_id:
-                # Update metadata with collected events
-                if event_metadata:
-                    storage.update_message_metadata(
-                        message_id=assistant_message_id,
-                        metadata=event_metadata
-                    )
-                    logger.info(f"Updated interrupted message {assistant_message_id} metadata with {len(event_metadata)} event types")
-
-                # Mark message as cancelled (status already set by interrupt endpoint)
+            if interrupted and stream_writer:
+                # Save streamed content and collected events; status was already set to
+                # cancelled by the interrupt endpoint
+                await stream_writer.finish(status=None, metadata=event_metadata or None)
                 logger.info(f"Message {assistant_message_id} interrupted with {len(accumulated_content)} characters saved")
 
+        except (asyncio.CancelledError, GeneratorExit):
+            # Client disconnected: keep what was streamed so far and stop the message. This
+            # scope is cancelled, so any await here would be cancelled too: finish in a task
+            if stream_writer and not stream_writer.finished:
+                stream_writer.finish_nowait(
+                    status="cancelled",
+                    error_message="Client disconnected",
+                    metadata=event_metadata or None,
+                )
+            raise
+
         except Exception as e:
             logger.exception(f"Stream chat failed: {e}")
 
-            # Mark assistant message as failed if it exists
-            if assistant_message_id and storage:
+            # Keep the partial answer and mark assistant message as failed if it exists
+            if stream_writer and not stream_writer.finished:
                 try:
-                    storage.mark_message_finished(
-                        message_id=assistant_message_id,
-                        status="failed",
-                        error_message=str(e)
-                    )
+                    await stream_writer.finish(status="failed", error_message=str(e))
                 except Exception as mark_error:
                     logger.exception(f"Failed to mark message as failed: {mark_error}")
 
             yield f"data: {json.dumps({'type': 'error', 'content': str(e)}, ensure_ascii=False)}\n\n"
 
         finally:
+            # Stream ended without a final stage: persist the remaining content
+            if stream_writer and not stream_writer.finished:
+                await stream_writer.finish(status=None, metadata=event_metadata or None)
+
             # Clean up the interrupt flag when stream ends
             if assistant_message_id and assistant_message_id in active_streams:
                 del active_streams[assistant_message_id]
@@ -297,7 +310,8 @@ async def resume_workflow(workflow_id: str, request: ResumeRequest, _auth: str =
         agent = get_agent()
 
         # Resume workflow
-        result = await agent.resume(workflow_id=workflow_id, user_input=request.user_input)
+        with llm_priority(RequestPriority.INTERACTIVE):
+            result = await agent.resume(workflow_id=workflow_id, user_input=request.user_input)
 
         # Build response
         response = ChatResponse(
@@ -9,7 +9,6 @@ Intelligent Completion API Routes
 Provides GitHub Copilot-like note content completion functionality
 """
 
-import asyncio
 import json
 from datetime import datetime
 from typing import Any, Dict, Optional
@@ -19,6 +18,7 @@ from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel, Field
 
 from opencontext.context_consumption.completion import get_completion_service
+from opencontext.context_consumption.completion.completion_service import CONTINUATION_TOKEN
 from opencontext.models.enums import CompletionType
 from opencontext.server.middleware.auth import auth_dependency
 from opencontext.utils.logging_utils import get_logger
@@ -78,7 +78,7 @@ async def get_completion_suggestions(request: CompletionRequest, _auth: str = au
         completion_service = get_completion_service()
 
         # Get completion suggestions
-        suggestions = completion_service.get_completions(
+        suggestions = await completion_service.get_completions_async(
             current_text=request.text,
             cursor_position=request.cursor_position,
             document_id=request.document_id,
@@ -133,14 +133,16 @@ async def get_completion_suggestions(request: CompletionRequest, _auth: str = au
 
 @router.post("/api/completions/suggest/stream")
 async def get_completion_suggestions_stream(
-    request: CompletionRequest, _auth: str = auth_dependency
+    request: CompletionRequest, http_request: Request, _auth: str = auth_dependency
 ):
     """
     Stream completion suggestions
-    Suitable for scenarios requiring real-time completion progress display
+    Each strategy runs once and its suggestions are sent as soon as it finishes; the semantic
+    continuation is also sent token by token as the model writes it
     """
 
     async def generate_completions():
+        completions = None
         try:
             # Send start event
             yield f"data: {json.dumps({'type': 'start', 'timestamp': datetime.now().isoformat()})}\n\n"
@@ -148,47 +150,46 @@ async def get_completion_suggestions_stream(
             # Get completion service
             completion_service = get_completion_service()
 
-            # Simulate streaming different types of completions
-            completion_types = [
-                CompletionType.TEMPLATE_COMPLETION,
-                CompletionType.SEMANTIC_CONTINUATION,
-                CompletionType.REFERENCE_SUGGESTION,
-            ]
-
-            all_suggestions = []
-
-            for comp_type in completion_types:
-                # Send processing status
-                yield f"data: {json.dumps({'type': 'processing', 'completion_type': comp_type.value})}\n\n"
-
-                # Get completions for this type
-                suggestions = completion_service.get_completions(
-                    current_text=request.text,
-                    cursor_position=request.cursor_position,
-                    document_id=request.document_id,
-                    user_context=request.context or {},
-                )
-
-                # Filter suggestions for current type
-                type_suggestions = [s for s in suggestions if s.completion_type == comp_type]
-
-                if type_suggestions:
-                    all_suggestions.extend(type_suggestions)
-
-                    # Send suggestions for this type
-                    for suggestion in type_suggestions:
-                        yield f"data: {json.dumps({'type': 'suggestion', 'data': suggestion.to_dict()})}\n\n"
-
-                # Small delay to simulate processing time
-                await asyncio.sleep(0.1)
+            filter_types = set(request.completion_types or []) & {ct.value for ct in CompletionType}
+            total_suggestions = 0
+
+            completions = completion_service.iter_completions(
+                current_text=request.text,
+                cursor_position=request.cursor_position,
+                document_id=request.document_id,
+                user_context=request.context or {},
+                stream_tokens=not filter_types
+                or CompletionType.SEMANTIC_CONTINUATION.value in filter_types,
+            )
+            async for source, payload in completions:
+                if await http_request.is_disconnected():
+                    logger.debug("Completion stream client disconnected")
+                    return
+
+                if source == CONTINUATION_TOKEN:
+                    yield f"data: {json.dumps({'type': 'token', 'completion_type': CompletionType.SEMANTIC_CONTINUATION.value, 'text': payload})}\n\n"
+                    continue
+
+                # Send the suggestions of a finished strategy (or of the cache)
+                for suggestion in payload:
+                    if filter_types and suggestion.completion_type.value not in filter_types:
+                        continue
+                    if request.max_suggestions and total_suggestions >= request.max_suggestions:
+                        break
+                    total_suggestions += 1
+                    yield f"data: {json.dumps({'type': 'suggestion', 'data': suggestion.to_dict()})}\n\n"
 
             # Send completion event
-            yield f"data: {json.dumps({'type': 'complete', 'total_suggestions': len(all_suggestions)})}\n\n"
+            yield f"data: {json.dumps({'type': 'complete', 'total_suggestions': total_suggestions})}\n\n"
             yield "data: [DONE]\n\n"
 
         except Exception as e:
             logger.error(f"Stream completion failed: {e}")
             yield f"data: {json.dumps({'type': 'error', 'error': str(e)})}\n\n"
+        finally:
+            # Stops the strategies still running when the stream ends early
+            if completions is not None:
+                await completions.aclose()
 
     return StreamingResponse(
         generate_completions(),
@@ -252,6 +253,7 @@ async def get_completion_stats(_auth: str = auth_dependency):
         stats = {
             "service_status": "active",
             "cache_stats": cache_stats,
+            "pipeline_stats": completion_service.get_pipeline_stats(),
             "supported_types": [ct.value for ct in CompletionType],
             "timestamp": datetime.now().isoformat(),
         }
@@ -303,7 +305,7 @@ async def precompute_document_context(document_id: int, content: str, _auth: str
     """Precompute document context"""
     try:
         completion_service = get_completion_service()
-        completion_service.precompute_document_context(document_id, content)
+        await completion_service.warm_document(document_id, content)
 
         return JSONResponse(
             {"success": True, "message": f"Document {document_id} context precomputation completed"}
@@ -227,8 +227,9 @@ async def manual_generate_debug_report(
             end_time = int(now.timestamp())
             start_time = int((now - timedelta(days=1)).timestamp())
 
+        # An ad-hoc window: leave the summaries of the scheduled reports alone
         report_content = await opencontext.consumption_manager._activity_generator.generate_report(
-            start_time, end_time
+            start_time, end_time, use_cache=False
         )
 
         if report_content:
@@ -720,9 +721,10 @@ async def generate_with_custom_prompts(
                 ]
 
             try:
+                # Summaries made with custom prompts must not be stored as the canonical ones
                 report_content = (
                     await opencontext.consumption_manager._activity_generator.generate_report(
-                        start_time, end_time
+                        start_time, end_time, use_cache=False
                     )
                 )
 
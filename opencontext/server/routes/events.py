@@ -4,14 +4,17 @@
 # SPDX-License-Identifier: Apache-2.0
 
 """
-Event push routes - Cached version, supports fetch and clear mechanism
+Event push routes - Server-Sent Events stream of the event bus
 """
 
+import json
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Header, Query, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
+from opencontext.config.global_config import get_config
 from opencontext.managers.event_manager import EventType, get_event_manager
 from opencontext.server.middleware.auth import auth_dependency
 from opencontext.server.opencontext import OpenContext
@@ -27,19 +30,69 @@ class PublishEventRequest(BaseModel):
     data: dict
 
 
+@router.get("/api/events/stream")
+async def stream_events(
+    request: Request,
+    last_event_id: Optional[int] = Query(None),
+    last_event_id_header: Optional[str] = Header(None, alias="Last-Event-ID"),
+    _auth: str = auth_dependency,
+):
+    """
+    Event stream - Core API
+
+    Pushes every published event as it happens (SSE, one JSON event per message, its
+    sequence number as the event id). A reconnecting EventSource sends Last-Event-ID and
+    receives what it missed; a client can also pass ?last_event_id= when it reopens.
+    """
+    if last_event_id is None and last_event_id_header and last_event_id_header.isdigit():
+        last_event_id = int(last_event_id_header)
+    keepalive = (get_config("events") or {}).get("keepalive_seconds", 15)
+    subscription = get_event_manager().subscribe(last_event_id)
+
+    async def generate():
+        try:
+            yield "retry: 3000\n\n"
+            while not subscription.closed:
+                event = await subscription.get(timeout=keepalive)
+                if event is None:
+                    if subscription.closed or await request.is_disconnected():
+                        break
+                    # Comment line: keeps proxies from closing an idle connection
+                    yield ": keepalive\n\n"
+                    continue
+                data = json.dumps(event.to_dict(), ensure_ascii=False)
+                yield f"id: {event.seq}\ndata: {data}\n\n"
+        finally:
+            subscription.close()
+
+    return StreamingResponse(
+        generate(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/api/events/fetch")
-async def fetch_and_clear_events(_auth: str = auth_dependency):
+async def fetch_events(after_id: int = Query(0, ge=0), _auth: str = auth_dependency):
     """
-    Fetch and clear cached events - Core API
+    Fetch buffered events after a sequence number
 
-    Returns all cached events and clears the cache.
-    Frontend should call this endpoint periodically to get new events.
+    For clients that cannot hold an event stream open. Events are not consumed, so several
+    clients can read them; pass the returned last_event_id as after_id on the next call.
     """
     try:
         event_manager = get_event_manager()
-        events = event_manager.fetch_and_clear_events()
+        events = event_manager.get_events_after(after_id)
+        last_event_id = events[-1]["seq"] if events else after_id
 
-        return convert_resp(data={"events": events, "count": len(events), "message": "success"})
+        return convert_resp(
+            data={
+                "events": events,
+                "count": len(events),
+                "last_event_id": last_event_id,
+                "message": "success",
+            }
+        )
 
     except Exception as e:
         logger.exception(f"Failed to fetch events: {e}")
@@ -50,7 +103,7 @@ async def fetch_and_clear_events(_auth: str = auth_dependency):
 async def get_event_status(
     opencontext: OpenContext = Depends(get_context_lab), _auth: str = auth_dependency
 ):
-    """Get event cache status"""
+    """Get event bus status"""
     try:
         event_manager = get_event_manager()
         status = event_manager.get_cache_status()
@@ -12,10 +12,15 @@ from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 
+from opencontext.context_processing.work_queue import get_work_queue_stats
+from opencontext.llm.http_pool import get_http_pool_stats
+from opencontext.llm.request_scheduler import get_llm_scheduler_stats
 from opencontext.monitoring import get_monitor
 from opencontext.server.middleware.auth import auth_dependency
 from opencontext.server.opencontext import OpenContext
+from opencontext.server.screenshot_ingest import get_screenshot_ingestor
 from opencontext.server.utils import get_context_lab
+from opencontext.tools.base import get_tool_executor_stats
 
 router = APIRouter(prefix="/api/monitoring", tags=["monitoring"])
 
@@ -242,3 +247,80 @@ async def reset_recording_stats(_auth: str = auth_dependency):
         raise HTTPException(
             status_code=500, detail=f"Failed to reset recording statistics: {str(e)}"
         )
+
+
+@router.get("/caches")
+async def get_cache_stats(_auth: str = auth_dependency):
+    """
+    Get cache hit/miss statistics
+    """
+    try:
+        monitor = get_monitor()
+        stats = monitor.get_cache_stats()
+        return {"success": True, "data": stats}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to get cache statistics: {str(e)}")
+
+
+@router.get("/http-pools")
+async def get_http_pools(_auth: str = auth_dependency):
+    """
+    Get connection pool statistics of the model endpoints
+    """
+    try:
+        return {"success": True, "data": get_http_pool_stats()}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to get HTTP pool statistics: {str(e)}")
+
+
+@router.get("/llm-scheduler")
+async def get_llm_scheduler(_auth: str = auth_dependency):
+    """
+    Get LLM request scheduler statistics: queue depth, wait times and rate control
+    """
+    try:
+        return {"success": True, "data": get_llm_scheduler_stats()}
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Failed to get LLM scheduler statistics: {str(e)}"
+        )
+
+
+@router.get("/tool-executor")
+async def get_tool_executor_status(_auth: str = auth_dependency):
+    """
+    Get tool worker pool statistics: queued calls and workers held by timed out calls
+    """
+    try:
+        return {"success": True, "data": get_tool_executor_stats()}
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Failed to get tool executor statistics: {str(e)}"
+        )
+
+
+@router.get("/work-queues")
+async def get_work_queues(_auth: str = auth_dependency):
+    """
+    Get processing work queue statistics: depth, retries and items recovered after a restart
+    """
+    try:
+        return {"success": True, "data": get_work_queue_stats()}
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Failed to get work queue statistics: {str(e)}"
+        )
+
+
+@router.get("/screenshot-ingest")
+async def get_screenshot_ingest(_auth: str = auth_dependency):
+    """
+    Get statistics of screenshots submitted over the API: accepted, rejected and in flight
+    """
+    try:
+        return {"success": True, "data": get_screenshot_ingestor().get_stats()}
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Failed to get screenshot ingest statistics: {str(e)}"
+        )
+
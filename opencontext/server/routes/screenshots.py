@@ -9,12 +9,13 @@ Screenshot management routes
 
 from typing import List
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from fastapi.responses import JSONResponse
-from pydantic import BaseModel
+from pydantic import BaseModel, ValidationError
 
 from opencontext.server.middleware.auth import auth_dependency
 from opencontext.server.opencontext import OpenContext
+from opencontext.server.screenshot_ingest import ScreenshotItem, get_screenshot_ingestor
 from opencontext.server.utils import convert_resp, get_context_lab
 from opencontext.utils.logging_utils import get_logger
 
@@ -40,9 +41,8 @@ async def add_screenshot(
     _auth: str = auth_dependency,
 ):
     try:
-        err_msg = opencontext.add_screenshot(
-            request.path, request.window, request.create_time, request.source
-        )
+        summary = await get_screenshot_ingestor().ingest(opencontext, _items([request]))
+        err_msg = summary["results"][0].get("error")
         if err_msg:
             return convert_resp(code=400, status=400, message=err_msg)
         return convert_resp(message="Screenshot added successfully")
@@ -58,13 +58,81 @@ async def add_screenshots(
     _auth: str = auth_dependency,
 ):
     try:
-        for screenshot in request.screenshots:
-            err_msg = opencontext.add_screenshot(
-                screenshot.path, screenshot.window, screenshot.create_time, screenshot.source
+        summary = await get_screenshot_ingestor().ingest(opencontext, _items(request.screenshots))
+        if summary["rejected"]:
+            return convert_resp(
+                data=summary,
+                code=400,
+                status=400,
+                message=f"{summary['rejected']} of {len(summary['results'])} screenshots rejected",
             )
-            if err_msg:
-                return convert_resp(code=400, status=400, message=err_msg)
-        return convert_resp(message="Screenshots added successfully")
+        return convert_resp(data=summary, message="Screenshots added successfully")
     except Exception as e:
         logger.exception(f"Error adding screenshots: {e}")
     return convert_resp(code=500, status=500, message="Internal server error")
+
+
+@router.post("/api/screenshots/bulk", response_class=JSONResponse)
+async def add_screenshots_bulk(
+    http_request: Request,
+    opencontext: OpenContext = Depends(get_context_lab),
+    _auth: str = auth_dependency,
+):
+    """
+    Queue a burst of screenshots for processing and answer with a result per screenshot.
+
+    Accepts the add_screenshots JSON body, or a multipart/form-data body of image files
+    (``window``, ``create_time`` and ``source`` text fields apply to the files after them).
+    Uploads are read only as fast as the screenshots are validated and journaled.
+    Responds 202 once they are queued; analysis happens in the background. A multipart
+    body that breaks off after some screenshots were queued gets 207, with the results of
+    the queued ones.
+    """
+    ingestor = get_screenshot_ingestor()
+    content_type = http_request.headers.get("content-type", "")
+    try:
+        if content_type.startswith("multipart/form-data"):
+            items = ingestor.iter_uploads(content_type, http_request.stream())
+        else:
+            request = AddScreenshotsRequest.model_validate(await http_request.json())
+            items = _items(request.screenshots)
+        summary = await ingestor.ingest(opencontext, items)
+    except (ValueError, ValidationError) as e:
+        return convert_resp(code=400, status=400, message=f"Invalid request: {e}")
+    except Exception as e:
+        logger.exception(f"Error adding screenshots: {e}")
+        return convert_resp(code=500, status=500, message="Internal server error")
+
+    if not summary["accepted"]:
+        message = f"Invalid request: {summary['error']}" if "error" in summary else None
+        return convert_resp(
+            data=summary, code=400, status=400, message=message or "No screenshot accepted"
+        )
+    if "error" in summary:
+        # The screenshots before the error are queued: the client must not send them again
+        return convert_resp(
+            data=summary,
+            status=207,
+            message=(
+                f"Upload failed after {summary['accepted']} screenshots were queued: "
+                f"{summary['error']}"
+            ),
+        )
+    return convert_resp(
+        data=summary,
+        status=202,
+        message=f"{summary['accepted']} of {len(summary['results'])} screenshots queued",
+    )
+
+
+def _items(screenshots: List[AddScreenshotRequest]) -> List[ScreenshotItem]:
+    return [
+        ScreenshotItem(
+            index=i,
+            path=s.path,
+            window=s.window,
+            create_time=s.create_time,
+            source=s.source,
+        )
+        for i, s in enumerate(screenshots)
+    ]
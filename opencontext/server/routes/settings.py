@@ -72,6 +72,12 @@ def _build_llm_config(
     return config
 
 
+def _validate_llm(llm_type: LLMType, config: dict) -> tuple:
+    """Validate a model config with a throwaway client, releasing its connection pool"""
+    with LLMClient(llm_type=llm_type, config=config) as client:
+        return client.validate()
+
+
 # ==================== API Endpoints ====================
 
 
@@ -132,7 +138,7 @@ async def update_model_settings(request: UpdateModelSettingsRequest, _auth: str
             vlm_config = _build_llm_config(
                 cfg.baseUrl, vlm_key, cfg.modelId, model_provider, LLMType.CHAT
             )
-            vlm_valid, vlm_msg = LLMClient(llm_type=LLMType.CHAT, config=vlm_config).validate()
+            vlm_valid, vlm_msg = _validate_llm(LLMType.CHAT, vlm_config)
             if not vlm_valid:
                 return convert_resp(
                     code=400, status=400, message=f"VLM validation failed: {vlm_msg}"
@@ -142,7 +148,7 @@ async def update_model_settings(request: UpdateModelSettingsRequest, _auth: str
             emb_config = _build_llm_config(
                 emb_url, emb_key, cfg.embeddingModelId, emb_provider, LLMType.EMBEDDING
             )
-            emb_valid, emb_msg = LLMClient(llm_type=LLMType.EMBEDDING, config=emb_config).validate()
+            emb_valid, emb_msg = _validate_llm(LLMType.EMBEDDING, emb_config)
             if not emb_valid:
                 return convert_resp(
                     code=400, status=400, message=f"Embedding validation failed: {emb_msg}"
@@ -214,10 +220,10 @@ async def validate_llm_config(request: UpdateModelSettingsRequest, _auth: str =
         )
 
         # Validate VLM
-        vlm_valid, vlm_msg = LLMClient(llm_type=LLMType.CHAT, config=vlm_config).validate()
+        vlm_valid, vlm_msg = _validate_llm(LLMType.CHAT, vlm_config)
 
         # Validate Embedding
-        emb_valid, emb_msg = LLMClient(llm_type=LLMType.EMBEDDING, config=emb_config).validate()
+        emb_valid, emb_msg = _validate_llm(LLMType.EMBEDDING, emb_config)
 
         # Build error message
         if not vlm_valid or not emb_valid:
@@ -21,6 +21,7 @@ from fastapi.responses import HTMLResponse, JSONResponse
 from fastapi.templating import Jinja2Templates
 from pydantic import BaseModel
 
+from opencontext.config.global_config import get_config
 from opencontext.models.enums import VaultType
 from opencontext.server.middleware.auth import auth_dependency
 from opencontext.storage.global_storage import get_storage
@@ -159,7 +160,9 @@ async def create_document(
 
 
 @router.get("/api/vaults/{document_id}")
-async def get_document(document_id: int, _auth: str = auth_dependency):
+async def get_document(
+    document_id: int, background_tasks: BackgroundTasks, _auth: str = auth_dependency
+):
     """
     Get document details
     """
@@ -178,6 +181,9 @@ async def get_document(document_id: int, _auth: str = auth_dependency):
         if not document:
             raise HTTPException(status_code=404, detail="Document not found")
 
+        # The document is being opened in the editor; get its completions ready
+        background_tasks.add_task(warm_completion_state, document_id, document["content"])
+
         return JSONResponse(
             {
                 "success": True,
@@ -238,6 +244,7 @@ async def save_document(
             background_tasks.add_task(
                 trigger_document_processing, document_id, document_data, "updated"
             )
+            background_tasks.add_task(warm_completion_state, document_id, document.content)
 
             return JSONResponse(
                 {
@@ -274,6 +281,7 @@ async def delete_document(
         if success:
             # Asynchronously clean up related context data
             background_tasks.add_task(cleanup_document_context, document_id)
+            drop_completion_state(document_id)
 
             return JSONResponse(
                 {
@@ -389,6 +397,38 @@ async def cleanup_document_context(doc_id: int):
         logger.exception(f"Failed to cleanup document context: {e}")
 
 
+async def warm_completion_state(doc_id: int, content: str):
+    """
+    Build or refresh the completion warm state of an opened or saved document
+
+    Args:
+        doc_id: Document ID
+        content: Document content
+    """
+    try:
+        if not (get_config("completion") or {}).get("enabled", True):
+            return
+        from opencontext.context_consumption.completion import get_completion_service
+
+        await get_completion_service().warm_document(doc_id, content or "")
+
+    except Exception as e:
+        logger.warning(f"Failed to warm completion state of document {doc_id}: {e}")
+
+
+def drop_completion_state(doc_id: int):
+    """Forget the completion warm state of a deleted document"""
+    try:
+        if not (get_config("completion") or {}).get("enabled", True):
+            return
+        from opencontext.context_consumption.completion import get_completion_service
+
+        get_completion_service().drop_document(doc_id)
+
+    except Exception as e:
+        logger.warning(f"Failed to drop completion state of document {doc_id}: {e}")
+
+
 def get_document_context_info(doc_id: int) -> dict:
     """
     Get document context processing information
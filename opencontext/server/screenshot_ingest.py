@@ -0,0 +1,319 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2025 Beijing Volcano Engine Technology Co., Ltd.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Screenshot ingestion for the API
+Screenshots submitted by path, or uploaded as multipart image parts, are validated, decoded,
+deduplicated and journaled on a bounded worker pool instead of the server's event loop.
+Uploads are parsed as the body streams in and written to disk by the workers, so at most
+``max_pending`` images of a request are held in memory however large the burst is.
+"""
+
+import asyncio
+import datetime
+import itertools
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Union
+
+from python_multipart.exceptions import FormParserError
+from python_multipart.multipart import MultipartParser, parse_options_header
+
+from opencontext.config.global_config import get_config
+from opencontext.models.enums import ContextSource
+from opencontext.utils.logging_utils import get_logger
+
+logger = get_logger(__name__)
+
+_IMAGE_EXTENSIONS = ("png", "jpg", "jpeg", "webp", "bmp")
+
+
+@dataclass
+class ScreenshotItem:
+    """One screenshot of a request: a path on disk, or uploaded bytes still to be written"""
+
+    index: int
+    path: str = ""
+    window: str = ""
+    create_time: str = ""
+    source: str = "unknown"
+    filename: str = ""
+    data: Optional[bytes] = None
+    error: Optional[str] = None
+
+
+class ScreenshotIngestor:
+    """
+    Bounded worker pool adding submitted screenshots to the processing pipeline
+
+    Each screenshot gets its own result, so one bad path or image no longer fails the
+    screenshots submitted with it. Accepted screenshots are journaled in the screenshot
+    processor's work queue and analysed later.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 0,
+        max_pending: int = 16,
+        max_items: int = 1000,
+        max_upload_bytes: int = 20 * 1024 * 1024,
+        upload_path: Optional[str] = None,
+    ):
+        self.max_pending = max(1, int(max_pending))
+        self.max_items = max(1, int(max_items))
+        self.max_upload_bytes = int(max_upload_bytes)
+        self.upload_path = upload_path or "./screenshots/uploads"
+        # Decoding is CPU bound: more threads than CPUs only contend for the GIL
+        self._executor = ThreadPoolExecutor(
+            max_workers=int(max_workers) or min(4, os.cpu_count() or 1),
+            thread_name_prefix="screenshot-ingest",
+        )
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._pending_bytes = 0
+        self._stats = {
+            "requests": 0,
+            "accepted": 0,
+            "rejected": 0,
+            "uploaded_bytes": 0,
+            "peak_in_flight": 0,
+            "peak_pending_bytes": 0,
+        }
+
+    async def ingest(
+        self, opencontext, items: Union[Iterable[ScreenshotItem], AsyncIterator[ScreenshotItem]]
+    ) -> Dict[str, Any]:
+        """
+        Add the screenshots to the pipeline, ``max_pending`` at a time; items are pulled
+        from ``items`` only as slots free up, which throttles a streamed upload.
+
+        A streamed body that turns out malformed part-way stops the ingestion: the summary
+        then carries the ``error`` along with the results of the screenshots before it,
+        which are queued already.
+        """
+        loop = asyncio.get_running_loop()
+        slots = asyncio.Semaphore(self.max_pending)
+        tasks: List[asyncio.Future] = []
+        results: List[Dict[str, Any]] = []
+
+        async def submit(item: ScreenshotItem):
+            if len(tasks) + len(results) >= self.max_items:
+                item.data = None
+                item.error = f"Too many screenshots in one request (max {self.max_items})"
+            if item.error:
+                results.append(self._result(item, item.error))
+                return
+            size = len(item.data or b"")
+            await slots.acquire()
+            self._track(1, size)
+            task = loop.run_in_executor(self._executor, self._ingest_one, opencontext, item)
+            task.add_done_callback(lambda _: self._release(slots, size))
+            tasks.append(task)
+
+        error = None
+        try:
+            if hasattr(items, "__aiter__"):
+                async for item in items:
+                    await submit(item)
+            else:
+                for item in items:
+                    await submit(item)
+        except ValueError as e:
+            error = str(e)
+        finally:
+            # Screenshots already handed to the pool are journaled even if the client is gone
+            results.extend(await asyncio.gather(*tasks))
+
+        results.sort(key=lambda result: result["index"])
+        accepted = sum(result["status"] == "accepted" for result in results)
+        with self._lock:
+            self._stats["requests"] += 1
+            self._stats["accepted"] += accepted
+            self._stats["rejected"] += len(results) - accepted
+        summary = {
+            "accepted": accepted,
+            "rejected": len(results) - accepted,
+            "results": results,
+            "queue_pressure": round(
+                opencontext.processor_manager.get_backpressure(ContextSource.SCREENSHOT), 3
+            ),
+        }
+        if error:
+            summary["error"] = error
+        return summary
+
+    def _ingest_one(self, opencontext, item: ScreenshotItem) -> Dict[str, Any]:
+        """Write an uploaded image to disk, then validate and enqueue the screenshot"""
+        try:
+            if item.data is not None:
+                item.path = self._write_upload(item)
+                item.data = None
+                item.create_time = item.create_time or datetime.datetime.now().isoformat()
+            err_msg = opencontext.add_screenshot(
+                item.path, item.window, item.create_time, item.source
+            )
+        except Exception as e:
+            logger.exception(f"Error adding screenshot {item.path or item.filename}: {e}")
+            err_msg = f"Failed to add screenshot: {e}"
+        # A rejected screenshot's downscaled file has been written by now: drop the upload
+        if err_msg and item.filename and item.path and os.path.exists(item.path):
+            os.remove(item.path)
+        return self._result(item, err_msg)
+
+    def _write_upload(self, item: ScreenshotItem) -> str:
+        extension = os.path.splitext(item.filename)[1][1:].lower()
+        os.makedirs(self.upload_path, exist_ok=True)
+        path = os.path.join(self.upload_path, f"{uuid.uuid4().hex}.{extension}")
+        with open(path, "wb") as f:
+            f.write(item.data)
+        with self._lock:
+            self._stats["uploaded_bytes"] += len(item.data)
+        return path
+
+    @staticmethod
+    def _result(item: ScreenshotItem, error: Optional[str]) -> Dict[str, Any]:
+        result = {
+            "index": item.index,
+            "path": item.path or item.filename,
+            "status": "rejected" if error else "accepted",
+        }
+        if error:
+            result["error"] = error
+        return result
+
+    def _track(self, count: int, size: int):
+        with self._lock:
+            self._in_flight += count
+            self._pending_bytes += size
+            self._stats["peak_in_flight"] = max(self._stats["peak_in_flight"], self._in_flight)
+            self._stats["peak_pending_bytes"] = max(
+                self._stats["peak_pending_bytes"], self._pending_bytes
+            )
+
+    def _release(self, slots: asyncio.Semaphore, size: int):
+        self._track(-1, -size)
+        slots.release()
+
+    async def iter_uploads(self, content_type: str, body: AsyncIterator[bytes]):
+        """
+        Parse a multipart body as it arrives, yielding each image part once it is complete.
+
+        Text fields ``window``, ``create_time`` and ``source`` apply to the image parts that
+        follow them. A part larger than ``max_upload_bytes`` is discarded while it streams
+        and reported as rejected.
+        """
+        _, options = parse_options_header(content_type)
+        boundary = options.get(b"boundary")
+        if not boundary:
+            raise ValueError("Multipart body without a boundary")
+
+        fields = {"window": "", "create_time": "", "source": "upload"}
+        completed: List[ScreenshotItem] = []
+        indexes = itertools.count()
+        part: Dict[str, Any] = {}
+
+        def on_part_begin():
+            part.update(headers={}, field=b"", value=b"", data=bytearray(), too_large=False)
+
+        def on_header_field(data: bytes, start: int, end: int):
+            part["field"] += data[start:end]
+
+        def on_header_value(data: bytes, start: int, end: int):
+            part["value"] += data[start:end]
+
+        def on_header_end():
+            part["headers"][part["field"].lower()] = part["value"]
+            part["field"], part["value"] = b"", b""
+
+        def on_part_data(data: bytes, start: int, end: int):
+            if part["too_large"]:
+                return
+            if len(part["data"]) + end - start > self.max_upload_bytes:
+                part["too_large"], part["data"] = True, bytearray()
+                return
+            part["data"] += data[start:end]
+
+        def on_part_end():
+            _, disposition = parse_options_header(part["headers"].get(b"content-disposition", b""))
+            name = disposition.get(b"name", b"").decode("utf-8", "replace")
+            filename = disposition.get(b"filename")
+            if filename is None:
+                if name in fields:
+                    fields[name] = part["data"].decode("utf-8", "replace")
+                return
+            item = ScreenshotItem(
+                index=next(indexes),
+                filename=filename.decode("utf-8", "replace"),
+                **fields,
+            )
+            extension = os.path.splitext(item.filename)[1][1:].lower()
+            if extension not in _IMAGE_EXTENSIONS:
+                item.error = f"Unsupported image type {extension or 'none'}"
+            elif part["too_large"]:
+                item.error = f"Image larger than {self.max_upload_bytes} bytes"
+            else:
+                item.data = bytes(part["data"])
+            part["data"] = bytearray()
+            completed.append(item)
+
+        parser = MultipartParser(
+            boundary,
+            {
+                "on_part_begin": on_part_begin,
+                "on_header_field": on_header_field,
+                "on_header_value": on_header_value,
+                "on_header_end": on_header_end,
+                "on_part_data": on_part_data,
+                "on_part_end": on_part_end,
+            },
+        )
+        error = None
+        try:
+            async for chunk in body:
+                parser.write(chunk)
+                # Stop reading the body while the pool has no slot for the parsed images
+                while completed:
+                    yield completed.pop(0)
+            parser.finalize()
+        except FormParserError as e:
+            error = e
+        # Images completed before a malformed part are still added
+        for item in completed:
+            yield item
+        if error is not None:
+            raise ValueError(f"Malformed multipart body: {error}") from error
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self._stats, "in_flight": self._in_flight}
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
+
+
+_ingestor: Optional[ScreenshotIngestor] = None
+_ingestor_lock = threading.Lock()
+
+
+def get_screenshot_ingestor() -> ScreenshotIngestor:
+    """Shared ingestor, configured under ``screenshot_ingest``"""
+    global _ingestor
+    if _ingestor is None:
+        with _ingestor_lock:
+            if _ingestor is None:
+                config = get_config("screenshot_ingest") or {}
+                storage_path = get_config("capture.screenshot.storage_path") or "./screenshots"
+                _ingestor = ScreenshotIngestor(
+                    max_workers=config.get("max_workers", 0),
+                    max_pending=config.get("max_pending", 16),
+                    max_items=config.get("max_items", 1000),
+                    max_upload_bytes=config.get("max_upload_bytes", 20 * 1024 * 1024),
+                    upload_path=config.get("upload_path") or os.path.join(storage_path, "uploads"),
+                )
+    return _ingestor
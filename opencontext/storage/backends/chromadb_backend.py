@@ -11,17 +11,19 @@ Creates independent collections for each context_type
 """
 
 import atexit
+import concurrent.futures
 import datetime
+import heapq
 import json
 import signal
 import threading
 import time
 from enum import Enum
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 import chromadb
 
-from opencontext.llm.global_embedding_client import do_vectorize
+from opencontext.llm.global_embedding_client import do_vectorize, do_vectorize_batch
 from opencontext.models.context import ContextProperties, ExtractedData, ProcessedContext, Vectorize
 from opencontext.models.enums import ContentFormat, ContextType
 from opencontext.storage.base_storage import IVectorStorageBackend, StorageType
@@ -50,6 +52,10 @@ class ChromaDBBackend(IVectorStorageBackend):
         self._pending_writes = []  # Pending writes
         self._write_lock = threading.Lock()  # Write lock
         self._cleanup_registered = False
+        # context_type -> whether the collection holds any documents, kept up to date on writes
+        self._collection_nonempty: Dict[str, bool] = {}
+        self._nonempty_lock = threading.Lock()
+        self._search_executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
 
         # Register graceful shutdown handler
         self._register_cleanup_handlers()
@@ -109,6 +115,8 @@ class ChromaDBBackend(IVectorStorageBackend):
                         metadatas=write_op["metadatas"],
                         embeddings=write_op["embeddings"],
                     )
+                    if write_op.get("context_type"):
+                        self._mark_nonempty(write_op["context_type"], True)
                     logger.debug(f"Completed pending write: {len(write_op['ids'])} documents")
                 except Exception as e:
                     logger.error(f"Failed to flush write operation: {e}")
@@ -157,6 +165,13 @@ class ChromaDBBackend(IVectorStorageBackend):
                 else:
                     self._client = chromadb.Client()
 
+            # Collections are queried concurrently during search
+            search_workers = int(chroma_config.get("search_max_workers", 8))
+            if search_workers > 1:
+                self._search_executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=search_workers, thread_name_prefix="chroma-search"
+                )
+
             # Get all available context_types
             context_types = [ct.value for ct in ContextType]
             config.get("collection_prefix", "opencontext")
@@ -262,6 +277,8 @@ class ChromaDBBackend(IVectorStorageBackend):
 
                 # Re-initialize collections
                 self._collections.clear()
+                with self._nonempty_lock:
+                    self._collection_nonempty.clear()
                 context_types = [ct.value for ct in ContextType]
                 for context_type in context_types:
                     collection_name = f"{context_type}"
@@ -305,6 +322,17 @@ class ChromaDBBackend(IVectorStorageBackend):
             logger.exception(f"Vectorization failed: {e}")
             raise RuntimeError(f"Vectorization failed: {str(e)}")
 
+    def _ensure_vectorized_batch(self, contexts: List[ProcessedContext]) -> None:
+        """Vectorize all contexts lacking a vector with batched embedding requests"""
+        pending = [c.vectorize for c in contexts if c.vectorize and not c.vectorize.vector]
+        if not pending:
+            return
+        try:
+            do_vectorize_batch(pending)
+        except Exception as e:
+            # Per-context vectorization below retries whatever is still missing
+            logger.warning(f"Batch vectorization of {len(pending)} contexts failed: {e}")
+
     def _context_to_chroma_format(self, context: ProcessedContext) -> Dict[str, Any]:
         """
         Convert the context object to a document format for storage
@@ -369,6 +397,8 @@ class ChromaDBBackend(IVectorStorageBackend):
         if not self._ensure_connection():
             raise RuntimeError("ChromaDB connection not available")
 
+        self._ensure_vectorized_batch(contexts)
+
         contexts_by_type = {}
         for context in contexts:
             context_type = context.extracted_data.context_type.value
@@ -427,6 +457,7 @@ class ChromaDBBackend(IVectorStorageBackend):
                     # Persist immediately to prevent data loss
                     if self._client and hasattr(self._client, "persist"):
                         self._client.persist()
+                self._mark_nonempty(context_type, True)
 
             except Exception as e:
                 logger.error(f"Batch storing context to {context_type} collection failed: {e}")
@@ -498,43 +529,15 @@ class ChromaDBBackend(IVectorStorageBackend):
         if not context_types:
             context_types = list(self._collections.keys())
 
+        where_clause = self._build_where_clause(filter)
         for context_type in context_types:
             if context_type not in self._collections:
                 continue
-            collection = self._collections[context_type]
             try:
-                where_clause = self._build_where_clause(filter)
-
-                # ChromaDB's get method does not directly support offset, so pagination needs to be implemented in other ways
-                with self._write_lock:
-                    results = collection.get(
-                        limit=limit + offset,  # Get more data to simulate offset
-                        where=where_clause,
-                        include=(
-                            ["metadatas", "documents", "embeddings"]
-                            if need_vector
-                            else ["metadatas", "documents"]
-                        ),
-                    )
-
-                contexts = []
-                if results and results["ids"]:
-                    # Manually apply offset
-                    start_idx = min(offset, len(results["ids"]))
-                    end_idx = min(start_idx + limit, len(results["ids"]))
-
-                    for i in range(start_idx, end_idx):
-                        doc = {
-                            "id": results["ids"][i],
-                            "document": results["documents"][i],
-                            "metadata": results["metadatas"][i],
-                        }
-                        if need_vector:
-                            doc["embedding"] = results["embeddings"][i]
-                        context = self._chroma_result_to_context(doc, need_vector)
-                        if context:
-                            contexts.append(context)
-
+                results = self._get_page(
+                    self._collections[context_type], where_clause, limit, offset, need_vector
+                )
+                contexts = self._results_to_contexts(results, need_vector)
                 if contexts:
                     result[context_type] = contexts
 
@@ -544,6 +547,71 @@ class ChromaDBBackend(IVectorStorageBackend):
 
         return result
 
+    def iter_processed_contexts(
+        self,
+        context_type: str,
+        filter: Optional[Dict[str, Any]] = None,
+        page_size: int = 500,
+        need_vector: bool = False,
+    ) -> Iterator[List[ProcessedContext]]:
+        """Stream ProcessedContexts of one context_type using Chroma's native offset"""
+        if not self._initialized or context_type not in self._collections:
+            return
+        collection = self._collections[context_type]
+        where_clause = self._build_where_clause(filter)
+        page_size = max(1, page_size)
+        offset = 0
+        while True:
+            results = self._get_page(collection, where_clause, page_size, offset, need_vector)
+            ids = results["ids"] if results else []
+            if not ids:
+                return
+            contexts = self._results_to_contexts(results, need_vector)
+            if contexts:
+                yield contexts
+            if len(ids) < page_size:
+                return
+            offset += len(ids)
+
+    def _get_page(
+        self,
+        collection,
+        where_clause: Optional[Dict[str, Any]],
+        limit: int,
+        offset: int,
+        need_vector: bool,
+    ) -> Dict[str, Any]:
+        """Read one page of a collection with Chroma's native limit/offset"""
+        with self._write_lock:
+            return collection.get(
+                limit=limit,
+                offset=offset,
+                where=where_clause,
+                include=(
+                    ["metadatas", "documents", "embeddings"]
+                    if need_vector
+                    else ["metadatas", "documents"]
+                ),
+            )
+
+    def _results_to_contexts(self, results, need_vector: bool) -> List[ProcessedContext]:
+        """Convert the column-oriented result of collection.get into ProcessedContexts"""
+        contexts = []
+        if not results or not results["ids"]:
+            return contexts
+        for i in range(len(results["ids"])):
+            doc = {
+                "id": results["ids"][i],
+                "document": results["documents"][i],
+                "metadata": results["metadatas"][i],
+            }
+            if need_vector:
+                doc["embedding"] = results["embeddings"][i]
+            context = self._chroma_result_to_context(doc, need_vector)
+            if context:
+                contexts.append(context)
+        return contexts
+
     def delete_processed_context(self, id: str, context_type: str) -> bool:
         """Delete ProcessedContext by ID"""
         return self.delete_contexts([id], context_type)
@@ -583,70 +651,114 @@ class ChromaDBBackend(IVectorStorageBackend):
             logger.warning("Unable to get query vector, search failed")
             return []
 
-        all_results = []
-
-        for context_type, collection in target_collections.items():
-            try:
-                # Check if collection is empty
-                try:
-                    with self._write_lock:
-                        count = collection.count()
-                    if count == 0:
-                        continue
-                except Exception as count_error:
-                    logger.debug(
-                        f"Unable to get count for collection '{context_type}': {count_error}"
-                    )
-                    # If count fails, collection has issues, skip
-                    continue
-
-                where_clause = self._build_where_clause(filters)
+        where_clause = self._build_where_clause(filters)
+        searchable = [
+            (context_type, collection)
+            for context_type, collection in target_collections.items()
+            if self._is_collection_nonempty(context_type, collection)
+        ]
+
+        if self._search_executor is not None and len(searchable) > 1:
+            futures = [
+                self._search_executor.submit(
+                    self._query_collection,
+                    context_type,
+                    collection,
+                    query_vector,
+                    top_k,
+                    where_clause,
+                    need_vector,
+                )
+                for context_type, collection in searchable
+            ]
+            per_collection = [future.result() for future in futures]
+        else:
+            per_collection = [
+                self._query_collection(
+                    context_type, collection, query_vector, top_k, where_clause, need_vector
+                )
+                for context_type, collection in searchable
+            ]
+
+        # Merge per-collection results and keep the global top_k by score
+        return heapq.nlargest(
+            top_k,
+            (item for results in per_collection for item in results),
+            key=lambda x: x[1],
+        )
 
-                with self._write_lock:
-                    results = collection.query(
-                        query_embeddings=[query_vector],
-                        n_results=top_k,
-                        where=where_clause,
-                        include=(
-                            ["metadatas", "documents", "distances", "embeddings"]
-                            if need_vector
-                            else ["metadatas", "documents", "distances"]
-                        ),
-                    )
+    def _mark_nonempty(self, context_type: str, nonempty: Optional[bool]) -> None:
+        """Update the cached emptiness of a collection; None means unknown"""
+        with self._nonempty_lock:
+            if nonempty is None:
+                self._collection_nonempty.pop(context_type, None)
+            else:
+                self._collection_nonempty[context_type] = nonempty
+
+    def _is_collection_nonempty(self, context_type: str, collection) -> bool:
+        """Check whether a collection has documents, counting only when not cached"""
+        with self._nonempty_lock:
+            cached = self._collection_nonempty.get(context_type)
+        if cached is not None:
+            return cached
+        try:
+            nonempty = collection.count() > 0
+        except Exception as count_error:
+            logger.debug(f"Unable to get count for collection '{context_type}': {count_error}")
+            # If count fails, collection has issues, skip
+            return False
+        with self._nonempty_lock:
+            # A concurrent write may have already marked it non-empty
+            self._collection_nonempty.setdefault(context_type, nonempty)
+            return self._collection_nonempty[context_type]
 
-                if results and results["ids"][0]:
-                    for i in range(len(results["ids"][0])):
-                        doc = {
-                            "id": results["ids"][0][i],
-                            "document": results["documents"][0][i],
-                            "metadata": results["metadatas"][0][i],
-                        }
-                        if need_vector:
-                            doc["embedding"] = results["embeddings"][0][i]
-                        context = self._chroma_result_to_context(doc, need_vector)
-                        if context:
-                            distance = results["distances"][0][i]
-                            score = 1 - distance  # Convert to similarity score
-                            all_results.append((context, score))
+    def _query_collection(
+        self,
+        context_type: str,
+        collection,
+        query_vector: List[float],
+        top_k: int,
+        where_clause: Optional[Dict[str, Any]],
+        need_vector: bool,
+    ) -> List[Tuple[ProcessedContext, float]]:
+        """Vector search within a single collection"""
+        results_list = []
+        try:
+            results = collection.query(
+                query_embeddings=[query_vector],
+                n_results=top_k,
+                where=where_clause,
+                include=(
+                    ["metadatas", "documents", "distances", "embeddings"]
+                    if need_vector
+                    else ["metadatas", "documents", "distances"]
+                ),
+            )
 
-            except Exception as e:
-                # Special handling for HNSW index errors
-                if (
-                    "hnsw segment reader" in str(e).lower()
-                    or "nothing found on disk" in str(e).lower()
-                ):
-                    logger.error(
-                        f"Collection '{context_type}' index not initialized (no data), skipping search: {e}"
-                    )
-                    continue
-                else:
-                    logger.exception(f"Vector search failed in {context_type} collection: {e}")
-                    continue
+            if results and results["ids"][0]:
+                for i in range(len(results["ids"][0])):
+                    doc = {
+                        "id": results["ids"][0][i],
+                        "document": results["documents"][0][i],
+                        "metadata": results["metadatas"][0][i],
+                    }
+                    if need_vector:
+                        doc["embedding"] = results["embeddings"][0][i]
+                    context = self._chroma_result_to_context(doc, need_vector)
+                    if context:
+                        distance = results["distances"][0][i]
+                        score = 1 - distance  # Convert to similarity score
+                        results_list.append((context, score))
 
-        # Sort by score and limit results
-        all_results.sort(key=lambda x: x[1], reverse=True)
-        # logger.info(f"Found {len(all_results)} results, returning top {top_k}")
-        return all_results[:top_k]
+        except Exception as e:
+            # Special handling for HNSW index errors
+            if "hnsw segment reader" in str(e).lower() or "nothing found on disk" in str(e).lower():
+                logger.error(
+                    f"Collection '{context_type}' index not initialized (no data), skipping search: {e}"
+                )
+            else:
+                logger.exception(f"Vector search failed in {context_type} collection: {e}")
+        return results_list
 
     def _chroma_result_to_context(
         self, doc: Dict[str, Any], need_vector: bool = True
@@ -686,6 +798,10 @@ class ChromaDBBackend(IVectorStorageBackend):
                 from opencontext.models.context import ProfileContextMetadata
 
                 metadata_field_names = set(ProfileContextMetadata.model_fields.keys())
+            elif context_type_value == ContextType.KNOWLEDGE_CONTEXT.value:
+                from opencontext.models.context import KnowledgeContextMetadata
+
+                metadata_field_names = set(KnowledgeContextMetadata.model_fields.keys())
             # Other context_types can add corresponding metadata models here
             # elif context_type_value == ContextType.ACTIVITY_CONTEXT.value:
             #     from opencontext.models.context import ActivityContextMetadata
@@ -782,6 +898,8 @@ class ChromaDBBackend(IVectorStorageBackend):
         try:
             with self._write_lock:
                 collection.delete(ids=ids)
+            # The collection may now be empty, recount on the next search
+            self._mark_nonempty(context_type, None)
             return True
         except Exception as e:
             logger.exception(f"Failed to delete ChromaDB contexts: {e}")
@@ -850,6 +968,7 @@ class ChromaDBBackend(IVectorStorageBackend):
                     embeddings=[embedding],
                     metadatas=[meta],
                 )
+            self._mark_nonempty("todo", True)
 
             return True
 
@@ -933,6 +1052,7 @@ class ChromaDBBackend(IVectorStorageBackend):
 
             with self._write_lock:
                 collection.delete(ids=[f"todo_{todo_id}"])
+            self._mark_nonempty("todo", None)
             logger.debug(f"Deleted todo embedding: id={todo_id}")
             return True
 
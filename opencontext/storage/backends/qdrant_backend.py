@@ -8,11 +8,11 @@ import datetime
 import json
 import uuid
 from enum import Enum
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 from qdrant_client import QdrantClient, models
 
-from opencontext.llm.global_embedding_client import do_vectorize
+from opencontext.llm.global_embedding_client import do_vectorize, do_vectorize_batch
 from opencontext.models.context import (
     ContextProperties,
     ExtractedData,
@@ -128,6 +128,17 @@ class QdrantBackend(IVectorStorageBackend):
             self._vector_size = len(context.vectorize.vector)
         return context.vectorize.vector
 
+    def _ensure_vectorized_batch(self, contexts: List[ProcessedContext]) -> None:
+        """Vectorize all contexts lacking a vector with batched embedding requests"""
+        pending = [c.vectorize for c in contexts if c.vectorize and not c.vectorize.vector]
+        if not pending:
+            return
+        try:
+            do_vectorize_batch(pending)
+        except Exception as e:
+            # Per-context vectorization below retries whatever is still missing
+            logger.warning(f"Batch vectorization of {len(pending)} contexts failed: {e}")
+
     def _context_to_qdrant_format(self, context: ProcessedContext) -> Dict[str, Any]:
         payload = context.model_dump(
             exclude_none=True,
@@ -187,6 +198,8 @@ class QdrantBackend(IVectorStorageBackend):
         if not self._check_connection():
             raise RuntimeError("Qdrant connection not available")
 
+        self._ensure_vectorized_batch(contexts)
+
         contexts_by_type = {}
         for context in contexts:
             context_type = context.extracted_data.context_type.value
@@ -296,24 +309,10 @@ class QdrantBackend(IVectorStorageBackend):
             try:
                 filter_condition = self._build_filter_condition(filter)
 
-                fetch_limit = limit + offset
-
-                records, _ = self._client.scroll(
-                    collection_name=collection_name,
-                    scroll_filter=filter_condition,
-                    limit=fetch_limit,
-                    with_payload=True,
-                    with_vectors=need_vector,
+                records = self._scroll_page(
+                    collection_name, filter_condition, limit, offset, need_vector
                 )
 
-                if offset > 0 and len(records) > offset:
-                    records = records[offset:]
-                elif offset > 0:
-                    records = []
-
-                if len(records) > limit:
-                    records = records[:limit]
-
                 contexts = []
                 for point in records:
                     context = self._qdrant_result_to_context(point, need_vector)
@@ -331,6 +330,76 @@ class QdrantBackend(IVectorStorageBackend):
 
         return result
 
+    def iter_processed_contexts(
+        self,
+        context_type: str,
+        filter: Optional[Dict[str, Any]] = None,
+        page_size: int = 500,
+        need_vector: bool = False,
+    ) -> Iterator[List[ProcessedContext]]:
+        """Stream contexts of one context_type, following Qdrant's scroll cursor"""
+        if not self._initialized or context_type not in self._collections:
+            return
+        collection_name = self._collections[context_type]
+        filter_condition = self._build_filter_condition(filter)
+        page_size = max(1, page_size)
+        next_offset = None
+        while True:
+            records, next_offset = self._client.scroll(
+                collection_name=collection_name,
+                scroll_filter=filter_condition,
+                limit=page_size,
+                offset=next_offset,
+                with_payload=True,
+                with_vectors=need_vector,
+            )
+            contexts = []
+            for point in records:
+                context = self._qdrant_result_to_context(point, need_vector)
+                if context:
+                    contexts.append(context)
+            if contexts:
+                yield contexts
+            if next_offset is None:
+                return
+
+    def _scroll_page(
+        self,
+        collection_name: str,
+        filter_condition,
+        limit: int,
+        offset: int,
+        need_vector: bool,
+    ) -> List[Any]:
+        """Read `limit` records after skipping `offset` matches
+
+        Qdrant cursors are point ids, so a numeric offset is reached by scrolling
+        over ids only, without payloads or vectors.
+        """
+        next_offset = None
+        while offset > 0:
+            skipped, next_offset = self._client.scroll(
+                collection_name=collection_name,
+                scroll_filter=filter_condition,
+                limit=min(offset, 1000),
+                offset=next_offset,
+                with_payload=False,
+                with_vectors=False,
+            )
+            offset -= len(skipped)
+            if next_offset is None:
+                return []
+
+        records, _ = self._client.scroll(
+            collection_name=collection_name,
+            scroll_filter=filter_condition,
+            limit=limit,
+            offset=next_offset,
+            with_payload=True,
+            with_vectors=need_vector,
+        )
+        return records
+
     def delete_processed_context(self, id: str, context_type: str) -> bool:
         return self.delete_contexts([id], context_type)
 
@@ -436,6 +505,10 @@ class QdrantBackend(IVectorStorageBackend):
                 from opencontext.models.context import ProfileContextMetadata
 
                 metadata_field_names = set(ProfileContextMetadata.model_fields.keys())
+            elif context_type_value == ContextType.KNOWLEDGE_CONTEXT.value:
+                from opencontext.models.context import KnowledgeContextMetadata
+
+                metadata_field_names = set(KnowledgeContextMetadata.model_fields.keys())
 
             original_id = payload.pop(FIELD_ORIGINAL_ID, str(point.id))
 
@@ -12,8 +12,9 @@ import json
 import os
 import sqlite3
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Union
 
+from opencontext.storage.backends.sqlite_engine import SQLiteReadPool, SQLiteWriter
 from opencontext.storage.base_storage import (
     DataType,
     DocumentData,
@@ -25,6 +26,10 @@ from opencontext.utils.logging_utils import get_logger
 
 logger = get_logger(__name__)
 
+# Vault changes kept while no consumer has a cursor, e.g. with the vault monitor disabled;
+# a consumer registering later starts from the latest change
+_VAULT_CHANGES_WITHOUT_CURSOR = 10000
+
 
 class SQLiteBackend(IDocumentStorageBackend):
     """
@@ -34,25 +39,40 @@ class SQLiteBackend(IDocumentStorageBackend):
 
     def __init__(self):
         self.db_path: Optional[str] = None
-        self.connection: Optional[sqlite3.Connection] = None
+        self._writer: Optional[SQLiteWriter] = None
+        self._readers: Optional[SQLiteReadPool] = None
         self._initialized = False
+        # Called after vault writes commit, so change feed consumers need not poll
+        self._vault_change_listeners: List[Callable[[], None]] = []
 
     def initialize(self, config: Dict[str, Any]) -> bool:
         """Initialize SQLite database"""
         try:
+            backend_config = config.get("config", {})
             # Use path from configuration, default to ./persist/sqlite/app.db
-            self.db_path = config.get("config", {}).get(
-                "path", "./persist/sqlite/app.db")
+            self.db_path = backend_config.get("path", "./persist/sqlite/app.db")
 
             # Ensure directory exists
             os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
 
-            self.connection = sqlite3.connect(
-                self.db_path, check_same_thread=False)
-            self.connection.row_factory = sqlite3.Row  # Allow column name access
+            # One writer thread serialises (and group-commits) all writes; reads use a
+            # pool of WAL readers that never wait for it
+            busy_timeout_ms = backend_config.get("busy_timeout_ms", 5000)
+            self._writer = SQLiteWriter(
+                self.db_path,
+                max_batch=backend_config.get("write_batch_size", 64),
+                busy_timeout_ms=busy_timeout_ms,
+            )
+            self._readers = SQLiteReadPool(
+                self.db_path,
+                size=backend_config.get("read_pool_size", 4),
+                busy_timeout_ms=busy_timeout_ms,
+            )
 
             # Create table structure
-            self._create_tables()
+            self._write(self._create_tables)
+            self._write(self._recover_streaming_messages)
+            self._insert_default_vault_document()
 
             self._initialized = True
             logger.info(
@@ -63,9 +83,20 @@ class SQLiteBackend(IDocumentStorageBackend):
             logger.exception(f"SQLite backend initialization failed: {e}")
             return False
 
-    def _create_tables(self):
+    def _write(self, job: Callable[[sqlite3.Cursor], Any]) -> Any:
+        """Run job(cursor) on the writer thread and return its result once committed"""
+        return self._writer.execute(job)
+
+    def _read_cursor(self):
+        """Check out a cursor on a pooled read connection (context manager)"""
+        return self._readers.cursor()
+
+    def get_write_stats(self) -> Dict[str, int]:
+        """Writer transaction statistics (group commit efficiency, queue depth)"""
+        return self._writer.get_stats() if self._writer else {}
+
+    def _create_tables(self, cursor: sqlite3.Cursor):
         """Create database table structure"""
-        cursor = self.connection.cursor()
 
         # vaults table - reports
         cursor.execute(
@@ -88,6 +119,56 @@ class SQLiteBackend(IDocumentStorageBackend):
         """
         )
 
+        # Vault change feed - every insert/update of a vault row appends a change with an
+        # increasing sequence number; consumers keep their position in vault_change_cursors
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS vault_changes (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                vault_id INTEGER NOT NULL,
+                change_type TEXT NOT NULL,
+                changed_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        """
+        )
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS vault_change_cursors (
+                consumer TEXT PRIMARY KEY,
+                seq INTEGER NOT NULL
+            )
+        """
+        )
+        cursor.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS trg_vaults_insert AFTER INSERT ON vaults
+            BEGIN
+                INSERT INTO vault_changes (vault_id, change_type) VALUES (NEW.id, 'created');
+            END
+        """
+        )
+        cursor.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS trg_vaults_update AFTER UPDATE ON vaults
+            BEGIN
+                INSERT INTO vault_changes (vault_id, change_type)
+                VALUES (NEW.id, CASE WHEN NEW.is_deleted AND NOT OLD.is_deleted
+                                     THEN 'deleted' ELSE 'updated' END);
+            END
+        """
+        )
+        # With cursors, changes are dropped once every consumer has processed them
+        cursor.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS trg_vault_changes_cap AFTER INSERT ON vault_changes
+            WHEN NOT EXISTS (SELECT 1 FROM vault_change_cursors)
+            BEGIN
+                DELETE FROM vault_changes
+                WHERE seq <= NEW.seq - {_VAULT_CHANGES_WITHOUT_CURSOR};
+            END
+        """
+        )
+
         # Todo table - todo items
         cursor.execute(
             """
@@ -162,6 +243,25 @@ class SQLiteBackend(IDocumentStorageBackend):
         """
         )
 
+        # Summaries table - hourly summaries and their rollups (e.g. daily reports), keyed by
+        # level and window start (unix seconds); stale once late contexts of the window arrive
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS summaries (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                level TEXT NOT NULL,
+                start_time INTEGER NOT NULL,
+                end_time INTEGER NOT NULL,
+                content TEXT,
+                source_count INTEGER DEFAULT 0,
+                is_stale INTEGER DEFAULT 0,
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                UNIQUE (level, start_time)
+            )
+        """
+        )
+
         # Monitoring tables
         # Token usage tracking - keep 7 days of data
         cursor.execute(
@@ -273,6 +373,9 @@ class SQLiteBackend(IDocumentStorageBackend):
         )
         cursor.execute(
             "CREATE INDEX IF NOT EXISTS idx_tips_time ON tips (created_at)")
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_summaries_window ON summaries (start_time, end_time)"
+        )
 
         # Monitoring table indexes
         cursor.execute(
@@ -337,21 +440,24 @@ class SQLiteBackend(IDocumentStorageBackend):
             "CREATE INDEX IF NOT EXISTS idx_message_thinking_sequence ON message_thinking(message_id, sequence)"
         )
 
-        self.connection.commit()
-
-        # Add default Quick Start document (only on first initialization)
-        self._insert_default_vault_document()
-
-    def _insert_default_vault_document(self):
-        """Insert default Quick Start document"""
-        cursor = self.connection.cursor()
-
-        # Check if Quick Start document already exists
+    def _recover_streaming_messages(self, cursor: sqlite3.Cursor):
+        """Fail messages left streaming by a previous process, keeping their partial content"""
+        now = datetime.now()
         cursor.execute(
-            "SELECT COUNT(*) FROM vaults WHERE title = 'Start With Tutorial'")
-        if cursor.fetchone()[0] > 0:
-            return
+            """
+            UPDATE messages
+            SET status = 'failed',
+                error_message = COALESCE(NULLIF(error_message, ''), 'Generation interrupted by a restart'),
+                completed_at = ?, updated_at = ?
+            WHERE status IN ('pending', 'streaming')
+            """,
+            (now, now),
+        )
+        if cursor.rowcount:
+            logger.warning(f"Marked {cursor.rowcount} interrupted streaming messages as failed")
 
+    def _insert_default_vault_document(self):
+        """Insert default Quick Start document (only on first initialization)"""
         try:
             config_dir = "./config"
             quick_start_file = os.path.join(
@@ -369,8 +475,12 @@ class SQLiteBackend(IDocumentStorageBackend):
         except Exception as e:
             default_content = "Welcome to Jarvis!\n\nYour Context-Aware AI Partner is ready to help you work, study, and create better."
 
-        # Insert default document
-        try:
+        def _insert(cursor):
+            # Check if Quick Start document already exists
+            cursor.execute(
+                "SELECT COUNT(*) FROM vaults WHERE title = 'Start With Tutorial'")
+            if cursor.fetchone()[0] > 0:
+                return None
             cursor.execute(
                 """
                 INSERT INTO vaults (title, summary, content, document_type, tags, is_folder, is_deleted)
@@ -386,8 +496,13 @@ class SQLiteBackend(IDocumentStorageBackend):
                     False,
                 ),
             )
-            vault_id = cursor.lastrowid
-            self.connection.commit()
+            return cursor.lastrowid
+
+        # Insert default document
+        try:
+            vault_id = self._write(_insert)
+            if vault_id is None:
+                return
             logger.info("Default Quick Start document inserted")
             from opencontext.managers.event_manager import EventType, get_event_manager
 
@@ -404,7 +519,6 @@ class SQLiteBackend(IDocumentStorageBackend):
         except Exception as e:
             logger.exception(
                 f"Failed to insert default Quick Start document: {e}")
-            self.connection.rollback()
 
     # Report table operations
     def insert_vaults(
@@ -421,8 +535,7 @@ class SQLiteBackend(IDocumentStorageBackend):
         if not self._initialized:
             raise RuntimeError("SQLite backend not initialized")
 
-        cursor = self.connection.cursor()
-        try:
+        def _op(cursor):
             cursor.execute(
                 """
                 INSERT INTO vaults (title, summary, content, tags, parent_id, is_folder, document_type, created_at, updated_at)
@@ -441,12 +554,14 @@ class SQLiteBackend(IDocumentStorageBackend):
                 ),
             )
 
-            vault_id = cursor.lastrowid
-            self.connection.commit()
+            return cursor.lastrowid
+
+        try:
+            vault_id = self._write(_op)
             logger.info(f"Report inserted, ID: {vault_id}")
+            self._notify_vault_change()
             return vault_id
         except Exception as e:
-            self.connection.rollback()
             logger.exception(f"Failed to insert report: {e}")
             raise
 
@@ -457,26 +572,26 @@ class SQLiteBackend(IDocumentStorageBackend):
         if not self._initialized:
             return []
 
-        cursor = self.connection.cursor()
-        try:
-            cursor.execute(
-                """
-                SELECT id, title, summary, content, tags, parent_id, is_folder, is_deleted,
-                       created_at, updated_at, document_type
-                FROM vaults
-                WHERE is_deleted = ? AND document_type != 'Note'
-                ORDER BY created_at DESC
-                LIMIT ? OFFSET ?
-            """,
-                (is_deleted, limit, offset),
-            )
+        with self._read_cursor() as cursor:
+            try:
+                cursor.execute(
+                    """
+                    SELECT id, title, summary, content, tags, parent_id, is_folder, is_deleted,
+                           created_at, updated_at, document_type
+                    FROM vaults
+                    WHERE is_deleted = ? AND document_type != 'Note'
+                    ORDER BY created_at DESC
+                    LIMIT ? OFFSET ?
+                """,
+                    (is_deleted, limit, offset),
+                )
 
-            rows = cursor.fetchall()
-            logger.info(f"Got report list successfully, {len(rows)} records")
-            return [dict(row) for row in rows]
-        except Exception as e:
-            logger.exception(f"Failed to get report list: {e}")
-            return []
+                rows = cursor.fetchall()
+                logger.info(f"Got report list successfully, {len(rows)} records")
+                return [dict(row) for row in rows]
+            except Exception as e:
+                logger.exception(f"Failed to get report list: {e}")
+                return []
 
     def get_vaults(
         self,
@@ -508,86 +623,85 @@ class SQLiteBackend(IDocumentStorageBackend):
         if not self._initialized:
             return []
 
-        cursor = self.connection.cursor()
-        try:
-            # Build WHERE conditions and parameters
-            where_clauses = ["is_deleted = ?"]
-            params = [is_deleted]
-
-            if document_type:
-                where_clauses.append("document_type = ?")
-                params.append(document_type)
-
-            if created_after:
-                where_clauses.append("created_at >= ?")
-                params.append(created_after.isoformat())
-
-            if created_before:
-                where_clauses.append("created_at <= ?")
-                params.append(created_before.isoformat())
-
-            if updated_after:
-                where_clauses.append("updated_at >= ?")
-                params.append(updated_after.isoformat())
-
-            if updated_before:
-                where_clauses.append("updated_at <= ?")
-                params.append(updated_before.isoformat())
-
-            # Add LIMIT and OFFSET parameters
-            params.extend([limit, offset])
-
-            where_clause = " AND ".join(where_clauses)
-            sql = f"""
-                SELECT id, title, summary, content, tags, parent_id, is_folder, is_deleted,
-                       created_at, updated_at, document_type
-                FROM vaults
-                WHERE {where_clause}
-                ORDER BY created_at DESC
-                LIMIT ? OFFSET ?
-            """
+        with self._read_cursor() as cursor:
+            try:
+                # Build WHERE conditions and parameters
+                where_clauses = ["is_deleted = ?"]
+                params = [is_deleted]
+
+                if document_type:
+                    where_clauses.append("document_type = ?")
+                    params.append(document_type)
+
+                if created_after:
+                    where_clauses.append("created_at >= ?")
+                    params.append(created_after.isoformat())
+
+                if created_before:
+                    where_clauses.append("created_at <= ?")
+                    params.append(created_before.isoformat())
+
+                if updated_after:
+                    where_clauses.append("updated_at >= ?")
+                    params.append(updated_after.isoformat())
+
+                if updated_before:
+                    where_clauses.append("updated_at <= ?")
+                    params.append(updated_before.isoformat())
+
+                # Add LIMIT and OFFSET parameters
+                params.extend([limit, offset])
+
+                where_clause = " AND ".join(where_clauses)
+                sql = f"""
+                    SELECT id, title, summary, content, tags, parent_id, is_folder, is_deleted,
+                           created_at, updated_at, document_type
+                    FROM vaults
+                    WHERE {where_clause}
+                    ORDER BY created_at DESC
+                    LIMIT ? OFFSET ?
+                """
 
-            cursor.execute(sql, params)
-            rows = cursor.fetchall()
+                cursor.execute(sql, params)
+                rows = cursor.fetchall()
 
-            # logger.info(f"Got vaults list successfully, {len(rows)} records")
-            return [dict(row) for row in rows]
+                # logger.info(f"Got vaults list successfully, {len(rows)} records")
+                return [dict(row) for row in rows]
 
-        except Exception as e:
-            logger.exception(f"Failed to get vaults list: {e}")
-            return []
+            except Exception as e:
+                logger.exception(f"Failed to get vaults list: {e}")
+                return []
 
     def get_vault(self, vault_id: int) -> Optional[Dict]:
         """Get vaults by ID"""
         if not self._initialized:
             return None
 
-        cursor = self.connection.cursor()
-        try:
-            cursor.execute(
-                """
-                SELECT id, title, summary, content, tags, parent_id, is_folder, is_deleted,
-                       created_at, updated_at, document_type
-                FROM vaults
-                WHERE id = ?
-            """,
-                (vault_id,),
-            )
+        with self._read_cursor() as cursor:
+            try:
+                cursor.execute(
+                    """
+                    SELECT id, title, summary, content, tags, parent_id, is_folder, is_deleted,
+                           created_at, updated_at, document_type
+                    FROM vaults
+                    WHERE id = ?
+                """,
+                    (vault_id,),
+                )
 
-            row = cursor.fetchone()
-            if row:
-                return dict(row)
-            return None
-        except Exception as e:
-            logger.exception(f"Failed to get vaults: {e}")
-            return None
+                row = cursor.fetchone()
+                if row:
+                    return dict(row)
+                return None
+            except Exception as e:
+                logger.exception(f"Failed to get vaults: {e}")
+                return None
 
     def update_vault(self, vault_id: int, **kwargs) -> bool:
         """Update report"""
         if not self._initialized:
             return False
 
-        cursor = self.connection.cursor()
         try:
             # Build dynamic update statement
             set_clauses = []
@@ -613,16 +727,93 @@ class SQLiteBackend(IDocumentStorageBackend):
             params.append(vault_id)
 
             sql = f"UPDATE vaults SET {', '.join(set_clauses)} WHERE id = ?"
-            cursor.execute(sql, params)
-
-            success = cursor.rowcount > 0
-            self.connection.commit()
-            return success
+            updated = self._write(lambda cursor: cursor.execute(sql, params).rowcount > 0)
+            if updated:
+                self._notify_vault_change()
+            return updated
         except Exception as e:
-            self.connection.rollback()
             logger.exception(f"Failed to update report: {e}")
             return False
 
+    # Vault change feed operations
+    def add_vault_change_listener(self, listener: Callable[[], None]) -> None:
+        """Register a function called (on the writing thread) after vault changes commit"""
+        self._vault_change_listeners.append(listener)
+
+    def _notify_vault_change(self):
+        for listener in list(self._vault_change_listeners):
+            try:
+                listener()
+            except Exception as e:
+                logger.debug(f"Vault change listener failed: {e}")
+
+    def get_vault_changes(self, after_seq: int, limit: int = 500) -> List[Dict]:
+        """Get vault changes after a sequence number, each with the vault's current row"""
+        if not self._initialized:
+            return []
+
+        with self._read_cursor() as cursor:
+            try:
+                cursor.execute(
+                    """
+                    SELECT c.seq, c.vault_id, c.change_type, v.title, v.summary, v.content,
+                           v.tags, v.parent_id, v.is_folder, v.is_deleted, v.created_at,
+                           v.updated_at, v.document_type
+                    FROM vault_changes c LEFT JOIN vaults v ON v.id = c.vault_id
+                    WHERE c.seq > ?
+                    ORDER BY c.seq
+                    LIMIT ?
+                """,
+                    (after_seq, limit),
+                )
+                return [dict(row) for row in cursor.fetchall()]
+            except Exception as e:
+                logger.exception(f"Failed to get vault changes: {e}")
+                return []
+
+    def get_vault_change_seq(self) -> int:
+        """Sequence number of the latest vault change, 0 if none"""
+        if not self._initialized:
+            return 0
+
+        with self._read_cursor() as cursor:
+            cursor.execute("SELECT COALESCE(MAX(seq), 0) FROM vault_changes")
+            return cursor.fetchone()[0]
+
+    def get_vault_change_cursor(self, consumer: str) -> Optional[int]:
+        """Last sequence number a consumer has processed, None if it never stored one"""
+        if not self._initialized:
+            return None
+
+        with self._read_cursor() as cursor:
+            cursor.execute("SELECT seq FROM vault_change_cursors WHERE consumer = ?", (consumer,))
+            row = cursor.fetchone()
+            return row[0] if row else None
+
+    def set_vault_change_cursor(self, consumer: str, seq: int) -> bool:
+        """Store a consumer's position and drop changes every consumer has processed"""
+        if not self._initialized:
+            return False
+
+        def _op(cursor):
+            cursor.execute(
+                """
+                INSERT INTO vault_change_cursors (consumer, seq) VALUES (?, ?)
+                ON CONFLICT (consumer) DO UPDATE SET seq = excluded.seq
+            """,
+                (consumer, seq),
+            )
+            cursor.execute(
+                "DELETE FROM vault_changes WHERE seq <= (SELECT MIN(seq) FROM vault_change_cursors)"
+            )
+            return True
+
+        try:
+            return self._write(_op)
+        except Exception as e:
+            logger.exception(f"Failed to store vault change cursor: {e}")
+            return False
+
     # Todo table operations
     def insert_todo(
         self,
@@ -638,8 +829,7 @@ class SQLiteBackend(IDocumentStorageBackend):
         if not self._initialized:
             raise RuntimeError("SQLite backend not initialized")
 
-        cursor = self.connection.cursor()
-        try:
+        def _op(cursor):
             cursor.execute(
                 """
                 INSERT INTO todo (content, start_time, end_time, status, urgency, assignee, reason, created_at)
@@ -657,12 +847,13 @@ class SQLiteBackend(IDocumentStorageBackend):
                 ),
             )
 
-            todo_id = cursor.lastrowid
-            self.connection.commit()
+            return cursor.lastrowid
+
+        try:
+            todo_id = self._write(_op)
             logger.info(f"Todo item inserted, ID: {todo_id}")
             return todo_id
         except Exception as e:
-            self.connection.rollback()
             logger.exception(f"Failed to insert todo item: {e}")
             raise
 
@@ -677,61 +868,59 @@ class SQLiteBackend(IDocumentStorageBackend):
         """Get todo item list"""
         if not self._initialized:
             return []
-        cursor = self.connection.cursor()
-        try:
-            where_conditions = []
-            params = []
-            if start_time:
-                where_conditions.append("start_time >= ?")
-                params.append(start_time)
-            if end_time:
-                where_conditions.append("end_time <= ?")
-                params.append(end_time)
-            if status is not None:
-                where_conditions.append("status = ?")
-                params.append(status)
-            where_clause = " AND ".join(
-                where_conditions) if where_conditions else "1=1"
-            params.extend([limit, offset])
-            cursor.execute(
-                f"""
-                SELECT id, content, created_at, start_time, end_time, status, urgency, assignee, reason
-                FROM todo
-                WHERE {where_clause}
-                ORDER BY urgency DESC, created_at DESC
-                LIMIT ? OFFSET ?
-            """,
-                params,
-            )
-            rows = cursor.fetchall()
-            return [dict(row) for row in rows]
-        except Exception as e:
-            logger.exception(f"Failed to get todo item list: {e}")
-            return []
+        with self._read_cursor() as cursor:
+            try:
+                where_conditions = []
+                params = []
+                if start_time:
+                    where_conditions.append("start_time >= ?")
+                    params.append(start_time)
+                if end_time:
+                    where_conditions.append("end_time <= ?")
+                    params.append(end_time)
+                if status is not None:
+                    where_conditions.append("status = ?")
+                    params.append(status)
+                where_clause = " AND ".join(
+                    where_conditions) if where_conditions else "1=1"
+                params.extend([limit, offset])
+                cursor.execute(
+                    f"""
+                    SELECT id, content, created_at, start_time, end_time, status, urgency, assignee, reason
+                    FROM todo
+                    WHERE {where_clause}
+                    ORDER BY urgency DESC, created_at DESC
+                    LIMIT ? OFFSET ?
+                """,
+                    params,
+                )
+                rows = cursor.fetchall()
+                return [dict(row) for row in rows]
+            except Exception as e:
+                logger.exception(f"Failed to get todo item list: {e}")
+                return []
 
     def update_todo_status(self, todo_id: int, status: int, end_time: datetime = None) -> bool:
         """Update todo item status"""
         if not self._initialized:
             return False
 
-        cursor = self.connection.cursor()
         try:
             if status == 1 and end_time is None:
                 end_time = datetime.now()
 
-            cursor.execute(
-                """
-                UPDATE todo SET status = ?, end_time = ?
-                WHERE id = ?
-            """,
-                (status, end_time, todo_id),
-            )
+            def _op(cursor):
+                cursor.execute(
+                    """
+                    UPDATE todo SET status = ?, end_time = ?
+                    WHERE id = ?
+                """,
+                    (status, end_time, todo_id),
+                )
+                return cursor.rowcount > 0
 
-            success = cursor.rowcount > 0
-            self.connection.commit()
-            return success
+            return self._write(_op)
         except Exception as e:
-            self.connection.rollback()
             logger.exception(f"Failed to update todo item status: {e}")
             return False
 
@@ -761,8 +950,7 @@ class SQLiteBackend(IDocumentStorageBackend):
         if not self._initialized:
             raise RuntimeError("SQLite backend not initialized")
 
-        cursor = self.connection.cursor()
-        try:
+        def _op(cursor):
             cursor.execute(
                 """
                 INSERT INTO activity (title, content, resources, metadata, start_time, end_time)
@@ -778,12 +966,13 @@ class SQLiteBackend(IDocumentStorageBackend):
                 ),
             )
 
-            activity_id = cursor.lastrowid
-            self.connection.commit()
+            return cursor.lastrowid
+
+        try:
+            activity_id = self._write(_op)
             logger.info(f"Activity record inserted, ID: {activity_id}")
             return activity_id
         except Exception as e:
-            self.connection.rollback()
             logger.exception(f"Failed to insert activity record: {e}")
             raise
 
@@ -798,38 +987,38 @@ class SQLiteBackend(IDocumentStorageBackend):
         if not self._initialized:
             return []
 
-        cursor = self.connection.cursor()
-        try:
-            where_conditions = []
-            params = []
+        with self._read_cursor() as cursor:
+            try:
+                where_conditions = []
+                params = []
 
-            if start_time:
-                where_conditions.append("start_time >= ?")
-                params.append(start_time)
-            if end_time:
-                where_conditions.append("end_time <= ?")
-                params.append(end_time)
+                if start_time:
+                    where_conditions.append("start_time >= ?")
+                    params.append(start_time)
+                if end_time:
+                    where_conditions.append("end_time <= ?")
+                    params.append(end_time)
 
-            where_clause = " AND ".join(
-                where_conditions) if where_conditions else "1=1"
-            params.extend([limit, offset])
+                where_clause = " AND ".join(
+                    where_conditions) if where_conditions else "1=1"
+                params.extend([limit, offset])
 
-            cursor.execute(
-                f"""
-                SELECT id, title, content, resources, metadata, start_time, end_time
-                FROM activity
-                WHERE {where_clause}
-                ORDER BY start_time DESC
-                LIMIT ? OFFSET ?
-            """,
-                params,
-            )
+                cursor.execute(
+                    f"""
+                    SELECT id, title, content, resources, metadata, start_time, end_time
+                    FROM activity
+                    WHERE {where_clause}
+                    ORDER BY start_time DESC
+                    LIMIT ? OFFSET ?
+                """,
+                    params,
+                )
 
-            rows = cursor.fetchall()
-            return [dict(row) for row in rows]
-        except Exception as e:
-            logger.exception(f"Failed to get activity record list: {e}")
-            return []
+                rows = cursor.fetchall()
+                return [dict(row) for row in rows]
+            except Exception as e:
+                logger.exception(f"Failed to get activity record list: {e}")
+                return []
 
     # Tips table operations
     def insert_tip(self, content: str) -> int:
@@ -837,8 +1026,7 @@ class SQLiteBackend(IDocumentStorageBackend):
         if not self._initialized:
             raise RuntimeError("SQLite backend not initialized")
 
-        cursor = self.connection.cursor()
-        try:
+        def _op(cursor):
             cursor.execute(
                 """
                 INSERT INTO tips (content, created_at)
@@ -847,12 +1035,13 @@ class SQLiteBackend(IDocumentStorageBackend):
                 (content, datetime.now()),
             )
 
-            tip_id = cursor.lastrowid
-            self.connection.commit()
+            return cursor.lastrowid
+
+        try:
+            tip_id = self._write(_op)
             logger.info(f"Tip inserted, ID: {tip_id}")
             return tip_id
         except Exception as e:
-            self.connection.rollback()
             logger.exception(f"Failed to insert tip: {e}")
             raise
 
@@ -867,39 +1056,135 @@ class SQLiteBackend(IDocumentStorageBackend):
         if not self._initialized:
             return []
 
-        cursor = self.connection.cursor()
-        try:
-            where_conditions = []
-            params = []
+        with self._read_cursor() as cursor:
+            try:
+                where_conditions = []
+                params = []
+
+                if start_time:
+                    where_conditions.append("created_at >= ?")
+                    params.append(start_time.isoformat())
+                if end_time:
+                    where_conditions.append("created_at <= ?")
+                    params.append(end_time.isoformat())
+
+                where_clause = " AND ".join(
+                    where_conditions) if where_conditions else "1=1"
+                params.extend([limit, offset])
 
-            if start_time:
-                where_conditions.append("created_at >= ?")
-                params.append(start_time.isoformat())
-            if end_time:
-                where_conditions.append("created_at <= ?")
-                params.append(end_time.isoformat())
+                cursor.execute(
+                    f"""
+                    SELECT id, content, created_at
+                    FROM tips
+                    WHERE {where_clause}
+                    ORDER BY created_at DESC
+                    LIMIT ? OFFSET ?
+                """,
+                    params,
+                )
+
+                rows = cursor.fetchall()
+                return [dict(row) for row in rows]
+            except Exception as e:
+                logger.exception(f"Failed to get tip list: {e}")
+                return []
+
+    # Summaries table operations
+    def upsert_summary(
+        self,
+        level: str,
+        start_time: int,
+        end_time: int,
+        content: str,
+        source_count: int = 0,
+    ) -> int:
+        """Store the summary of a window, replacing (and un-staling) an earlier one
 
-            where_clause = " AND ".join(
-                where_conditions) if where_conditions else "1=1"
-            params.extend([limit, offset])
+        Args:
+            level: Summary level, e.g. 'hour' or 'day'
+            start_time: Window start (unix seconds)
+            end_time: Window end (unix seconds)
+            content: Summary text, empty if nothing happened in the window
+            source_count: Number of contexts the summary was built from
+
+        Returns:
+            int: Summary ID
+        """
+        if not self._initialized:
+            raise RuntimeError("SQLite backend not initialized")
 
+        def _op(cursor):
             cursor.execute(
-                f"""
-                SELECT id, content, created_at
-                FROM tips
-                WHERE {where_clause}
-                ORDER BY created_at DESC
-                LIMIT ? OFFSET ?
+                """
+                INSERT INTO summaries (level, start_time, end_time, content, source_count, is_stale)
+                VALUES (?, ?, ?, ?, ?, 0)
+                ON CONFLICT (level, start_time) DO UPDATE SET
+                    end_time = excluded.end_time,
+                    content = excluded.content,
+                    source_count = excluded.source_count,
+                    is_stale = 0,
+                    updated_at = CURRENT_TIMESTAMP
             """,
-                params,
+                (level, start_time, end_time, content, source_count),
             )
+            cursor.execute(
+                "SELECT id FROM summaries WHERE level = ? AND start_time = ?",
+                (level, start_time),
+            )
+            return cursor.fetchone()[0]
 
-            rows = cursor.fetchall()
-            return [dict(row) for row in rows]
+        try:
+            return self._write(_op)
         except Exception as e:
-            logger.exception(f"Failed to get tip list: {e}")
+            logger.exception(f"Failed to store {level} summary: {e}")
+            raise
+
+    def get_summaries(self, level: str, start_time: int, end_time: int) -> List[Dict]:
+        """Get the summaries of a level whose window lies within [start_time, end_time]"""
+        if not self._initialized:
             return []
 
+        with self._read_cursor() as cursor:
+            try:
+                cursor.execute(
+                    """
+                    SELECT id, level, start_time, end_time, content, source_count, is_stale,
+                           updated_at
+                    FROM summaries
+                    WHERE level = ? AND start_time >= ? AND end_time <= ?
+                    ORDER BY start_time
+                """,
+                    (level, start_time, end_time),
+                )
+                return [dict(row) for row in cursor.fetchall()]
+            except Exception as e:
+                logger.exception(f"Failed to get {level} summaries: {e}")
+                return []
+
+    def mark_summaries_stale(self, timestamps: List[int]) -> int:
+        """Mark the summaries of every level whose window contains one of the timestamps stale"""
+        if not self._initialized or not timestamps:
+            return 0
+
+        def _op(cursor):
+            stale = 0
+            for ts in timestamps:
+                cursor.execute(
+                    """
+                    UPDATE summaries SET is_stale = 1, updated_at = CURRENT_TIMESTAMP
+                    WHERE is_stale = 0 AND start_time <= ? AND end_time > ?
+                """,
+                    (ts, ts),
+                )
+                stale += cursor.rowcount
+            return stale
+
+        try:
+            return self._write(_op)
+        except Exception as e:
+            logger.exception(f"Failed to mark summaries stale: {e}")
+            return 0
+
     def get_name(self) -> str:
         return "sqlite"
 
@@ -911,49 +1196,10 @@ class SQLiteBackend(IDocumentStorageBackend):
         self, model: str, prompt_tokens: int, completion_tokens: int, total_tokens: int
     ) -> bool:
         """Save token usage monitoring data (aggregated by hour using UPSERT)"""
-        if not self._initialized:
-            return False
-
-        try:
-            cursor = self.connection.cursor()
-
-            # Calculate time bucket (hour precision)
-            now = datetime.now()
-            time_bucket = now.strftime("%Y-%m-%d %H:00:00")
-
-            # Use INSERT ... ON CONFLICT to update or insert
-            cursor.execute(
-                """
-                INSERT INTO monitoring_token_usage (time_bucket, model, prompt_tokens, completion_tokens, total_tokens, created_at)
-                VALUES (?, ?, ?, ?, ?, ?)
-                ON CONFLICT(time_bucket, model)
-                DO UPDATE SET
-                    prompt_tokens = prompt_tokens + ?,
-                    completion_tokens = completion_tokens + ?,
-                    total_tokens = total_tokens + ?
-                """,
-                (
-                    time_bucket,
-                    model,
-                    prompt_tokens,
-                    completion_tokens,
-                    total_tokens,
-                    now,
-                    prompt_tokens,
-                    completion_tokens,
-                    total_tokens,
-                ),
-            )
-
-            self.connection.commit()
-            return True
-        except Exception as e:
-            logger.error(f"Failed to save token usage: {e}")
-            try:
-                self.connection.rollback()
-            except:
-                pass
-            return False
+        time_bucket = datetime.now().strftime("%Y-%m-%d %H:00:00")
+        return self.save_monitoring_batch(
+            token_usage=[(time_bucket, model, prompt_tokens, completion_tokens, total_tokens)]
+        )
 
     def save_monitoring_stage_timing(
         self,
@@ -963,93 +1209,23 @@ class SQLiteBackend(IDocumentStorageBackend):
         metadata: Optional[str] = None,
     ) -> bool:
         """Save stage timing monitoring data (aggregated by hour using UPSERT)"""
-        if not self._initialized:
-            return False
-
-        try:
-            cursor = self.connection.cursor()
-
-            # Calculate time bucket (hour precision)
-            now = datetime.now()
-            time_bucket = now.strftime("%Y-%m-%d %H:00:00")
-
-            # First, get existing stats if any
-            cursor.execute(
-                """
-                SELECT count, total_duration_ms, min_duration_ms, max_duration_ms, success_count, error_count
-                FROM monitoring_stage_timing
-                WHERE time_bucket = ? AND stage_name = ?
-                """,
-                (time_bucket, stage_name),
-            )
-            existing = cursor.fetchone()
-
-            if existing:
-                # Update existing record with aggregated stats
-                old_count, old_total, old_min, old_max, old_success, old_error = existing
-                new_count = old_count + 1
-                new_total = old_total + duration_ms
-                new_min = min(old_min, duration_ms)
-                new_max = max(old_max, duration_ms)
-                new_avg = new_total // new_count
-                new_success = old_success + (1 if status == "success" else 0)
-                new_error = old_error + (0 if status == "success" else 1)
-
-                cursor.execute(
-                    """
-                    UPDATE monitoring_stage_timing
-                    SET count = ?,
-                        total_duration_ms = ?,
-                        min_duration_ms = ?,
-                        max_duration_ms = ?,
-                        avg_duration_ms = ?,
-                        success_count = ?,
-                        error_count = ?
-                    WHERE time_bucket = ? AND stage_name = ?
-                    """,
-                    (
-                        new_count,
-                        new_total,
-                        new_min,
-                        new_max,
-                        new_avg,
-                        new_success,
-                        new_error,
-                        time_bucket,
-                        stage_name,
-                    ),
-                )
-            else:
-                # Insert new record
-                cursor.execute(
-                    """
-                    INSERT INTO monitoring_stage_timing
-                    (time_bucket, stage_name, count, total_duration_ms, min_duration_ms, max_duration_ms, avg_duration_ms, success_count, error_count, metadata, created_at)
-                    VALUES (?, ?, 1, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
-                    (
-                        time_bucket,
-                        stage_name,
-                        duration_ms,
-                        duration_ms,
-                        duration_ms,
-                        duration_ms,
-                        1 if status == "success" else 0,
-                        0 if status == "success" else 1,
-                        metadata,
-                        now,
-                    ),
+        time_bucket = datetime.now().strftime("%Y-%m-%d %H:00:00")
+        success = 1 if status == "success" else 0
+        return self.save_monitoring_batch(
+            stage_timing=[
+                (
+                    time_bucket,
+                    stage_name,
+                    1,
+                    duration_ms,
+                    duration_ms,
+                    duration_ms,
+                    success,
+                    1 - success,
+                    metadata,
                 )
-
-            self.connection.commit()
-            return True
-        except Exception as e:
-            logger.error(f"Failed to save stage timing: {e}")
-            try:
-                self.connection.rollback()
-            except:
-                pass
-            return False
+            ]
+        )
 
     def save_monitoring_data_stats(
         self,
@@ -1059,36 +1235,97 @@ class SQLiteBackend(IDocumentStorageBackend):
         metadata: Optional[str] = None,
     ) -> bool:
         """Save data statistics monitoring data (aggregated by hour using UPSERT)"""
+        time_bucket = datetime.now().strftime("%Y-%m-%d %H:00:00")
+        return self.save_monitoring_batch(
+            data_stats=[(time_bucket, data_type, context_type, count, metadata)]
+        )
+
+    def save_monitoring_batch(
+        self,
+        token_usage: Optional[List[tuple]] = None,
+        stage_timing: Optional[List[tuple]] = None,
+        data_stats: Optional[List[tuple]] = None,
+    ) -> bool:
+        """Merge pre-aggregated hourly monitoring rows in a single transaction
+
+        Args:
+            token_usage: (time_bucket, model, prompt_tokens, completion_tokens, total_tokens)
+            stage_timing: (time_bucket, stage_name, count, total_duration_ms, min_duration_ms,
+                max_duration_ms, success_count, error_count, metadata)
+            data_stats: (time_bucket, data_type, context_type, count, metadata)
+        """
         if not self._initialized:
             return False
+        if not token_usage and not stage_timing and not data_stats:
+            return True
 
-        try:
-            cursor = self.connection.cursor()
+        now = datetime.now()
 
-            # Calculate time bucket (hour precision)
-            now = datetime.now()
-            time_bucket = now.strftime("%Y-%m-%d %H:00:00")
+        def _op(cursor):
+            if token_usage:
+                cursor.executemany(
+                    """
+                    INSERT INTO monitoring_token_usage (time_bucket, model, prompt_tokens, completion_tokens, total_tokens, created_at)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(time_bucket, model)
+                    DO UPDATE SET
+                        prompt_tokens = prompt_tokens + excluded.prompt_tokens,
+                        completion_tokens = completion_tokens + excluded.completion_tokens,
+                        total_tokens = total_tokens + excluded.total_tokens
+                    """,
+                    [(*row, now) for row in token_usage],
+                )
 
-            # Use INSERT ... ON CONFLICT to update or insert
-            # First, try to get existing count
-            cursor.execute(
-                """
-                INSERT INTO monitoring_data_stats (time_bucket, data_type, count, context_type, metadata, created_at)
-                VALUES (?, ?, ?, ?, ?, ?)
-                ON CONFLICT(time_bucket, data_type, context_type)
-                DO UPDATE SET count = count + ?
-                """,
-                (time_bucket, data_type, count, context_type, metadata, now, count),
-            )
+            if stage_timing:
+                cursor.executemany(
+                    """
+                    INSERT INTO monitoring_stage_timing
+                    (time_bucket, stage_name, count, total_duration_ms, min_duration_ms, max_duration_ms, avg_duration_ms, success_count, error_count, metadata, created_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(time_bucket, stage_name)
+                    DO UPDATE SET
+                        count = count + excluded.count,
+                        total_duration_ms = total_duration_ms + excluded.total_duration_ms,
+                        min_duration_ms = MIN(min_duration_ms, excluded.min_duration_ms),
+                        max_duration_ms = MAX(max_duration_ms, excluded.max_duration_ms),
+                        avg_duration_ms = (total_duration_ms + excluded.total_duration_ms) / (count + excluded.count),
+                        success_count = success_count + excluded.success_count,
+                        error_count = error_count + excluded.error_count
+                    """,
+                    [
+                        (
+                            bucket,
+                            stage,
+                            count,
+                            total,
+                            min_ms,
+                            max_ms,
+                            total // max(count, 1),
+                            success,
+                            error,
+                            metadata,
+                            now,
+                        )
+                        for bucket, stage, count, total, min_ms, max_ms, success, error, metadata in stage_timing
+                    ],
+                )
+
+            if data_stats:
+                cursor.executemany(
+                    """
+                    INSERT INTO monitoring_data_stats (time_bucket, data_type, context_type, count, metadata, created_at)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(time_bucket, data_type, context_type)
+                    DO UPDATE SET count = count + excluded.count
+                    """,
+                    [(*row, now) for row in data_stats],
+                )
 
-            self.connection.commit()
+        try:
+            self._write(_op)
             return True
         except Exception as e:
-            logger.error(f"Failed to save data stats: {e}")
-            try:
-                self.connection.rollback()
-            except:
-                pass
+            logger.error(f"Failed to save monitoring data: {e}")
             return False
 
     def query_monitoring_token_usage(self, hours: int = 24) -> List[Dict[str, Any]]:
@@ -1099,27 +1336,27 @@ class SQLiteBackend(IDocumentStorageBackend):
         try:
             cutoff_time = datetime.now() - timedelta(hours=hours)
             cutoff_bucket = cutoff_time.strftime("%Y-%m-%d %H:00:00")
-            cursor = self.connection.cursor()
-            cursor.execute(
-                """
-                SELECT model, prompt_tokens, completion_tokens, total_tokens, time_bucket
-                FROM monitoring_token_usage
-                WHERE time_bucket >= ?
-                ORDER BY time_bucket DESC
-                """,
-                (cutoff_bucket,),
-            )
-            rows = cursor.fetchall()
-            return [
-                {
-                    "model": row[0],
-                    "prompt_tokens": row[1],
-                    "completion_tokens": row[2],
-                    "total_tokens": row[3],
-                    "time_bucket": row[4],
-                }
-                for row in rows
-            ]
+            with self._read_cursor() as cursor:
+                cursor.execute(
+                    """
+                    SELECT model, prompt_tokens, completion_tokens, total_tokens, time_bucket
+                    FROM monitoring_token_usage
+                    WHERE time_bucket >= ?
+                    ORDER BY time_bucket DESC
+                    """,
+                    (cutoff_bucket,),
+                )
+                rows = cursor.fetchall()
+                return [
+                    {
+                        "model": row[0],
+                        "prompt_tokens": row[1],
+                        "completion_tokens": row[2],
+                        "total_tokens": row[3],
+                        "time_bucket": row[4],
+                    }
+                    for row in rows
+                ]
         except Exception as e:
             logger.error(f"Failed to query token usage: {e}")
             return []
@@ -1132,33 +1369,33 @@ class SQLiteBackend(IDocumentStorageBackend):
         try:
             cutoff_time = datetime.now() - timedelta(hours=hours)
             cutoff_bucket = cutoff_time.strftime("%Y-%m-%d %H:00:00")
-            cursor = self.connection.cursor()
-            cursor.execute(
-                """
-                SELECT stage_name, count, total_duration_ms, min_duration_ms, max_duration_ms, avg_duration_ms, success_count, error_count, time_bucket
-                FROM monitoring_stage_timing
-                WHERE time_bucket >= ?
-                ORDER BY time_bucket DESC
-                """,
-                (cutoff_bucket,),
-            )
-            rows = cursor.fetchall()
-            return [
-                {
-                    "stage_name": row[0],
-                    "count": row[1],
-                    "total_duration": row[2],
-                    "min_duration": row[3],
-                    "max_duration": row[4],
-                    "duration_ms": row[5],  # avg_duration_ms
-                    "success_count": row[6],
-                    "error_count": row[7],
-                    # Backward compatibility
-                    "status": "success" if row[6] > 0 else "error",
-                    "time_bucket": row[8],
-                }
-                for row in rows
-            ]
+            with self._read_cursor() as cursor:
+                cursor.execute(
+                    """
+                    SELECT stage_name, count, total_duration_ms, min_duration_ms, max_duration_ms, avg_duration_ms, success_count, error_count, time_bucket
+                    FROM monitoring_stage_timing
+                    WHERE time_bucket >= ?
+                    ORDER BY time_bucket DESC
+                    """,
+                    (cutoff_bucket,),
+                )
+                rows = cursor.fetchall()
+                return [
+                    {
+                        "stage_name": row[0],
+                        "count": row[1],
+                        "total_duration": row[2],
+                        "min_duration": row[3],
+                        "max_duration": row[4],
+                        "duration_ms": row[5],  # avg_duration_ms
+                        "success_count": row[6],
+                        "error_count": row[7],
+                        # Backward compatibility
+                        "status": "success" if row[6] > 0 else "error",
+                        "time_bucket": row[8],
+                    }
+                    for row in rows
+                ]
         except Exception as e:
             logger.error(f"Failed to query stage timing: {e}")
             return []
@@ -1171,25 +1408,25 @@ class SQLiteBackend(IDocumentStorageBackend):
         try:
             cutoff_time = datetime.now() - timedelta(hours=hours)
             cutoff_bucket = cutoff_time.strftime("%Y-%m-%d %H:00:00")
-            cursor = self.connection.cursor()
-            cursor.execute(
-                """
-                SELECT data_type, SUM(count) as total_count, context_type
-                FROM monitoring_data_stats
-                WHERE time_bucket >= ?
-                GROUP BY data_type, context_type
-                """,
-                (cutoff_bucket,),
-            )
-            rows = cursor.fetchall()
-            return [
-                {
-                    "data_type": row[0],
-                    "count": row[1],
-                    "context_type": row[2],
-                }
-                for row in rows
-            ]
+            with self._read_cursor() as cursor:
+                cursor.execute(
+                    """
+                    SELECT data_type, SUM(count) as total_count, context_type
+                    FROM monitoring_data_stats
+                    WHERE time_bucket >= ?
+                    GROUP BY data_type, context_type
+                    """,
+                    (cutoff_bucket,),
+                )
+                rows = cursor.fetchall()
+                return [
+                    {
+                        "data_type": row[0],
+                        "count": row[1],
+                        "context_type": row[2],
+                    }
+                    for row in rows
+                ]
         except Exception as e:
             logger.error(f"Failed to query data stats: {e}")
             return []
@@ -1206,25 +1443,25 @@ class SQLiteBackend(IDocumentStorageBackend):
             start_bucket = start_time.strftime("%Y-%m-%d %H:00:00")
             end_bucket = end_time.strftime("%Y-%m-%d %H:00:00")
 
-            cursor = self.connection.cursor()
-            cursor.execute(
-                """
-                SELECT data_type, SUM(count) as total_count, context_type
-                FROM monitoring_data_stats
-                WHERE time_bucket >= ? AND time_bucket <= ?
-                GROUP BY data_type, context_type
-                """,
-                (start_bucket, end_bucket),
-            )
-            rows = cursor.fetchall()
-            return [
-                {
-                    "data_type": row[0],
-                    "count": row[1],
-                    "context_type": row[2],
-                }
-                for row in rows
-            ]
+            with self._read_cursor() as cursor:
+                cursor.execute(
+                    """
+                    SELECT data_type, SUM(count) as total_count, context_type
+                    FROM monitoring_data_stats
+                    WHERE time_bucket >= ? AND time_bucket <= ?
+                    GROUP BY data_type, context_type
+                    """,
+                    (start_bucket, end_bucket),
+                )
+                rows = cursor.fetchall()
+                return [
+                    {
+                        "data_type": row[0],
+                        "count": row[1],
+                        "context_type": row[2],
+                    }
+                    for row in rows
+                ]
         except Exception as e:
             logger.error(f"Failed to query data stats by range: {e}")
             return []
@@ -1247,33 +1484,32 @@ class SQLiteBackend(IDocumentStorageBackend):
         try:
             cutoff_time = datetime.now() - timedelta(hours=hours)
             cutoff_bucket = cutoff_time.strftime("%Y-%m-%d %H:00:00")
-            cursor = self.connection.cursor()
-
-            # Query using time_bucket directly (already hourly grouped)
-            cursor.execute(
-                """
-                SELECT
-                    time_bucket,
-                    data_type,
-                    SUM(count) as total_count,
-                    context_type
-                FROM monitoring_data_stats
-                WHERE time_bucket >= ?
-                GROUP BY time_bucket, data_type, context_type
-                ORDER BY time_bucket ASC
-                """,
-                (cutoff_bucket,),
-            )
-            rows = cursor.fetchall()
-            return [
-                {
-                    "timestamp": row[0],
-                    "data_type": row[1],
-                    "count": row[2],
-                    "context_type": row[3],
-                }
-                for row in rows
-            ]
+            with self._read_cursor() as cursor:
+                # Query using time_bucket directly (already hourly grouped)
+                cursor.execute(
+                    """
+                    SELECT
+                        time_bucket,
+                        data_type,
+                        SUM(count) as total_count,
+                        context_type
+                    FROM monitoring_data_stats
+                    WHERE time_bucket >= ?
+                    GROUP BY time_bucket, data_type, context_type
+                    ORDER BY time_bucket ASC
+                    """,
+                    (cutoff_bucket,),
+                )
+                rows = cursor.fetchall()
+                return [
+                    {
+                        "timestamp": row[0],
+                        "data_type": row[1],
+                        "count": row[2],
+                        "context_type": row[3],
+                    }
+                    for row in rows
+                ]
         except Exception as e:
             logger.error(f"Failed to query data stats trend: {e}")
             return []
@@ -1286,35 +1522,31 @@ class SQLiteBackend(IDocumentStorageBackend):
         try:
             cutoff_time = datetime.now() - timedelta(days=days)
             cutoff_bucket = cutoff_time.strftime("%Y-%m-%d %H:00:00")
-            cursor = self.connection.cursor()
 
-            # Clean up token usage data (use time_bucket)
-            cursor.execute(
-                "DELETE FROM monitoring_token_usage WHERE time_bucket < ?",
-                (cutoff_bucket,),
-            )
+            def _op(cursor):
+                # Clean up token usage data (use time_bucket)
+                cursor.execute(
+                    "DELETE FROM monitoring_token_usage WHERE time_bucket < ?",
+                    (cutoff_bucket,),
+                )
 
-            # Clean up stage timing data (use time_bucket)
-            cursor.execute(
-                "DELETE FROM monitoring_stage_timing WHERE time_bucket < ?",
-                (cutoff_bucket,),
-            )
+                # Clean up stage timing data (use time_bucket)
+                cursor.execute(
+                    "DELETE FROM monitoring_stage_timing WHERE time_bucket < ?",
+                    (cutoff_bucket,),
+                )
 
-            # Clean up data stats (use time_bucket)
-            cursor.execute(
-                "DELETE FROM monitoring_data_stats WHERE time_bucket < ?",
-                (cutoff_bucket,),
-            )
+                # Clean up data stats (use time_bucket)
+                cursor.execute(
+                    "DELETE FROM monitoring_data_stats WHERE time_bucket < ?",
+                    (cutoff_bucket,),
+                )
 
-            self.connection.commit()
+            self._write(_op)
             logger.info(f"Cleaned up monitoring data older than {days} days")
             return True
         except Exception as e:
             logger.error(f"Failed to cleanup old monitoring data: {e}")
-            try:
-                self.connection.rollback()
-            except:
-                pass
             return False
 
     # Conversation/Message operations
@@ -1331,11 +1563,10 @@ class SQLiteBackend(IDocumentStorageBackend):
         if not self._initialized:
             raise RuntimeError("SQLite backend not initialized")
 
-        cursor = self.connection.cursor()
-        try:
-            now = datetime.now()
-            meta_str = json.dumps(metadata, ensure_ascii=False) if metadata else "{}"
+        now = datetime.now()
+        meta_str = json.dumps(metadata, ensure_ascii=False) if metadata else "{}"
 
+        def _op(cursor):
             cursor.execute(
                 """
                 INSERT INTO conversations (page_name, user_id, title, metadata, status, created_at, updated_at)
@@ -1343,13 +1574,13 @@ class SQLiteBackend(IDocumentStorageBackend):
                 """,
                 (page_name, user_id, title, meta_str, "active", now, now),
             )
+            return cursor.lastrowid
 
-            conversation_id = cursor.lastrowid
-            self.connection.commit()
+        try:
+            conversation_id = self._write(_op)
             logger.info(f"Conversation created, ID: {conversation_id}")
             return self.get_conversation(conversation_id)
         except Exception as e:
-            self.connection.rollback()
             logger.exception(f"Failed to create conversation: {e}")
             return None
 
@@ -1360,24 +1591,24 @@ class SQLiteBackend(IDocumentStorageBackend):
         if not self._initialized:
             return None
 
-        cursor = self.connection.cursor()
-        try:
-            cursor.execute(
-                """
-                SELECT id, title, user_id, page_name, status, metadata, created_at, updated_at
-                FROM conversations
-                WHERE id = ?
-                """,
-                (conversation_id,),
-            )
+        with self._read_cursor() as cursor:
+            try:
+                cursor.execute(
+                    """
+                    SELECT id, title, user_id, page_name, status, metadata, created_at, updated_at
+                    FROM conversations
+                    WHERE id = ?
+                    """,
+                    (conversation_id,),
+                )
 
-            row = cursor.fetchone()
-            if row:
-                return dict(row)
-            return None
-        except Exception as e:
-            logger.exception(f"Failed to get conversation: {e}")
-            return None
+                row = cursor.fetchone()
+                if row:
+                    return dict(row)
+                return None
+            except Exception as e:
+                logger.exception(f"Failed to get conversation: {e}")
+                return None
 
     def get_conversation_list(
         self,
@@ -1393,56 +1624,56 @@ class SQLiteBackend(IDocumentStorageBackend):
         if not self._initialized:
             return {"items": [], "total": 0}
 
-        cursor = self.connection.cursor()
-        try:
-            where_clauses = []
-            params = []
-
-            if status:
-                where_clauses.append("status = ?")
-                params.append(status)
-            if page_name:
-                where_clauses.append("page_name = ?")
-                params.append(page_name)
-            if user_id:
-                where_clauses.append("user_id = ?")
-                params.append(user_id)
-
-            where_sql = " AND ".join(
-                where_clauses) if where_clauses else "1=1"
-
-            # Get total count
-            count_params = params[:]
-            cursor.execute(
-                f"""
-                SELECT COUNT(*)
-                FROM conversations
-                WHERE {where_sql}
-                """,
-                count_params,
-            )
-            total = cursor.fetchone()[0]
+        with self._read_cursor() as cursor:
+            try:
+                where_clauses = []
+                params = []
+
+                if status:
+                    where_clauses.append("status = ?")
+                    params.append(status)
+                if page_name:
+                    where_clauses.append("page_name = ?")
+                    params.append(page_name)
+                if user_id:
+                    where_clauses.append("user_id = ?")
+                    params.append(user_id)
+
+                where_sql = " AND ".join(
+                    where_clauses) if where_clauses else "1=1"
+
+                # Get total count
+                count_params = params[:]
+                cursor.execute(
+                    f"""
+                    SELECT COUNT(*)
+                    FROM conversations
+                    WHERE {where_sql}
+                    """,
+                    count_params,
+                )
+                total = cursor.fetchone()[0]
 
-            # Get items
-            list_params = params + [limit, offset]
-            cursor.execute(
-                f"""
-                SELECT id, title, user_id, page_name, status, metadata, created_at, updated_at
-                FROM conversations
-                WHERE {where_sql}
-                ORDER BY updated_at DESC
-                LIMIT ? OFFSET ?
-                """,
-                list_params,
-            )
-            rows = cursor.fetchall()
-            items = [dict(row) for row in rows]
+                # Get items
+                list_params = params + [limit, offset]
+                cursor.execute(
+                    f"""
+                    SELECT id, title, user_id, page_name, status, metadata, created_at, updated_at
+                    FROM conversations
+                    WHERE {where_sql}
+                    ORDER BY updated_at DESC
+                    LIMIT ? OFFSET ?
+                    """,
+                    list_params,
+                )
+                rows = cursor.fetchall()
+                items = [dict(row) for row in rows]
 
-            return {"items": items, "total": total}
+                return {"items": items, "total": total}
 
-        except Exception as e:
-            logger.exception(f"Failed to get conversation list: {e}")
-            return {"items": [], "total": 0}
+            except Exception as e:
+                logger.exception(f"Failed to get conversation list: {e}")
+                return {"items": [], "total": 0}
 
     def update_conversation(
         self,
@@ -1456,7 +1687,6 @@ class SQLiteBackend(IDocumentStorageBackend):
         if not self._initialized:
             return None
 
-        cursor = self.connection.cursor()
         try:
             set_clauses = []
             params = []
@@ -1478,11 +1708,8 @@ class SQLiteBackend(IDocumentStorageBackend):
             params.append(conversation_id)
 
             sql = f"UPDATE conversations SET {', '.join(set_clauses)} WHERE id = ?"
-            cursor.execute(sql, params)
-
-            self.connection.commit()
 
-            if cursor.rowcount > 0:
+            if self._write(lambda cursor: cursor.execute(sql, params).rowcount) > 0:
                 logger.info(f"Conversation {conversation_id} updated.")
                 return self.get_conversation(conversation_id)
             else:
@@ -1490,7 +1717,6 @@ class SQLiteBackend(IDocumentStorageBackend):
                     f"Failed to update conversation {conversation_id}, row not found or no change.")
                 return None
         except Exception as e:
-            self.connection.rollback()
             logger.exception(f"Failed to update conversation: {e}")
             return None
 
@@ -1523,27 +1749,27 @@ class SQLiteBackend(IDocumentStorageBackend):
         if not self._initialized:
             return None
 
-        cursor = self.connection.cursor()
-        try:
-            cursor.execute(
-                """
-                SELECT * FROM messages WHERE id = ?
-                """,
-                (message_id,),
-            )
-            row = cursor.fetchone()
-            if row:
-                message = dict(row)
+        with self._read_cursor() as cursor:
+            try:
+                cursor.execute(
+                    """
+                    SELECT * FROM messages WHERE id = ?
+                    """,
+                    (message_id,),
+                )
+                row = cursor.fetchone()
+                if row:
+                    message = dict(row)
 
-                # Include thinking records if requested
-                if include_thinking:
-                    message['thinking'] = self.get_message_thinking(message_id)
+                    # Include thinking records if requested
+                    if include_thinking:
+                        message['thinking'] = self.get_message_thinking(message_id)
 
-                return message
-            return None
-        except Exception as e:
-            logger.exception(f"Failed to get message: {e}")
-            return None
+                    return message
+                return None
+            except Exception as e:
+                logger.exception(f"Failed to get message: {e}")
+                return None
 
     def create_message(
         self,
@@ -1561,14 +1787,13 @@ class SQLiteBackend(IDocumentStorageBackend):
         if not self._initialized:
             raise RuntimeError("SQLite backend not initialized")
 
-        cursor = self.connection.cursor()
-        try:
-            now = datetime.now()
-            # Map is_complete to status and completed_at
-            status = "completed" if is_complete else "streaming"
-            completed_at = now if is_complete else None
-            meta_str = json.dumps(metadata, ensure_ascii=False) if metadata else "{}"
+        now = datetime.now()
+        # Map is_complete to status and completed_at
+        status = "completed" if is_complete else "streaming"
+        completed_at = now if is_complete else None
+        meta_str = json.dumps(metadata, ensure_ascii=False) if metadata else "{}"
 
+        def _op(cursor):
             cursor.execute(
                 """
                 INSERT INTO messages (conversation_id, role, content, status, token_count,
@@ -1595,12 +1820,13 @@ class SQLiteBackend(IDocumentStorageBackend):
                 "UPDATE conversations SET updated_at = ? WHERE id = ?",
                 (now, conversation_id),
             )
+            return message_id
 
-            self.connection.commit()
+        try:
+            message_id = self._write(_op)
             logger.info(f"Message created, ID: {message_id}")
             return self.get_message(message_id)  # Return the created message
         except Exception as e:
-            self.connection.rollback()
             logger.exception(f"Failed to create message: {e}")
             return None
 
@@ -1638,7 +1864,6 @@ class SQLiteBackend(IDocumentStorageBackend):
         if not self._initialized:
             return None
 
-        cursor = self.connection.cursor()
         try:
             now = datetime.now()
             set_clauses = ["content = ?", "updated_at = ?"]
@@ -1661,27 +1886,27 @@ class SQLiteBackend(IDocumentStorageBackend):
             params.append(message_id)
 
             sql = f"UPDATE messages SET {', '.join(set_clauses)} WHERE id = ?"
-            cursor.execute(sql, params)
 
-            # Update conversation's updated_at
-            cursor.execute(
-                """
-                UPDATE conversations SET updated_at = ?
-                WHERE id = (SELECT conversation_id FROM messages WHERE id = ?)
-                """,
-                (now, message_id),
-            )
+            def _op(cursor):
+                cursor.execute(sql, params)
 
-            self.connection.commit()
+                # Update conversation's updated_at
+                cursor.execute(
+                    """
+                    UPDATE conversations SET updated_at = ?
+                    WHERE id = (SELECT conversation_id FROM messages WHERE id = ?)
+                    """,
+                    (now, message_id),
+                )
+                return cursor.rowcount
 
-            if cursor.rowcount > 0:
+            if self._write(_op) > 0:
                 return self.get_message(message_id)
             else:
                 logger.warning(
                     f"Failed to update message {message_id}, not found.")
                 return None
         except Exception as e:
-            self.connection.rollback()
             logger.exception(f"Failed to update message: {e}")
             return None
 
@@ -1697,10 +1922,9 @@ class SQLiteBackend(IDocumentStorageBackend):
         if not self._initialized:
             return False
 
-        cursor = self.connection.cursor()
-        try:
-            now = datetime.now()
+        now = datetime.now()
 
+        def _op(cursor):
             # Use SQLite string concatenation ||
             # Also update status to 'streaming' if it was 'pending'
             cursor.execute(
@@ -1716,8 +1940,6 @@ class SQLiteBackend(IDocumentStorageBackend):
             )
 
             if cursor.rowcount == 0:
-                logger.warning(
-                    f"Failed to append message {message_id}, not found.")
                 return False
 
             # Update conversation's updated_at
@@ -1728,11 +1950,15 @@ class SQLiteBackend(IDocumentStorageBackend):
                 """,
                 (now, message_id),
             )
+            return True
 
-            self.connection.commit()
+        try:
+            if not self._write(_op):
+                logger.warning(
+                    f"Failed to append message {message_id}, not found.")
+                return False
             return True
         except Exception as e:
-            self.connection.rollback()
             logger.exception(f"Failed to append message content: {e}")
             return False
 
@@ -1747,11 +1973,10 @@ class SQLiteBackend(IDocumentStorageBackend):
         if not self._initialized:
             return False
 
-        cursor = self.connection.cursor()
-        try:
-            now = datetime.now()
-            meta_str = json.dumps(metadata, ensure_ascii=False) if metadata else "{}"
+        now = datetime.now()
+        meta_str = json.dumps(metadata, ensure_ascii=False) if metadata else "{}"
 
+        def _op(cursor):
             cursor.execute(
                 """
                 UPDATE messages
@@ -1760,12 +1985,11 @@ class SQLiteBackend(IDocumentStorageBackend):
                 """,
                 (meta_str, now, message_id),
             )
+            return cursor.rowcount > 0
 
-            success = cursor.rowcount > 0
-            self.connection.commit()
-            return success
+        try:
+            return self._write(_op)
         except Exception as e:
-            self.connection.rollback()
             logger.exception(f"Failed to update message metadata: {e}")
             return False
 
@@ -1784,7 +2008,6 @@ class SQLiteBackend(IDocumentStorageBackend):
         if status not in ["completed", "failed", "cancelled"]:
             status = "completed"  # Default to completed
 
-        cursor = self.connection.cursor()
         try:
             now = datetime.now()
 
@@ -1804,33 +2027,33 @@ class SQLiteBackend(IDocumentStorageBackend):
             # Remove the last part from sql
             sql = f"UPDATE messages SET {', '.join(set_clauses[:-1])} WHERE id = ? AND {set_clauses[-1]}"
 
-            cursor.execute(sql, params)
-
-            success = cursor.rowcount > 0
-            if not success:
-                # Check if it failed because it was already in the desired state
+            def _op(cursor):
+                cursor.execute(sql, params)
+
+                success = cursor.rowcount > 0
+                if not success:
+                    # Check if it failed because it was already in the desired state
+                    cursor.execute(
+                        "SELECT status FROM messages WHERE id = ?", (message_id,))
+                    row = cursor.fetchone()
+                    if row and row[0] == status:
+                        success = True  # Already done, count as success
+                    else:
+                        logger.warning(
+                            f"Failed to mark message {message_id} as {status}, not found or no change.")
+
+                # Update conversation's updated_at
                 cursor.execute(
-                    "SELECT status FROM messages WHERE id = ?", (message_id,))
-                row = cursor.fetchone()
-                if row and row[0] == status:
-                    success = True  # Already done, count as success
-                else:
-                    logger.warning(
-                        f"Failed to mark message {message_id} as {status}, not found or no change.")
-
-            # Update conversation's updated_at
-            cursor.execute(
-                """
-                UPDATE conversations SET updated_at = ?
-                WHERE id = (SELECT conversation_id FROM messages WHERE id = ?)
-                """,
-                (now, message_id),
-            )
+                    """
+                    UPDATE conversations SET updated_at = ?
+                    WHERE id = (SELECT conversation_id FROM messages WHERE id = ?)
+                    """,
+                    (now, message_id),
+                )
+                return success
 
-            self.connection.commit()
-            return success
+            return self._write(_op)
         except Exception as e:
-            self.connection.rollback()
             logger.exception(f"Failed to mark message {status}: {e}")
             return False
 
@@ -1852,28 +2075,28 @@ class SQLiteBackend(IDocumentStorageBackend):
         if not self._initialized:
             return []
 
-        cursor = self.connection.cursor()
-        try:
-            cursor.execute(
-                """
-                SELECT * FROM messages
-                WHERE conversation_id = ?
-                ORDER BY created_at ASC
-                """,
-                (conversation_id,),
-            )
-            rows = cursor.fetchall()
-            # Convert sqlite3.Row objects to standard dicts and add thinking records
-            messages = []
-            for row in rows:
-                message = dict(row)
-                # Add thinking records for this message
-                message['thinking'] = self.get_message_thinking(message['id'])
-                messages.append(message)
-            return messages
-        except Exception as e:
-            logger.exception(f"Failed to get conversation messages: {e}")
-            return []
+        with self._read_cursor() as cursor:
+            try:
+                cursor.execute(
+                    """
+                    SELECT * FROM messages
+                    WHERE conversation_id = ?
+                    ORDER BY created_at ASC
+                    """,
+                    (conversation_id,),
+                )
+                rows = cursor.fetchall()
+                # Convert sqlite3.Row objects to standard dicts and add thinking records
+                messages = []
+                for row in rows:
+                    message = dict(row)
+                    # Add thinking records for this message
+                    message['thinking'] = self.get_message_thinking(message['id'])
+                    messages.append(message)
+                return messages
+            except Exception as e:
+                logger.exception(f"Failed to get conversation messages: {e}")
+                return []
 
     def delete_message(self, message_id: int) -> bool:
         """
@@ -1889,16 +2112,14 @@ class SQLiteBackend(IDocumentStorageBackend):
             logger.warning("Storage not initialized")
             return False
 
-        cursor = self.connection.cursor()
         try:
-            cursor.execute(
-                "DELETE FROM messages WHERE id = ?",
-                (message_id,)
+            return self._write(
+                lambda cursor: cursor.execute(
+                    "DELETE FROM messages WHERE id = ?", (message_id,)
+                ).rowcount
+                > 0
             )
-            self.connection.commit()
-            return cursor.rowcount > 0
         except Exception as e:
-            self.connection.rollback()
             logger.exception(f"Failed to delete message {message_id}: {e}")
             return False
 
@@ -1931,17 +2152,18 @@ class SQLiteBackend(IDocumentStorageBackend):
             logger.warning("Storage not initialized")
             return None
 
-        cursor = self.connection.cursor()
-        try:
-            # Auto-increment sequence if not provided
-            if sequence is None:
+        meta_str = json.dumps(metadata, ensure_ascii=False) if metadata else "{}"
+
+        def _op(cursor):
+            # Auto-increment sequence if not provided; read in the write transaction so
+            # concurrent records of the same message get distinct sequence numbers
+            next_sequence = sequence
+            if next_sequence is None:
                 cursor.execute(
                     "SELECT COALESCE(MAX(sequence), -1) + 1 FROM message_thinking WHERE message_id = ?",
                     (message_id,)
                 )
-                sequence = cursor.fetchone()[0]
-
-            meta_str = json.dumps(metadata, ensure_ascii=False) if metadata else "{}"
+                next_sequence = cursor.fetchone()[0]
 
             cursor.execute(
                 """
@@ -1949,14 +2171,15 @@ class SQLiteBackend(IDocumentStorageBackend):
                 (message_id, content, stage, progress, sequence, metadata)
                 VALUES (?, ?, ?, ?, ?, ?)
                 """,
-                (message_id, content, stage, progress, sequence, meta_str),
+                (message_id, content, stage, progress, next_sequence, meta_str),
             )
-            thinking_id = cursor.lastrowid
-            self.connection.commit()
+            return cursor.lastrowid
+
+        try:
+            thinking_id = self._write(_op)
             logger.debug(f"Added thinking record {thinking_id} to message {message_id}")
             return thinking_id
         except Exception as e:
-            self.connection.rollback()
             logger.exception(f"Failed to add thinking to message {message_id}: {e}")
             return None
 
@@ -1973,22 +2196,22 @@ class SQLiteBackend(IDocumentStorageBackend):
         if not self._initialized:
             return []
 
-        cursor = self.connection.cursor()
-        try:
-            cursor.execute(
-                """
-                SELECT id, message_id, content, stage, progress, sequence, metadata, created_at
-                FROM message_thinking
-                WHERE message_id = ?
-                ORDER BY sequence ASC, created_at ASC
-                """,
-                (message_id,)
-            )
-            rows = cursor.fetchall()
-            return [dict(row) for row in rows]
-        except Exception as e:
-            logger.exception(f"Failed to get thinking for message {message_id}: {e}")
-            return []
+        with self._read_cursor() as cursor:
+            try:
+                cursor.execute(
+                    """
+                    SELECT id, message_id, content, stage, progress, sequence, metadata, created_at
+                    FROM message_thinking
+                    WHERE message_id = ?
+                    ORDER BY sequence ASC, created_at ASC
+                    """,
+                    (message_id,)
+                )
+                rows = cursor.fetchall()
+                return [dict(row) for row in rows]
+            except Exception as e:
+                logger.exception(f"Failed to get thinking for message {message_id}: {e}")
+                return []
 
     def clear_message_thinking(self, message_id: int) -> bool:
         """
@@ -2003,16 +2226,14 @@ class SQLiteBackend(IDocumentStorageBackend):
         if not self._initialized:
             return False
 
-        cursor = self.connection.cursor()
         try:
-            cursor.execute(
-                "DELETE FROM message_thinking WHERE message_id = ?",
-                (message_id,)
+            self._write(
+                lambda cursor: cursor.execute(
+                    "DELETE FROM message_thinking WHERE message_id = ?", (message_id,)
+                )
             )
-            self.connection.commit()
             return True
         except Exception as e:
-            self.connection.rollback()
             logger.exception(f"Failed to clear thinking for message {message_id}: {e}")
             return False
 
@@ -2023,113 +2244,114 @@ class SQLiteBackend(IDocumentStorageBackend):
         if not self._initialized:
             return QueryResult(documents=[], total_count=0)
 
-        cursor = self.connection.cursor()
-
-        try:
-            # Build query conditions
-            where_conditions = []
-            params = []
-
-            # Text search conditions
-            if query:
-                where_conditions.append(
-                    '(content LIKE ? OR JSON_EXTRACT(metadata, "$.title") LIKE ?)'
-                )
-                query_pattern = f"%{query}%"
-                params.extend([query_pattern, query_pattern])
+        with self._read_cursor() as cursor:
+            try:
+                # Build query conditions
+                where_conditions = []
+                params = []
 
-            # Filter conditions
-            if filters:
-                if "content_type" in filters:
+                # Text search conditions
+                if query:
                     where_conditions.append(
-                        'JSON_EXTRACT(metadata, "$.content_type") = ?')
-                    params.append(filters["content_type"])
-
-                if "data_type" in filters:
-                    where_conditions.append("data_type = ?")
-                    params.append(filters["data_type"])
-
-                if "tags" in filters:
-                    tags = (
-                        filters["tags"] if isinstance(filters["tags"], list) else [
-                            filters["tags"]]
+                        '(content LIKE ? OR JSON_EXTRACT(metadata, "$.title") LIKE ?)'
                     )
-                    if tags:
-                        # Use proper parameterized query for tags
-                        tag_placeholders = ",".join(["?"] * len(tags))
+                    query_pattern = f"%{query}%"
+                    params.extend([query_pattern, query_pattern])
+
+                # Filter conditions
+                if filters:
+                    if "content_type" in filters:
                         where_conditions.append(
-                            f'id IN (SELECT document_id FROM document_tags WHERE tag IN ({tag_placeholders}))'
+                            'JSON_EXTRACT(metadata, "$.content_type") = ?')
+                        params.append(filters["content_type"])
+
+                    if "data_type" in filters:
+                        where_conditions.append("data_type = ?")
+                        params.append(filters["data_type"])
+
+                    if "tags" in filters:
+                        tags = (
+                            filters["tags"] if isinstance(filters["tags"], list) else [
+                                filters["tags"]]
                         )
-                        for tag in tags:
-                            params.append(tag.lower())
-
-            # Build SQL query
-            where_clause = " AND ".join(
-                where_conditions) if where_conditions else "1=1"
-
-            # Get documents
-            # Use text() for safe SQL composition with parameters
-            base_sql = """
-                SELECT DISTINCT d.id, d.content, d.data_type, d.metadata, d.created_at, d.updated_at
-                FROM documents d
-                LEFT JOIN document_tags dt ON d.id = dt.document_id
-                WHERE """
-            sql = base_sql + where_clause + """
-                ORDER BY d.updated_at DESC
-                LIMIT ?
-            """
-            params.append(limit)
+                        if tags:
+                            # Use proper parameterized query for tags
+                            tag_placeholders = ",".join(["?"] * len(tags))
+                            where_conditions.append(
+                                f'id IN (SELECT document_id FROM document_tags WHERE tag IN ({tag_placeholders}))'
+                            )
+                            for tag in tags:
+                                params.append(tag.lower())
+
+                # Build SQL query
+                where_clause = " AND ".join(
+                    where_conditions) if where_conditions else "1=1"
+
+                # Get documents
+                # Use text() for safe SQL composition with parameters
+                base_sql = """
+                    SELECT DISTINCT d.id, d.content, d.data_type, d.metadata, d.created_at, d.updated_at
+                    FROM documents d
+                    LEFT JOIN document_tags dt ON d.id = dt.document_id
+                    WHERE """
+                sql = base_sql + where_clause + """
+                    ORDER BY d.updated_at DESC
+                    LIMIT ?
+                """
+                params.append(limit)
 
-            cursor.execute(sql, params)
-            rows = cursor.fetchall()
+                cursor.execute(sql, params)
+                rows = cursor.fetchall()
 
-            documents = []
-            for row in rows:
-                # Get images for each document
-                cursor.execute(
-                    "SELECT image_path FROM images WHERE document_id = ? ORDER BY id", (
-                        row["id"],)
-                )
-                images = [img_row[0] for img_row in cursor.fetchall()]
-
-                # Parse metadata
-                metadata = {}
-                if row["metadata"]:
-                    try:
-                        metadata = json.loads(row["metadata"])
-                    except json.JSONDecodeError:
-                        pass
-
-                documents.append(
-                    DocumentData(
-                        id=row["id"],
-                        content=row["content"],
-                        metadata=metadata,
-                        data_type=DataType(row["data_type"]),
-                        images=images if images else None,
+                documents = []
+                for row in rows:
+                    # Get images for each document
+                    cursor.execute(
+                        "SELECT image_path FROM images WHERE document_id = ? ORDER BY id", (
+                            row["id"],)
+                    )
+                    images = [img_row[0] for img_row in cursor.fetchall()]
+
+                    # Parse metadata
+                    metadata = {}
+                    if row["metadata"]:
+                        try:
+                            metadata = json.loads(row["metadata"])
+                        except json.JSONDecodeError:
+                            pass
+
+                    documents.append(
+                        DocumentData(
+                            id=row["id"],
+                            content=row["content"],
+                            metadata=metadata,
+                            data_type=DataType(row["data_type"]),
+                            images=images if images else None,
+                        )
                     )
-                )
 
-            # Get total count
-            count_base_sql = """
-                SELECT COUNT(DISTINCT d.id)
-                FROM documents d
-                LEFT JOIN document_tags dt ON d.id = dt.document_id
-                WHERE """
-            count_sql = count_base_sql + where_clause
-            cursor.execute(count_sql, params[:-1])  # Exclude limit parameter
-            total_count = cursor.fetchone()[0]
+                # Get total count
+                count_base_sql = """
+                    SELECT COUNT(DISTINCT d.id)
+                    FROM documents d
+                    LEFT JOIN document_tags dt ON d.id = dt.document_id
+                    WHERE """
+                count_sql = count_base_sql + where_clause
+                cursor.execute(count_sql, params[:-1])  # Exclude limit parameter
+                total_count = cursor.fetchone()[0]
 
-            return QueryResult(documents=documents, total_count=total_count)
+                return QueryResult(documents=documents, total_count=total_count)
 
-        except Exception as e:
-            logger.exception(f"SQLite text search failed: {e}")
-            return QueryResult(documents=[], total_count=0)
+            except Exception as e:
+                logger.exception(f"SQLite text search failed: {e}")
+                return QueryResult(documents=[], total_count=0)
 
     def close(self):
-        """Close the database connection"""
-        if self.connection:
-            self.connection.close()
-            self.connection = None
+        """Drain pending writes and close the database connections"""
+        if self._writer:
             self._initialized = False
+            self._writer.close()
+            self._readers.close()
+            self._writer = None
+            self._readers = None
             logger.info("SQLite database connection closed")
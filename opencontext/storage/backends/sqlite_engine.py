@@ -0,0 +1,251 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2025 Beijing Volcano Engine Technology Co., Ltd.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+SQLite connection management: WAL-mode read connection pool and a single writer thread
+"""
+
+import queue
+import sqlite3
+import threading
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, List, Optional, Tuple
+
+from opencontext.utils.logging_utils import get_logger
+
+logger = get_logger(__name__)
+
+WriteJob = Callable[[sqlite3.Cursor], Any]
+
+
+def connect(path: str, read_only: bool = False, busy_timeout_ms: int = 5000) -> sqlite3.Connection:
+    """Open a connection with the pragmas every connection of the backend shares"""
+    # isolation_level=None: transactions are managed explicitly by the writer
+    connection = sqlite3.connect(
+        path,
+        check_same_thread=False,
+        isolation_level=None,
+        timeout=busy_timeout_ms / 1000,
+    )
+    connection.row_factory = sqlite3.Row
+    connection.execute(f"PRAGMA busy_timeout={int(busy_timeout_ms)}")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    connection.execute("PRAGMA temp_store=MEMORY")
+    connection.execute("PRAGMA cache_size=-16000")  # 16 MiB per connection
+    if read_only:
+        connection.execute("PRAGMA query_only=ON")
+    return connection
+
+
+class SQLiteReadPool:
+    """
+    Bounded pool of read-only connections.
+
+    In WAL mode readers never block the writer nor each other, so each checked-out
+    connection sees the last committed snapshot while writes proceed. Checkouts are
+    re-entrant per thread: a read that calls another read (e.g. messages with their
+    thinking records) reuses the connection it already holds instead of waiting for a
+    second one, which could deadlock a fully checked-out pool.
+    """
+
+    def __init__(self, path: str, size: int = 4, busy_timeout_ms: int = 5000):
+        self._path = path
+        self._size = max(1, int(size))
+        self._busy_timeout_ms = busy_timeout_ms
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._created = 0
+        self._all: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._closed = False
+
+    @contextmanager
+    def cursor(self) -> Iterator[sqlite3.Cursor]:
+        held = getattr(self._local, "held", None)
+        if held is not None:
+            connection, depth = held
+            self._local.held = (connection, depth + 1)
+            try:
+                yield connection.cursor()
+            finally:
+                self._local.held = (connection, depth)
+            return
+
+        connection = self._acquire()
+        self._local.held = (connection, 1)
+        try:
+            yield connection.cursor()
+        finally:
+            self._local.held = None
+            self._release(connection)
+
+    def _acquire(self) -> sqlite3.Connection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("SQLite read pool is closed")
+            if self._created < self._size:
+                connection = connect(
+                    self._path, read_only=True, busy_timeout_ms=self._busy_timeout_ms
+                )
+                self._created += 1
+                self._all.append(connection)
+                return connection
+        return self._idle.get()
+
+    def _release(self, connection: sqlite3.Connection):
+        if connection.in_transaction:
+            connection.rollback()
+        self._idle.put(connection)
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            connections, self._all = self._all, []
+        for connection in connections:
+            try:
+                connection.close()
+            except Exception:
+                pass
+
+
+class SQLiteWriter:
+    """
+    Single writer thread owning the only write connection.
+
+    Callers submit a job, a callable receiving a cursor, and block until the transaction
+    containing it is committed. The writer drains every job queued while the previous
+    transaction was running (up to ``max_batch``) and commits them together; each job
+    runs inside its own savepoint, so a failing job is rolled back and reports its
+    exception without affecting the others in the group.
+    """
+
+    _STOP = object()
+
+    def __init__(self, path: str, max_batch: int = 64, busy_timeout_ms: int = 5000):
+        self._connection = connect(path, busy_timeout_ms=busy_timeout_ms)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._max_batch = max(1, int(max_batch))
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._stats = {"transactions": 0, "jobs": 0, "failed_jobs": 0}
+        # Makes the closed check and the put in submit atomic with close
+        self._lock = threading.Lock()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="sqlite-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, job: WriteJob) -> "Future[Any]":
+        future: "Future[Any]" = Future()
+        with self._lock:
+            if not self._closed and self._thread.is_alive():
+                self._queue.put((job, future))
+                return future
+        future.set_exception(RuntimeError("SQLite writer is closed"))
+        return future
+
+    def execute(self, job: WriteJob) -> Any:
+        """Run a job in a write transaction and return its result once committed"""
+        if threading.current_thread() is self._thread:
+            # Nested write from inside a job: join the enclosing transaction
+            return job(self._connection.cursor())
+        return self.submit(job).result()
+
+    def get_stats(self) -> dict:
+        stats = dict(self._stats)
+        stats["pending"] = self._queue.qsize()
+        return stats
+
+    def close(self, timeout: Optional[float] = 10.0):
+        with self._lock:
+            if not self._closed:
+                self._closed = True
+                # Nothing is queued after the sentinel: the writer fails what follows it
+                self._queue.put(self._STOP)
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            # Still in a transaction: the connection is left to the writer thread
+            logger.warning("SQLite writer did not stop in time, leaving its connection open")
+            return
+        try:
+            self._connection.close()
+        except Exception:
+            pass
+
+    def _run(self):
+        try:
+            self._write_loop()
+        finally:
+            with self._lock:
+                self._closed = True
+            # Jobs behind the sentinel, or left by a writer that died, are never run
+            while True:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is not self._STOP and not item[1].done():
+                    item[1].set_exception(RuntimeError("SQLite writer is closed"))
+
+    def _write_loop(self):
+        while True:
+            item = self._queue.get()
+            if item is self._STOP:
+                return
+            batch = [item]
+            stop = False
+            while len(batch) < self._max_batch:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is self._STOP:
+                    stop = True
+                    break
+                batch.append(item)
+            self._commit_batch(batch)
+            if stop:
+                return
+
+    def _commit_batch(self, batch: List[Tuple[WriteJob, Future]]):
+        cursor = self._connection.cursor()
+        outcomes = []
+        try:
+            cursor.execute("BEGIN IMMEDIATE")
+            for job, future in batch:
+                if not future.set_running_or_notify_cancel():
+                    continue
+                cursor.execute("SAVEPOINT job")
+                try:
+                    outcomes.append((future, job(cursor), None))
+                    cursor.execute("RELEASE job")
+                except Exception as e:
+                    cursor.execute("ROLLBACK TO job")
+                    cursor.execute("RELEASE job")
+                    outcomes.append((future, None, e))
+            cursor.execute("COMMIT")
+        except Exception as e:
+            logger.exception(f"SQLite write transaction failed: {e}")
+            try:
+                self._connection.rollback()
+            except Exception:
+                pass
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        self._stats["transactions"] += 1
+        for future, result, error in outcomes:
+            self._stats["jobs"] += 1
+            if error is not None:
+                self._stats["failed_jobs"] += 1
+                future.set_exception(error)
+            else:
+                future.set_result(result)
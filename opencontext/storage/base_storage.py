@@ -13,7 +13,7 @@ from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
 
 from opencontext.models.context import ProcessedContext, Vectorize
 
@@ -110,6 +110,30 @@ class IVectorStorageBackend(IStorageBackend):
     ) -> Dict[str, List[ProcessedContext]]:
         """Get processed contexts"""
 
+    @abstractmethod
+    def iter_processed_contexts(
+        self,
+        context_type: str,
+        filter: Optional[Dict[str, Any]] = None,
+        page_size: int = 500,
+        need_vector: bool = False,
+    ) -> Iterator[List[ProcessedContext]]:
+        """Stream processed contexts of one context_type page by page
+
+        Pages are read with the backend's native cursor, so a full scan costs O(N) rows.
+        Cursors may be offset based: collect ids and delete them after the scan instead
+        of deleting from the scanned collection while iterating.
+
+        Args:
+            context_type: Context type to scan
+            filter: Optional filter conditions, same format as get_all_processed_contexts
+            page_size: Maximum number of contexts per page
+            need_vector: Whether to include embedding vectors
+
+        Yields:
+            Non-empty lists of ProcessedContext
+        """
+
     @abstractmethod
     def get_processed_context(self, id: str, context_type: str) -> ProcessedContext:
         """Get specified context"""
@@ -125,6 +149,7 @@ class IVectorStorageBackend(IStorageBackend):
         top_k: int = 10,
         context_types: Optional[List[str]] = None,
         filters: Optional[Dict[str, Any]] = None,
+        need_vector: bool = False,
     ) -> List[Tuple[ProcessedContext, float]]:
         """Vector similarity search"""
 
@@ -298,6 +323,45 @@ class IDocumentStorageBackend(IStorageBackend):
     def get_tips(self, limit: int = 100, offset: int = 0) -> List[Dict]:
         """Get tips"""
 
+    @abstractmethod
+    def get_vault_changes(self, after_seq: int, limit: int = 500) -> List[Dict]:
+        """Get vault changes after a sequence number, with the vaults' current rows"""
+
+    @abstractmethod
+    def get_vault_change_seq(self) -> int:
+        """Sequence number of the latest vault change"""
+
+    @abstractmethod
+    def get_vault_change_cursor(self, consumer: str) -> Optional[int]:
+        """Last vault change sequence number a consumer has processed"""
+
+    @abstractmethod
+    def set_vault_change_cursor(self, consumer: str, seq: int) -> bool:
+        """Store the last vault change sequence number a consumer has processed"""
+
+    @abstractmethod
+    def add_vault_change_listener(self, listener: Callable[[], None]) -> None:
+        """Register a function called after vault changes are committed"""
+
+    @abstractmethod
+    def upsert_summary(
+        self,
+        level: str,
+        start_time: int,
+        end_time: int,
+        content: str,
+        source_count: int = 0,
+    ) -> int:
+        """Store the summary of a time window (hour, day, ...), replacing an earlier one"""
+
+    @abstractmethod
+    def get_summaries(self, level: str, start_time: int, end_time: int) -> List[Dict]:
+        """Get the summaries of a level within a time range"""
+
+    @abstractmethod
+    def mark_summaries_stale(self, timestamps: List[int]) -> int:
+        """Mark the summaries whose window contains one of the timestamps stale"""
+
     @abstractmethod
     def update_todo_status(self, todo_id: int, status: int, end_time: datetime = None) -> bool:
         """Update todo item status"""
@@ -0,0 +1,188 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2025 Beijing Volcano Engine Technology Co., Ltd.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Buffered writer for streaming chat messages
+Accumulates streamed chunks in memory and appends them to storage in batches, off the event loop
+"""
+
+import asyncio
+import time
+from typing import Any, Dict, List, Optional
+
+from opencontext.utils.logging_utils import get_logger
+
+logger = get_logger(__name__)
+
+# Finishing tasks outlive the request that started them; keep them referenced until done
+_finishing = set()
+
+
+class MessageStreamWriter:
+    """
+    Persists one streaming message.
+
+    Chunks are buffered and appended with a single ``append_message_content`` call once
+    ``flush_interval`` seconds passed since the last flush or ``flush_chars`` characters
+    are pending. Storage calls run in a worker thread; at most one flush is in flight,
+    and each flush takes everything buffered when it starts, so chunks land in order.
+
+    Durability: while streaming, the stored content lags the generated one by at most one
+    flush window, and the message stays in 'streaming' status so readers see the partial
+    answer. ``finish`` flushes the remainder before writing metadata and the final status.
+    If the process dies mid-stream, the message keeps the content of the last flush and
+    is marked 'failed' by the storage backend on the next start.
+    """
+
+    def __init__(
+        self,
+        storage: Any,
+        message_id: int,
+        flush_interval: float = 0.25,
+        flush_chars: int = 1024,
+    ):
+        self._storage = storage
+        self._message_id = message_id
+        self._flush_interval = flush_interval
+        self._flush_chars = flush_chars
+        self._chunks: List[str] = []
+        self._pending_chars = 0
+        self._pending_tokens = 0
+        self._last_flush = time.monotonic()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._finished = False
+        self._finish_task: Optional[asyncio.Task] = None
+        self.flush_count = 0
+
+    @property
+    def message_id(self) -> int:
+        return self._message_id
+
+    @property
+    def finished(self) -> bool:
+        return self._finished
+
+    def append(self, chunk: str, token_count: int = 1):
+        """Buffer a chunk, starting a background flush when one is due"""
+        if self._finished or not chunk:
+            return
+        self._chunks.append(chunk)
+        self._pending_chars += len(chunk)
+        self._pending_tokens += token_count
+        self._schedule()
+
+    async def flush(self):
+        """Wait for the flush in flight, then write whatever is still buffered"""
+        while self._flush_task is not None and not self._flush_task.done():
+            await asyncio.shield(self._flush_task)
+        self._cancel_timer()
+        if self._chunks:
+            self._flush_task = asyncio.get_running_loop().create_task(self._flush())
+            await asyncio.shield(self._flush_task)
+
+    async def finish(
+        self,
+        status: Optional[str] = "completed",
+        error_message: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+    ):
+        """
+        Flush remaining content, then store metadata and the final status.
+
+        Pass status=None to only persist content and metadata, e.g. when the status was
+        already set elsewhere (interrupt endpoint).
+        """
+        task = self.finish_nowait(status, error_message, metadata)
+        if task is not None:
+            await asyncio.shield(task)
+
+    def finish_nowait(
+        self,
+        status: Optional[str] = "completed",
+        error_message: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> Optional[asyncio.Task]:
+        """
+        Start finishing in a task of its own without awaiting it.
+        For callers being cancelled (client disconnect), where any await is cancelled again.
+        """
+        if self._finished:
+            return self._finish_task
+        self._finished = True
+        self._finish_task = asyncio.get_running_loop().create_task(
+            self._finish(status, error_message, metadata)
+        )
+        _finishing.add(self._finish_task)
+        self._finish_task.add_done_callback(_finishing.discard)
+        return self._finish_task
+
+    async def _finish(
+        self, status: Optional[str], error_message: Optional[str], metadata: Optional[Dict]
+    ):
+        await self.flush()
+
+        def _finalize():
+            if metadata:
+                self._storage.update_message_metadata(
+                    message_id=self._message_id, metadata=metadata
+                )
+            if status:
+                self._storage.mark_message_finished(
+                    message_id=self._message_id, status=status, error_message=error_message
+                )
+
+        try:
+            await asyncio.to_thread(_finalize)
+        except Exception as e:
+            logger.exception(f"Failed to finish streamed message {self._message_id}: {e}")
+
+    def _schedule(self):
+        """Start a flush now if one is due, otherwise make sure one runs when it is"""
+        if self._finished or not self._chunks:
+            return
+        if self._flush_task is not None and not self._flush_task.done():
+            return  # Rescheduled when the flush in flight completes
+        loop = asyncio.get_running_loop()
+        due_in = self._last_flush + self._flush_interval - time.monotonic()
+        if self._pending_chars >= self._flush_chars or due_in <= 0:
+            self._cancel_timer()
+            self._flush_task = loop.create_task(self._flush())
+        elif self._timer is None:
+            # Pauses in the stream must not leave the tail unpersisted
+            self._timer = loop.call_later(due_in, self._on_timer)
+
+    def _on_timer(self):
+        self._timer = None
+        self._schedule()
+
+    def _cancel_timer(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    async def _flush(self):
+        if not self._chunks:
+            return
+        content = "".join(self._chunks)
+        tokens = self._pending_tokens
+        self._chunks = []
+        self._pending_chars = 0
+        self._pending_tokens = 0
+        self._last_flush = time.monotonic()
+        try:
+            await asyncio.to_thread(
+                self._storage.append_message_content,
+                message_id=self._message_id,
+                content_chunk=content,
+                token_count=tokens,
+            )
+            self.flush_count += 1
+        except Exception as e:
+            logger.exception(
+                f"Failed to persist streamed content of message {self._message_id}: {e}"
+            )
+        self._schedule()
@@ -9,7 +9,7 @@ Unified storage system - unified management supporting multiple storage backends
 """
 
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 from opencontext.models.context import ProcessedContext, Vectorize
 from opencontext.models.enums import ContextType
@@ -179,6 +179,7 @@ class UnifiedStorage:
         try:
             # Directly pass ProcessedContext to vector database
             doc_ids = self._vector_backend.batch_upsert_processed_context(contexts)
+            self._invalidate_summaries(contexts)
             return doc_ids
 
         except Exception as e:
@@ -198,12 +199,28 @@ class UnifiedStorage:
         try:
             # Directly pass ProcessedContext to vector database
             doc_id = self._vector_backend.upsert_processed_context(context)
+            self._invalidate_summaries([context])
             return doc_id
 
         except Exception as e:
             logger.exception(f"Failed to store context: {e}")
             return None
 
+    def _invalidate_summaries(self, contexts: List[ProcessedContext]):
+        """Contexts arriving late for an hour that has closed make its stored summaries stale"""
+        if not self._document_backend:
+            return
+        current_hour = datetime.now().replace(minute=0, second=0, microsecond=0).timestamp()
+        late_hours = set()
+        for context in contexts:
+            hour = context.properties.create_time.replace(minute=0, second=0, microsecond=0)
+            if hour.timestamp() < current_hour:
+                late_hours.add(int(hour.timestamp()))
+        if late_hours:
+            stale = self._document_backend.mark_summaries_stale(sorted(late_hours))
+            if stale:
+                logger.info(f"Late contexts invalidated {stale} stored summaries")
+
     def get_processed_context(self, id: str, context_type: str):
         return self._vector_backend.get_processed_context(id, context_type)
 
@@ -241,6 +258,51 @@ class UnifiedStorage:
             logger.exception(f"Failed to query ProcessedContext: {e}")
             return {}
 
+    def iter_processed_contexts(
+        self,
+        context_type: str,
+        filter: Optional[Dict[str, Any]] = None,
+        page_size: int = 500,
+        need_vector: bool = False,
+    ) -> Iterator[List[ProcessedContext]]:
+        """Stream processed contexts of one context_type page by page"""
+        if not self._initialized:
+            logger.error("Unified storage system not initialized")
+            return
+
+        if not self._vector_backend:
+            logger.error("Vector database backend not initialized")
+            return
+
+        try:
+            yield from self._vector_backend.iter_processed_contexts(
+                context_type=context_type,
+                filter=filter,
+                page_size=page_size,
+                need_vector=need_vector,
+            )
+        except Exception as e:
+            logger.exception(f"Failed to iterate {context_type} ProcessedContext: {e}")
+
+    def delete_contexts(self, ids: List[str], context_type: str) -> bool:
+        """Delete several processed contexts of one context_type"""
+        if not ids:
+            return True
+        if not self._initialized or not self._vector_backend:
+            logger.error("Vector database backend not initialized")
+            return False
+
+        try:
+            success = True
+            # Keep each delete request bounded for large cleanups
+            for start in range(0, len(ids), 1000):
+                chunk = ids[start : start + 1000]
+                success = self._vector_backend.delete_contexts(chunk, context_type) and success
+            return success
+        except Exception as e:
+            logger.exception(f"Failed to delete {context_type} contexts: {e}")
+            return False
+
     def get_processed_context_count(self, context_type: str) -> int:
         """Get record count for specified context_type"""
         if not self._initialized:
@@ -286,6 +348,7 @@ class UnifiedStorage:
         top_k: int = 10,
         context_types: Optional[List[str]] = None,
         filters: Optional[Dict[str, Any]] = None,
+        need_vector: bool = False,
     ) -> List[Tuple[ProcessedContext, float]]:
         """Vector search, supports context_type filtering"""
         if not self._initialized:
@@ -299,7 +362,11 @@ class UnifiedStorage:
         try:
             # Execute vector search
             search_results = self._vector_backend.search(
-                query=query, top_k=top_k, context_types=context_types, filters=filters
+                query=query,
+                top_k=top_k,
+                context_types=context_types,
+                filters=filters,
+                need_vector=need_vector,
             )
 
             return search_results
@@ -524,6 +591,35 @@ class UnifiedStorage:
 
         return self._document_backend.update_vault(vault_id, **kwargs)
 
+    def get_vault_changes(self, after_seq: int, limit: int = 500) -> List[Dict]:
+        """Get vault changes after a sequence number, with the vaults' current rows"""
+        if not self._initialized or not self._document_backend:
+            return []
+        return self._document_backend.get_vault_changes(after_seq, limit)
+
+    def get_vault_change_seq(self) -> int:
+        """Sequence number of the latest vault change"""
+        if not self._initialized or not self._document_backend:
+            return 0
+        return self._document_backend.get_vault_change_seq()
+
+    def get_vault_change_cursor(self, consumer: str) -> Optional[int]:
+        """Last vault change sequence number a consumer has processed"""
+        if not self._initialized or not self._document_backend:
+            return None
+        return self._document_backend.get_vault_change_cursor(consumer)
+
+    def set_vault_change_cursor(self, consumer: str, seq: int) -> bool:
+        """Store the last vault change sequence number a consumer has processed"""
+        if not self._initialized or not self._document_backend:
+            return False
+        return self._document_backend.set_vault_change_cursor(consumer, seq)
+
+    def add_vault_change_listener(self, listener) -> None:
+        """Register a function called after vault changes are committed"""
+        if self._document_backend:
+            self._document_backend.add_vault_change_listener(listener)
+
     def get_reports(
         self, limit: int = 100, offset: int = 0, is_deleted: bool = False
     ) -> List[Dict]:
@@ -687,6 +783,35 @@ class UnifiedStorage:
             return []
         return self._document_backend.get_tips(start_time, end_time, limit, offset)
 
+    def upsert_summary(
+        self,
+        level: str,
+        start_time: int,
+        end_time: int,
+        content: str,
+        source_count: int = 0,
+    ) -> Optional[int]:
+        """Store the summary of a time window (hour, day, ...)"""
+        if not self._initialized:
+            logger.error("Unified storage system not initialized")
+            return None
+
+        if not self._document_backend:
+            return None
+        return self._document_backend.upsert_summary(
+            level, start_time, end_time, content, source_count
+        )
+
+    def get_summaries(self, level: str, start_time: int, end_time: int) -> List[Dict]:
+        """Get stored summaries of a level within a time range"""
+        if not self._initialized:
+            logger.error("Unified storage system not initialized")
+            return []
+
+        if not self._document_backend:
+            return []
+        return self._document_backend.get_summaries(level, start_time, end_time)
+
     def update_todo_status(self, todo_id: int, status: int, end_time: datetime = None) -> bool:
         """Update todo item status"""
         if not self._initialized:
@@ -708,6 +833,15 @@ class UnifiedStorage:
             model, prompt_tokens, completion_tokens, total_tokens
         )
 
+    def save_monitoring_batch(
+        self,
+        token_usage: Optional[List[tuple]] = None,
+        stage_timing: Optional[List[tuple]] = None,
+        data_stats: Optional[List[tuple]] = None,
+    ) -> bool:
+        """Save pre-aggregated monitoring rows in one transaction"""
+        return self._document_backend.save_monitoring_batch(token_usage, stage_timing, data_stats)
+
     def save_monitoring_stage_timing(
         self,
         stage_name: str,
@@ -836,9 +970,7 @@ class UnifiedStorage:
             message_id=message_id, content_chunk=content_chunk, token_count=token_count
         )
 
-    def update_message_metadata(
-        self, message_id: int, metadata: Dict[str, Any]
-    ) -> bool:
+    def update_message_metadata(self, message_id: int, metadata: Dict[str, Any]) -> bool:
         """Update message metadata"""
         if not self._initialized or not self._document_backend:
             logger.error("Storage not initialized")
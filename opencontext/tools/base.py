@@ -8,13 +8,141 @@
 Entity normalization tool base class
 """
 
+import asyncio
+import contextvars
+import functools
+import threading
+import weakref
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Set
 
+from opencontext.config.global_config import get_config
 from opencontext.utils.logging_utils import get_logger
 
 logger = get_logger(__name__)
 
+_tool_executor: Optional[ThreadPoolExecutor] = None
+_tool_executor_lock = threading.Lock()
+_worker_state = threading.local()
+# Calls the caller gave up on (timed out) that still occupy a worker, per pool
+_abandoned: Dict[ThreadPoolExecutor, Set[Future]] = {}
+# Pool each submitted call runs on: a timed out call counts against its own pool
+_call_pools: "weakref.WeakKeyDictionary[Future, ThreadPoolExecutor]" = weakref.WeakKeyDictionary()
+_executor_stats = {"abandoned": 0, "replaced_pools": 0}
+
+
+def _mark_tool_worker():
+    _worker_state.active = True
+
+
+def _max_workers() -> int:
+    return get_config("tools.execution.max_workers") or 8
+
+
+def get_tool_executor() -> ThreadPoolExecutor:
+    """
+    Shared, bounded thread pool running blocking tool work (storage queries, sync tools).
+
+    Sized by ``tools.execution.max_workers``, so a burst of parallel tool calls queues
+    instead of spawning one thread per call. A thread cannot be interrupted, so a timed out
+    call keeps its worker until it returns; once such calls hold half of the workers, new
+    calls go to a fresh pool and the old one is left to finish them.
+    """
+    global _tool_executor
+    if _tool_executor is None:
+        with _tool_executor_lock:
+            if _tool_executor is None:
+                _tool_executor = ThreadPoolExecutor(
+                    max_workers=_max_workers(),
+                    thread_name_prefix="tool-worker",
+                    initializer=_mark_tool_worker,
+                )
+    return _tool_executor
+
+
+def submit_tool_call(func: Callable[..., Any], *args, **kwargs) -> Future:
+    """Submit a call to the shared tool executor, remembering the pool it runs on"""
+    executor = get_tool_executor()
+    try:
+        future = executor.submit(func, *args, **kwargs)
+    except RuntimeError:
+        # Another thread retired and shut down the pool since we got it: use the new one
+        executor = get_tool_executor()
+        future = executor.submit(func, *args, **kwargs)
+    with _tool_executor_lock:
+        _call_pools[future] = executor
+    return future
+
+
+def abandon_tool_call(future: Future):
+    """
+    Record that the caller stopped waiting for a call made with ``submit_tool_call``.
+    A call still queued is dropped; one already running counts against the pool it runs
+    on, which is retired if it is still the current one.
+    """
+    if future.cancel() or future.done():
+        return
+    global _tool_executor
+    with _tool_executor_lock:
+        executor = _call_pools.get(future)
+        if executor is None:
+            return
+        stuck = _abandoned.setdefault(executor, set())
+        stuck.add(future)
+        _executor_stats["abandoned"] += 1
+        if executor is _tool_executor and len(stuck) * 2 >= executor._max_workers:
+            logger.warning(
+                f"{len(stuck)} timed out tool calls hold tool workers, starting a new tool pool"
+            )
+            _tool_executor = None
+            _executor_stats["replaced_pools"] += 1
+            executor.shutdown(wait=False)
+    future.add_done_callback(lambda f: _release_abandoned(executor, f))
+
+
+def _release_abandoned(executor: ThreadPoolExecutor, future: Future):
+    with _tool_executor_lock:
+        stuck = _abandoned.get(executor)
+        if stuck is not None:
+            stuck.discard(future)
+            if not stuck and executor is not _tool_executor:
+                del _abandoned[executor]
+
+
+def get_tool_executor_stats() -> Dict[str, Any]:
+    """Workers of the tool pool and the timed out calls still holding some"""
+    with _tool_executor_lock:
+        executor = _tool_executor
+        stuck = len(_abandoned.get(executor, ())) if executor else 0
+        return {
+            **_executor_stats,
+            "max_workers": executor._max_workers if executor else _max_workers(),
+            "queued": executor._work_queue.qsize() if executor else 0,
+            "stuck_workers": stuck,
+            "stuck_in_retired_pools": sum(
+                len(calls) for pool, calls in _abandoned.items() if pool is not executor
+            ),
+        }
+
+
+def in_tool_worker() -> bool:
+    """Whether the current thread belongs to the shared tool executor"""
+    return getattr(_worker_state, "active", False)
+
+
+async def run_in_tool_executor(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """Run a blocking callable on the shared tool executor without blocking the event loop"""
+    # Like asyncio.to_thread, carry the caller's context variables into the worker
+    call = functools.partial(contextvars.copy_context().run, func, *args, **kwargs)
+    future = submit_tool_call(call)
+    try:
+        return await asyncio.wrap_future(future)
+    except asyncio.CancelledError:
+        # Timed out (wait_for) or the caller went away
+        abandon_tool_call(future)
+        raise
+
 
 class BaseTool(ABC):
     """Base class for entity tools"""
@@ -35,6 +163,15 @@ class BaseTool(ABC):
     def execute(self, **kwargs) -> Dict[str, Any]:
         """Execute tool operation"""
 
+    async def aexecute(self, **kwargs) -> Dict[str, Any]:
+        """
+        Execute tool operation asynchronously
+
+        The default runs ``execute`` on the shared tool executor; tools doing network I/O
+        override it with a native async implementation.
+        """
+        return await run_in_tool_executor(self.execute, **kwargs)
+
     @classmethod
     def get_definition(cls) -> Dict[str, Any]:
         """Get tool definition for LLM calls"""
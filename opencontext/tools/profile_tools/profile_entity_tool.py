@@ -12,10 +12,11 @@ Unified entity management tool, integrating storage, search, matching and LLM in
 import json
 from typing import Any, Dict, List, Optional, Tuple
 
+from opencontext.llm.global_embedding_client import do_vectorize_async
 from opencontext.models.context import ProcessedContext, ProfileContextMetadata, Vectorize
 from opencontext.models.enums import ContextType
 from opencontext.storage.global_storage import get_storage
-from opencontext.tools.base import BaseTool
+from opencontext.tools.base import BaseTool, run_in_tool_executor
 from opencontext.utils.json_parser import parse_json_from_response
 from opencontext.utils.logging_utils import get_logger
 
@@ -168,6 +169,30 @@ class ProfileEntityTool(BaseTool):
             logger.error(f"Failed to execute entity operation - {operation}: {e}", exc_info=True)
             return {"success": False, "error": str(e), "operation": operation}
 
+    async def aexecute(self, **kwargs) -> Dict[str, Any]:
+        """Execute entity operation asynchronously
+
+        Similar search and matching embed the query and ask the LLM without blocking the
+        event loop; the other operations are plain storage reads and run on the shared
+        tool executor.
+        """
+        operation = kwargs.get("operation")
+
+        async_handlers = {
+            "find_similar_entity": self._handle_find_similar_async,
+            "match_entity": self._handle_match_async,
+        }
+
+        handler = async_handlers.get(operation)
+        if not handler:
+            return await super().aexecute(**kwargs)
+
+        try:
+            return await handler(kwargs)
+        except Exception as e:
+            logger.error(f"Failed to execute entity operation - {operation}: {e}", exc_info=True)
+            return {"success": False, "error": str(e), "operation": operation}
+
     def _handle_find_exact(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Handle exact search operation"""
         entity_name = params.get("entity_name", "")
@@ -196,6 +221,23 @@ class ProfileEntityTool(BaseTool):
 
         top_k = min(max(params.get("top_k", 10), 1), 100)
         results = self.find_similar_entities([entity_name], top_k=top_k)
+        return self._similar_result(entity_name, results)
+
+    async def _handle_find_similar_async(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        entity_name = params.get("entity_name", "")
+        if not entity_name:
+            return {
+                "success": False,
+                "error": "entity_name is required for find_similar_entity operation",
+            }
+
+        top_k = min(max(params.get("top_k", 10), 1), 100)
+        results = await self.find_similar_entities_async([entity_name], top_k=top_k)
+        return self._similar_result(entity_name, results)
+
+    def _similar_result(
+        self, entity_name: str, results: List[ProcessedContext]
+    ) -> Dict[str, Any]:
         if not results:
             return {
                 "success": False,
@@ -218,6 +260,26 @@ class ProfileEntityTool(BaseTool):
         matched_name, matched_context = self.match_entity(
             entity_name=entity_name, entity_type=entity_type, top_k=top_k
         )
+        return self._match_result(entity_name, matched_name, matched_context)
+
+    async def _handle_match_async(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        entity_name = params.get("entity_name", "")
+        if not entity_name:
+            return {"success": False, "error": "entity_name is required for match_entity operation"}
+
+        top_k = min(max(params.get("top_k", 5), 1), 10)
+        entity_type = params.get("entity_type", None)
+        matched_name, matched_context = await self.match_entity_async(
+            entity_name=entity_name, entity_type=entity_type, top_k=top_k
+        )
+        return self._match_result(entity_name, matched_name, matched_context)
+
+    def _match_result(
+        self,
+        entity_name: str,
+        matched_name: Optional[str],
+        matched_context: Optional[ProcessedContext],
+    ) -> Dict[str, Any]:
         if not matched_name:
             return {
                 "success": False,
@@ -301,6 +363,30 @@ class ProfileEntityTool(BaseTool):
         else:
             return similar_contexts[0].metadata.get("entity_canonical_name", entity_name), similar_contexts[0]
 
+    async def match_entity_async(
+        self, entity_name: str, entity_type: str = None, top_k: int = 3, judge: bool = True
+    ) -> Tuple[Optional[str], Optional[ProcessedContext]]:
+        """Async counterpart of match_entity"""
+        exact_result = await run_in_tool_executor(
+            self.find_exact_entity, [entity_name], entity_type
+        )
+        if exact_result:
+            metadata = exact_result.metadata
+            matched_name = metadata.get("entity_canonical_name", entity_name)
+            return matched_name, exact_result
+
+        top_k = min(max(top_k, 1), 10)
+        similar_contexts = await self.find_similar_entities_async(
+            [entity_name], entity_type, top_k=top_k
+        )
+        if not similar_contexts:
+            return None, None
+
+        if judge:
+            return await self.judge_entity_match_async([entity_name], similar_contexts)
+        else:
+            return similar_contexts[0].metadata.get("entity_canonical_name", entity_name), similar_contexts[0]
+
     def find_exact_entity(
         self, entity_names: List[str], entity_type: str = None
     ) -> Optional[ProcessedContext]:
@@ -334,6 +420,35 @@ class ProfileEntityTool(BaseTool):
             context_types=[ContextType.ENTITY_CONTEXT.value],
             filters=filter,
         )
+        return self._filter_similar(results)
+
+    async def find_similar_entities_async(
+        self, entity_names: List[str], entity_type: str = None, top_k: int = 3
+    ) -> List[ProcessedContext]:
+        """Similar entity search, embedding the query with the async embedding client"""
+        if not entity_names:
+            return []
+        filter = {}
+        if entity_type:
+            filter["entity_type"] = entity_type
+        query = Vectorize(text=" ".join(entity_names))
+        try:
+            await do_vectorize_async(query)
+        except Exception as e:
+            # The storage backend embeds the query itself when no vector is set
+            logger.warning(f"Async entity query embedding failed: {e}")
+        results = await run_in_tool_executor(
+            self.storage.search,
+            query=query,
+            top_k=top_k,
+            context_types=[ContextType.ENTITY_CONTEXT.value],
+            filters=filter,
+        )
+        return self._filter_similar(results)
+
+    def _filter_similar(
+        self, results: List[Tuple[ProcessedContext, float]]
+    ) -> List[ProcessedContext]:
         if not results:
             return []
         contexts = []
@@ -578,44 +693,78 @@ class ProfileEntityTool(BaseTool):
             return None, None
 
         try:
-            candidate_info = []
-            for context in candidates[:5]:
-                entity_data = context.metadata
-                info = {
-                    "name": entity_data.get("entity_canonical_name", ""),
-                    "entity_aliases": entity_data.get("entity_aliases", []),
-                    "type": entity_data.get("entity_type", ""),
-                    "description": entity_data.get("description", ""),
-                }
-                candidate_info.append(info)
+            messages = self._build_match_messages(extracted_names, candidates)
+            from opencontext.llm.global_vlm_client import generate_with_messages
 
-            # Build prompt
-            from opencontext.config.global_config import get_prompt_group
+            response = generate_with_messages(
+                messages,
+                thinking="disabled",
+            )
+            return self._resolve_match(response, candidates)
 
-            prompt_template = get_prompt_group("entity_processing.entity_matching")
+        except Exception as e:
+            logger.error(f"LLM failed to judge entity match: {e}")
+            return None, None
 
-            user_prompt = prompt_template["user"].format(
-                extracted_names=extracted_names,
-                candidates=json.dumps(candidate_info, ensure_ascii=False, indent=2),
-            )
+    async def judge_entity_match_async(
+        self, extracted_names: List[str], candidates: List[ProcessedContext]
+    ) -> Optional[Tuple[str, ProcessedContext]]:
+        """Async counterpart of judge_entity_match"""
+        if not candidates:
+            return None, None
 
-            messages = [
-                {"role": "system", "content": prompt_template["system"]},
-                {"role": "user", "content": user_prompt},
-            ]
-            from opencontext.llm.global_vlm_client import generate_with_messages
+        try:
+            messages = self._build_match_messages(extracted_names, candidates)
+            from opencontext.llm.global_vlm_client import generate_with_messages_async
 
-            response = generate_with_messages(
+            response = await generate_with_messages_async(
                 messages,
                 thinking="disabled",
             )
-            result = parse_json_from_response(response)
-            if result.get("is_match") and result.get("matched_entity"):
-                for candidate in candidates:
-                    if result.get("matched_entity") in candidate.metadata.get("entity_aliases", []):
-                        return candidate.metadata.get("entity_canonical_name"), candidate
-            return None, None
+            return self._resolve_match(response, candidates)
 
         except Exception as e:
             logger.error(f"LLM failed to judge entity match: {e}")
             return None, None
+
+    def _build_match_messages(
+        self, extracted_names: List[str], candidates: List[ProcessedContext]
+    ) -> List[Dict[str, str]]:
+        """Build the entity matching prompt"""
+        candidate_info = []
+        for context in candidates[:5]:
+            entity_data = context.metadata
+            info = {
+                "name": entity_data.get("entity_canonical_name", ""),
+                "entity_aliases": entity_data.get("entity_aliases", []),
+                "type": entity_data.get("entity_type", ""),
+                "description": entity_data.get("description", ""),
+            }
+            candidate_info.append(info)
+
+        # Build prompt
+        from opencontext.config.global_config import get_prompt_group
+
+        prompt_template = get_prompt_group("entity_processing.entity_matching")
+
+        user_prompt = prompt_template["user"].format(
+            extracted_names=extracted_names,
+            candidates=json.dumps(candidate_info, ensure_ascii=False, indent=2),
+        )
+
+        messages = [
+            {"role": "system", "content": prompt_template["system"]},
+            {"role": "user", "content": user_prompt},
+        ]
+        return messages
+
+    def _resolve_match(
+        self, response: str, candidates: List[ProcessedContext]
+    ) -> Tuple[Optional[str], Optional[ProcessedContext]]:
+        """Map the LLM judgement back to the matched candidate"""
+        result = parse_json_from_response(response)
+        if result.get("is_match") and result.get("matched_entity"):
+            for candidate in candidates:
+                if result.get("matched_entity") in candidate.metadata.get("entity_aliases", []):
+                    return candidate.metadata.get("entity_canonical_name"), candidate
+        return None, None
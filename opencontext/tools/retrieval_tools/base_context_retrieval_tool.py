@@ -11,10 +11,11 @@ Provides common functionality for searching and filtering processed contexts
 from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional, Tuple
 
+from opencontext.llm.global_embedding_client import do_vectorize_async
 from opencontext.models.context import ProcessedContext, Vectorize
 from opencontext.models.enums import ContextSimpleDescriptions, ContextType
 from opencontext.storage.global_storage import get_storage
-from opencontext.tools.base import BaseTool
+from opencontext.tools.base import BaseTool, run_in_tool_executor
 from opencontext.tools.profile_tools.profile_entity_tool import ProfileEntityTool
 from opencontext.utils.logging_utils import get_logger
 
@@ -63,6 +64,31 @@ class BaseContextRetrievalTool(BaseTool):
 
     def _build_filters(self, filters: ContextRetrievalFilter) -> Dict[str, Any]:
         """Build filter conditions for storage backend"""
+        build_filter = self._build_time_filter(filters)
+
+        # Entity filter with normalization
+        if filters.entities is not None and filters.entities:
+            # Use Profile entity tool to handle entity unification
+            unify_result = self.profile_entity_tool.execute(
+                entities=filters.entities, operation="match_entities", context_info=""
+            )
+            build_filter["entities"] = self._unified_entities(filters.entities, unify_result)
+
+        return build_filter
+
+    async def _build_filters_async(self, filters: ContextRetrievalFilter) -> Dict[str, Any]:
+        """Build filter conditions for storage backend without blocking the event loop"""
+        build_filter = self._build_time_filter(filters)
+
+        if filters.entities is not None and filters.entities:
+            unify_result = await self.profile_entity_tool.aexecute(
+                entities=filters.entities, operation="match_entities", context_info=""
+            )
+            build_filter["entities"] = self._unified_entities(filters.entities, unify_result)
+
+        return build_filter
+
+    def _build_time_filter(self, filters: ContextRetrievalFilter) -> Dict[str, Any]:
         build_filter = {}
 
         # Time range filter
@@ -73,27 +99,20 @@ class BaseContextRetrievalTool(BaseTool):
                 build_filter[time_type]["$gte"] = filters.time_range.start
             if filters.time_range.end:
                 build_filter[time_type]["$lte"] = filters.time_range.end
-
-        # Entity filter with normalization
-        if filters.entities is not None and filters.entities:
-            # Use Profile entity tool to handle entity unification
-            unify_result = self.profile_entity_tool.execute(
-                entities=filters.entities, operation="match_entities", context_info=""
-            )
-            if unify_result.get("success"):
-                # Extract matched standardized entity names
-                matches = unify_result.get("matches", [])
-                unified_entities = [
-                    match.get("entity_canonical_name", match["input_entity"]) for match in matches
-                ]
-                if not unified_entities:
-                    unified_entities = filters.entities
-                build_filter["entities"] = unified_entities
-            else:
-                build_filter["entities"] = filters.entities
-
         return build_filter
 
+    def _unified_entities(self, entities: List[str], unify_result: Dict[str, Any]) -> List[str]:
+        """Standardized entity names from the entity tool result, or the input entities"""
+        if unify_result.get("success"):
+            # Extract matched standardized entity names
+            matches = unify_result.get("matches", [])
+            unified_entities = [
+                match.get("entity_canonical_name", match["input_entity"]) for match in matches
+            ]
+            if unified_entities:
+                return unified_entities
+        return entities
+
     def _execute_search(
         self, query: Optional[str], filters: ContextRetrievalFilter, top_k: int = 20
     ) -> List[Tuple[ProcessedContext, float]]:
@@ -122,18 +141,53 @@ class BaseContextRetrievalTool(BaseTool):
                 top_k=top_k,
             )
         else:
-            # Filter-only retrieval without query
-            results_dict = self.storage.get_all_processed_contexts(
-                context_types=[context_type_str], limit=top_k, filter=built_filters
+            return self._filter_contexts(built_filters, top_k)
+
+    async def _execute_search_async(
+        self, query: Optional[str], filters: ContextRetrievalFilter, top_k: int = 20
+    ) -> List[Tuple[ProcessedContext, float]]:
+        """
+        Execute search operation without blocking the event loop
+
+        The query is embedded through the async embedding client; only the vector store
+        query itself runs on the shared tool executor.
+        """
+        context_type_str = self.CONTEXT_TYPE.value
+        built_filters = await self._build_filters_async(filters)
+
+        if query:
+            vectorize = Vectorize(text=query)
+            try:
+                await do_vectorize_async(vectorize)
+            except Exception as e:
+                # The storage backend embeds the query itself when no vector is set
+                logger.warning(f"{self.get_name()} async query embedding failed: {e}")
+            return await run_in_tool_executor(
+                self.storage.search,
+                query=vectorize,
+                context_types=[context_type_str],
+                filters=built_filters,
+                top_k=top_k,
             )
+        else:
+            return await run_in_tool_executor(self._filter_contexts, built_filters, top_k)
 
-            # Convert results to (context, score) format
-            results = []
-            contexts = results_dict.get(context_type_str, [])
-            for ctx in contexts:
-                results.append((ctx, 1.0))  # No similarity score for filter-only
+    def _filter_contexts(
+        self, built_filters: Dict[str, Any], top_k: int
+    ) -> List[Tuple[ProcessedContext, float]]:
+        """Filter-only retrieval without query"""
+        context_type_str = self.CONTEXT_TYPE.value
+        results_dict = self.storage.get_all_processed_contexts(
+            context_types=[context_type_str], limit=top_k, filter=built_filters
+        )
 
-            return results[:top_k]
+        # Convert results to (context, score) format
+        results = []
+        contexts = results_dict.get(context_type_str, [])
+        for ctx in contexts:
+            results.append((ctx, 1.0))  # No similarity score for filter-only
+
+        return results[:top_k]
 
     def _format_context_result(
         self, context: ProcessedContext, score: float, additional_fields: Dict[str, Any] = None
@@ -232,6 +286,34 @@ class BaseContextRetrievalTool(BaseTool):
         Returns:
             List of formatted context results
         """
+        try:
+            query, filters, top_k = self._parse_arguments(kwargs)
+
+            # Execute search
+            search_results = self._execute_search(query=query, filters=filters, top_k=top_k)
+
+            # Format and return results
+            return self._format_results(search_results)
+
+        except Exception as e:
+            return self._error_result(e)
+
+    async def aexecute(self, **kwargs) -> List[Dict[str, Any]]:
+        """Execute context retrieval asynchronously, same arguments and results as execute"""
+        try:
+            query, filters, top_k = self._parse_arguments(kwargs)
+            search_results = await self._execute_search_async(
+                query=query, filters=filters, top_k=top_k
+            )
+            return self._format_results(search_results)
+
+        except Exception as e:
+            return self._error_result(e)
+
+    def _parse_arguments(
+        self, kwargs: Dict[str, Any]
+    ) -> Tuple[Optional[str], ContextRetrievalFilter, int]:
+        """Build the query, filter conditions and result count from tool arguments"""
         query = kwargs.get("query")
         entities = kwargs.get("entities", [])
         time_range = kwargs.get("time_range")
@@ -244,15 +326,10 @@ class BaseContextRetrievalTool(BaseTool):
         if time_range:
             filters.time_range = TimeRangeFilter(**time_range)
 
-        try:
-            # Execute search
-            search_results = self._execute_search(query=query, filters=filters, top_k=top_k)
-
-            # Format and return results
-            return self._format_results(search_results)
+        return query, filters, top_k
 
-        except Exception as e:
-            logger.error(f"{self.get_name()} execute exception: {str(e)}")
-            return [
-                {"error": f"Error occurred during {self.CONTEXT_TYPE.value} retrieval: {str(e)}"}
-            ]
+    def _error_result(self, error: Exception) -> List[Dict[str, Any]]:
+        logger.error(f"{self.get_name()} execute exception: {str(error)}")
+        return [
+            {"error": f"Error occurred during {self.CONTEXT_TYPE.value} retrieval: {str(error)}"}
+        ]
@@ -3,13 +3,17 @@
 
 import asyncio
 import json
-from typing import Any, Dict, List, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 from opencontext.config import GlobalConfig
+from opencontext.config.global_config import get_config
 from opencontext.tools.base import BaseTool
 from opencontext.tools.operation_tools import *
 from opencontext.tools.profile_tools import ProfileEntityTool
 from opencontext.tools.retrieval_tools import *
+from opencontext.utils.logging_utils import get_logger
+
+logger = get_logger(__name__)
 
 
 class ToolsExecutor:
@@ -31,51 +35,46 @@ class ToolsExecutor:
             # Operation tools
             WebSearchTool.get_name(): WebSearchTool(),
         }
+        execution_config = get_config("tools.execution") or {}
+        self._default_timeout = execution_config.get("default_timeout", 30)
+        self._timeouts: Dict[str, float] = execution_config.get("timeouts") or {}
+
+    def get_timeout(self, tool_name: str) -> float:
+        """Time limit in seconds for one call of the tool"""
+        return self._timeouts.get(tool_name, self._default_timeout)
+
+    def timeout_result(self, tool_name: str) -> Dict[str, Any]:
+        return {
+            "error": f"Tool {tool_name} timed out after {self.get_timeout(tool_name)}s",
+            "message": "The tool did not respond in time, answer with the information available",
+        }
 
     async def run_async(self, tool_name: str, tool_input: Dict[str, Any]) -> Any:
-        if tool_name in self._tools_map:
-            tool = self._tools_map[tool_name]
+        tool, tool_input = self._resolve(tool_name, tool_input)
+        if tool is None:
+            return tool_input
 
-            if (
-                isinstance(tool_input, list)
-                and len(tool_input) == 1
-                and isinstance(tool_input[0], dict)
-            ):
-                tool_input = tool_input[0]
-
-            # Ensure tool_input is dictionary type
-            if not isinstance(tool_input, dict):
-                return {
-                    "error": f"Tool parameter format error: expected dict, got {type(tool_input).__name__}",
-                    "message": "Tool parameters must be in dictionary format",
-                    "received_type": type(tool_input).__name__,
-                }
-
-            return tool.execute(**tool_input)
-        else:
-            # Log unknown tool call but don't throw exception, return warning message
-            import logging
-            from difflib import get_close_matches
+        try:
+            return await asyncio.wait_for(
+                tool.aexecute(**tool_input), timeout=self.get_timeout(tool_name)
+            )
+        except asyncio.TimeoutError:
+            logger.warning(f"Tool {tool_name} timed out after {self.get_timeout(tool_name)}s")
+            return self.timeout_result(tool_name)
 
-            logger = logging.getLogger(__name__)
+    def run(self, tool_name: str, tool_input: Dict[str, Any]) -> Any:
+        tool, tool_input = self._resolve(tool_name, tool_input)
+        if tool is None:
+            return tool_input
 
-            # Provide similar tool name suggestions
-            available_tools = list(self._tools_map.keys())
-            suggestions = get_close_matches(tool_name, available_tools, n=3, cutoff=0.6)
-            suggestion_text = f"Suggested tools: {', '.join(suggestions)}" if suggestions else ""
+        return tool.execute(**tool_input)
 
-            error_msg = f"Unknown tool: {tool_name}. {suggestion_text}"
-            available_tools_text = f"Available tools: {', '.join(available_tools[:10])}" + (
-                "..." if len(available_tools) > 10 else ""
-            )
-            return {
-                "error": error_msg,
-                "message": "This tool does not exist, please use system-provided tools",
-                "available_tools": available_tools_text,
-                "suggestions": suggestions,
-            }
+    def _resolve(self, tool_name: str, tool_input: Any) -> Tuple[Optional[BaseTool], Any]:
+        """
+        Look the tool up and normalize its input
 
-    def run(self, tool_name: str, tool_input: Dict[str, Any]) -> Any:
+        Returns (tool, tool_input), or (None, error_result) when the call cannot be executed
+        """
         if tool_name in self._tools_map:
             tool = self._tools_map[tool_name]
 
@@ -89,20 +88,17 @@ class ToolsExecutor:
 
             # Ensure tool_input is dictionary type
             if not isinstance(tool_input, dict):
-                return {
+                return None, {
                     "error": f"Tool parameter format error: expected dict, got {type(tool_input).__name__}",
                     "message": "Tool parameters must be in dictionary format",
                     "received_type": type(tool_input).__name__,
                 }
 
-            return tool.execute(**tool_input)
+            return tool, tool_input
         else:
             # Log unknown tool call but don't throw exception, return warning message
-            import logging
             from difflib import get_close_matches
 
-            logger = logging.getLogger(__name__)
-
             # Provide similar tool name suggestions
             available_tools = list(self._tools_map.keys())
             suggestions = get_close_matches(tool_name, available_tools, n=3, cutoff=0.6)
@@ -112,7 +108,7 @@ class ToolsExecutor:
             available_tools_text = f"Available tools: {', '.join(available_tools[:10])}" + (
                 "..." if len(available_tools) > 10 else ""
             )
-            return {
+            return None, {
                 "error": error_msg,
                 "message": "This tool does not exist, please use system-provided tools",
                 "available_tools": available_tools_text,
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2025 Beijing Volcano Engine Technology Co., Ltd.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+OpenContext module: hash_index
+Sliding-window Hamming-distance index for perceptual hashes
+"""
+
+from collections import OrderedDict
+from typing import Dict, Hashable, List, Optional, Set, Tuple
+
+
+class HammingIndex:
+    """
+    Multi-index hashing over a sliding window of integer hashes.
+
+    Each hash is split into ``max_distance + 1`` disjoint bit chunks. By the pigeonhole
+    principle, two hashes within ``max_distance`` bits of each other agree exactly on at
+    least one chunk, so a lookup only verifies the entries sharing a chunk with the query
+    instead of scanning the whole window. Unlike a BK-tree, entries can be evicted in O(1),
+    which keeps the window bounded.
+
+    The window is ordered by recency: a lookup that finds a match refreshes it, and the
+    least recently seen entry is evicted once ``window`` entries are held.
+    """
+
+    def __init__(self, max_distance: int, window: int = 30, bits: int = 64):
+        self._bits = bits
+        self._max_distance = max(0, min(int(max_distance), bits - 1))
+        self._window = max(1, int(window))
+        chunk_count = self._max_distance + 1
+        base, extra = divmod(bits, chunk_count)
+        # (shift, mask) per chunk; the first `extra` chunks get one more bit
+        self._chunks: List[Tuple[int, int]] = []
+        shift = 0
+        for i in range(chunk_count):
+            width = base + (1 if i < extra else 0)
+            self._chunks.append((shift, (1 << width) - 1))
+            shift += width
+        self._buckets: List[Dict[int, Set[Hashable]]] = [{} for _ in self._chunks]
+        self._entries: "OrderedDict[Hashable, int]" = OrderedDict()
+
+    @property
+    def max_distance(self) -> int:
+        return self._max_distance
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def find(self, value: int, refresh: bool = True) -> Optional[Tuple[Hashable, int]]:
+        """Return (key, distance) of the closest entry within max_distance, or None"""
+        best = None
+        seen: Set[Hashable] = set()
+        for (shift, mask), buckets in zip(self._chunks, self._buckets):
+            for key in buckets.get((value >> shift) & mask, ()):
+                if key in seen:
+                    continue
+                seen.add(key)
+                distance = (self._entries[key] ^ value).bit_count()
+                if distance <= self._max_distance and (best is None or distance < best[1]):
+                    best = (key, distance)
+                    if distance == 0:
+                        break
+        if best is not None and refresh:
+            self._entries.move_to_end(best[0])
+        return best
+
+    def add(self, key: Hashable, value: int):
+        """Insert a hash, evicting the least recently seen entry if the window is full"""
+        if key in self._entries:
+            self.remove(key)
+        self._entries[key] = value
+        for (shift, mask), buckets in zip(self._chunks, self._buckets):
+            buckets.setdefault((value >> shift) & mask, set()).add(key)
+        while len(self._entries) > self._window:
+            self.remove(next(iter(self._entries)))
+
+    def find_or_add(self, key: Hashable, value: int) -> Optional[Tuple[Hashable, int]]:
+        """Look a hash up and insert it under `key` when no near duplicate exists"""
+        match = self.find(value)
+        if match is None:
+            self.add(key, value)
+        return match
+
+    def remove(self, key: Hashable):
+        value = self._entries.pop(key, None)
+        if value is None:
+            return
+        for (shift, mask), buckets in zip(self._chunks, self._buckets):
+            chunk = (value >> shift) & mask
+            bucket = buckets.get(chunk)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del buckets[chunk]
+
+    def clear(self):
+        self._entries.clear()
+        for buckets in self._buckets:
+            buckets.clear()
@@ -7,12 +7,34 @@
 OpenContext module: image
 """
 
-from typing import Optional
+import base64
+import io
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional, Tuple
 
 import imagehash
+import numpy as np
 from PIL import Image
 
 
+def dhash(image: Image.Image, hash_size: int = 8) -> int:
+    """
+    Difference hash of an image as an integer.
+    Same bit layout as imagehash.dhash, but shrinks with a box filter first so it stays
+    cheap on full-resolution frames.
+    """
+    small = image.convert("L").resize(
+        (hash_size + 1, hash_size), Image.Resampling.BOX, reducing_gap=2.0
+    )
+    pixels = np.asarray(small, dtype=np.int16)
+    bits = (pixels[:, 1:] > pixels[:, :-1]).flatten()
+    value = 0
+    for bit in bits:
+        value = (value << 1) | int(bit)
+    return value
+
+
 def calculate_bytes2phash(image_bytes: bytes) -> Optional[str]:
     """
     Calculate perceptual hash of image (cached).
@@ -65,3 +87,153 @@ def resize_image(path: str, max_size: int, resize_quality: int) -> bool:
         logger = get_logger(__name__)
         logger.error(f"Failed to resize image {path}: {e}")
     return False
+
+
+_persist_executor: Optional[ThreadPoolExecutor] = None
+_persist_executor_lock = threading.Lock()
+
+
+def _get_persist_executor() -> ThreadPoolExecutor:
+    global _persist_executor
+    with _persist_executor_lock:
+        if _persist_executor is None:
+            _persist_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="frame-writer")
+        return _persist_executor
+
+
+class ImageFrame:
+    """
+    A decoded screenshot carried in memory from capture to the VLM.
+
+    Holds the (already downscaled) image, its dHash and the encoded bytes, each computed
+    at most once, so a frame is decoded and encoded a single time however many pipeline
+    stages look at it. Writing the encoded bytes to disk is an optional background task.
+    """
+
+    def __init__(
+        self,
+        image: Image.Image,
+        image_format: str = "png",
+        quality: int = 95,
+        dhash_value: Optional[int] = None,
+    ):
+        self.image = image if image.mode in ("RGB", "L") else image.convert("RGB")
+        self.original_size: Tuple[int, int] = image.size
+        self.format = "jpeg" if image_format.lower() in ("jpg", "jpeg") else "png"
+        self.quality = quality
+        self._encoded: Optional[bytes] = None
+        self._dhash: Optional[int] = dhash_value
+        self._persist_future: Optional[Future] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_image(
+        cls,
+        image: Image.Image,
+        max_size: int = 0,
+        image_format: str = "png",
+        quality: int = 95,
+        dhash_value: Optional[int] = None,
+    ) -> "ImageFrame":
+        """
+        Wrap a decoded image, scaling it down proportionally to max_size.
+        A dHash already computed on the full-size image can be passed to keep it.
+        """
+        frame = cls(image, image_format, quality)
+        frame.downscale(max_size)
+        if dhash_value is not None:
+            frame._dhash = dhash_value
+        return frame
+
+    @classmethod
+    def from_file(cls, path: str, max_size: int = 0, quality: int = 95) -> "ImageFrame":
+        """Decode an image file once; the frame format follows the file extension"""
+        with Image.open(path) as img:
+            img.load()
+            image_format = "jpeg" if path.lower().endswith((".jpg", ".jpeg")) else "png"
+            return cls.from_image(img, max_size, image_format, quality)
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        return self.image.size
+
+    @property
+    def mime_type(self) -> str:
+        return f"image/{self.format}"
+
+    @property
+    def dhash(self) -> int:
+        """Difference hash of the frame as an integer"""
+        with self._lock:
+            if self._dhash is None:
+                self._dhash = dhash(self.image)
+            return self._dhash
+
+    @property
+    def phash(self) -> str:
+        """Difference hash as a hex string, in the format calculate_phash returns"""
+        return f"{self.dhash:016x}"
+
+    def downscale(self, max_size: int) -> bool:
+        """Scale the frame down in memory if it exceeds max_size; returns whether it changed"""
+        if not max_size or (self.image.width <= max_size and self.image.height <= max_size):
+            return False
+        with self._lock:
+            image = self.image.copy()
+            image.thumbnail((max_size, max_size), Image.Resampling.BILINEAR)
+            self.image = image
+            self._encoded = None
+            self._dhash = None
+        return True
+
+    def encode(self) -> bytes:
+        """Encoded image bytes in the frame format"""
+        with self._lock:
+            if self._encoded is None:
+                buffer = io.BytesIO()
+                if self.format == "jpeg":
+                    self.image.save(buffer, format="JPEG", quality=self.quality)
+                else:
+                    self.image.save(buffer, format="PNG")
+                self._encoded = buffer.getvalue()
+            return self._encoded
+
+    def to_base64(self) -> str:
+        return base64.b64encode(self.encode()).decode("utf-8")
+
+    def save(self, path: str):
+        with open(path, "wb") as f:
+            f.write(self.encode())
+
+    def persist_async(self, path: str) -> Future:
+        """Write the encoded frame to path on the background writer thread"""
+        self._persist_future = _get_persist_executor().submit(self.save, path)
+        return self._persist_future
+
+    def wait_persisted(self, timeout: Optional[float] = None) -> bool:
+        """Block until a pending background write finishes; returns whether it succeeded"""
+        future = self._persist_future
+        if future is None:
+            return True
+        try:
+            future.result(timeout=timeout)
+            return True
+        except Exception:
+            return False
+
+    def release(self):
+        """
+        Drop pixel data and encoded bytes once the frame has been consumed; a background
+        write still in progress needs them, so they are dropped when it finishes instead
+        """
+        future = self._persist_future
+        if future is None:
+            self._drop()
+        else:
+            # Runs at once if the write is already done
+            future.add_done_callback(lambda _: self._drop())
+
+    def _drop(self):
+        with self._lock:
+            self._encoded = None
+            self.image = None